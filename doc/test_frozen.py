@@ -0,0 +1,211 @@
+#!/bin/env python
+
+from __future__ import print_function
+
+verbose = __name__ == "__main__"
+
+import os
+import sys
+import pickle
+import tempfile
+if not verbose:
+    out = open(os.devnull, 'w')
+else:
+    out = sys.stdout
+from graph_tool.all import *
+import numpy.random
+from numpy.random import randint, random
+from numpy import allclose, array_equal
+
+numpy.random.seed(42)
+seed_rng(42)
+
+
+def gen_graph(directed):
+    g = price_network(300, m=2, directed=directed)
+    g.vp.idx = g.new_vp("int32_t", g.vertex_index.copy("int32_t").a)
+    g.vp.x = g.new_vp("double", random(g.num_vertices()))
+    g.vp.pos = g.new_vp("vector<double>")
+    for v in g.vertices():
+        g.vp.pos[v] = random(2)
+    g.vp.cat = g.new_vp("categorical",
+                        vals=[str(x) for x in randint(0, 5, g.num_vertices())])
+    g.ep.w = g.new_ep("double", random(g.num_edges()) + 1)
+    g.gp.name = g.new_gp("string", "test")
+    return g
+
+
+def edge_set(g):
+    es = g.get_edges()
+    if not g.is_directed():
+        es[:, :2] = numpy.sort(es[:, :2], axis=1)
+    return sorted(map(tuple, es))
+
+
+def check_same(g, h):
+    # h is a frozen or thawed version of g, without unused edge indexes
+    assert g.is_directed() == h.is_directed()
+    assert g.num_vertices() == h.num_vertices()
+    assert g.num_edges() == h.num_edges()
+    assert edge_set(g) == edge_set(h)
+    for v in g.vertices():
+        assert array_equal(numpy.sort(g.get_out_neighbours(v)),
+                           numpy.sort(h.get_out_neighbours(v)))
+        assert array_equal(numpy.sort(g.get_in_neighbours(v)),
+                           numpy.sort(h.get_in_neighbours(v)))
+    for name in ["idx", "x"]:
+        assert array_equal(g.vp[name].a, h.vp[name].a)
+    assert array_equal(g.vp.pos.get_2d_array([0, 1]),
+                       h.vp.pos.get_2d_array([0, 1]))
+    assert [g.vp.cat[v] for v in g.vertices()] == \
+        [h.vp.cat[v] for v in h.vertices()]
+    assert array_equal(g.ep.w.a, h.ep.w.a)
+    assert g.gp.name == h.gp.name
+
+
+def check_unsupported(fg):
+    for f in [lambda: fg.add_vertex(), lambda: fg.add_edge(0, 1),
+              lambda: pseudo_diameter(fg), lambda: vertex_hist(fg, "out")]:
+        try:
+            f()
+        except RuntimeError:
+            continue
+        raise AssertionError("frozen graph modified or used by an unsupported function")
+
+
+def check_parity(g, fg):
+    # the frozen graph gives the same results as the original one
+    for s in [10, 100, 200]:
+        assert array_equal(shortest_distance(g, s).a,
+                           shortest_distance(fg, s).a)
+        assert allclose(shortest_distance(g, s, weights=g.ep.w).a,
+                        shortest_distance(fg, s, weights=fg.ep.w).a)
+        # in the directed price network, the edges point to older vertices
+        t = 0
+        vl, el = shortest_path(g, s, t)
+        fvl, fel = shortest_path(fg, s, t)
+        assert len(vl) == len(fvl)
+        assert (sorted(map(tuple, all_shortest_paths(g, s, t))) ==
+                sorted(map(tuple, all_shortest_paths(fg, s, t))))
+
+        dist = {}
+        for h in [g, fg]:
+            d = dist[h] = h.new_vp("int64_t", -1)
+            d[s] = 0
+            for e in bfs_iterator(h, s):
+                d[e.target()] = d[e.source()] + 1
+        assert array_equal(dist[g].a, dist[fg].a)
+
+        dist = {}
+        for h in [g, fg]:
+            dist[h] = dijkstra_search(h, s, h.ep.w)[0]
+        assert allclose(dist[g].a, dist[fg].a)
+
+        assert (len(list(dfs_iterator(g, s))) ==
+                len(list(dfs_iterator(fg, s))))
+
+    assert allclose(shortest_distance(g).get_2d_array(range(g.num_vertices())),
+                    shortest_distance(fg).get_2d_array(range(fg.num_vertices())))
+    assert array_equal(label_components(g)[0].a, label_components(fg)[0].a)
+    assert array_equal(kcore_decomposition(g).a, kcore_decomposition(fg).a)
+    assert allclose(pagerank(g).a, pagerank(fg).a)
+    assert allclose(pagerank(g, weight=g.ep.w).a,
+                    pagerank(fg, weight=fg.ep.w).a)
+    assert allclose(betweenness(g)[0].a, betweenness(fg)[0].a)
+    assert allclose(closeness(g).a, closeness(fg).a, equal_nan=True)
+    assert allclose(katz(g).a, katz(fg).a)
+    if not g.is_directed():
+        assert allclose(eigenvector(g)[1].a, eigenvector(fg)[1].a)
+
+    # graph views of a frozen graph
+    vfilt = g.vp.x.a > .2
+    u = GraphView(g, vfilt=vfilt)
+    fu = GraphView(fg, vfilt=vfilt)
+    assert u.num_vertices() == fu.num_vertices()
+    assert u.num_edges() == fu.num_edges()
+    assert array_equal(label_components(u)[0].fa,
+                       label_components(fu)[0].fa)
+    s = int(u.get_vertices()[0])
+    assert array_equal(shortest_distance(u, s).fa,
+                       shortest_distance(fu, s).fa)
+
+
+for directed in [True, False]:
+    print("directed:", directed, file=out)
+
+    g = gen_graph(directed)
+
+    # freeze/thaw round trips
+
+    fg = g.freeze()
+    print(fg, file=out)
+    check_same(g, fg)
+    check_same(g, fg.thaw())
+    check_same(g, fg.thaw().freeze())
+    check_unsupported(fg)
+
+    # unused edge indexes are renumbered contiguously
+    h = g.copy()
+    h.remove_edge(h.edge(*h.get_edges()[0, :2]))
+    fh = h.freeze()
+    assert fh.num_edges() == h.num_edges()
+    assert array_equal(numpy.sort(fh.ep.w.a),
+                       numpy.sort([h.ep.w[e] for e in h.edges()]))
+
+    # filtered graphs are pruned
+    u = GraphView(g, vfilt=g.vp.x.a > .5)
+    fu = u.freeze()
+    check_same(Graph(u, prune=True), fu)
+
+    # pickling, in- and out-of-band
+
+    for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+        check_same(g, pickle.loads(pickle.dumps(fg, protocol)))
+    if pickle.HIGHEST_PROTOCOL >= 5:
+        buffers = []
+        data = pickle.dumps(fg, protocol=5, buffer_callback=buffers.append)
+        check_same(g, pickle.loads(data, buffers=buffers))
+
+    # frozen file format, read and memory-mapped
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fname = os.path.join(tmp, "g.frozen")
+        g.save(fname, fmt="frozen")
+        for mmap in [False, True]:
+            h = load_graph(fname, fmt="frozen", mmap=mmap)
+            assert isinstance(h, FrozenGraph)
+            check_same(g, h)
+            check_parity(g, h)
+            del h
+
+    # shared memory
+
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        shared_memory = None
+    if shared_memory is not None:
+        shm = g.to_shared_memory()
+        try:
+            h = Graph.attach_shared_memory(shm.name)
+            assert isinstance(h, FrozenGraph)
+            check_same(g, h)
+            check_parity(g, h)
+            del h
+            h = Graph.attach_shared_memory(shm.name, frozen=False)
+            assert not isinstance(h, FrozenGraph)
+            check_same(g, h)
+            h = Graph.attach_shared_memory(shm.name, vprops=["x"], eprops=[],
+                                           gprops=[])
+            assert list(h.vp) == ["x"]
+            assert len(h.ep) == 0 and len(h.gp) == 0
+            del h
+        finally:
+            shm.close()
+            shm.unlink()
+
+    # algorithms
+
+    check_parity(g, fg)
+
+print("OK")
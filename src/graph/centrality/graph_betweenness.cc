@@ -135,7 +135,7 @@ void betweenness(GraphInterface& g, boost::any weight,
 
     if (!weight.empty())
     {
-        run_action<>()
+        run_action<all_graph_views_with_frozen>()
             (g, std::bind<>(get_weighted_betweenness(),
                             std::placeholders::_1, g.get_vertex_index(),
                             std::placeholders::_2,
@@ -147,7 +147,7 @@ void betweenness(GraphInterface& g, boost::any weight,
     }
     else
     {
-        run_action<>()
+        run_action<all_graph_views_with_frozen>()
             (g, std::bind<void>(get_betweenness(), std::placeholders::_1,
                                 g.get_vertex_index(), std::placeholders::_2,
                                 std::placeholders::_3, normalize,
@@ -172,7 +172,7 @@ double central_point(GraphInterface& g,
                      boost::any vertex_betweenness)
 {
     double c = 0.0;
-    run_action<graph_tool::detail::never_reversed>()
+    run_action<graph_tool::never_reversed_with_frozen>()
         (g, std::bind<>(get_central_point_dominance(), std::placeholders::_1,
                         std::placeholders::_2, std::ref(c)),
          vertex_scalar_properties()) (vertex_betweenness);
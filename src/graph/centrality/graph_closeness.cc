@@ -33,7 +33,7 @@ void do_get_closeness(GraphInterface& gi, boost::any weight,
 {
     if (weight.empty())
     {
-        run_action<>()(gi,
+        run_action<all_graph_views_with_frozen>()(gi,
                        std::bind(get_closeness(), std::placeholders::_1,
                                  gi.get_vertex_index(), no_weightS(),
                                  std::placeholders::_2, harmonic, norm),
@@ -41,7 +41,7 @@ void do_get_closeness(GraphInterface& gi, boost::any weight,
     }
     else
     {
-        run_action<>()(gi,
+        run_action<all_graph_views_with_frozen>()(gi,
                        std::bind(get_closeness(), std::placeholders::_1,
                                  gi.get_vertex_index(), std::placeholders::_2,
                                  std::placeholders::_3, harmonic, norm),
@@ -41,7 +41,7 @@ long double eigenvector(GraphInterface& g, boost::any w, boost::any c,
         w = weight_map_t();
 
     long double eig = 0;
-    run_action<>()
+    run_action<all_graph_views_with_frozen>()
         (g, std::bind(get_eigenvector(), std::placeholders::_1, g.get_vertex_index(),
                       std::placeholders::_2, std::placeholders::_3, epsilon, max_iter,
                       std::ref(eig)),
@@ -53,7 +53,7 @@ void katz(GraphInterface& g, boost::any w, boost::any c, boost::any beta,
     if(beta.empty())
         beta = beta_map_t();
 
-    run_action<>()(g, std::bind(get_katz(), std::placeholders::_1, g.get_vertex_index(),
+    run_action<all_graph_views_with_frozen>()(g, std::bind(get_katz(), std::placeholders::_1, g.get_vertex_index(),
                                 std::placeholders::_2, std::placeholders::_3,
                                 std::placeholders::_4, alpha, epsilon, max_iter),
                    weight_props_t(),
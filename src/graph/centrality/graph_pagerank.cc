@@ -55,7 +55,7 @@ size_t pagerank(GraphInterface& g, boost::any rank, boost::any pers,
         weight = weight_map_t();
 
     size_t iter;
-    run_action<>()
+    run_action<all_graph_views_with_frozen>()
         (g, std::bind(get_pagerank(),
                       std::placeholders::_1, g.get_vertex_index(), std::placeholders::_2,
                       std::placeholders::_3, std::placeholders::_4, d,
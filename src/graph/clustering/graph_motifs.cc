@@ -83,7 +83,7 @@ void get_motifs(GraphInterface& g, size_t k, boost::python::list subgraph_list,
     if (total == 1.0)
         sampler = sample_all();
     else
-        sampler = sample_some(plist, rng);
+        sampler = sample_some<>(plist, rng);
 
     typedef property_map_type
             ::apply<int32_t, GraphInterface::vertex_index_map_t>::type
@@ -95,7 +95,7 @@ void get_motifs(GraphInterface& g, size_t k, boost::python::list subgraph_list,
                                      fill_list, rng),
                       std::placeholders::_1, k, std::ref(list), std::ref(phist),
                       std::ref(vmaps), std::placeholders::_2),
-         boost::mpl::vector<sample_all,sample_some>())(sampler);
+         boost::mpl::vector<sample_all,sample_some<>>())(sampler);
 
     for (size_t i = 0; i < phist.size(); ++i)
         hist.append(phist[i]);
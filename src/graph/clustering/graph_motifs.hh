@@ -25,6 +25,7 @@
 
 #include "random.hh"
 #include "hash_map_wrap.hh"
+#include "../inference/parallel_rng.hh"
 
 namespace graph_tool
 {
@@ -139,11 +140,15 @@ struct sample_all
 {
     template <class val_type>
     void operator()(std::vector<val_type>&, size_t) {}
+
+    template <class RNG>
+    sample_all with_rng(RNG&) const { return *this; }
 };
 
+template <class RNG = rng_t>
 struct sample_some
 {
-    sample_some(std::vector<double>& p, rng_t& rng): _p(&p), _rng(&rng) {}
+    sample_some(std::vector<double>& p, RNG& rng): _p(&p), _rng(&rng) {}
     sample_some() {}
 
     template <class val_type>
@@ -156,12 +161,7 @@ struct sample_some
         size_t nc = extend.size();
         double u = nc*pd - floor(nc*pd);
         size_t n;
-        double r;
-        #pragma omp critical (random)
-        {
-            r = random();
-        }
-        if (r < u)
+        if (random() < u)
             n = size_t(ceil(nc*pd));
         else
             n = size_t(floor(nc*pd));
@@ -179,18 +179,22 @@ struct sample_some
         {
             auto random_v = std::bind(idist_t(0, extend.size()-i-1),
                                       std::ref(*_rng));
-            size_t j;
-            #pragma omp critical (random)
-            {
-                j = i + random_v();
-            }
+            size_t j = i + random_v();
             std::swap(extend[i], extend[j]);
         }
         extend.resize(n);
     }
 
+    // copy which draws from the given generator, to be used by a single
+    // thread
+    template <class ORNG>
+    sample_some<ORNG> with_rng(ORNG& rng) const
+    {
+        return sample_some<ORNG>(*_p, rng);
+    }
+
     std::vector<double>* _p;
-    rng_t* _rng;
+    RNG* _rng;
 };
 
 
@@ -357,6 +361,9 @@ struct get_all_motifs
             V.resize(n);
         }
 
+        // the subgraphs of each vertex are sampled with their own generator
+        parallel_rng<rng_t> rngs(rng);
+
         size_t N = (p < 1) ? V.size() : num_vertices(g);
         #pragma omp parallel for if (num_vertices(g) > OPENMP_MIN_THRESH) \
             private(sig)
@@ -370,7 +377,7 @@ struct get_all_motifs
                 continue;
 
             typename wrap_undirected::apply<Graph>::type ug(g);
-            get_subgraphs(ug, v, k, subgraphs, sampler);
+            get_subgraphs(ug, v, k, subgraphs, sampler.with_rng(rngs.get(i)));
 
             #pragma omp critical (gather)
             {
@@ -21,6 +21,7 @@
 #include "graph_generation.hh"
 #include "sampler.hh"
 #include "dynamic_sampler.hh"
+#include "numpy_bind.hh"
 #include <boost/python.hpp>
 
 using namespace std;
@@ -68,6 +69,81 @@ void generate_graph(GraphInterface& gi, size_t N,
                        std::ref(rng), verbose, verify))();
 }
 
+// Degree sampler backed by an (N, 2) array of (in, out) degrees. Each entry is
+// handed out once; when a vertex needs to be re-sampled, all the entries
+// consumed since the last refill are replaced at once with a single call to
+// the batch function, which receives the array of vertex indexes and returns
+// an array of shape (len(idx), 2) with the new degrees.
+class PythonArraySampler
+{
+public:
+    PythonArraySampler(boost::python::object odegs,
+                       boost::python::object batch_f)
+        : _odegs(odegs), _degs(get_array<int64_t,2>(odegs)), _f(batch_f),
+          _used(_degs.shape()[0], false) {}
+
+    pair<size_t, size_t> operator()(size_t i) const
+    {
+        if (_used[i])
+            refill();
+        _used[i] = true;
+        _pending.push_back(i);
+        return make_pair(size_t(_degs[i][0]), size_t(_degs[i][1]));
+    }
+
+    size_t operator()(size_t i, bool) const
+    {
+        return (*this)(i).second;
+    }
+
+private:
+    void refill() const
+    {
+        if (_f == boost::python::object())
+            throw ValueException("the supplied degree sequence cannot be "
+                                 "used to build a graph with the requested "
+                                 "constraints");
+        boost::python::object oidx = wrap_vector_owned(_pending);
+        boost::python::object ret = _f(oidx);
+        auto ndegs = get_array<int64_t,2>(ret);
+        for (size_t j = 0; j < _pending.size(); ++j)
+        {
+            size_t v = _pending[j];
+            _degs[v][0] = ndegs[j][0];
+            _degs[v][1] = ndegs[j][1];
+            _used[v] = false;
+        }
+        _pending.clear();
+    }
+
+    boost::python::object _odegs;
+    mutable boost::multi_array_ref<int64_t,2> _degs;
+    boost::python::object _f;
+    mutable vector<bool> _used;
+    mutable vector<size_t> _pending;
+};
+
+void generate_graph_array(GraphInterface& gi, size_t N,
+                          boost::python::object odegs,
+                          boost::python::object batch_f, bool no_parallel,
+                          bool no_self_loops, bool undirected, rng_t& rng,
+                          bool verbose, bool verify)
+{
+    typedef graph_tool::detail::get_all_graph_views::apply<
+    graph_tool::detail::filt_scalar_type, boost::mpl::bool_<false>,
+        boost::mpl::bool_<false>, boost::mpl::bool_<false>,
+        boost::mpl::bool_<true>, boost::mpl::bool_<true> >::type graph_views;
+
+    if (undirected)
+        gi.set_directed(false);
+
+    run_action<graph_views>()
+        (gi, std::bind(gen_graph(), std::placeholders::_1, N,
+                       PythonArraySampler(odegs, batch_f),
+                       no_parallel, no_self_loops,
+                       std::ref(rng), verbose, verify))();
+}
+
 void generate_sbm(GraphInterface& gi, boost::any ab, boost::python::object ors,
                   boost::python::object oss, boost::python::object oprobs,
                   boost::any ain_deg, boost::any aout_deg, rng_t& rng);
@@ -123,6 +199,7 @@ using namespace boost::python;
 BOOST_PYTHON_MODULE(libgraph_tool_generation)
 {
     def("gen_graph", &generate_graph);
+    def("gen_graph_array", &generate_graph_array);
     def("gen_sbm", &generate_sbm);
     def("random_rewire", &random_rewire);
     def("predecessor_graph", &predecessor_graph);
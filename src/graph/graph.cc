@@ -18,6 +18,7 @@
 #include "graph.hh"
 #include "graph_filtering.hh"
 #include "graph_properties.hh"
+#include "numpy_bind.hh"
 
 #include <boost/lambda/lambda.hpp>
 #include <boost/lambda/bind.hpp>
@@ -56,8 +57,11 @@ size_t GraphInterface::get_num_vertices(bool filtered)
 {
     size_t n = 0;
     if (filtered && is_vertex_filter_active())
-        run_action<>()(*this, lambda::var(n) =
-                       lambda::bind<size_t>(HardNumVertices(),lambda::_1))();
+        run_action<all_graph_views_with_frozen>()
+            (*this, lambda::var(n) =
+             lambda::bind<size_t>(HardNumVertices(),lambda::_1))();
+    else if (_fg)
+        n = num_vertices(*_fg);
     else
         n = num_vertices(*_mg);
     return n;
@@ -71,13 +75,66 @@ size_t GraphInterface::get_num_edges(bool filtered)
     using namespace boost::lambda;
     size_t n = 0;
     if (filtered && (is_edge_filter_active() || is_vertex_filter_active()))
-        run_action<>()(*this, lambda::var(n) =
-                       lambda::bind<size_t>(HardNumEdges(),lambda::_1))();
+        run_action<all_graph_views_with_frozen>()
+            (*this, lambda::var(n) =
+             lambda::bind<size_t>(HardNumEdges(),lambda::_1))();
+    else if (_fg)
+        n = num_edges(*_fg);
     else
         n = num_edges(*_mg);
     return n;
 }
 
+// returns a view of one of the (ptr, bptr, data, eidx) array tuples of a
+// FrozenGraph, checking their types and sizes
+boost::detail::frozen_csr get_frozen_csr(python::tuple csr, size_t N, size_t E)
+{
+    typedef boost::detail::frozen_index_array index_t;
+    std::vector<PyArrayObject*> as;
+    for (int i = 0; i < 4; ++i)
+    {
+        python::object a = csr[i];
+        if (!PyArray_Check(a.ptr()))
+            throw ValueException("frozen graph arrays must be numpy arrays");
+        PyArrayObject* pa = (PyArrayObject*) a.ptr();
+        if (PyArray_NDIM(pa) != 1 || !PyArray_ISCARRAY_RO(pa) ||
+            !PyArray_ISUNSIGNED(pa) ||
+            (i == 2 ? PyArray_ITEMSIZE(pa) != 1 :
+             (PyArray_ITEMSIZE(pa) != 4 && PyArray_ITEMSIZE(pa) != 8)))
+            throw ValueException("invalid frozen graph array type");
+        as.push_back(pa);
+    }
+    if (size_t(PyArray_DIM(as[0], 0)) != N + 1 ||
+        size_t(PyArray_DIM(as[1], 0)) != N + 1 ||
+        size_t(PyArray_DIM(as[3], 0)) != E)
+        throw ValueException("invalid frozen graph array sizes");
+
+    index_t ptr(PyArray_DATA(as[0]), PyArray_ITEMSIZE(as[0]));
+    index_t bptr(PyArray_DATA(as[1]), PyArray_ITEMSIZE(as[1]));
+    if (ptr[N] != E || bptr[N] != size_t(PyArray_DIM(as[2], 0)))
+        throw ValueException("invalid frozen graph array sizes");
+    return boost::detail::frozen_csr(ptr, bptr,
+                                     static_cast<const uint8_t*>(PyArray_DATA(as[2])),
+                                     index_t(PyArray_DATA(as[3]),
+                                             PyArray_ITEMSIZE(as[3])));
+}
+
+void GraphInterface::freeze(size_t n_vertices, size_t n_edges,
+                            python::tuple out_csr, python::tuple in_csr)
+{
+    auto out = get_frozen_csr(out_csr, n_vertices, n_edges);
+    auto in = get_frozen_csr(in_csr, n_vertices, n_edges);
+
+    // the arrays are kept alive for as long as the graph is used by any
+    // graph view, via the deleter
+    python::object refs = python::make_tuple(out_csr, in_csr);
+    _fg = std::shared_ptr<frozen_graph_t>
+        (new frozen_graph_t(n_vertices, n_edges, n_edges, out, in),
+         [refs](frozen_graph_t* g) { delete g; });
+    _mg = std::make_shared<multigraph_t>();
+    _graph_views.clear();
+}
+
 struct clear_vertices
 {
     template <class Graph>
@@ -22,10 +22,12 @@
 #include <Python.h>
 #include <boost/python/object.hpp>
 #include <boost/python/dict.hpp>
+#include <boost/python/tuple.hpp>
 
 #include <deque>
 
 #include "graph_adjacency.hh"
+#include "graph_frozen.hh"
 
 #include <boost/graph/graph_traits.hpp>
 
@@ -83,8 +85,16 @@ public:
     bool get_directed() {return _directed;}
     void set_reversed(bool reversed) {_reversed = reversed;}
     bool get_reversed() {return _reversed;}
-    void set_keep_epos(bool keep) {_mg->set_keep_epos(keep);}
-    bool get_keep_epos() {return _mg->get_keep_epos();}
+    void set_keep_epos(bool keep) {get_graph().set_keep_epos(keep);}
+    bool get_keep_epos() {return !_fg && _mg->get_keep_epos();}
+    void set_keep_ecache(bool keep) {get_graph().set_keep_ecache(keep);}
+    bool get_keep_ecache() {return !_fg && _mg->get_keep_ecache();}
+
+    // frozen graphs: the graph is replaced by a read-only view of the
+    // compressed arrays of a FrozenGraph, which are referenced, not copied
+    void freeze(size_t n_vertices, size_t n_edges,
+                boost::python::tuple out_csr, boost::python::tuple in_csr);
+    bool is_frozen() const {return bool(_fg);}
 
 
     // graph filtering
@@ -106,7 +116,7 @@ public:
                               boost::any prop_tgt);
     void copy_edge_property(const GraphInterface& src, boost::any prop_src,
                             boost::any prop_tgt);
-    void shrink_to_fit() { _mg->shrink_to_fit(); }
+    void shrink_to_fit() { get_graph().shrink_to_fit(); }
 
     //
     // python interface
@@ -131,6 +141,7 @@ public:
     //
 
     typedef boost::adj_list<size_t> multigraph_t;
+    typedef boost::frozen_adj_list<size_t> frozen_graph_t;
     typedef boost::graph_traits<multigraph_t>::vertex_descriptor vertex_t;
     typedef boost::graph_traits<multigraph_t>::edge_descriptor edge_t;
 
@@ -140,11 +151,22 @@ public:
 
     // internal access
 
-    multigraph_t&      get_graph() {return *_mg;}
+    multigraph_t&      get_graph()
+    {
+        if (_fg)
+            throw GraphException("This operation is not supported by frozen "
+                                 "graphs. Use FrozenGraph.thaw() to obtain a "
+                                 "mutable copy of the graph first.");
+        return *_mg;
+    }
     std::shared_ptr<multigraph_t> get_graph_ptr() {return _mg;}
+    std::shared_ptr<frozen_graph_t> get_frozen_graph_ptr() {return _fg;}
     vertex_index_map_t get_vertex_index()   {return _vertex_index;}
     edge_index_map_t   get_edge_index()     {return _edge_index;}
-    size_t             get_edge_index_range() {return _mg->get_edge_index_range();}
+    size_t             get_edge_index_range() const
+    {
+        return _fg ? _fg->get_edge_index_range() : _mg->get_edge_index_range();
+    }
 
     graph_index_map_t  get_graph_index()  {return graph_index_map_t(0);}
 
@@ -161,6 +183,9 @@ private:
     // this is the main graph
     std::shared_ptr<multigraph_t> _mg;
 
+    // the frozen graph, which replaces the main graph if set
+    std::shared_ptr<frozen_graph_t> _fg;
+
     // vertex index map
     vertex_index_map_t _vertex_index;
 
@@ -19,12 +19,14 @@
 #define GRAPH_ADJACENCY_HH
 
 #include <vector>
+#include <algorithm>
 #include <deque>
 #include <utility>
 #include <numeric>
 #include <iostream>
 #include <tuple>
 #include <functional>
+#include <unordered_map>
 #include <boost/iterator.hpp>
 #include <boost/graph/graph_traits.hpp>
 #include <boost/range/irange.hpp>
@@ -185,7 +187,8 @@ public:
     typedef std::vector<edge_list_t> vertex_list_t;
     typedef typename integer_range<Vertex>::iterator vertex_iterator;
 
-    adj_list(): _n_edges(0), _edge_index_range(0), _keep_epos(false) {}
+    adj_list(): _n_edges(0), _edge_index_range(0), _keep_epos(false),
+                _keep_ecache(false) {}
 
     struct get_vertex
     {
@@ -334,6 +337,8 @@ public:
 
         if (_keep_epos)
             rebuild_epos();
+        if (_keep_ecache)
+            rebuild_ecache();
     }
 
     void set_keep_epos(bool keep)
@@ -355,6 +360,73 @@ public:
         return _keep_epos;
     }
 
+    void set_keep_ecache(bool keep)
+    {
+        if (keep)
+        {
+            if (!_keep_ecache)
+                rebuild_ecache();
+        }
+        else
+        {
+            edge_cache_t().swap(_ecache);
+        }
+        _keep_ecache = keep;
+    }
+
+    bool get_keep_ecache()
+    {
+        return _keep_ecache;
+    }
+
+    // Remove all vertices v with deleted[v] == true, together with their
+    // edges, in a single pass. The remaining vertices keep their relative
+    // order, and vmap[v] is set to the new index of v, or -1 if it was
+    // removed. The indexes of the remaining edges are not modified.
+    template <class Mask>
+    void remove_vertices(const Mask& deleted, std::vector<int64_t>& vmap)
+    {
+        size_t N = _out_edges.size();
+        vmap.resize(N);
+        size_t n = 0;
+        for (size_t v = 0; v < N; ++v)
+            vmap[v] = deleted[v] ? -1 : int64_t(n++);
+
+        // an edge is removed if its source or target is removed; the freed
+        // indexes are collected only from the out-edge lists, so that they
+        // are counted once
+        auto is_removed = [&](Vertex v, auto& e) -> bool
+            { return deleted[v] || deleted[e.first]; };
+        auto rename = [&](auto& e) { e.first = vmap[e.first]; };
+        filter_edges(is_removed, rename);
+
+        for (size_t v = 0; v < N; ++v)
+        {
+            if (vmap[v] >= 0 && size_t(vmap[v]) != v)
+            {
+                _out_edges[vmap[v]].swap(_out_edges[v]);
+                _in_edges[vmap[v]].swap(_in_edges[v]);
+            }
+        }
+        _out_edges.resize(n);
+        _in_edges.resize(n);
+
+        if (_keep_ecache)
+            rebuild_ecache();
+    }
+
+    // Remove all edges with deleted[idx] == true in a single pass. The
+    // indexes of the remaining edges are not modified.
+    template <class Mask>
+    void remove_edges(const Mask& deleted)
+    {
+        auto is_removed = [&](Vertex, auto& e) -> bool
+            { return e.second < deleted.size() && deleted[e.second]; };
+        filter_edges(is_removed, [](auto&) {});
+        if (_keep_ecache)
+            rebuild_ecache();
+    }
+
     size_t get_edge_index_range() const { return _edge_index_range; }
 
     static Vertex null_vertex() { return std::numeric_limits<Vertex>::max(); }
@@ -398,6 +470,112 @@ private:
     bool _keep_epos;
     std::vector<std::pair<int32_t, int32_t>> _epos;
 
+    // hash of the (source, target) pairs, used for O(1) edge lookups. The
+    // values are the index of one of the edges, and the number of parallel
+    // edges.
+    struct edge_hash
+    {
+        size_t operator()(const std::pair<Vertex, Vertex>& k) const
+        {
+            size_t seed = std::hash<Vertex>()(k.first);
+            seed ^= std::hash<Vertex>()(k.second) + 0x9e3779b9 +
+                (seed << 6) + (seed >> 2);
+            return seed;
+        }
+    };
+    typedef std::unordered_map<std::pair<Vertex, Vertex>,
+                               std::pair<Vertex, size_t>, edge_hash>
+        edge_cache_t;
+    bool _keep_ecache;
+    edge_cache_t _ecache;
+
+    void rebuild_ecache()
+    {
+        _ecache.clear();
+        _ecache.reserve(_n_edges);
+        for (size_t i = 0; i < _out_edges.size(); ++i)
+        {
+            for (auto& oe : _out_edges[i])
+                ecache_add(i, oe.first, oe.second);
+        }
+    }
+
+    void ecache_add(Vertex s, Vertex t, Vertex idx)
+    {
+        auto& x = _ecache[std::make_pair(s, t)];
+        if (x.second == 0)
+            x.first = idx;
+        x.second++;
+    }
+
+    void ecache_remove(Vertex s, Vertex t, Vertex idx)
+    {
+        auto iter = _ecache.find(std::make_pair(s, t));
+        if (iter == _ecache.end())
+            return;
+        auto& x = iter->second;
+        if (--x.second == 0)
+        {
+            _ecache.erase(iter);
+            return;
+        }
+        if (x.first != idx)
+            return;
+        // the removed edge was the one stored; replace it by a parallel edge
+        for (auto& oe : _out_edges[s])
+        {
+            if (oe.first == t && oe.second != idx)
+            {
+                x.first = oe.second;
+                break;
+            }
+        }
+    }
+
+    // remove the edges for which is_removed(v, e) is true from the edge lists
+    // of every vertex v, and call update(e) on the remaining ones
+    template <class Pred, class Update>
+    void filter_edges(Pred&& is_removed, Update&& update)
+    {
+        size_t N = _out_edges.size();
+        std::vector<Vertex> freed;
+        #pragma omp parallel if (N > OPENMP_MIN_THRESH)
+        {
+            std::vector<Vertex> lfreed;
+            #pragma omp for schedule(runtime)
+            for (size_t v = 0; v < N; ++v)
+            {
+                auto filter = [&](auto& es, bool out)
+                {
+                    auto iter = std::remove_if(es.begin(), es.end(),
+                                               [&](auto& e) -> bool
+                                               {
+                                                   if (!is_removed(v, e))
+                                                       return false;
+                                                   if (out)
+                                                       lfreed.push_back(e.second);
+                                                   return true;
+                                               });
+                    es.erase(iter, es.end());
+                    for (auto& e : es)
+                        update(e);
+                };
+                filter(_out_edges[v], true);
+                filter(_in_edges[v], false);
+            }
+
+            #pragma omp critical
+            freed.insert(freed.end(), lfreed.begin(), lfreed.end());
+        }
+
+        std::sort(freed.begin(), freed.end());
+        _n_edges -= freed.size();
+        _free_indexes.insert(_free_indexes.end(), freed.begin(), freed.end());
+
+        if (_keep_epos)
+            rebuild_epos();
+    }
+
     void rebuild_epos()
     {
         _epos.resize(_edge_index_range);
@@ -596,6 +774,14 @@ std::pair<typename adj_list<Vertex>::edge_descriptor, bool>
 edge(Vertex s, Vertex t, const adj_list<Vertex>& g)
 {
     typedef typename adj_list<Vertex>::edge_descriptor edge_descriptor;
+    if (g._keep_ecache) // O(1)
+    {
+        auto iter = g._ecache.find(std::make_pair(s, t));
+        if (iter != g._ecache.end())
+            return {edge_descriptor(s, t, iter->second.first, false), true};
+        Vertex v = graph_traits<adj_list<Vertex> >::null_vertex();
+        return {edge_descriptor(v, v, v, false), false};
+    }
     const auto& oes = g._out_edges[s];
     auto iter = std::find_if(oes.begin(), oes.end(),
                              [&](const auto& e) -> bool {return e.first == t;});
@@ -706,6 +892,24 @@ Vertex add_vertex(adj_list<Vertex>& g)
 template <class Vertex, class Pred>
 void clear_vertex(Vertex v, adj_list<Vertex>& g, Pred&& pred)
 {
+    std::vector<std::tuple<Vertex, Vertex, Vertex>> removed;
+    if (g._keep_ecache)
+    {
+        typename adj_list<Vertex>::make_out_edge mk_out_edge;
+        typename adj_list<Vertex>::make_in_edge mk_in_edge;
+        for (const auto& oe : g._out_edges[v])
+        {
+            if (pred(mk_out_edge.def(v, oe)))
+                removed.emplace_back(v, oe.first, oe.second);
+        }
+        for (const auto& ie : g._in_edges[v])
+        {
+            // self-loops were already included above
+            if (ie.first != v && pred(mk_in_edge.def(v, ie)))
+                removed.emplace_back(ie.first, v, ie.second);
+        }
+    }
+
     if (!g._keep_epos)
     {
         auto remove_es = [&] (auto& out_edges, auto& in_edges,
@@ -790,6 +994,9 @@ void clear_vertex(Vertex v, adj_list<Vertex>& g, Pred&& pred)
                   [&](size_t idx) -> auto& {return g._epos[idx].first;},
                   typename adj_list<Vertex>::make_in_edge());
     }
+
+    for (auto& e : removed)
+        g.ecache_remove(std::get<0>(e), std::get<1>(e), std::get<2>(e));
 }
 
 template <class Vertex>
@@ -823,6 +1030,9 @@ void remove_vertex(Vertex v, adj_list<Vertex>& g)
         shift_es(g._out_edges, i);
         shift_es(g._in_edges, i);
     }
+
+    if (g._keep_ecache)
+        g.rebuild_ecache();
 }
 
 // O(k + k_last)
@@ -834,6 +1044,16 @@ void remove_vertex_fast(Vertex v, adj_list<Vertex>& g)
     if (v < back)
     {
         clear_vertex(v, g);
+
+        // the edges of the last vertex will be renamed
+        if (g._keep_ecache)
+        {
+            for (auto& oe : g._out_edges[back])
+                g._ecache.erase(std::make_pair(back, oe.first));
+            for (auto& ie : g._in_edges[back])
+                g._ecache.erase(std::make_pair(ie.first, back));
+        }
+
         g._out_edges[v].swap(g._out_edges[back]);
         g._in_edges[v].swap(g._in_edges[back]);
         g._out_edges.pop_back();
@@ -873,6 +1093,17 @@ void remove_vertex_fast(Vertex v, adj_list<Vertex>& g)
                  [&](size_t idx) -> auto {return g._epos[idx].second;});
         rename_v(g._in_edges, g._out_edges,
                  [&](size_t idx) -> auto {return g._epos[idx].first;});
+
+        if (g._keep_ecache)
+        {
+            for (auto& oe : g._out_edges[v])
+                g.ecache_add(v, oe.first, oe.second);
+            for (auto& ie : g._in_edges[v])
+            {
+                if (ie.first != v)
+                    g.ecache_add(ie.first, v, ie.second);
+            }
+        }
     }
     else
     {
@@ -912,6 +1143,9 @@ add_edge(Vertex s, Vertex t, adj_list<Vertex>& g)
         ei.second = ies.size() - 1;
     }
 
+    if (g._keep_ecache)
+        g.ecache_add(s, t, idx);
+
     typedef typename adj_list<Vertex>::edge_descriptor edge_descriptor;
     return {edge_descriptor(s, t, idx, false), true};
 }
@@ -927,9 +1161,12 @@ void remove_edge(Vertex s, Vertex t, adj_list<Vertex>& g)
                                    {return t == ei.first;});
         if (iter_o != oes.end())
         {
-            g._free_indexes.push_back(iter_o->second);
+            Vertex idx = iter_o->second;
+            g._free_indexes.push_back(idx);
             oes.erase(iter_o);
             g._n_edges--;
+            if (g._keep_ecache)
+                g.ecache_remove(s, t, idx);
         }
 
         auto& ies = g._in_edges[t];
@@ -999,6 +1236,8 @@ void remove_edge(const typename adj_list<Vertex>::edge_descriptor& e,
     {
         g._free_indexes.push_back(idx);
         g._n_edges--;
+        if (g._keep_ecache)
+            g.ecache_remove(s, t, idx);
     }
 }
 
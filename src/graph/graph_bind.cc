@@ -434,12 +434,26 @@ void set_vertex_property(GraphInterface& gi, boost::any prop,
                          boost::python::object val);
 void set_edge_property(GraphInterface& gi, boost::any prop,
                        boost::python::object val);
+void load_csv_edges(GraphInterface& gi, std::string file, char delim,
+                    char quote, bool skip_first, size_t col_s, size_t col_t,
+                    int hash_mode, boost::any vmap,
+                    boost::python::object oeprops);
 
 
 void export_python_interface();
 
 void export_openmp();
 
+// draw seeds for independent random number streams
+boost::python::object get_rng_seeds(rng_t& rng, size_t n)
+{
+    std::uniform_int_distribution<size_t> sample;
+    std::vector<size_t> seeds(n);
+    for (auto& s : seeds)
+        s = sample(rng);
+    return wrap_vector_owned(seeds);
+}
+
 BOOST_PYTHON_MODULE(libgraph_tool_core)
 {
     using namespace boost::python;
@@ -451,6 +465,9 @@ BOOST_PYTHON_MODULE(libgraph_tool_core)
     // random numbers
     class_<rng_t>("rng_t");
     def("get_rng", get_rng);
+    def("get_rng_seeds", get_rng_seeds);
+    def("set_rng_deterministic", set_rng_deterministic);
+    def("get_rng_deterministic", get_rng_deterministic);
 
     register_exception_translator<GraphException>
         (graph_exception_translator<GraphException>);
@@ -488,6 +505,8 @@ BOOST_PYTHON_MODULE(libgraph_tool_core)
         .def("get_reversed", &GraphInterface::get_reversed)
         .def("set_keep_epos", &GraphInterface::set_keep_epos)
         .def("get_keep_epos", &GraphInterface::get_keep_epos)
+        .def("set_keep_ecache", &GraphInterface::set_keep_ecache)
+        .def("get_keep_ecache", &GraphInterface::get_keep_ecache)
         .def("set_vertex_filter_property",
              &GraphInterface::set_vertex_filter_property)
         .def("is_vertex_filter_active", &GraphInterface::is_vertex_filter_active)
@@ -513,7 +532,9 @@ BOOST_PYTHON_MODULE(libgraph_tool_core)
         .def("copy_vertex_property", &GraphInterface::copy_vertex_property)
         .def("copy_edge_property", &GraphInterface::copy_edge_property)
         .def("get_graph_ptr", &GraphInterface::get_graph_ptr)
-        .def("get_graph_view", &GraphInterface::get_graph_view);
+        .def("get_graph_view", &GraphInterface::get_graph_view)
+        .def("freeze", &GraphInterface::freeze)
+        .def("is_frozen", &GraphInterface::is_frozen);
 
     class_<GraphInterface::vertex_index_map_t>("vertex_index_map", no_init);
     class_<GraphInterface::edge_index_map_t>("edge_index_map", no_init);
@@ -554,7 +575,9 @@ BOOST_PYTHON_MODULE(libgraph_tool_core)
     to_python_converter<py::str, scxx_to_python<py::str> >();
 #endif
 
-    class_<IStream>("IStream", no_init).def("read", &IStream::read);
+    class_<IStream>("IStream", no_init).def("read", &IStream::read).
+        def("readline", &IStream::readline).
+        def("readinto", &IStream::readinto);
     class_<OStream>("OStream", no_init).def("write", &OStream::write).
         def("flush", &OStream::flush);
     def("set_pickler", &set_pickler);
@@ -571,6 +594,7 @@ BOOST_PYTHON_MODULE(libgraph_tool_core)
     def("perfect_vhash", &perfect_vhash);
     def("set_vertex_property", &set_vertex_property);
     def("set_edge_property", &set_edge_property);
+    def("load_csv_edges", &load_csv_edges);
 
     class_<LibInfo>("mod_info")
         .add_property("name", &LibInfo::GetName)
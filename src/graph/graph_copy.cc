@@ -234,6 +234,7 @@ GraphInterface::GraphInterface(const GraphInterface& gi, bool keep_ref,
                                python::object ovprops, python::object oeprops,
                                python::object vorder)
     :_mg(keep_ref ? gi._mg : std::make_shared<multigraph_t>()),
+     _fg(keep_ref ? gi._fg : nullptr),
      _vertex_index(get(vertex_index, *_mg)),
      _edge_index(get(edge_index_t(), *_mg)),
      _reversed(gi._reversed),
@@ -248,7 +249,7 @@ GraphInterface::GraphInterface(const GraphInterface& gi, bool keep_ref,
     if (keep_ref)
         return;
 
-    if (vorder == python::object())
+    if (vorder == python::object() && !gi._fg)
     {
         // simple copying
         *_mg = *gi._mg;
@@ -268,10 +269,23 @@ GraphInterface::GraphInterface(const GraphInterface& gi, bool keep_ref,
                                    std::ref(python::extract<boost::any&>(oeprops[i][1])())));
     }
 
+    if (vorder == python::object())
+    {
+        // frozen graphs are copied edge by edge, keeping the vertex order
+        run_action<all_graph_views_with_frozen>()
+            (const_cast<GraphInterface&>(gi),
+             std::bind(do_graph_copy(gi.get_edge_index_range()),
+                       std::placeholders::_1, std::ref(*_mg),
+                       gi._vertex_index, _vertex_index, gi._edge_index,
+                       _edge_index, gi._vertex_index, std::ref(vprops),
+                       std::ref(eprops)))();
+        return;
+    }
+
     boost::any avorder = python::extract<boost::any>(vorder)();
-    run_action<>()
+    run_action<all_graph_views_with_frozen>()
         (const_cast<GraphInterface&>(gi),
-         std::bind(do_graph_copy(gi._mg->get_edge_index_range()),
+         std::bind(do_graph_copy(gi.get_edge_index_range()),
                    std::placeholders::_1, std::ref(*_mg),
                    gi._vertex_index, _vertex_index, gi._edge_index,
                    _edge_index, std::placeholders::_2, std::ref(vprops),
@@ -130,6 +130,13 @@ check_filtered(const Graph& g, const EdgeFilter& edge_filter,
 // gets the correct graph view at run time
 boost::any GraphInterface::get_graph_view() const
 {
+    if (_fg)
+        return check_filtered(*_fg, _edge_filter_map, _edge_filter_invert,
+                              _edge_filter_active, _fg->get_edge_index_range(),
+                              _vertex_filter_map, _vertex_filter_invert,
+                              _vertex_filter_active,
+                              const_cast<GraphInterface&>(*this), _reversed,
+                              _directed);
     boost::any graph =
         check_filtered(*_mg, _edge_filter_map, _edge_filter_invert,
                        _edge_filter_active, _mg->get_edge_index_range(),
@@ -140,6 +147,30 @@ boost::any GraphInterface::get_graph_view() const
     return graph;
 }
 
+struct check_frozen_view
+{
+    check_frozen_view(const std::type_info& view, bool& found)
+        : _view(view), _found(found) {}
+
+    template <class Graph>
+    void operator()(Graph*) const
+    {
+        if (_view == typeid(std::reference_wrapper<Graph>))
+            _found = true;
+    }
+
+    const std::type_info& _view;
+    bool& _found;
+};
+
+bool graph_tool::detail::is_frozen_graph_view(const std::type_info& view)
+{
+    bool found = false;
+    boost::mpl::for_each<frozen_graph_views, std::add_pointer<boost::mpl::_1>>
+        (check_frozen_view(view, found));
+    return found;
+}
+
 // these test whether or not the vertex and edge filters are active
 bool GraphInterface::is_vertex_filter_active() const
 { return _vertex_filter_active; }
@@ -152,7 +183,7 @@ bool GraphInterface::is_edge_filter_active() const
 // found
 void GraphInterface::re_index_edges()
 {
-    _mg->reindex_edges();
+    get_graph().reindex_edges();
 }
 
 // this will definitively remove all the edges from the graph, which are being
@@ -162,15 +193,16 @@ void GraphInterface::purge_edges()
     if (!is_edge_filter_active())
         return;
 
+    multigraph_t& g = get_graph();
     MaskFilter<edge_filter_t> filter(_edge_filter_map, _edge_filter_invert);
     vector<graph_traits<multigraph_t>::edge_descriptor> deleted_edges;
-    for (auto v : vertices_range(*_mg))
+    for (auto v : vertices_range(g))
     {
-        for (auto e : out_edges_range(v, *_mg))
+        for (auto e : out_edges_range(v, g))
             if (!filter(e))
                 deleted_edges.push_back(e);
         for (auto& e  : deleted_edges)
-            remove_edge(e, *_mg);
+            remove_edge(e, g);
         deleted_edges.clear();
     }
 }
@@ -183,15 +215,16 @@ void GraphInterface::purge_vertices(boost::any aold_index)
     if (!is_vertex_filter_active())
         return;
 
+    multigraph_t& g = get_graph();
     typedef vprop_map_t<int32_t>::type index_prop_t;
     index_prop_t old_index = any_cast<index_prop_t>(aold_index);
 
     MaskFilter<vertex_filter_t> filter(_vertex_filter_map,
                                        _vertex_filter_invert);
-    size_t N = num_vertices(*_mg);
+    size_t N = num_vertices(g);
     vector<bool> deleted(N, false);
     for (size_t i = 0; i < N; ++i)
-        deleted[i] = !filter(vertex(i, *_mg));
+        deleted[i] = !filter(vertex(i, g));
     vector<int> old_indexes;
 
     vector<graph_traits<multigraph_t>::edge_descriptor> edges;
@@ -202,8 +235,8 @@ void GraphInterface::purge_vertices(boost::any aold_index)
         if (deleted[i])
         {
             graph_traits<multigraph_t>::vertex_descriptor v =
-                vertex(i, *_mg);
-            remove_vertex(v, *_mg);
+                vertex(i, g);
+            remove_vertex(v, g);
         }
         else
         {
@@ -214,7 +247,7 @@ void GraphInterface::purge_vertices(boost::any aold_index)
     N = old_indexes.size();
     for (int i = N-1; i >= 0; --i)
     {
-        old_index[vertex((N - 1) - i, *_mg)] = old_indexes[i];
+        old_index[vertex((N - 1) - i, g)] = old_indexes[i];
     }
 }
 
@@ -44,6 +44,9 @@
 #include <boost/mpl/quote.hpp>
 #include <boost/mpl/range_c.hpp>
 #include <boost/mpl/print.hpp>
+#include <boost/mpl/contains.hpp>
+#include <boost/mpl/copy.hpp>
+#include <boost/mpl/back_inserter.hpp>
 
 #include "graph_adaptor.hh"
 #include "graph_selectors.hh"
@@ -245,7 +248,7 @@ struct get_property_map_type<boost::keep_all, IndexMap>
 // used in the property maps
 struct get_graph_filtered
 {
-    template <class Scalar>
+    template <class Scalar, class Graph = GraphInterface::multigraph_t>
     struct apply
     {
         // if the 'scalar' is the index map itself, use simply that, otherwise
@@ -258,7 +261,7 @@ struct get_graph_filtered
             Scalar,
             GraphInterface::vertex_index_map_t>::type vertex_property_map;
 
-        typedef typename graph_filter::apply<GraphInterface::multigraph_t,
+        typedef typename graph_filter::apply<Graph,
                                              edge_property_map,
                                              vertex_property_map>::type type;
     };
@@ -272,15 +275,16 @@ struct get_all_graph_views
               class NeverDirected = boost::mpl::bool_<false>,
               class AlwaysReversed = boost::mpl::bool_<false>,
               class NeverReversed = boost::mpl::bool_<false>,
-              class NeverFiltered = boost::mpl::bool_<false> >
+              class NeverFiltered = boost::mpl::bool_<false>,
+              class Graph = GraphInterface::multigraph_t>
     struct apply
     {
         // filtered graphs
         struct filtered_graphs:
             boost::mpl::if_<NeverFiltered,
-                            boost::mpl::vector1<GraphInterface::multigraph_t>,
-                            boost::mpl::vector2<GraphInterface::multigraph_t,
-                                                typename get_graph_filtered::apply<FiltType>::type>
+                            boost::mpl::vector1<Graph>,
+                            boost::mpl::vector2<Graph,
+                                                typename get_graph_filtered::apply<FiltType, Graph>::type>
                             >::type {};
 
         // filtered + reversed graphs
@@ -364,6 +368,58 @@ BOOST_MPL_ASSERT_RELATION(n_views::value, == , boost::mpl::int_<6>::value);
 BOOST_MPL_ASSERT_RELATION(n_views::value, == , boost::mpl::int_<3>::value);
 #endif
 
+// The views of the frozen graph (see graph_frozen.hh) are not part of
+// all_graph_views, so that the algorithms are not compiled for them by
+// default. The algorithms which support frozen graphs dispatch on one of the
+// *_with_frozen sequences below, which contain the views of both graph types.
+
+struct frozen_graph_views:
+    get_all_graph_views::apply<filt_scalar_type,boost::mpl::bool_<false>,
+                               boost::mpl::bool_<false>,boost::mpl::bool_<false>,
+                               boost::mpl::bool_<false>,boost::mpl::bool_<false>,
+                               GraphInterface::frozen_graph_t>::type {};
+
+template <class AlwaysDirected = boost::mpl::bool_<false>,
+          class NeverDirected = boost::mpl::bool_<false>,
+          class AlwaysReversed = boost::mpl::bool_<false>,
+          class NeverReversed = boost::mpl::bool_<false>,
+          class NeverFiltered = boost::mpl::bool_<false> >
+struct get_views_with_frozen
+{
+    typedef typename get_all_graph_views::apply<filt_scalar_type,
+                                                AlwaysDirected, NeverDirected,
+                                                AlwaysReversed, NeverReversed,
+                                                NeverFiltered>::type views;
+    typedef typename get_all_graph_views::apply<filt_scalar_type,
+                                                AlwaysDirected, NeverDirected,
+                                                AlwaysReversed, NeverReversed,
+                                                NeverFiltered,
+                                                GraphInterface::frozen_graph_t>::type
+        frozen_views;
+    typedef typename boost::mpl::copy<frozen_views,
+                                      boost::mpl::back_inserter<views> >::type
+        type;
+};
+
+struct all_graph_views_with_frozen:
+    get_views_with_frozen<>::type {};
+
+struct always_directed_with_frozen:
+    get_views_with_frozen<boost::mpl::bool_<true> >::type {};
+
+struct never_directed_with_frozen:
+    get_views_with_frozen<boost::mpl::bool_<false>,
+                          boost::mpl::bool_<true> >::type {};
+
+struct never_reversed_with_frozen:
+    get_views_with_frozen<boost::mpl::bool_<false>,
+                          boost::mpl::bool_<false>, boost::mpl::bool_<false>,
+                          boost::mpl::bool_<true> >::type {};
+
+// returns true if the type held by a graph view wrapper (as returned by
+// GraphInterface::get_graph_view()) is a view of a frozen graph
+bool is_frozen_graph_view(const std::type_info& view);
+
 // run_action() and gt_dispatch() implementation
 // =============================================
 
@@ -403,9 +459,11 @@ struct action_wrap
     auto& deference(Type* a) const
     {
         typedef typename std::remove_const<Type>::type type_t;
-        typedef typename boost::mpl::find<detail::all_graph_views, type_t>::type iter_t;
-        typedef typename boost::mpl::end<detail::all_graph_views>::type end_t;
-        return deference_dispatch(a, typename std::is_same<iter_t, end_t>::type());
+        typedef typename boost::mpl::or_<
+            boost::mpl::contains<detail::all_graph_views, type_t>,
+            boost::mpl::contains<detail::frozen_graph_views, type_t> >::type
+            is_view_t;
+        return deference_dispatch(a, std::integral_constant<bool, !is_view_t::value>());
     }
 
     template <class Type>
@@ -451,6 +509,14 @@ struct action_dispatch
         if (!found)
         {
             std::vector<const std::type_info*> args_t = {(&(args).type())...};
+            for (auto t : args_t)
+            {
+                if (is_frozen_graph_view(*t))
+                    throw GraphException("This function does not support "
+                                         "frozen graphs. Use FrozenGraph.thaw() "
+                                         "to obtain a mutable copy of the "
+                                         "graph first.");
+            }
             throw ActionNotFound(typeid(Action), args_t);
         }
     }
@@ -491,15 +557,32 @@ typedef detail::never_reversed never_reversed;
 typedef detail::always_directed_never_reversed always_directed_never_reversed;
 typedef detail::never_filtered never_filtered;
 typedef detail::never_filtered_never_reversed never_filtered_never_reversed;
+typedef detail::frozen_graph_views frozen_graph_views;
+typedef detail::all_graph_views_with_frozen all_graph_views_with_frozen;
+typedef detail::always_directed_with_frozen always_directed_with_frozen;
+typedef detail::never_directed_with_frozen never_directed_with_frozen;
+typedef detail::never_reversed_with_frozen never_reversed_with_frozen;
 
 // returns true if graph filtering was enabled at compile time
 bool graph_filtering_enabled();
 
 
+inline std::shared_ptr<GraphInterface::multigraph_t>
+get_base_graph_ptr(GraphInterface& gi, GraphInterface::multigraph_t*)
+{
+    return gi.get_graph_ptr();
+}
+
+inline std::shared_ptr<GraphInterface::frozen_graph_t>
+get_base_graph_ptr(GraphInterface& gi, GraphInterface::frozen_graph_t*)
+{
+    return gi.get_frozen_graph_ptr();
+}
+
 template <class Graph, class GraphInit>
 std::shared_ptr<Graph> get_graph_ptr(GraphInterface& gi, GraphInit&, std::true_type)
 {
-    return gi.get_graph_ptr();
+    return get_base_graph_ptr(gi, static_cast<Graph*>(nullptr));
 }
 
 template <class Graph, class GraphInit>
@@ -515,7 +598,16 @@ typename std::shared_ptr<Graph>
 retrieve_graph_view(GraphInterface& gi, Graph& init)
 {
     typedef typename std::remove_const<Graph>::type g_t;
-    size_t index = boost::mpl::find<detail::all_graph_views,g_t>::type::pos::value;
+    typedef typename boost::mpl::find<detail::all_graph_views,g_t>::type iter_t;
+    typedef typename boost::mpl::end<detail::all_graph_views>::type end_t;
+
+    // the views of frozen graphs are stored after all the others
+    size_t index;
+    if (std::is_same<iter_t, end_t>::value)
+        index = detail::n_views::value +
+            boost::mpl::find<detail::frozen_graph_views,g_t>::type::pos::value;
+    else
+        index = iter_t::pos::value;
     auto& graph_views = gi.get_graph_views();
     if (index >= graph_views.size())
         graph_views.resize(index + 1);
@@ -523,9 +615,12 @@ retrieve_graph_view(GraphInterface& gi, Graph& init)
     std::shared_ptr<g_t>* gptr = boost::any_cast<std::shared_ptr<g_t>>(&gview);
     if (gptr == 0)
     {
+        typedef typename boost::mpl::or_<
+            std::is_same<g_t, GraphInterface::multigraph_t>,
+            std::is_same<g_t, GraphInterface::frozen_graph_t> >::type is_base_t;
         std::shared_ptr<g_t> new_g =
             get_graph_ptr<g_t>(gi, init,
-                               std::is_same<g_t, GraphInterface::multigraph_t>());
+                               std::integral_constant<bool, is_base_t::value>());
         gview = new_g;
         return new_g;
     }
@@ -0,0 +1,615 @@
+// graph-tool -- a general graph modification and manipulation thingy
+//
+// Copyright (C) 2006-2017 Tiago de Paula Peixoto <tiago@skewed.de>
+//
+// This program is free software; you can redistribute it and/or
+// modify it under the terms of the GNU General Public License
+// as published by the Free Software Foundation; either version 3
+// of the License, or (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+#ifndef GRAPH_FROZEN_HH
+#define GRAPH_FROZEN_HH
+
+#include <cstdint>
+#include <limits>
+
+#include "graph_adjacency.hh"
+
+namespace boost
+{
+
+// ========================================================================
+// Frozen (read-only) adjacency list
+// ========================================================================
+
+// frozen_adj_list is an immutable graph type, which reads the compressed
+// sparse row (CSR) arrays of a graph_tool.FrozenGraph in place, without
+// owning or copying them. For each vertex, the out- and in-neighbours are
+// sorted, and stored as LEB128-encoded differences between consecutive
+// values, which are decoded on the fly by forward iterators.
+//
+// The vertex and edge descriptors, and the vertex and edge index property
+// maps, are the same as in adj_list, so that the same property map types
+// can be used with both graphs.
+
+template <class Vertex>
+class frozen_adj_list;
+
+template <class Vertex>
+std::pair<typename frozen_adj_list<Vertex>::vertex_iterator,
+          typename frozen_adj_list<Vertex>::vertex_iterator>
+vertices(const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+std::pair<typename frozen_adj_list<Vertex>::edge_iterator,
+          typename frozen_adj_list<Vertex>::edge_iterator>
+edges(const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+std::pair<typename frozen_adj_list<Vertex>::edge_descriptor, bool>
+edge(Vertex s, Vertex t, const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+size_t out_degree(Vertex v, const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+size_t in_degree(Vertex v, const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+std::pair<typename frozen_adj_list<Vertex>::out_edge_iterator,
+          typename frozen_adj_list<Vertex>::out_edge_iterator>
+out_edges(Vertex v, const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+std::pair<typename frozen_adj_list<Vertex>::in_edge_iterator,
+          typename frozen_adj_list<Vertex>::in_edge_iterator>
+in_edges(Vertex v, const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+std::pair<typename frozen_adj_list<Vertex>::adjacency_iterator,
+          typename frozen_adj_list<Vertex>::adjacency_iterator>
+out_neighbours(Vertex v, const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+std::pair<typename frozen_adj_list<Vertex>::adjacency_iterator,
+          typename frozen_adj_list<Vertex>::adjacency_iterator>
+in_neighbours(Vertex v, const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+size_t num_vertices(const frozen_adj_list<Vertex>& g);
+
+template <class Vertex>
+size_t num_edges(const frozen_adj_list<Vertex>& g);
+
+namespace detail
+{
+
+// read-only array of 32 or 64 bit unsigned integers, with the width chosen at
+// run time
+class frozen_index_array
+{
+public:
+    frozen_index_array() : _data(nullptr), _wide(true) {}
+    frozen_index_array(const void* data, size_t width)
+        : _data(data), _wide(width == sizeof(uint64_t)) {}
+
+    __attribute__((always_inline))
+    size_t operator[](size_t i) const
+    {
+        if (_wide)
+            return static_cast<const uint64_t*>(_data)[i];
+        return static_cast<const uint32_t*>(_data)[i];
+    }
+
+private:
+    const void* _data;
+    bool _wide;
+};
+
+// the compressed adjacency of each vertex in one direction: the edges of
+// vertex v are in the range [ptr[v], ptr[v+1]), the encoded neighbours
+// occupy the bytes [bptr[v], bptr[v+1]) of data, and eidx holds the edge
+// indexes
+struct frozen_csr
+{
+    frozen_csr() : data(nullptr) {}
+    frozen_csr(frozen_index_array ptr, frozen_index_array bptr,
+               const uint8_t* data, frozen_index_array eidx)
+        : ptr(ptr), bptr(bptr), data(data), eidx(eidx) {}
+
+    frozen_index_array ptr;
+    frozen_index_array bptr;
+    const uint8_t* data;
+    frozen_index_array eidx;
+};
+
+template <class Vertex, class Deference>
+class frozen_row_iterator:
+    public boost::iterator_facade<frozen_row_iterator<Vertex, Deference>,
+                                  typename Deference::value_type,
+                                  boost::forward_traversal_tag,
+                                  typename Deference::value_type>
+{
+public:
+    frozen_row_iterator() : _csr(nullptr), _v(0), _pos(0), _end(0),
+                            _data(nullptr), _u(0) {}
+    frozen_row_iterator(const frozen_csr& csr, Vertex v, size_t pos,
+                        size_t end, const uint8_t* data)
+        : _csr(&csr), _v(v), _pos(pos), _end(end), _data(data), _u(0)
+    {
+        if (_pos < _end)
+            _u = decode();
+    }
+
+private:
+    friend class boost::iterator_core_access;
+
+    __attribute__((always_inline))
+    Vertex decode()
+    {
+        uint64_t x = 0;
+        unsigned int shift = 0;
+        uint8_t b;
+        do
+        {
+            b = *_data++;
+            x |= uint64_t(b & 0x7f) << shift;
+            shift += 7;
+        }
+        while (b & 0x80);
+        return x;
+    }
+
+    void increment()
+    {
+        ++_pos;
+        if (_pos < _end)
+            _u += decode();
+    }
+
+    bool equal(frozen_row_iterator const& other) const
+    {
+        return _pos == other._pos;
+    }
+
+    typename Deference::value_type dereference() const
+    {
+        return Deference::def(_v, _u, *_csr, _pos);
+    }
+
+    const frozen_csr* _csr;
+    Vertex _v;
+    size_t _pos;
+    size_t _end;
+    const uint8_t* _data;
+    Vertex _u;
+};
+
+} // namespace detail
+
+template <class Vertex = size_t>
+class frozen_adj_list
+{
+public:
+    struct graph_tag {};
+    typedef Vertex vertex_t;
+
+    typedef detail::adj_edge_descriptor<Vertex> edge_descriptor;
+    typedef detail::frozen_csr csr_t;
+    typedef typename integer_range<Vertex>::iterator vertex_iterator;
+
+    frozen_adj_list(): _n_vertices(0), _n_edges(0), _edge_index_range(0) {}
+
+    frozen_adj_list(size_t n_vertices, size_t n_edges, size_t edge_index_range,
+                    const csr_t& out_csr, const csr_t& in_csr)
+        : _n_vertices(n_vertices), _n_edges(n_edges),
+          _edge_index_range(edge_index_range), _out(out_csr), _in(in_csr) {}
+
+    // copies are shallow, and refer to the same arrays as the original
+
+    struct make_out_edge
+    {
+        typedef edge_descriptor value_type;
+        __attribute__((always_inline))
+        static edge_descriptor def(Vertex v, Vertex u, const csr_t& csr,
+                                   size_t pos)
+        { return edge_descriptor(v, u, csr.eidx[pos], false); }
+    };
+
+    struct make_in_edge
+    {
+        typedef edge_descriptor value_type;
+        __attribute__((always_inline))
+        static edge_descriptor def(Vertex v, Vertex u, const csr_t& csr,
+                                   size_t pos)
+        { return edge_descriptor(u, v, csr.eidx[pos], false); }
+    };
+
+    struct get_vertex
+    {
+        typedef Vertex value_type;
+        __attribute__((always_inline))
+        static Vertex def(Vertex, Vertex u, const csr_t&, size_t)
+        { return u; }
+    };
+
+    typedef detail::frozen_row_iterator<Vertex, make_out_edge> out_edge_iterator;
+    typedef detail::frozen_row_iterator<Vertex, make_in_edge> in_edge_iterator;
+    typedef detail::frozen_row_iterator<Vertex, get_vertex> adjacency_iterator;
+    typedef adjacency_iterator in_adjacency_iterator;
+
+    class edge_iterator:
+        public boost::iterator_facade<edge_iterator,
+                                      edge_descriptor,
+                                      boost::forward_traversal_tag,
+                                      edge_descriptor>
+    {
+    public:
+        edge_iterator() : _g(nullptr), _v(0) {}
+        edge_iterator(const frozen_adj_list& g, Vertex v)
+            : _g(&g), _v(v)
+        {
+            if (_v < _g->_n_vertices)
+                _ei = _g->template row<make_out_edge>(_g->_out, _v, true);
+            skip();
+        }
+
+    private:
+        friend class boost::iterator_core_access;
+
+        void skip()
+        {
+            // skip vertices without out-edges
+            while (_v < _g->_n_vertices &&
+                   _ei == _g->template row<make_out_edge>(_g->_out, _v, false))
+            {
+                ++_v;
+                if (_v < _g->_n_vertices)
+                    _ei = _g->template row<make_out_edge>(_g->_out, _v, true);
+            }
+        }
+
+        void increment()
+        {
+            ++_ei;
+            skip();
+        }
+
+        bool equal(edge_iterator const& other) const
+        {
+            if (_v >= _g->_n_vertices)
+                return other._v >= _g->_n_vertices;
+            return _v == other._v && _ei == other._ei;
+        }
+
+        edge_descriptor dereference() const
+        {
+            return *_ei;
+        }
+
+        const frozen_adj_list* _g;
+        Vertex _v;
+        out_edge_iterator _ei;
+    };
+
+    static Vertex null_vertex() { return std::numeric_limits<Vertex>::max(); }
+
+    size_t get_edge_index_range() const { return _edge_index_range; }
+
+private:
+    template <class Deference>
+    __attribute__((always_inline))
+    detail::frozen_row_iterator<Vertex, Deference>
+    row(const csr_t& csr, Vertex v, bool begin) const
+    {
+        typedef detail::frozen_row_iterator<Vertex, Deference> iter_t;
+        size_t end = csr.ptr[v + 1];
+        if (!begin)
+            return iter_t(csr, v, end, end, nullptr);
+        return iter_t(csr, v, csr.ptr[v], end, csr.data + csr.bptr[v]);
+    }
+
+    size_t _n_vertices;
+    size_t _n_edges;
+    size_t _edge_index_range;
+    csr_t _out;
+    csr_t _in;
+
+    // access functions
+    friend std::pair<vertex_iterator, vertex_iterator>
+    vertices<>(const frozen_adj_list<Vertex>& g);
+
+    friend std::pair<edge_iterator, edge_iterator>
+    edges<>(const frozen_adj_list<Vertex>& g);
+
+    friend std::pair<edge_descriptor, bool>
+    edge<>(Vertex s, Vertex t, const frozen_adj_list<Vertex>& g);
+
+    friend size_t out_degree<>(Vertex v, const frozen_adj_list<Vertex>& g);
+
+    friend size_t in_degree<>(Vertex v, const frozen_adj_list<Vertex>& g);
+
+    friend std::pair<out_edge_iterator, out_edge_iterator>
+    out_edges<>(Vertex v, const frozen_adj_list<Vertex>& g);
+
+    friend std::pair<in_edge_iterator, in_edge_iterator>
+    in_edges<>(Vertex v, const frozen_adj_list<Vertex>& g);
+
+    friend std::pair<adjacency_iterator, adjacency_iterator>
+    out_neighbours<>(Vertex v, const frozen_adj_list<Vertex>& g);
+
+    friend std::pair<adjacency_iterator, adjacency_iterator>
+    in_neighbours<>(Vertex v, const frozen_adj_list<Vertex>& g);
+
+    friend size_t num_vertices<>(const frozen_adj_list<Vertex>& g);
+
+    friend size_t num_edges<>(const frozen_adj_list<Vertex>& g);
+};
+
+//========================================================================
+// Graph traits and BGL scaffolding
+//========================================================================
+
+template <class Vertex>
+struct graph_traits<frozen_adj_list<Vertex> >
+{
+    typedef Vertex vertex_descriptor;
+    typedef typename frozen_adj_list<Vertex>::edge_descriptor edge_descriptor;
+    typedef typename frozen_adj_list<Vertex>::edge_iterator edge_iterator;
+    typedef typename frozen_adj_list<Vertex>::adjacency_iterator adjacency_iterator;
+
+    typedef typename frozen_adj_list<Vertex>::out_edge_iterator out_edge_iterator;
+    typedef typename frozen_adj_list<Vertex>::in_edge_iterator in_edge_iterator;
+
+    typedef typename frozen_adj_list<Vertex>::vertex_iterator vertex_iterator;
+
+    typedef bidirectional_tag directed_category;
+    typedef allow_parallel_edge_tag edge_parallel_category;
+    typedef adj_list_traversal_tag traversal_category;
+
+    typedef Vertex vertices_size_type;
+    typedef Vertex edges_size_type;
+    typedef size_t degree_size_type;
+
+    static Vertex null_vertex() { return frozen_adj_list<Vertex>::null_vertex(); }
+};
+
+template <class Vertex>
+struct graph_traits<const frozen_adj_list<Vertex> >
+    : public graph_traits<frozen_adj_list<Vertex> >
+{
+};
+
+template <class Vertex>
+struct edge_property_type<frozen_adj_list<Vertex> >
+{
+    typedef void type;
+};
+
+template <class Vertex>
+struct vertex_property_type<frozen_adj_list<Vertex> >
+{
+    typedef void type;
+};
+
+template <class Vertex>
+struct graph_property_type<frozen_adj_list<Vertex> >
+{
+    typedef void type;
+};
+
+//========================================================================
+// Graph access functions
+//========================================================================
+
+template <class Vertex>
+inline __attribute__((always_inline))
+std::pair<typename frozen_adj_list<Vertex>::vertex_iterator,
+          typename frozen_adj_list<Vertex>::vertex_iterator>
+vertices(const frozen_adj_list<Vertex>& g)
+{
+    typedef typename frozen_adj_list<Vertex>::vertex_iterator vi_t;
+    return {vi_t(0), vi_t(g._n_vertices)};
+}
+
+template <class Vertex>
+inline
+std::pair<typename frozen_adj_list<Vertex>::edge_iterator,
+          typename frozen_adj_list<Vertex>::edge_iterator>
+edges(const frozen_adj_list<Vertex>& g)
+{
+    typedef typename frozen_adj_list<Vertex>::edge_iterator ei_t;
+    return {ei_t(g, 0), ei_t(g, g._n_vertices)};
+}
+
+template <class Vertex>
+inline __attribute__((always_inline))
+Vertex vertex(size_t i, const frozen_adj_list<Vertex>&)
+{
+    return i;
+}
+
+template <class Vertex>
+inline
+std::pair<typename frozen_adj_list<Vertex>::edge_descriptor, bool>
+edge(Vertex s, Vertex t, const frozen_adj_list<Vertex>& g)
+{
+    typedef typename frozen_adj_list<Vertex>::edge_descriptor edge_descriptor;
+    typedef typename frozen_adj_list<Vertex>::make_out_edge make_out_edge;
+
+    // the neighbours are sorted, so the search stops at the first larger one
+    auto ei = g.template row<make_out_edge>(g._out, s, true);
+    auto ei_end = g.template row<make_out_edge>(g._out, s, false);
+    for (; ei != ei_end; ++ei)
+    {
+        auto e = *ei;
+        if (e.t == t)
+            return {e, true};
+        if (e.t > t)
+            break;
+    }
+    Vertex v = graph_traits<frozen_adj_list<Vertex> >::null_vertex();
+    return {edge_descriptor(v, v, v, false), false};
+}
+
+template <class Vertex>
+inline __attribute__((always_inline))
+size_t out_degree(Vertex v, const frozen_adj_list<Vertex>& g)
+{
+    return g._out.ptr[v + 1] - g._out.ptr[v];
+}
+
+template <class Vertex>
+inline __attribute__((always_inline))
+size_t in_degree(Vertex v, const frozen_adj_list<Vertex>& g)
+{
+    return g._in.ptr[v + 1] - g._in.ptr[v];
+}
+
+template <class Vertex>
+inline __attribute__((always_inline))
+size_t degree(Vertex v, const frozen_adj_list<Vertex>& g)
+{
+    return in_degree(v, g) + out_degree(v, g);
+}
+
+template <class Vertex>
+inline __attribute__((always_inline)) __attribute__((flatten))
+std::pair<typename frozen_adj_list<Vertex>::out_edge_iterator,
+          typename frozen_adj_list<Vertex>::out_edge_iterator>
+out_edges(Vertex v, const frozen_adj_list<Vertex>& g)
+{
+    typedef typename frozen_adj_list<Vertex>::make_out_edge make_out_edge;
+    return {g.template row<make_out_edge>(g._out, v, true),
+            g.template row<make_out_edge>(g._out, v, false)};
+}
+
+template <class Vertex>
+inline __attribute__((always_inline)) __attribute__((flatten))
+std::pair<typename frozen_adj_list<Vertex>::in_edge_iterator,
+          typename frozen_adj_list<Vertex>::in_edge_iterator>
+in_edges(Vertex v, const frozen_adj_list<Vertex>& g)
+{
+    typedef typename frozen_adj_list<Vertex>::make_in_edge make_in_edge;
+    return {g.template row<make_in_edge>(g._in, v, true),
+            g.template row<make_in_edge>(g._in, v, false)};
+}
+
+template <class Vertex>
+inline __attribute__((always_inline)) __attribute__((flatten))
+std::pair<typename frozen_adj_list<Vertex>::adjacency_iterator,
+          typename frozen_adj_list<Vertex>::adjacency_iterator>
+out_neighbours(Vertex v, const frozen_adj_list<Vertex>& g)
+{
+    typedef typename frozen_adj_list<Vertex>::get_vertex get_vertex;
+    return {g.template row<get_vertex>(g._out, v, true),
+            g.template row<get_vertex>(g._out, v, false)};
+}
+
+template <class Vertex>
+inline __attribute__((always_inline)) __attribute__((flatten))
+std::pair<typename frozen_adj_list<Vertex>::adjacency_iterator,
+          typename frozen_adj_list<Vertex>::adjacency_iterator>
+in_neighbours(Vertex v, const frozen_adj_list<Vertex>& g)
+{
+    typedef typename frozen_adj_list<Vertex>::get_vertex get_vertex;
+    return {g.template row<get_vertex>(g._in, v, true),
+            g.template row<get_vertex>(g._in, v, false)};
+}
+
+template <class Vertex>
+inline __attribute__((always_inline)) __attribute__((flatten))
+std::pair<typename frozen_adj_list<Vertex>::adjacency_iterator,
+          typename frozen_adj_list<Vertex>::adjacency_iterator>
+adjacent_vertices(Vertex v, const frozen_adj_list<Vertex>& g)
+{
+    return out_neighbours(v, g);
+}
+
+template <class Vertex>
+inline __attribute__((always_inline))
+size_t num_vertices(const frozen_adj_list<Vertex>& g)
+{
+    return g._n_vertices;
+}
+
+template <class Vertex>
+inline __attribute__((always_inline))
+size_t num_edges(const frozen_adj_list<Vertex>& g)
+{
+    return g._n_edges;
+}
+
+template <class Vertex>
+inline
+Vertex source(const typename frozen_adj_list<Vertex>::edge_descriptor& e,
+              const frozen_adj_list<Vertex>&)
+{
+    return e.s;
+}
+
+template <class Vertex>
+inline
+Vertex target(const typename frozen_adj_list<Vertex>::edge_descriptor& e,
+              const frozen_adj_list<Vertex>&)
+{
+    return e.t;
+}
+
+//========================================================================
+// Vertex and edge index property maps
+//========================================================================
+
+template <class Vertex>
+struct property_map<frozen_adj_list<Vertex>, vertex_index_t>
+{
+    typedef identity_property_map type;
+    typedef type const_type;
+};
+
+template <class Vertex>
+struct property_map<const frozen_adj_list<Vertex>, vertex_index_t>
+{
+    typedef identity_property_map type;
+    typedef type const_type;
+};
+
+template <class Vertex>
+inline identity_property_map
+get(vertex_index_t, const frozen_adj_list<Vertex>&)
+{
+    return identity_property_map();
+}
+
+template <class Vertex>
+struct property_map<frozen_adj_list<Vertex>, edge_index_t>
+{
+    typedef adj_edge_index_property_map<Vertex> type;
+    typedef type const_type;
+};
+
+template <class Vertex>
+struct property_map<const frozen_adj_list<Vertex>, edge_index_t>
+{
+    typedef adj_edge_index_property_map<Vertex> type;
+    typedef type const_type;
+};
+
+template <class Vertex>
+inline adj_edge_index_property_map<Vertex>
+get(edge_index_t, const frozen_adj_list<Vertex>&)
+{
+    return adj_edge_index_property_map<Vertex>();
+}
+
+} // namespace boost
+
+#endif //GRAPH_FROZEN_HH
@@ -389,7 +389,7 @@ boost::python::tuple GraphInterface::read_from_file(string file,
         create_dynamic_map<vertex_index_map_t,edge_index_map_t>
             map_creator(_vertex_index, _edge_index);
         dynamic_properties dp(map_creator);
-        *_mg = multigraph_t();
+        get_graph() = multigraph_t();
 
         if (format == "dot")
             _directed = read_graphviz(stream, *_mg, dp, "vertex_name", true,
@@ -285,6 +285,9 @@ struct vertex_range_traits
     IterRange<typename boost::graph_traits<Graph>::vertex_iterator>
     static get_range(Graph& g) { return vertices_range(g); }
 
+    template <class Graph>
+    static size_t get_size(Graph& g) { return num_vertices(g); }
+
     static property_type get_property_id() { return property_type::Vertex; }
 };
 
@@ -299,6 +302,9 @@ struct edge_range_traits
     IterRange<typename boost::graph_traits<Graph>::edge_iterator>
     static get_range(Graph& g) { return edges_range(g); }
 
+    template <class Graph>
+    static size_t get_size(Graph& g) { return num_edges(g); }
+
     static property_type get_property_id() { return property_type::Edge; }
 };
 
@@ -383,6 +389,28 @@ void write_property(Graph& g, std::string& name, boost::any& prop, std::ostream&
 }
 
 
+// The vertices and edges of a freshly read graph are indexed contiguously in
+// the same order they are stored in the file, hence scalar values can be read
+// in a single block directly into the property map storage.
+
+template <bool BE, class RangeTraits, class Graph, class PMap>
+void read_values(Graph& g, PMap& prop, std::istream& s, std::true_type)
+{
+    typedef typename property_traits<PMap>::value_type val_t;
+    auto& vals = prop.get_storage();
+    vals.resize(RangeTraits::get_size(g));
+    s.read(reinterpret_cast<char*>(vals.data()), sizeof(val_t) * vals.size());
+    for (auto& x : vals)
+        byte_swap<BE>(x);
+}
+
+template <bool BE, class RangeTraits, class Graph, class PMap>
+void read_values(Graph& g, PMap& prop, std::istream& s, std::false_type)
+{
+    for (auto x : RangeTraits::get_range(g))
+        read<BE>(s, prop[x]);
+}
+
 template <bool BE, class RangeTraits>
 struct read_property_dispatch
 {
@@ -397,8 +425,12 @@ struct read_property_dispatch
             pmap_t prop(RangeTraits::get_index_map(g));
             if (!ignore)
             {
-                for (auto x : RangeTraits::get_range(g))
-                    read<BE>(s, prop[x]);
+                typedef typename std::integral_constant
+                    <bool, (std::is_arithmetic<T>::value &&
+                            !std::is_same<RangeTraits,
+                                          graph_range_traits>::value)>::type
+                    is_block;
+                read_values<BE, RangeTraits>(g, prop, s, is_block());
                 aprop = prop;
             }
             else
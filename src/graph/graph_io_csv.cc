@@ -0,0 +1,472 @@
+// graph-tool -- a general graph modification and manipulation thingy
+//
+// Copyright (C) 2006-2017 Tiago de Paula Peixoto <tiago@skewed.de>
+//
+// This program is free software; you can redistribute it and/or
+// modify it under the terms of the GNU General Public License
+// as published by the Free Software Foundation; either version 3
+// of the License, or (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+#include "graph.hh"
+#include "graph_properties.hh"
+#include "graph_util.hh"
+
+#include <boost/python.hpp>
+#include <boost/python/stl_iterator.hpp>
+#include <boost/iostreams/device/mapped_file.hpp>
+
+#include <cstdlib>
+#include <unordered_map>
+
+#ifdef USING_OPENMP
+#include <omp.h>
+#endif
+
+using namespace std;
+using namespace boost;
+using namespace graph_tool;
+
+namespace graph_tool
+{
+
+// A field of a csv file, given by its position and length in the mapped
+// data. Quoted fields still contain the enclosing quotes, which are removed
+// (together with the escaping of inner quotes) only when the value is
+// extracted.
+
+struct csv_field
+{
+    size_t pos = 0;
+    size_t len = 0;
+    bool quoted = false;
+    bool valid = false;
+};
+
+class csv_parser
+{
+public:
+    csv_parser(const char* data, char delim, char quote)
+        : _data(data), _delim(delim), _quote(quote) {}
+
+    // Split the line starting at 'pos' into fields, and return the position
+    // of the next line.
+    size_t parse_line(size_t pos, size_t end, vector<csv_field>& fields) const
+    {
+        fields.clear();
+        while (true)
+        {
+            csv_field f;
+            f.pos = pos;
+            f.valid = true;
+            if (pos < end && _data[pos] == _quote)
+            {
+                f.quoted = true;
+                ++pos;
+                while (pos < end)
+                {
+                    if (_data[pos] == _quote)
+                    {
+                        if (pos + 1 < end && _data[pos + 1] == _quote)
+                        {
+                            pos += 2;
+                            continue;
+                        }
+                        ++pos;
+                        break;
+                    }
+                    ++pos;
+                }
+            }
+            while (pos < end && _data[pos] != _delim && _data[pos] != '\n')
+                ++pos;
+            f.len = pos - f.pos;
+            if (f.len > 0 && (pos == end || _data[pos] == '\n') &&
+                _data[f.pos + f.len - 1] == '\r')
+                --f.len;
+            fields.push_back(f);
+            if (pos >= end || _data[pos] == '\n')
+                break;
+            ++pos;
+        }
+        return pos + 1;
+    }
+
+    string get(const csv_field& f) const
+    {
+        if (!f.quoted)
+            return string(_data + f.pos, f.len);
+        string s;
+        s.reserve(f.len);
+        size_t end = f.pos + f.len;
+        for (size_t pos = f.pos + 1; pos < end; ++pos)
+        {
+            char c = _data[pos];
+            if (c == _quote)
+            {
+                if (pos + 1 < end && _data[pos + 1] == _quote)
+                    ++pos;
+                else
+                    continue;
+            }
+            s.push_back(c);
+        }
+        return s;
+    }
+
+private:
+    const char* _data;
+    char _delim;
+    char _quote;
+};
+
+// The rows of a contiguous byte range of the file. Each row contains the
+// source and target fields, followed by the edge property fields.
+
+struct csv_chunk
+{
+    size_t begin;
+    size_t end;
+    size_t nrows = 0;
+    vector<csv_field> fields;
+    vector<size_t> vs;  // (source, target) vertex of each row
+};
+
+template <class Key>
+Key get_csv_key(const string& s);
+
+template <>
+string get_csv_key(const string& s)
+{
+    return s;
+}
+
+template <>
+int64_t get_csv_key(const string& s)
+{
+    char* end;
+    int64_t val = strtoll(s.c_str(), &end, 10);
+    while (*end == ' ' || *end == '\t')
+        ++end;
+    if (s.empty() || *end != '\0')
+        throw ValueException("invalid integer vertex value: " + s);
+    return val;
+}
+
+// Map the vertex values to contiguous vertex ids in the order they are
+// encountered in the file. Each chunk is hashed independently in parallel,
+// and the local hash tables are then merged in the chunk order.
+
+template <class Key, class Graph, class VProp>
+void hash_csv_vertices(Graph& g, vector<csv_chunk>& chunks,
+                       const csv_parser& parser, size_t stride, VProp vmap,
+                       string& err)
+{
+    vector<vector<Key>> local_names(chunks.size());
+
+    #pragma omp parallel for schedule(dynamic, 1)
+    for (size_t i = 0; i < chunks.size(); ++i)
+    {
+        auto& chunk = chunks[i];
+        auto& names = local_names[i];
+        unordered_map<Key, size_t> local;
+        chunk.vs.resize(2 * chunk.nrows);
+        try
+        {
+            for (size_t j = 0; j < chunk.nrows; ++j)
+            {
+                for (size_t k = 0; k < 2; ++k)
+                {
+                    Key r = get_csv_key<Key>(parser.get(chunk.fields[j * stride + k]));
+                    auto iter = local.find(r);
+                    if (iter == local.end())
+                    {
+                        iter = local.insert(make_pair(r, names.size())).first;
+                        names.push_back(r);
+                    }
+                    chunk.vs[2 * j + k] = iter->second;
+                }
+            }
+        }
+        catch (ValueException& e)
+        {
+            #pragma omp critical
+            err = e.what();
+        }
+    }
+
+    if (!err.empty())
+        return;
+
+    size_t N = num_vertices(g);
+    unordered_map<Key, size_t> vertices;
+    vector<vector<size_t>> trans(chunks.size());
+    for (size_t i = 0; i < chunks.size(); ++i)
+    {
+        for (auto& r : local_names[i])
+        {
+            auto iter = vertices.find(r);
+            if (iter == vertices.end())
+                iter = vertices.insert(make_pair(r, N + vertices.size())).first;
+            trans[i].push_back(iter->second);
+        }
+    }
+
+    size_t n_new = vertices.size();
+    for (size_t i = 0; i < n_new; ++i)
+        add_vertex(g);
+
+    auto names = vmap.get_unchecked(num_vertices(g));
+
+    #pragma omp parallel for schedule(dynamic, 1)
+    for (size_t i = 0; i < chunks.size(); ++i)
+    {
+        auto& chunk = chunks[i];
+        for (auto& v : chunk.vs)
+            v = trans[i][v];
+        for (size_t j = 0; j < local_names[i].size(); ++j)
+            names[trans[i][j]] = local_names[i][j];
+    }
+}
+
+template <class Graph>
+void index_csv_vertices(Graph& g, vector<csv_chunk>& chunks,
+                        const csv_parser& parser, size_t stride, string& err)
+{
+    size_t N = 0;
+
+    #pragma omp parallel for schedule(dynamic, 1) reduction(max:N)
+    for (size_t i = 0; i < chunks.size(); ++i)
+    {
+        auto& chunk = chunks[i];
+        chunk.vs.resize(2 * chunk.nrows);
+        try
+        {
+            for (size_t j = 0; j < chunk.nrows; ++j)
+            {
+                for (size_t k = 0; k < 2; ++k)
+                {
+                    int64_t v = get_csv_key<int64_t>(parser.get(chunk.fields[j * stride + k]));
+                    if (v < 0)
+                        throw ValueException("invalid vertex index: " +
+                                             lexical_cast<string>(v));
+                    chunk.vs[2 * j + k] = v;
+                    N = std::max(N, size_t(v) + 1);
+                }
+            }
+        }
+        catch (ValueException& e)
+        {
+            #pragma omp critical
+            err = e.what();
+        }
+    }
+
+    while (num_vertices(g) < N)
+        add_vertex(g);
+}
+
+// Convert the property columns to the value types of the edge property maps,
+// in parallel. Since the graph is initially empty, the edge indexes
+// correspond to the global row numbers.
+
+struct set_csv_column
+{
+    template <class Value>
+    void operator()(Value, boost::any& aprop, vector<csv_chunk>& chunks,
+                    const vector<size_t>& offsets, const csv_parser& parser,
+                    size_t stride, size_t col, size_t E, bool& found,
+                    string& err) const
+    {
+        typedef typename eprop_map_t<Value>::type eprop_t;
+        typedef GraphInterface::edge_t edge_t;
+        eprop_t* prop = any_cast<eprop_t>(&aprop);
+        if (prop == nullptr)
+            return;
+        found = true;
+        auto uprop = prop->get_unchecked(E);
+        convert<Value, string> conv;
+
+        #pragma omp parallel for schedule(dynamic, 1)
+        for (size_t i = 0; i < chunks.size(); ++i)
+        {
+            auto& chunk = chunks[i];
+            for (size_t j = 0; j < chunk.nrows; ++j)
+            {
+                auto& f = chunk.fields[j * stride + col];
+                if (!f.valid)
+                    continue;
+                string val = parser.get(f);
+                edge_t e;
+                e.idx = offsets[i] + j;
+                try
+                {
+                    uprop[e] = conv(val);
+                }
+                catch (bad_lexical_cast&)
+                {
+                    #pragma omp critical
+                    err = "Invalid edge property value: " + val;
+                }
+            }
+        }
+    }
+};
+
+} // namespace graph_tool
+
+void load_csv_edges(GraphInterface& gi, string file, char delim, char quote,
+                    bool skip_first, size_t col_s, size_t col_t, int hash_mode,
+                    boost::any vmap, python::object oeprops)
+{
+    auto& g = gi.get_graph();
+    if (num_edges(g) > 0 || gi.get_edge_index_range() > 0)
+        throw GraphException("csv edges can only be loaded into an empty graph");
+
+    vector<boost::any> eprops;
+    python::stl_input_iterator<boost::any> piter(oeprops), pend;
+    for (; piter != pend; ++piter)
+        eprops.push_back(*piter);
+    size_t stride = 2 + eprops.size();
+    size_t ncols = std::max(col_s, col_t) + 1;
+
+    boost::iostreams::mapped_file_source mfile;
+    try
+    {
+        mfile.open(file);
+    }
+    catch (std::ios_base::failure& e)
+    {
+        throw IOException("error reading from file '" + file + "':" + e.what());
+    }
+    const char* data = mfile.data();
+    size_t size = mfile.size();
+    csv_parser parser(data, delim, quote);
+
+    size_t begin = 0;
+    if (skip_first)
+    {
+        vector<csv_field> fields;
+        begin = std::min(parser.parse_line(0, size, fields), size);
+    }
+
+    // split the file into byte ranges at line boundaries
+
+    size_t nchunks = 1;
+    #ifdef USING_OPENMP
+    if (size - begin > (1 << 20))
+        nchunks = 4 * omp_get_max_threads();
+    #endif
+    vector<csv_chunk> chunks(nchunks);
+    for (size_t i = 0; i < nchunks; ++i)
+    {
+        size_t pos = begin + ((size - begin) * i) / nchunks;
+        while (i > 0 && pos < size && data[pos - 1] != '\n')
+            ++pos;
+        chunks[i].begin = pos;
+        if (i > 0)
+            chunks[i - 1].end = pos;
+    }
+    chunks.back().end = size;
+
+    string err;
+
+    #pragma omp parallel for schedule(dynamic, 1)
+    for (size_t i = 0; i < nchunks; ++i)
+    {
+        auto& chunk = chunks[i];
+        vector<csv_field> fields;
+        size_t pos = chunk.begin;
+        while (pos < chunk.end)
+        {
+            pos = parser.parse_line(pos, chunk.end, fields);
+
+            // empty lines are skipped, as done by csv.reader
+            if (fields.size() == 1 && fields[0].len == 0)
+                continue;
+
+            if (fields.size() < ncols)
+            {
+                #pragma omp critical
+                err = "invalid line with only " +
+                    lexical_cast<string>(fields.size()) + " column(s)";
+                break;
+            }
+
+            chunk.fields.push_back(fields[col_s]);
+            chunk.fields.push_back(fields[col_t]);
+            size_t n = 0;
+            for (size_t j = 0; j < fields.size() && n < eprops.size(); ++j)
+            {
+                if (j == col_s || j == col_t)
+                    continue;
+                chunk.fields.push_back(fields[j]);
+                ++n;
+            }
+            for (; n < eprops.size(); ++n)
+                chunk.fields.push_back(csv_field());
+            chunk.nrows++;
+        }
+    }
+
+    if (!err.empty())
+        throw ValueException(err);
+
+    switch (hash_mode)
+    {
+    case 0:
+        index_csv_vertices(g, chunks, parser, stride, err);
+        break;
+    case 1:
+        hash_csv_vertices<string>(g, chunks, parser, stride,
+                                  any_cast<vprop_map_t<string>::type>(vmap),
+                                  err);
+        break;
+    case 2:
+        hash_csv_vertices<int64_t>(g, chunks, parser, stride,
+                                   any_cast<vprop_map_t<int64_t>::type>(vmap),
+                                   err);
+        break;
+    default:
+        throw ValueException("invalid hash mode: " +
+                             lexical_cast<string>(hash_mode));
+    }
+
+    if (!err.empty())
+        throw ValueException(err);
+
+    vector<size_t> offsets(nchunks);
+    size_t E = 0;
+    for (size_t i = 0; i < nchunks; ++i)
+    {
+        offsets[i] = E;
+        auto& vs = chunks[i].vs;
+        for (size_t j = 0; j < chunks[i].nrows; ++j)
+            add_edge(vertex(vs[2 * j], g), vertex(vs[2 * j + 1], g), g);
+        E += chunks[i].nrows;
+        vector<size_t>().swap(vs);
+    }
+
+    typedef mpl::push_back<scalar_types, string>::type col_types;
+    for (size_t i = 0; i < eprops.size(); ++i)
+    {
+        bool found = false;
+        mpl::for_each<col_types>(std::bind(set_csv_column(),
+                                           std::placeholders::_1,
+                                           std::ref(eprops[i]),
+                                           std::ref(chunks), std::ref(offsets),
+                                           std::ref(parser), stride, i + 2, E,
+                                           std::ref(found), std::ref(err)));
+        if (!found)
+            throw ValueException("invalid edge property map type for csv column");
+        if (!err.empty())
+            throw ValueException(err);
+    }
+}
@@ -0,0 +1,309 @@
+// graph-tool -- a general graph modification and manipulation thingy
+//
+// Copyright (C) 2006-2017 Tiago de Paula Peixoto <tiago@skewed.de>
+//
+// This program is free software; you can redistribute it and/or
+// modify it under the terms of the GNU General Public License
+// as published by the Free Software Foundation; either version 3
+// of the License, or (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+#ifndef GRAPH_PARALLEL_BFS_HH
+#define GRAPH_PARALLEL_BFS_HH
+
+#include <vector>
+#include <limits>
+#include <algorithm>
+
+#include "graph_util.hh"
+
+#ifdef USING_OPENMP
+#include <omp.h>
+#endif
+
+namespace graph_tool
+{
+using namespace std;
+using namespace boost;
+
+// Lowers the value at x to v, if it is larger, atomically.
+template <class T>
+inline void atomic_min(T& x, T v)
+{
+    T old = __atomic_load_n(&x, __ATOMIC_RELAXED);
+    while (v < old &&
+           !__atomic_compare_exchange_n(&x, &old, v, true, __ATOMIC_RELAXED,
+                                        __ATOMIC_RELAXED));
+}
+
+// Calls f(u) for all in-neighbours u of v, or all neighbours for undirected
+// graphs, stopping if it returns false.
+template <class Graph, class F>
+inline void bfs_in_neighbors(size_t v, const Graph& g, F&& f)
+{
+    for (const auto& e : in_or_out_edges_range(vertex(v, g), g))
+    {
+        size_t u = is_directed::apply<Graph>::type::value ?
+            source(e, g) : target(e, g);
+        if (!f(u))
+            break;
+    }
+}
+
+// Level-synchronous, direction-optimizing parallel BFS [beamer-direction-2012].
+//
+// Each level is expanded either "top-down", where the edges leaving the
+// current frontier are scanned, or "bottom-up", where every unvisited vertex
+// looks for its neighbours in the frontier. The latter is much cheaper when
+// the frontier contains a large fraction of the edges, which is typical of the
+// middle levels of a search in small-world networks, since each vertex stops
+// scanning at the first neighbour it finds in the frontier.
+//
+// On return, dist[v] contains the depth of v (or the maximum value of
+// int32_t if it was not reached), and pred[v] its parent in the search tree
+// (or v itself). For every level d, f(d, vs) is called with the vertices at
+// that depth; the search stops if it returns false.
+//
+// The result does not depend on the number of threads. In a top-down step,
+// the parent of a vertex is its neighbour that comes first in the previous
+// level, and the vertices of the level are ordered by their parent, and then
+// by their position in its adjacency list, as with a sequential search with a
+// FIFO queue. In a bottom-up step, the parent is the first neighbour in the
+// frontier found in the vertex's own adjacency list, and the level is
+// ordered by vertex index. If fifo is true, only top-down steps are done, so
+// that the whole tree and the order of discovery are the same as those of
+// the sequential search.
+//
+// In both cases, the work is split in contiguous blocks, one per thread, so
+// that the vertices found by each thread are already in order, and only need
+// to be concatenated.
+template <class Graph, class F>
+void parallel_bfs(const Graph& g, size_t s, vector<int32_t>& dist,
+                  vector<size_t>& pred, F&& f, bool fifo = false,
+                  double alpha = 14, double beta = 24)
+{
+    constexpr int32_t inf = numeric_limits<int32_t>::max();
+    constexpr size_t no_pred = numeric_limits<size_t>::max();
+    size_t N = num_vertices(g);
+
+    dist.clear();
+    dist.resize(N, inf);
+    pred.clear();
+    pred.resize(N, no_pred);
+
+    // edges still to be checked from unexplored vertices
+    size_t m_u = 0;
+    if (!fifo)
+    {
+        #pragma omp parallel for default(shared) schedule(runtime) \
+            reduction(+:m_u) if (N > OPENMP_MIN_THRESH)
+        for (size_t v = 0; v < N; ++v)
+        {
+            if (is_valid_vertex(vertex(v, g), g))
+                m_u += out_degree(vertex(v, g), g);
+        }
+        m_u -= out_degree(vertex(s, g), g);
+    }
+
+    size_t max_threads = 1;
+#ifdef USING_OPENMP
+    max_threads = omp_get_max_threads();
+#endif
+
+    // Vertices found by each thread in the current step, with the position
+    // of the edge that reached them in the concatenated adjacency lists of
+    // the frontier, whose offsets are kept in pos. If a vertex is reached by
+    // more than one thread in a top-down step, key[v] is the smallest such
+    // position, and only the thread that found it keeps it.
+    vector<vector<pair<size_t, size_t>>> found(max_threads);
+    vector<size_t> frontier = {s}, next, pos, key;
+    dist[s] = 0;
+    pred[s] = s;
+
+    bool bottom_up = false;
+    for (int32_t d = 0; !frontier.empty(); ++d)
+    {
+        if (!f(size_t(d), frontier))
+            break;
+
+        size_t nf = frontier.size();
+        pos.resize(nf + 1);
+        pos[0] = 0;
+        for (size_t i = 0; i < nf; ++i)
+            pos[i + 1] = pos[i] + out_degree(vertex(frontier[i], g), g);
+        size_t m_f = pos[nf];
+
+        if (fifo)
+            bottom_up = false;
+        else if (!bottom_up && m_f > m_u / alpha)
+            bottom_up = true;
+        else if (bottom_up && nf < N / beta)
+            bottom_up = false;
+
+        next.clear();
+        if (!bottom_up && (max_threads == 1 || m_f <= OPENMP_MIN_THRESH))
+        {
+            for (auto v : frontier)
+            {
+                for (auto u : adjacent_vertices_range(vertex(v, g), g))
+                {
+                    if (dist[u] != inf)
+                        continue;
+                    dist[u] = d + 1;
+                    pred[u] = v;
+                    next.push_back(u);
+                }
+            }
+        }
+        else
+        {
+            size_t nt = 1;
+            if (!bottom_up)
+            {
+                if (key.empty())
+                    key.resize(N, no_pred);
+
+                #pragma omp parallel
+                {
+                    size_t t = 0;
+#ifdef USING_OPENMP
+                    t = omp_get_thread_num();
+                    #pragma omp single
+                    nt = omp_get_num_threads();
+#endif
+                    // contiguous block of the frontier with a share of its
+                    // edges
+                    auto block = [&](size_t t)
+                        {
+                            if (t == nt)
+                                return nf;
+                            return size_t(std::lower_bound(pos.begin(),
+                                                           pos.end(),
+                                                           (m_f * t) / nt) -
+                                          pos.begin());
+                        };
+
+                    auto& lfound = found[t];
+                    lfound.clear();
+                    size_t end = block(t + 1);
+                    for (size_t i = block(t); i < end; ++i)
+                    {
+                        size_t k = pos[i];
+                        for (auto u : adjacent_vertices_range(vertex(frontier[i], g), g))
+                        {
+                            auto du = __atomic_load_n(&dist[u], __ATOMIC_RELAXED);
+                            if (du == inf)
+                            {
+                                __atomic_compare_exchange_n(&dist[u], &du,
+                                                            d + 1, false,
+                                                            __ATOMIC_RELAXED,
+                                                            __ATOMIC_RELAXED);
+                                du = d + 1;
+                            }
+                            if (du == d + 1 &&
+                                k < __atomic_load_n(&key[u], __ATOMIC_RELAXED))
+                            {
+                                atomic_min(key[u], k);
+                                lfound.emplace_back(u, k);
+                            }
+                            ++k;
+                        }
+                    }
+
+                    #pragma omp barrier
+
+                    size_t j = 0;
+                    for (auto& uk : lfound)
+                    {
+                        if (key[uk.first] != uk.second)
+                            continue;
+                        size_t i = std::upper_bound(pos.begin(), pos.end(),
+                                                    uk.second) - pos.begin() - 1;
+                        pred[uk.first] = frontier[i];
+                        lfound[j++] = uk;
+                    }
+                    lfound.resize(j);
+
+                    #pragma omp barrier
+
+                    for (auto& uk : lfound)
+                        key[uk.first] = no_pred;
+                }
+            }
+            else
+            {
+                #pragma omp parallel if (N > OPENMP_MIN_THRESH)
+                {
+                    size_t t = 0;
+#ifdef USING_OPENMP
+                    t = omp_get_thread_num();
+                    #pragma omp single
+                    nt = omp_get_num_threads();
+#endif
+                    auto& lfound = found[t];
+                    lfound.clear();
+
+                    // the static schedule gives each thread a contiguous range
+                    // of vertices, in the order of the threads
+                    #pragma omp for schedule(static)
+                    for (size_t u = 0; u < N; ++u)
+                    {
+                        if (dist[u] != inf || !is_valid_vertex(vertex(u, g), g))
+                            continue;
+                        bfs_in_neighbors(u, g,
+                                         [&](size_t v)
+                                         {
+                                             if (dist[v] != d)
+                                                 return true;
+                                             pred[u] = v;
+                                             return false;
+                                         });
+                        if (pred[u] != no_pred)
+                            lfound.emplace_back(u, 0);
+                    }
+                }
+            }
+
+            for (size_t t = 0; t < nt; ++t)
+            {
+                for (auto& uk : found[t])
+                    next.push_back(uk.first);
+            }
+
+            // in a bottom-up step, the distances are only set after the whole
+            // level is scanned, so that the new vertices are not taken to be
+            // in the frontier
+            if (bottom_up)
+            {
+                for (auto u : next)
+                    dist[u] = d + 1;
+            }
+        }
+
+        if (!fifo)
+        {
+            for (auto v : next)
+                m_u -= out_degree(vertex(v, g), g);
+        }
+        frontier.swap(next);
+    }
+
+    #pragma omp parallel for default(shared) schedule(runtime) \
+        if (N > OPENMP_MIN_THRESH)
+    for (size_t v = 0; v < N; ++v)
+    {
+        if (pred[v] == no_pred)
+            pred[v] = v;
+    }
+}
+
+} // graph_tool namespace
+
+#endif // GRAPH_PARALLEL_BFS_HH
@@ -67,11 +67,12 @@ struct do_shift_vertex_property
 // this function will shift all the properties when a vertex is to be deleted
 void GraphInterface::shift_vertex_property(boost::any prop, python::object oindex) const
 {
+    auto& g = const_cast<GraphInterface&>(*this).get_graph();
     boost::multi_array_ref<int64_t,1> index = get_array<int64_t,1>(oindex);
     bool found = false;
     mpl::for_each<writable_vertex_properties>
         (std::bind(do_shift_vertex_property(), std::placeholders::_1,
-                   std::ref(*_mg), prop, index, std::ref(found)));
+                   std::ref(g), prop, index, std::ref(found)));
     if (!found)
         throw GraphException("invalid writable property map");
 }
@@ -100,11 +101,12 @@ struct do_move_vertex_property
 // this function will move the back of the property map when a vertex in the middle is to be deleted
 void GraphInterface::move_vertex_property(boost::any prop, python::object oindex) const
 {
+    auto& g = const_cast<GraphInterface&>(*this).get_graph();
     boost::multi_array_ref<int64_t,1> index = get_array<int64_t,1>(oindex);
-    size_t back = num_vertices(*_mg) - 1;
+    size_t back = num_vertices(g) - 1;
     bool found = false;
     mpl::for_each<writable_vertex_properties>
-        (std::bind(do_move_vertex_property(), std::placeholders::_1, std::ref(*_mg),
+        (std::bind(do_move_vertex_property(), std::placeholders::_1, std::ref(g),
                    prop, index, back, std::ref(found)));
     if (!found)
         throw GraphException("invalid writable property map");
@@ -136,12 +138,13 @@ struct reindex_vertex_property
 void GraphInterface::re_index_vertex_property(boost::any map,
                                               boost::any aold_index) const
 {
+    auto& g = const_cast<GraphInterface&>(*this).get_graph();
     typedef vprop_map_t<int64_t>::type index_prop_t;
     index_prop_t old_index = any_cast<index_prop_t>(aold_index);
 
     bool found = false;
     mpl::for_each<writable_vertex_properties>
-        (std::bind(reindex_vertex_property(), std::placeholders::_1, std::ref(*_mg),
+        (std::bind(reindex_vertex_property(), std::placeholders::_1, std::ref(g),
                    map, old_index, std::ref(found)));
     if (!found)
         throw GraphException("invalid writable property map");
@@ -32,11 +32,23 @@ void GraphInterface::copy_edge_property(const GraphInterface& src,
                                         boost::any prop_src,
                                         boost::any prop_tgt)
 {
-    gt_dispatch<>()
-        (std::bind(copy_property<edge_selector,edge_properties>(),
-                   std::placeholders::_1, std::placeholders::_2,
-                   std::placeholders::_3, prop_src),
-         all_graph_views(), all_graph_views(),
-         writable_edge_properties())
-        (this->get_graph_view(), src.get_graph_view(), prop_tgt);
+    auto copy = std::bind(copy_property<edge_selector,edge_properties>(),
+                          std::placeholders::_1, std::placeholders::_2,
+                          std::placeholders::_3, prop_src);
+
+    // frozen graphs have their own views, which are only combined with each
+    // other, to avoid instantiating every pair of graph types
+    if (is_frozen() != src.is_frozen())
+        throw GraphException("Property maps cannot be copied between frozen "
+                             "and mutable graphs.");
+    if (is_frozen())
+        gt_dispatch<>()
+            (copy, frozen_graph_views(), frozen_graph_views(),
+             writable_edge_properties())
+            (this->get_graph_view(), src.get_graph_view(), prop_tgt);
+    else
+        gt_dispatch<>()
+            (copy, all_graph_views(), all_graph_views(),
+             writable_edge_properties())
+            (this->get_graph_view(), src.get_graph_view(), prop_tgt);
 }
@@ -48,7 +48,7 @@ struct get_vertex_iterator
 python::object get_vertices(GraphInterface& gi)
 {
     python::object iter;
-    run_action<>()(gi, std::bind(get_vertex_iterator(),
+    run_action<all_graph_views_with_frozen>()(gi, std::bind(get_vertex_iterator(),
                                  std::placeholders::_1,
                                  std::ref(gi),
                                  std::ref(iter)))();
@@ -94,11 +94,11 @@ python::object get_vertex(GraphInterface& gi, size_t i, bool use_index)
 {
     python::object v;
     if (!use_index)
-        run_action<>()(gi,
+        run_action<all_graph_views_with_frozen>()(gi,
                        std::bind(get_vertex_hard(), std::placeholders::_1,
                                  std::ref(gi), i, std::ref(v)))();
     else
-        run_action<>()(gi,
+        run_action<all_graph_views_with_frozen>()(gi,
                        std::bind(get_vertex_soft(), std::placeholders::_1,
                                  std::ref(gi), i, std::ref(v)))();
     return v;
@@ -120,7 +120,7 @@ struct get_edge_iterator
 python::object get_edges(GraphInterface& gi)
 {
     python::object iter;
-    run_action<>()(gi, std::bind(get_edge_iterator(), std::placeholders::_1,
+    run_action<all_graph_views_with_frozen>()(gi, std::bind(get_edge_iterator(), std::placeholders::_1,
                                  std::ref(gi), std::ref(iter)))();
     return iter;
 }
@@ -184,6 +184,24 @@ void remove_vertex(GraphInterface& gi, size_t v, bool fast)
     }
 }
 
+python::object remove_vertex_mask(GraphInterface& gi,
+                                  const python::object& omask)
+{
+    boost::multi_array_ref<bool,1> mask = get_array<bool,1>(omask);
+    auto& g = gi.get_graph();
+    if (mask.size() != num_vertices(g))
+        throw ValueException("vertex mask has invalid size");
+    std::vector<int64_t> vmap;
+    g.remove_vertices(mask, vmap);
+    return wrap_vector_owned(vmap);
+}
+
+void remove_edge_mask(GraphInterface& gi, const python::object& omask)
+{
+    boost::multi_array_ref<bool,1> mask = get_array<bool,1>(omask);
+    gi.get_graph().remove_edges(mask);
+}
+
 struct do_clear_vertex
 {
     template <class Graph>
@@ -250,6 +268,22 @@ struct get_edge_dispatch
                     bool all_edges, boost::python::list& es) const
     {
         auto gp = retrieve_graph_view<Graph>(gi, g);
+
+        // O(1) lookup with the edge cache; if the graph is filtered, the
+        // cached edge may be filtered out while a parallel one is not, so the
+        // adjacency lists are scanned if it is not found
+        if (!all_edges && gi.get_keep_ecache())
+        {
+            auto e = edge(vertex(s, g), vertex(t, g), g);
+            if (e.second)
+            {
+                es.append(PythonEdge<Graph>(gp, e.first));
+                return;
+            }
+            if (!gi.is_vertex_filter_active() && !gi.is_edge_filter_active())
+                return;
+        }
+
         size_t k_t = is_directed::apply<Graph>::type::value ?
             in_degreeS()(t, g) : out_degree(t, g);
         if (out_degree(s, g) <= k_t)
@@ -286,7 +320,7 @@ struct get_edge_dispatch
 python::object get_edge(GraphInterface& gi, size_t s, size_t t, bool all_edges)
 {
     python::list es;
-    run_action<>()(gi, std::bind(get_edge_dispatch(), std::placeholders::_1,
+    run_action<all_graph_views_with_frozen>()(gi, std::bind(get_edge_dispatch(), std::placeholders::_1,
                                  std::ref(gi), s, t, all_edges,
                                  std::ref(es)))();
     return es;
@@ -328,17 +362,17 @@ python::object GraphInterface::degree_map(string deg, boost::any weight) const
         weight = detail::no_weightS();
 
     if (deg == "in")
-        run_action<>()(const_cast<GraphInterface&>(*this),
+        run_action<all_graph_views_with_frozen>()(const_cast<GraphInterface&>(*this),
                        std::bind(get_degree_map(), std::placeholders::_1,
                                  std::ref(deg_map), in_degreeS(), std::placeholders::_2), weight_t())
             (weight);
     else if (deg == "out")
-        run_action<>()(const_cast<GraphInterface&>(*this),
+        run_action<all_graph_views_with_frozen>()(const_cast<GraphInterface&>(*this),
                        std::bind(get_degree_map(), std::placeholders::_1,
                                  std::ref(deg_map), out_degreeS(), std::placeholders::_2), weight_t())
             (weight);
     else if (deg == "total")
-        run_action<>()(const_cast<GraphInterface&>(*this),
+        run_action<all_graph_views_with_frozen>()(const_cast<GraphInterface&>(*this),
                        std::bind(get_degree_map(), std::placeholders::_1,
                                  std::ref(deg_map), total_degreeS(), std::placeholders::_2), weight_t())
             (weight);
@@ -499,16 +533,26 @@ do_get_edge_index(GraphInterface& g)
         (g.get_edge_index());
 }
 
-void do_add_edge_list(GraphInterface& gi, python::object aedge_list,
-                      python::object eprops);
+python::object do_add_edge_list(GraphInterface& gi, python::object aedge_list,
+                                python::object eprops);
 
 void do_add_edge_list_hashed(GraphInterface& gi, python::object aedge_list,
                              boost::any& vertex_map, bool is_str,
                              python::object eprops);
 
+python::object do_hash_strings(python::object avals);
+
 void do_add_edge_list_iter(GraphInterface& gi, python::object edge_list,
                            python::object eprops);
 
+python::object do_get_edge_list(GraphInterface& gi);
+
+void do_get_edge_list_chunked(GraphInterface& gi, python::object callback,
+                              size_t chunk);
+
+python::object do_find_edges(GraphInterface& gi, python::object asources,
+                             python::object atargets, bool all_edges);
+
 } // namespace graph_tool
 
 // register everything
@@ -539,9 +583,9 @@ void export_python_interface()
     class_<VertexBase>("VertexBase", no_init);
     class_<EdgeBase>("EdgeBase", no_init);
 
-    typedef boost::mpl::transform<graph_tool::all_graph_views,
+    typedef boost::mpl::transform<graph_tool::all_graph_views_with_frozen,
                                   boost::mpl::quote1<std::add_const> >::type const_graph_views;
-    typedef boost::mpl::transform<graph_tool::all_graph_views,
+    typedef boost::mpl::transform<graph_tool::all_graph_views_with_frozen,
                                   boost::mpl::quote1<std::add_pointer> >::type all_graph_views;
     typedef boost::mpl::transform<const_graph_views,
                                   boost::mpl::quote1<std::add_pointer> >::type all_const_graph_views;
@@ -563,11 +607,17 @@ void export_python_interface()
     def("add_edge", graph_tool::add_edge);
     def("remove_vertex", graph_tool::remove_vertex);
     def("remove_vertex_array", graph_tool::remove_vertex_array);
+    def("remove_vertex_mask", graph_tool::remove_vertex_mask);
     def("clear_vertex", graph_tool::clear_vertex);
     def("remove_edge", graph_tool::remove_edge);
+    def("remove_edge_mask", graph_tool::remove_edge_mask);
     def("add_edge_list", graph_tool::do_add_edge_list);
     def("add_edge_list_hashed", graph_tool::do_add_edge_list_hashed);
+    def("hash_strings", graph_tool::do_hash_strings);
     def("add_edge_list_iter", graph_tool::do_add_edge_list_iter);
+    def("get_edge_list", graph_tool::do_get_edge_list);
+    def("get_edge_list_chunked", graph_tool::do_get_edge_list_chunked);
+    def("find_edges", graph_tool::do_find_edges);
     def("get_edge", get_edge);
 
     def("get_vertex_index", get_vertex_index);
@@ -20,6 +20,7 @@
 
 #include <boost/python.hpp>
 #include <boost/python/type_id.hpp>
+#include <boost/python/stl_iterator.hpp>
 
 #include <functional>
 
@@ -611,6 +612,185 @@ public:
         return size_t(_pmap.get_storage().data());
     }
 
+    // bulk access to the values of a list of vertex or edge indexes
+    //
+    // Scalar values are returned as an array, vectors of scalars as a pair of
+    // arrays (values, offsets), where the values of the i-th index are
+    // values[offsets[i]:offsets[i+1]], and all other types as a list.
+
+    boost::python::object take_array(boost::python::object aidx)
+    {
+        typename boost::mpl::or_<
+            std::is_same<PropertyMap,
+                         GraphInterface::vertex_index_map_t>,
+            std::is_same<PropertyMap,
+                         GraphInterface::edge_index_map_t> >::type is_index;
+        return take_dispatch(aidx, is_index);
+    }
+
+    boost::python::object take_dispatch(boost::python::object aidx,
+                                        boost::mpl::bool_<true>)
+    {
+        auto idx = ::get_array<int64_t, 1>(aidx);
+        std::vector<int64_t> vals(idx.begin(), idx.end());
+        return wrap_vector_owned(vals);
+    }
+
+    boost::python::object take_dispatch(boost::python::object aidx,
+                                        boost::mpl::bool_<false>)
+    {
+        auto idx = ::get_array<int64_t, 1>(aidx);
+        auto& storage = _pmap.get_storage();
+        for (auto i : idx)
+        {
+            if (size_t(i) >= storage.size())
+                storage.resize(i + 1);
+        }
+        return take_values(idx, storage,
+                           typename bulk_value_kind<value_type>::type());
+    }
+
+    void put_array(boost::python::object aidx, boost::python::object avals,
+                   boost::python::object aoffsets)
+    {
+        typename boost::mpl::or_<
+            std::is_same<PropertyMap,
+                         GraphInterface::vertex_index_map_t>,
+            std::is_same<PropertyMap,
+                         GraphInterface::edge_index_map_t> >::type is_index;
+        put_dispatch(aidx, avals, aoffsets, is_index);
+    }
+
+    void put_dispatch(boost::python::object, boost::python::object,
+                      boost::python::object, boost::mpl::bool_<true>)
+    {
+        throw ValueException("property is read-only");
+    }
+
+    void put_dispatch(boost::python::object aidx, boost::python::object avals,
+                      boost::python::object aoffsets, boost::mpl::bool_<false>)
+    {
+        auto idx = ::get_array<int64_t, 1>(aidx);
+        auto& storage = _pmap.get_storage();
+        for (auto i : idx)
+        {
+            if (size_t(i) >= storage.size())
+                storage.resize(i + 1);
+        }
+        put_values(idx, storage, avals, aoffsets,
+                   typename bulk_value_kind<value_type>::type());
+    }
+
+    // 0: scalar, 1: vector of scalars, 2: anything else
+    template <class Val>
+    struct bulk_value_kind
+    {
+        typedef std::integral_constant
+            <int, boost::mpl::has_key<numpy_types, Val>::type::value ? 0 : 2> type;
+    };
+
+    template <class Val>
+    struct bulk_value_kind<std::vector<Val>>
+    {
+        typedef std::integral_constant
+            <int, boost::mpl::has_key<numpy_types, Val>::type::value ? 1 : 2> type;
+    };
+
+    template <class Idx, class Val>
+    boost::python::object take_values(Idx& idx, std::vector<Val>& storage,
+                                      std::integral_constant<int, 0>)
+    {
+        std::vector<Val> vals(idx.size());
+        #pragma omp parallel for default(shared) schedule(runtime) \
+            if (vals.size() > OPENMP_MIN_THRESH)
+        for (size_t i = 0; i < vals.size(); ++i)
+            vals[i] = storage[idx[i]];
+        return wrap_vector_owned(vals);
+    }
+
+    template <class Idx, class Val>
+    boost::python::object take_values(Idx& idx,
+                                      std::vector<std::vector<Val>>& storage,
+                                      std::integral_constant<int, 1>)
+    {
+        std::vector<int64_t> offsets(idx.size() + 1);
+        offsets[0] = 0;
+        for (size_t i = 0; i < idx.size(); ++i)
+            offsets[i + 1] = offsets[i] + storage[idx[i]].size();
+        std::vector<Val> vals(offsets.back());
+        #pragma omp parallel for default(shared) schedule(runtime) \
+            if (idx.size() > OPENMP_MIN_THRESH)
+        for (size_t i = 0; i < idx.size(); ++i)
+        {
+            auto& x = storage[idx[i]];
+            std::copy(x.begin(), x.end(), vals.begin() + offsets[i]);
+        }
+        return boost::python::make_tuple(wrap_vector_owned(vals),
+                                         wrap_vector_owned(offsets));
+    }
+
+    template <class Idx, class Val>
+    boost::python::object take_values(Idx& idx, std::vector<Val>& storage,
+                                      std::integral_constant<int, 2>)
+    {
+        boost::python::list vals;
+        for (auto i : idx)
+            vals.append(boost::python::object(storage[i]));
+        return vals;
+    }
+
+    template <class Idx, class Val>
+    void put_values(Idx& idx, std::vector<Val>& storage,
+                    boost::python::object avals, boost::python::object,
+                    std::integral_constant<int, 0>)
+    {
+        auto vals = ::get_array<Val, 1>(avals);
+        if (vals.size() != idx.size())
+            throw ValueException("number of values does not match the number of indexes");
+        // the same index can appear more than once, so this is not parallel
+        for (size_t i = 0; i < idx.size(); ++i)
+            storage[idx[i]] = vals[i];
+    }
+
+    template <class Idx, class Val>
+    void put_values(Idx& idx, std::vector<std::vector<Val>>& storage,
+                    boost::python::object avals,
+                    boost::python::object aoffsets,
+                    std::integral_constant<int, 1>)
+    {
+        auto vals = ::get_array<Val, 1>(avals);
+        auto offsets = ::get_array<int64_t, 1>(aoffsets);
+        if (offsets.size() != idx.size() + 1)
+            throw ValueException("number of offsets must be the number of indexes plus one");
+        for (size_t i = 0; i < idx.size(); ++i)
+        {
+            if (offsets[i] > offsets[i + 1] || offsets[i] < 0 ||
+                size_t(offsets[i + 1]) > vals.size())
+                throw ValueException("invalid offsets at position " +
+                                     boost::lexical_cast<std::string>(i));
+        }
+        // the same index can appear more than once, so this is not parallel
+        for (size_t i = 0; i < idx.size(); ++i)
+        {
+            auto& x = storage[idx[i]];
+            x.resize(offsets[i + 1] - offsets[i]);
+            for (size_t j = 0; j < x.size(); ++j)
+                x[j] = vals[offsets[i] + j];
+        }
+    }
+
+    template <class Idx, class Val>
+    void put_values(Idx& idx, std::vector<Val>& storage,
+                    boost::python::object avals, boost::python::object,
+                    std::integral_constant<int, 2>)
+    {
+        if (boost::python::len(avals) != idx.size())
+            throw ValueException("number of values does not match the number of indexes");
+        boost::python::stl_input_iterator<boost::python::object> iter(avals), end;
+        for (size_t i = 0; iter != end; ++iter, ++i)
+            storage[idx[i]] = boost::python::extract<Val>(*iter)();
+    }
+
 private:
     PropertyMap _pmap; // hold an internal copy, since it's cheap
 };
@@ -692,10 +872,45 @@ public:
         buf.resize(n);
         _s.read(&buf[0], n);
         buf.resize(_s.gcount());
+        return to_bytes(buf);
+    }
+
+    // read until (and including) the next newline, or until n bytes were
+    // read, if n >= 0
+    boost::python::object readline(long n)
+    {
+        std::string buf;
+        while (n < 0 || buf.size() < size_t(n))
+        {
+            auto c = _s.get();
+            if (c == std::istream::traits_type::eof())
+                break;
+            buf.push_back(c);
+            if (c == '\n')
+                break;
+        }
+        return to_bytes(buf);
+    }
 
+    // read directly into a writable python buffer, and return the number of
+    // bytes read
+    size_t readinto(boost::python::object obuf)
+    {
+        Py_buffer view;
+        if (PyObject_GetBuffer(obuf.ptr(), &view, PyBUF_WRITABLE) != 0)
+            boost::python::throw_error_already_set();
+        _s.read(static_cast<char*>(view.buf), view.len);
+        size_t n = _s.gcount();
+        PyBuffer_Release(&view);
+        return n;
+    }
+
+private:
+    boost::python::object to_bytes(const std::string& buf)
+    {
 #if (PY_MAJOR_VERSION >= 3)
         // in python 3 we need to construct a 'bytes' instance
-        PyObject* bytes = PyBytes_FromStringAndSize(&buf[0], buf.size());
+        PyObject* bytes = PyBytes_FromStringAndSize(buf.data(), buf.size());
         boost::python::handle<> x(bytes);
         boost::python::object pbuf(x);
 #else
@@ -704,7 +919,6 @@ public:
         return pbuf;
     }
 
-private:
     std::istream& _s;
 };
 
@@ -66,11 +66,13 @@ struct export_vertex_property_map
             .def("reserve", &pmap_t::reserve)
             .def("resize", &pmap_t::resize)
             .def("shrink_to_fit", &pmap_t::shrink_to_fit)
-            .def("data_ptr", &pmap_t::data_ptr);
+            .def("data_ptr", &pmap_t::data_ptr)
+            .def("take", &pmap_t::take_array)
+            .def("put", &pmap_t::put_array);
 
-        typedef boost::mpl::transform<graph_tool::all_graph_views,
+        typedef boost::mpl::transform<graph_tool::all_graph_views_with_frozen,
                                       boost::mpl::quote1<std::add_const> >::type const_graph_views;
-        typedef boost::mpl::transform<graph_tool::all_graph_views,
+        typedef boost::mpl::transform<graph_tool::all_graph_views_with_frozen,
                                       boost::mpl::quote1<std::add_pointer> >::type all_graph_views;
         typedef boost::mpl::transform<const_graph_views,
                                       boost::mpl::quote1<std::add_pointer> >::type all_const_graph_views;
@@ -149,12 +151,14 @@ struct export_edge_property_map
             .def("reserve", &pmap_t::reserve)
             .def("resize", &pmap_t::resize)
             .def("shrink_to_fit", &pmap_t::shrink_to_fit)
-            .def("data_ptr", &pmap_t::data_ptr);
+            .def("data_ptr", &pmap_t::data_ptr)
+            .def("take", &pmap_t::take_array)
+            .def("put", &pmap_t::put_array);
 
 
-        typedef boost::mpl::transform<graph_tool::all_graph_views,
+        typedef boost::mpl::transform<graph_tool::all_graph_views_with_frozen,
                                       boost::mpl::quote1<std::add_const> >::type const_graph_views;
-        typedef boost::mpl::transform<graph_tool::all_graph_views,
+        typedef boost::mpl::transform<graph_tool::all_graph_views_with_frozen,
                                       boost::mpl::quote1<std::add_pointer> >::type all_graph_views;
         typedef boost::mpl::transform<const_graph_views,
                                       boost::mpl::quote1<std::add_pointer> >::type all_const_graph_views;
@@ -23,6 +23,11 @@
 #include <boost/python.hpp>
 #include <boost/python/stl_iterator.hpp>
 #include <set>
+#include <cstring>
+
+#ifdef USING_OPENMP
+#include <omp.h>
+#endif
 
 
 using namespace std;
@@ -37,11 +42,13 @@ struct add_edge_list
 {
     template <class Graph>
     void operator()(Graph& g, python::object aedge_list,
-                    python::object& eprops, bool& found) const
+                    python::object& eprops, vector<int64_t>& eidx,
+                    bool& found) const
     {
         boost::mpl::for_each<ValueList>(std::bind(dispatch(), std::ref(g),
                                                   std::ref(aedge_list),
                                                   std::ref(eprops),
+                                                  std::ref(eidx),
                                                   std::ref(found),
                                                   std::placeholders::_1));
     }
@@ -50,7 +57,8 @@ struct add_edge_list
     {
         template <class Graph, class Value>
         void operator()(Graph& g, python::object& aedge_list,
-                        python::object& oeprops, bool& found, Value) const
+                        python::object& oeprops, vector<int64_t>& eidx,
+                        bool& found, Value) const
         {
             if (found)
                 return;
@@ -69,6 +77,8 @@ struct add_edge_list
 
                 size_t n_props = std::min(eprops.size(), edge_list.shape()[1] - 2);
 
+                auto eindex = get(edge_index_t(), g);
+                eidx.reserve(edge_list.shape()[0]);
                 for (const auto& e : edge_list)
                 {
                     size_t s = e[0];
@@ -76,6 +86,7 @@ struct add_edge_list
                     while (s >= num_vertices(g) || t >= num_vertices(g))
                         add_vertex(g);
                     auto ne = add_edge(vertex(s, g), vertex(t, g), g).first;
+                    eidx.push_back(eindex[ne]);
                     for (size_t i = 0; i < n_props; ++i)
                     {
                         try
@@ -96,18 +107,20 @@ struct add_edge_list
     };
 };
 
-void do_add_edge_list(GraphInterface& gi, python::object aedge_list,
-                      python::object eprops)
+python::object do_add_edge_list(GraphInterface& gi, python::object aedge_list,
+                                python::object eprops)
 {
     typedef mpl::vector<bool, char, uint8_t, uint16_t, uint32_t, uint64_t,
                         int8_t, int16_t, int32_t, int64_t, uint64_t, double,
                         long double> vals_t;
     bool found = false;
+    vector<int64_t> eidx;
     run_action<>()(gi, std::bind(add_edge_list<vals_t>(), std::placeholders::_1,
-                                 aedge_list, std::ref(eprops),
+                                 aedge_list, std::ref(eprops), std::ref(eidx),
                                  std::ref(found)))();
     if (!found)
         throw GraphException("Invalid type for edge list; must be two-dimensional with a scalar type");
+    return wrap_vector_owned(eidx);
 }
 
 template <class ValueList>
@@ -361,6 +374,141 @@ void do_add_edge_list_hashed(GraphInterface& gi, python::object aedge_list,
          writable_vertex_properties())(vertex_map);
 }
 
+// Rows of a string array are stored in the hash tables by their position,
+// which is only dereferenced if it is valid, since the empty and deleted keys
+// of gt_hash_set are not.
+
+struct row_hash
+{
+    row_hash(const vector<uint64_t>& hash) : _hash(&hash) {}
+    size_t operator()(size_t i) const
+    {
+        return i < _hash->size() ? (*_hash)[i] : i;
+    }
+    const vector<uint64_t>* _hash;
+};
+
+struct row_eq
+{
+    row_eq(const vector<uint64_t>& hash, const uint8_t* data, size_t w)
+        : _hash(&hash), _data(data), _w(w) {}
+    bool operator()(size_t i, size_t j) const
+    {
+        if (i == j)
+            return true;
+        size_t M = _hash->size();
+        if (i >= M || j >= M || (*_hash)[i] != (*_hash)[j])
+            return false;
+        return memcmp(_data + i * _w, _data + j * _w, _w) == 0;
+    }
+    const vector<uint64_t>* _hash;
+    const uint8_t* _data;
+    size_t _w;
+};
+
+// Number the fixed-width byte strings in the rows of `avals` in the order in
+// which they are first encountered. The strings are hashed in parallel, and
+// then distributed into shards according to their hash values, preserving
+// their order, so that each shard can be inserted into its own hash table by
+// a single thread. Returns the number of each string, and the row of the
+// first occurrence of each number.
+
+python::object do_hash_strings(python::object avals)
+{
+    auto vals = get_array<uint8_t, 2>(avals);
+    size_t M = vals.shape()[0];
+    size_t w = vals.shape()[1];
+    if (M > 0 && ((w > 1 && vals.strides()[1] != 1) ||
+                  (M > 1 && size_t(vals.strides()[0]) != w)))
+        throw ValueException("string array must be contiguous");
+
+    vector<uint64_t> hash(M);
+    #pragma omp parallel for schedule(static) if (M > OPENMP_MIN_THRESH)
+    for (size_t i = 0; i < M; ++i)
+    {
+        // FNV-1a
+        uint64_t h = 14695981039346656037ULL;
+        auto r = &vals[i][0];
+        for (size_t j = 0; j < w; ++j)
+            h = (h ^ r[j]) * 1099511628211ULL;
+        hash[i] = h;
+    }
+
+    // the shard is given by the highest bits of the hash, and the remaining
+    // ones are used by the hash tables
+    constexpr size_t nshards = 256;
+    auto shard = [&](size_t i) { return hash[i] >> 56; };
+
+    size_t nblocks = 1;
+    #ifdef USING_OPENMP
+    if (M > OPENMP_MIN_THRESH)
+        nblocks = omp_get_max_threads();
+    #endif
+    auto block = [&](size_t b) { return (M * b) / nblocks; };
+
+    vector<size_t> count(nblocks * nshards);
+    #pragma omp parallel for schedule(static) if (nblocks > 1)
+    for (size_t b = 0; b < nblocks; ++b)
+    {
+        for (size_t i = block(b); i < block(b + 1); ++i)
+            count[shard(i) * nblocks + b]++;
+    }
+
+    // the counts are ordered by shard and then block, so that their
+    // cumulative sum gives where each block starts writing in each shard
+    vector<size_t> begin(nshards + 1);
+    size_t pos = 0;
+    for (size_t k = 0; k < count.size(); ++k)
+    {
+        if (k % nblocks == 0)
+            begin[k / nblocks] = pos;
+        size_t c = count[k];
+        count[k] = pos;
+        pos += c;
+    }
+    begin[nshards] = pos;
+
+    vector<size_t> order(M);
+    #pragma omp parallel for schedule(static) if (nblocks > 1)
+    for (size_t b = 0; b < nblocks; ++b)
+    {
+        for (size_t i = block(b); i < block(b + 1); ++i)
+            order[count[shard(i) * nblocks + b]++] = i;
+    }
+    vector<size_t>().swap(count);
+
+    vector<size_t> first(M);
+    #pragma omp parallel for schedule(dynamic, 1) if (nblocks > 1)
+    for (size_t k = 0; k < nshards; ++k)
+    {
+        gt_hash_set<size_t, row_hash, row_eq>
+            rows(0, row_hash(hash), row_eq(hash, vals.data(), w));
+        for (size_t j = begin[k]; j < begin[k + 1]; ++j)
+        {
+            size_t i = order[j];
+            first[i] = *rows.insert(i).first;
+        }
+    }
+    vector<size_t>().swap(order);
+
+    // the first occurrence always precedes the others, hence the numbers
+    // can be assigned in a single pass
+    vector<int64_t> ids(M), firsts;
+    for (size_t i = 0; i < M; ++i)
+    {
+        if (first[i] == i)
+        {
+            ids[i] = firsts.size();
+            firsts.push_back(i);
+        }
+        else
+        {
+            ids[i] = ids[first[i]];
+        }
+    }
+    return python::make_tuple(wrap_vector_owned(ids),
+                              wrap_vector_owned(firsts));
+}
 
 struct add_edge_list_iter
 {
@@ -428,5 +576,216 @@ void do_add_edge_list_iter(GraphInterface& gi, python::object edge_list,
                        std::ref(edge_list), std::ref(eprops)))();
 }
 
+struct get_edge_list
+{
+    template <class Graph>
+    void operator()(Graph& g, vector<int64_t>& edges) const
+    {
+        // edges are placed in the slot of their index, so that the list is
+        // ordered by edge index
+        auto eindex = get(edge_index_t(), g);
+        parallel_edge_loop
+            (g,
+             [&](const auto& e)
+             {
+                 size_t i = eindex[e];
+                 edges[3 * i] = source(e, g);
+                 edges[3 * i + 1] = target(e, g);
+                 edges[3 * i + 2] = i;
+             });
+    }
+};
+
+python::object do_get_edge_list(GraphInterface& gi)
+{
+    vector<int64_t> edges(3 * gi.get_edge_index_range(), -1);
+    run_action<all_graph_views_with_frozen>()
+        (gi, std::bind(get_edge_list(), std::placeholders::_1,
+                       std::ref(edges)))();
+
+    // remove unused and filtered indexes
+    size_t pos = 0;
+    for (size_t i = 0; i < edges.size(); i += 3)
+    {
+        if (edges[i + 2] < 0)
+            continue;
+        for (size_t j = 0; j < 3; ++j)
+            edges[pos + j] = edges[i + j];
+        pos += 3;
+    }
+    edges.resize(pos);
+    return wrap_vector_owned(edges);
+}
+
+struct get_edge_list_chunked
+{
+    template <class Graph>
+    void operator()(Graph& g, python::object& callback, size_t chunk) const
+    {
+        // the buffer is reused for every chunk, and is only valid during the
+        // call to the callback
+        auto eindex = get(edge_index_t(), g);
+        vector<int64_t> edges;
+        edges.reserve(3 * chunk);
+        for (auto e : edges_range(g))
+        {
+            edges.push_back(source(e, g));
+            edges.push_back(target(e, g));
+            edges.push_back(eindex[e]);
+            if (edges.size() == 3 * chunk)
+            {
+                callback(wrap_vector_not_owned(edges));
+                edges.clear();
+            }
+        }
+        if (!edges.empty())
+            callback(wrap_vector_not_owned(edges));
+    }
+};
+
+void do_get_edge_list_chunked(GraphInterface& gi, python::object callback,
+                              size_t chunk)
+{
+    run_action<all_graph_views_with_frozen>()
+        (gi, std::bind(get_edge_list_chunked(), std::placeholders::_1,
+                       std::ref(callback), std::max(chunk, size_t(1))))();
+}
+
+
+struct find_edges
+{
+    // call f(e) for every edge (u, w) until it returns false, scanning the
+    // smaller adjacency list
+    template <class Graph, class Vertex, class F>
+    static void iter_edges(Graph& g, Vertex u, Vertex w, F&& f)
+    {
+        size_t k_w = is_directed::apply<Graph>::type::value ?
+            in_degreeS()(w, g) : out_degree(w, g);
+        if (out_degree(u, g) <= k_w)
+        {
+            for (auto e : out_edges_range(u, g))
+            {
+                if (target(e, g) == w && !f(e))
+                    break;
+            }
+        }
+        else
+        {
+            for (auto e : in_or_out_edges_range(w, g))
+            {
+                auto x = is_directed::apply<Graph>::type::value ?
+                    source(e, g) : target(e, g);
+                if (x == u && !f(e))
+                    break;
+            }
+        }
+    }
+
+    template <class Graph, class Array>
+    void operator()(Graph& g, Array& sources, Array& targets, bool all_edges,
+                    bool use_cache, bool filtered, vector<int64_t>& ids,
+                    vector<int64_t>& offsets) const
+    {
+        auto eindex = get(edge_index_t(), g);
+        size_t N = num_vertices(g);
+        size_t M = sources.size();
+
+        auto get_pair =
+            [&](size_t i, auto& u, auto& w)
+            {
+                if (size_t(sources[i]) >= N || size_t(targets[i]) >= N)
+                    return false;
+                u = vertex(sources[i], g);
+                w = vertex(targets[i], g);
+                return (is_valid_vertex(u, g) && is_valid_vertex(w, g));
+            };
+
+        typename graph_traits<Graph>::vertex_descriptor u, w;
+        if (!all_edges)
+        {
+            ids.resize(M);
+            #pragma omp parallel for default(shared) private(u, w) \
+                schedule(runtime) if (M > OPENMP_MIN_THRESH)
+            for (size_t i = 0; i < M; ++i)
+            {
+                ids[i] = -1;
+                if (!get_pair(i, u, w))
+                    continue;
+                if (use_cache)
+                {
+                    // O(1) lookup with the edge cache; if the graph is
+                    // filtered, the cached edge may be filtered out while a
+                    // parallel one is not
+                    auto e = edge(u, w, g);
+                    if (e.second)
+                        ids[i] = eindex[e.first];
+                    if (e.second || !filtered)
+                        continue;
+                }
+                iter_edges(g, u, w,
+                           [&](const auto& e)
+                           {
+                               ids[i] = eindex[e];
+                               return false;
+                           });
+            }
+            return;
+        }
+
+        // all parallel edges are returned in CSR format: the edges of the
+        // i-th pair are ids[offsets[i]:offsets[i+1]]
+        offsets.resize(M + 1);
+        offsets[0] = 0;
+        #pragma omp parallel for default(shared) private(u, w) \
+            schedule(runtime) if (M > OPENMP_MIN_THRESH)
+        for (size_t i = 0; i < M; ++i)
+        {
+            size_t k = 0;
+            if (get_pair(i, u, w))
+                iter_edges(g, u, w, [&](const auto&) { ++k; return true; });
+            offsets[i + 1] = k;
+        }
+
+        for (size_t i = 0; i < M; ++i)
+            offsets[i + 1] += offsets[i];
+        ids.resize(offsets[M]);
+
+        #pragma omp parallel for default(shared) private(u, w) \
+            schedule(runtime) if (M > OPENMP_MIN_THRESH)
+        for (size_t i = 0; i < M; ++i)
+        {
+            if (!get_pair(i, u, w))
+                continue;
+            size_t pos = offsets[i];
+            iter_edges(g, u, w,
+                       [&](const auto& e)
+                       {
+                           ids[pos++] = eindex[e];
+                           return true;
+                       });
+        }
+    }
+};
+
+python::object do_find_edges(GraphInterface& gi, python::object asources,
+                             python::object atargets, bool all_edges)
+{
+    auto sources = get_array<int64_t, 1>(asources);
+    auto targets = get_array<int64_t, 1>(atargets);
+    if (sources.size() != targets.size())
+        throw ValueException("sources and targets must have the same size");
+    vector<int64_t> ids, offsets;
+    bool filtered = (gi.is_vertex_filter_active() ||
+                     gi.is_edge_filter_active());
+    run_action<all_graph_views_with_frozen>()
+        (gi, std::bind(find_edges(), std::placeholders::_1,
+                       std::ref(sources), std::ref(targets), all_edges,
+                       gi.get_keep_ecache(), filtered, std::ref(ids),
+                       std::ref(offsets)))();
+    if (!all_edges)
+        return wrap_vector_owned(ids);
+    return python::make_tuple(wrap_vector_owned(ids),
+                              wrap_vector_owned(offsets));
+}
 
 } // namespace graph_tool
@@ -39,12 +39,11 @@ auto gibbs_sweep(GibbsState state, RNG& rng_)
 {
     auto& g = state._g;
 
-    vector<std::shared_ptr<RNG>> rngs;
+    parallel_rng<RNG> rngs(rng_, state._parallel);
     std::vector<std::pair<size_t, double>> best_move;
 
     if (state._parallel)
     {
-        init_rngs(rngs, rng_);
         init_cache(state._E);
         best_move.resize(num_vertices(g));
     }
@@ -80,9 +79,9 @@ auto gibbs_sweep(GibbsState state, RNG& rng_)
             if (state._parallel)
         parallel_loop_no_spawn
             (vlist,
-             [&](size_t, auto v)
+             [&](size_t i, auto v)
              {
-                 auto& rng = get_rng(rngs, rng_);
+                 auto& rng = rngs.get(i);
 
                  if (!state._sequential)
                      v = uniform_sample(vlist, rng);
@@ -160,12 +159,13 @@ auto gibbs_sweep(GibbsState state, RNG& rng_)
                     if (dS > 0 && std::isinf(beta))
                         continue;
 
-                    state.perform_move(v, s, get_rng(rngs, rng_));
+                    state.perform_move(v, s, rngs.get_serial());
                     nmoves++;
                     S += dS;
                 }
             }
         }
+        rngs.next_round();
     }
     return make_pair(S, nmoves);
 }
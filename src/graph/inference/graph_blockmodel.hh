@@ -1215,13 +1215,19 @@ public:
         return sample_block<rng_t>(v, c, rng);
     }
 
-    size_t random_neighbour(size_t v, rng_t& rng)
+    template <class RNG>
+    size_t random_neighbour(size_t v, RNG& rng)
     {
         if (_neighbour_sampler.empty(v))
             return v;
         return _neighbour_sampler.sample(v, rng);
     }
 
+    size_t random_neighbour(size_t v, rng_t& rng)
+    {
+        return random_neighbour<rng_t>(v, rng);
+    }
+
     // Computes the move proposal probability
     template <class MEntries>
     double get_move_prob(size_t v, size_t r, size_t s, double c, bool reverse,
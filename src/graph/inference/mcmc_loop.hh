@@ -108,10 +108,9 @@ auto mcmc_sweep_parallel(MCMCState state, RNG& rng_)
 {
     auto& g = state._g;
 
-    vector<std::shared_ptr<RNG>> rngs;
+    parallel_rng<RNG> rngs(rng_);
     std::vector<std::pair<size_t, double>> best_move;
 
-    init_rngs(rngs, rng_);
     init_cache(state._E);
     best_move.resize(num_vertices(g));
 
@@ -135,9 +134,9 @@ auto mcmc_sweep_parallel(MCMCState state, RNG& rng_)
         #pragma omp parallel firstprivate(state)
         parallel_loop_no_spawn
             (vlist,
-             [&](size_t, auto v)
+             [&](size_t i, auto v)
              {
-                 auto& rng = get_rng(rngs, rng_);
+                 auto& rng = rngs.get(i);
 
                  if (state.node_weight(v) == 0)
                      return;
@@ -177,6 +176,7 @@ auto mcmc_sweep_parallel(MCMCState state, RNG& rng_)
                 S += get<0>(ddS);
             }
         }
+        rngs.next_round();
     }
     return make_pair(S, nmoves);
 }
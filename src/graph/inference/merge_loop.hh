@@ -37,10 +37,9 @@ namespace graph_tool
 template <class MergeState, class RNG>
 auto merge_sweep(MergeState state, RNG& rng_)
 {
-    vector<std::shared_ptr<RNG>> rngs;
+    parallel_rng<RNG> rngs(rng_, state._parallel);
     if (state._parallel)
     {
-        init_rngs(rngs, rng_);
         init_cache(state._E);
     }
 
@@ -55,9 +54,9 @@ auto merge_sweep(MergeState state, RNG& rng_)
     #pragma omp parallel firstprivate(state) if (state._parallel)
     parallel_loop_no_spawn
         (state._available,
-         [&](size_t, auto v)
+         [&](size_t i, auto v)
          {
-             auto& rng = get_rng(rngs, rng_);
+             auto& rng = rngs.get(i);
 
              if (state.node_weight(v) == 0)
                  return;
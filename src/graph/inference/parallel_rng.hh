@@ -19,33 +19,134 @@
 #define PARALLEL_RNG_HH
 
 #include <vector>
+#include <memory>
+#include <limits>
+
+#include "random.hh"
+
+#ifdef USING_OPENMP
+#include <omp.h>
+#endif
+
+// Set of random number generators for parallel loops. By default, there is
+// one generator per thread, seeded from the master generator. If
+// get_rng_deterministic() is true, each work item instead draws from a
+// counter-based (Philox) stream keyed on the (round, item) pair, which makes
+// the outcome independent of the number of threads and scheduling.
 
 template <class RNG>
-void init_rngs(std::vector<std::shared_ptr<RNG>>& rngs, RNG& rng)
+class parallel_rng
 {
-    size_t num_threads = 1;
+public:
+    static_assert(RNG::min() == 0 &&
+                  RNG::max() == std::numeric_limits<uint32_t>::max(),
+                  "the generator must produce 32-bit values");
+
+    // Generator of a work item, which forwards to the generator of the
+    // current thread, or yields the Philox stream of the item.
+    class item_rng
+    {
+    public:
+        typedef uint32_t result_type;
+
+        item_rng() : _rng(nullptr) {}
+        item_rng(RNG& rng) : _rng(&rng) {}
+        item_rng(const philox_rng& philox) : _rng(nullptr), _philox(philox) {}
+
+        static constexpr result_type min() { return 0; }
+        static constexpr result_type max()
+        {
+            return std::numeric_limits<result_type>::max();
+        }
+
+        result_type operator()()
+        {
+            if (_rng != nullptr)
+                return (*_rng)();
+            return _philox();
+        }
+
+    private:
+        RNG* _rng;
+        philox_rng _philox;
+    };
+
+    parallel_rng(RNG& rng, bool parallel = true)
+        : _rng(rng), _deterministic(parallel && get_rng_deterministic()),
+          _round(0), _key{{0, 0}}
+    {
+        size_t num_threads = 1;
 #ifdef USING_OPENMP
-    num_threads = omp_get_max_threads();
+        if (parallel)
+            num_threads = omp_get_max_threads();
 #endif
-    for (size_t i = 0; i < num_threads; ++i)
-    {
-        std::array<int, RNG::state_size> seed_data;
-        std::generate_n(seed_data.data(), seed_data.size(), std::ref(rng));
-        std::seed_seq seq(std::begin(seed_data), std::end(seed_data));
-        rngs.push_back(std::make_shared<rng_t>(seq));
+        _items.resize(num_threads);
+
+        if (!parallel)
+            return;
+
+        if (_deterministic)
+        {
+            // the master generator must advance by the same amount
+            // regardless of the number of threads
+            _key[0] = rng();
+            _key[1] = rng();
+            return;
+        }
+
+        for (size_t i = 0; i < num_threads; ++i)
+        {
+            std::array<int, RNG::state_size> seed_data;
+            std::generate_n(seed_data.data(), seed_data.size(), std::ref(rng));
+            std::seed_seq seq(std::begin(seed_data), std::end(seed_data));
+            _rngs.push_back(std::make_shared<RNG>(seq));
+        }
     }
-}
 
-template <class RNG>
-RNG& get_rng(std::vector<std::shared_ptr<RNG>>& rngs, RNG& rng)
-{
-    if (rngs.empty())
+    // generator for a given work item of the current round
+    item_rng& get(size_t item)
+    {
+        size_t tid = 0;
+#ifdef USING_OPENMP
+        tid = omp_get_thread_num();
+#endif
+        auto& rng = _items[tid];
+        if (_deterministic)
+            rng = item_rng(philox_rng(_key, _round, item));
+        else
+            rng = item_rng(get());
         return rng;
-    size_t tid = 0;
+    }
+
+    // generator to be used serially, outside of the parallel sections
+    RNG& get_serial()
+    {
+        if (_deterministic)
+            return _rng;
+        return get();
+    }
+
+    void next_round() { ++_round; }
+
+private:
+    // generator of the current thread
+    RNG& get()
+    {
+        if (_rngs.empty())
+            return _rng;
+        size_t tid = 0;
 #ifdef USING_OPENMP
-    tid = omp_get_thread_num();
+        tid = omp_get_thread_num();
 #endif
-    return *rngs[tid];
+        return *_rngs[tid];
+    }
+
+    RNG& _rng;
+    bool _deterministic;
+    uint32_t _round;
+    std::array<uint32_t, 2> _key;
+    std::vector<std::shared_ptr<RNG>> _rngs;
+    std::vector<item_rng> _items;
 };
 
 #endif // PARALLEL_RNG_HH
@@ -22,3 +22,15 @@ rng_t get_rng(size_t seed)
     std::seed_seq seq{seed, seed + 1, seed + 2, seed + 3, seed + 4};
     return rng_t(seq);
 }
+
+static bool _rng_deterministic = false;
+
+void set_rng_deterministic(bool deterministic)
+{
+    _rng_deterministic = deterministic;
+}
+
+bool get_rng_deterministic()
+{
+    return _rng_deterministic;
+}
@@ -19,9 +19,71 @@
 #define RANDOM_HH
 
 #include <random>
+#include <array>
+#include <cstdint>
+#include <limits>
 
 typedef std::mt19937 rng_t;
 
 rng_t get_rng(size_t seed);
 
+// If enabled, parallel algorithms derive the random streams from the work
+// items being processed instead of the threads, so that the results do not
+// depend on the number of threads or on scheduling.
+void set_rng_deterministic(bool deterministic);
+bool get_rng_deterministic();
+
+// Philox4x32-10 counter-based generator (Salmon et al., SC'11)
+inline std::array<uint32_t, 4> philox4x32(std::array<uint32_t, 4> ctr,
+                                          std::array<uint32_t, 2> key)
+{
+    for (size_t i = 0; i < 10; ++i)
+    {
+        uint64_t p0 = uint64_t(0xD2511F53) * ctr[0];
+        uint64_t p1 = uint64_t(0xCD9E8D57) * ctr[2];
+        ctr = {{uint32_t(p1 >> 32) ^ ctr[1] ^ key[0], uint32_t(p1),
+                uint32_t(p0 >> 32) ^ ctr[3] ^ key[1], uint32_t(p0)}};
+        key[0] += 0x9E3779B9;
+        key[1] += 0xBB67AE85;
+    }
+    return ctr;
+}
+
+// Uniform random bit generator which yields the Philox stream identified by a
+// key and a (round, item) pair. It is cheap to construct, since its state is
+// only the counter and the current block of output.
+class philox_rng
+{
+public:
+    typedef uint32_t result_type;
+
+    philox_rng(std::array<uint32_t, 2> key = {{0, 0}}, uint32_t round = 0,
+               uint64_t item = 0)
+        : _key(key), _ctr{{0, round, uint32_t(item), uint32_t(item >> 32)}},
+          _block{{0, 0, 0, 0}}, _pos(_block.size()) {}
+
+    static constexpr result_type min() { return 0; }
+    static constexpr result_type max()
+    {
+        return std::numeric_limits<result_type>::max();
+    }
+
+    result_type operator()()
+    {
+        if (_pos == _block.size())
+        {
+            _block = philox4x32(_ctr, _key);
+            ++_ctr[0];
+            _pos = 0;
+        }
+        return _block[_pos++];
+    }
+
+private:
+    std::array<uint32_t, 2> _key;
+    std::array<uint32_t, 4> _ctr;
+    std::array<uint32_t, 4> _block;
+    size_t _pos;
+};
+
 #endif
@@ -24,9 +24,12 @@
 #include "graph.hh"
 #include "graph_selectors.hh"
 #include "graph_util.hh"
+#include "graph_parallel_bfs.hh"
 
 #include "coroutine.hh"
 #include "graph_python_interface.hh"
+#include "numpy_bind.hh"
+#include "hash_map_wrap.hh"
 
 using namespace std;
 using namespace boost;
@@ -117,11 +120,170 @@ struct do_bfs
 
 void bfs_search(GraphInterface& g, size_t s, python::object vis)
 {
-    run_action<graph_tool::all_graph_views,mpl::true_>()
+    run_action<graph_tool::all_graph_views_with_frozen, mpl::true_>()
         (g, std::bind(do_bfs(), std::placeholders::_1, s,
                       BFSVisitorWrapper(g, vis)))();
 }
 
+// Level-synchronous BFS from s, done with parallel_bfs() in FIFO order. For
+// each level d, f(d, vs, es) is called with the vertices at distance d from
+// the source, in the order they are discovered, and, if collect_edges is
+// true, the tree edges that reached them, as consecutive (source, target,
+// edge index) triples. The search stops if f returns false.
+template <class Graph, class F>
+void bfs_levels(const Graph& g, size_t s, vector<size_t>& pred,
+                bool collect_edges, F&& f)
+{
+    auto eindex = get(edge_index_t(), g);
+    vector<int32_t> dist;
+    vector<int64_t> es;
+    vector<size_t> runs;
+    parallel_bfs(g, s, dist, pred,
+                 [&](size_t d, auto& vs)
+                 {
+                     es.clear();
+                     if (collect_edges && d > 0)
+                     {
+                         // the children of each parent are contiguous, and
+                         // in the order of its adjacency list, so that it
+                         // needs to be scanned only once
+                         es.resize(3 * vs.size());
+                         runs.clear();
+                         for (size_t i = 0; i < vs.size(); ++i)
+                         {
+                             if (i == 0 || pred[vs[i]] != pred[vs[i - 1]])
+                                 runs.push_back(i);
+                         }
+                         runs.push_back(vs.size());
+
+                         size_t nr = runs.size() - 1;
+                         #pragma omp parallel for default(shared) \
+                             schedule(runtime) if (nr > OPENMP_MIN_THRESH)
+                         for (size_t r = 0; r < nr; ++r)
+                         {
+                             size_t i = runs[r];
+                             size_t u = pred[vs[i]];
+                             for (auto e : out_edges_range(vertex(u, g), g))
+                             {
+                                 if (i == runs[r + 1])
+                                     break;
+                                 if (size_t(target(e, g)) != vs[i])
+                                     continue;
+                                 es[3 * i] = u;
+                                 es[3 * i + 1] = vs[i];
+                                 es[3 * i + 2] = eindex[e];
+                                 ++i;
+                             }
+                         }
+                     }
+                     return f(d, vs, es);
+                 }, true);
+}
+
+python::object bfs_search_native(GraphInterface& gi, size_t s,
+                                 boost::any adist, boost::any apred,
+                                 boost::any atime, size_t max_dist,
+                                 python::object otargets, bool collect_edges)
+{
+    typedef vprop_map_t<int32_t>::type dist_t;
+    typedef vprop_map_t<int64_t>::type pred_t;
+    size_t N = gi.get_num_vertices(false);
+    auto dist = any_cast<dist_t>(adist).get_unchecked(N);
+    auto pred = any_cast<pred_t>(apred).get_unchecked(N);
+    auto time = any_cast<pred_t>(atime).get_unchecked(N);
+
+    auto targets = get_array<int64_t, 1>(otargets);
+    gt_hash_set<size_t> tgts(targets.begin(), targets.end());
+    bool stop_targets = !tgts.empty();
+
+    vector<size_t> counts;
+    vector<int64_t> tree_edges;
+
+    run_action<all_graph_views_with_frozen>()
+        (gi,
+         [&](auto& g)
+         {
+             for (auto v : vertices_range(g))
+             {
+                 dist[v] = numeric_limits<int32_t>::max();
+                 pred[v] = v;
+                 time[v] = -1;
+             }
+
+             int64_t t = 0;
+             auto visit_level = [&](size_t d, auto& vs)
+                 {
+                     counts.push_back(vs.size());
+                     for (auto v : vs)
+                     {
+                         dist[v] = d;
+                         time[v] = t++;
+                         if (stop_targets)
+                             tgts.erase(v);
+                     }
+                     return d < max_dist && !(stop_targets && tgts.empty());
+                 };
+
+             vector<size_t> ppred;
+             bfs_levels(g, s, ppred, collect_edges,
+                        [&](size_t d, auto& vs, auto& es)
+                        {
+                            tree_edges.insert(tree_edges.end(),
+                                              es.begin(), es.end());
+                            return visit_level(d, vs);
+                        });
+             for (auto v : vertices_range(g))
+                 pred[v] = ppred[v];
+         })();
+
+    python::object oedges = wrap_vector_owned(tree_edges);
+    return python::make_tuple(wrap_vector_owned(counts),
+                              oedges.attr("reshape")(-1, 3));
+}
+
+void bfs_search_batch(GraphInterface& gi, size_t s, python::object vis)
+{
+    run_action<all_graph_views_with_frozen>()
+        (gi,
+         [&](auto& g)
+         {
+             vector<size_t> pred;
+             bfs_levels(g, s, pred, true,
+                        [&](size_t d, auto& vs, auto& es)
+                        {
+                            python::object oes = wrap_vector_owned(es);
+                            python::object ret =
+                                vis.attr("frontier")(d, wrap_vector_owned(vs),
+                                                     oes.attr("reshape")(-1, 3));
+                            return (ret == python::object() ||
+                                    python::extract<bool>(ret)());
+                        });
+         })();
+}
+
+python::object bfs_search_levels(GraphInterface& gi, size_t s)
+{
+    vector<vector<size_t>> levels;
+    run_action<all_graph_views_with_frozen>()
+        (gi,
+         [&](auto& g)
+         {
+             vector<int32_t> dist;
+             vector<size_t> pred;
+             parallel_bfs(g, s, dist, pred,
+                          [&](size_t, auto& vs)
+                          {
+                              levels.push_back(vs);
+                              return true;
+                          });
+         })();
+
+    python::list ret;
+    for (auto& vs : levels)
+        ret.append(wrap_vector_owned(vs));
+    return ret;
+}
+
 #ifdef HAVE_BOOST_COROUTINE
 
 class BFSGeneratorVisitor : public bfs_visitor<>
@@ -151,7 +313,7 @@ boost::python::object bfs_search_generator(GraphInterface& g, size_t s)
     auto dispatch = [&](auto& yield)
         {
             BFSGeneratorVisitor vis(g, yield);
-            run_action<graph_tool::all_graph_views,mpl::true_>()
+            run_action<graph_tool::all_graph_views_with_frozen, mpl::true_>()
                 (g, std::bind(do_bfs(), std::placeholders::_1, s, vis))();
         };
     return boost::python::object(CoroGenerator(dispatch));
@@ -164,5 +326,8 @@ void export_bfs()
 {
     using namespace boost::python;
     def("bfs_search", &bfs_search);
+    def("bfs_search_native", &bfs_search_native);
+    def("bfs_search_batch", &bfs_search_batch);
+    def("bfs_search_levels", &bfs_search_levels);
     def("bfs_search_generator", &bfs_search_generator);
 }
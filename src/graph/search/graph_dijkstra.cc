@@ -27,6 +27,8 @@
 
 #include "coroutine.hh"
 #include "graph_python_interface.hh"
+#include "numpy_bind.hh"
+#include "hash_map_wrap.hh"
 
 using namespace std;
 using namespace boost;
@@ -173,7 +175,7 @@ void dijkstra_search(GraphInterface& g, size_t source, boost::any dist_map,
     typedef typename property_map_type::
         apply<int64_t, GraphInterface::vertex_index_map_t>::type pred_t;
     pred_t pred = any_cast<pred_t>(pred_map);
-    run_action<graph_tool::all_graph_views, mpl::true_>()
+    run_action<graph_tool::all_graph_views_with_frozen, mpl::true_>()
         (g, std::bind(do_djk_search(), std::placeholders::_1, source,
                       std::placeholders::_2, pred, weight,
                       DJKVisitorWrapper(g, vis), DJKCmp(cmp), DJKCmb(cmb),
@@ -181,6 +183,121 @@ void dijkstra_search(GraphInterface& g, size_t source, boost::any dist_map,
          writable_vertex_properties())(dist_map);
 }
 
+struct stop_search {};
+
+// Compiled visitor, which records the order in which the vertices are
+// discovered, collects the edges of the final search tree, and stops the
+// search beyond a given distance, or once a set of targets has been reached.
+template <class Graph, class DistMap, class TimeMap>
+class DJKNativeVisitor : public dijkstra_visitor<>
+{
+public:
+    typedef typename graph_traits<Graph>::edge_descriptor edge_t;
+
+    DJKNativeVisitor(DistMap dist, TimeMap time, long double max_dist,
+                     gt_hash_set<size_t>& targets, bool collect_edges,
+                     vector<int64_t>& edges)
+        : _dist(dist), _time(time), _max_dist(max_dist), _targets(targets),
+          _stop_targets(!targets.empty()), _collect_edges(collect_edges),
+          _edges(edges), _t(0) {}
+
+    void discover_vertex(size_t v, const Graph&)
+    {
+        _time[v] = _t++;
+    }
+
+    void edge_relaxed(const edge_t& e, const Graph& g)
+    {
+        if (_collect_edges)
+            _pred_edge[target(e, g)] = e;
+    }
+
+    void examine_vertex(size_t v, const Graph& g)
+    {
+        if (_dist[v] > _max_dist)
+            throw stop_search();
+
+        if (_collect_edges)
+        {
+            auto iter = _pred_edge.find(v);
+            if (iter != _pred_edge.end())
+            {
+                auto& e = iter->second;
+                _edges.push_back(source(e, g));
+                _edges.push_back(v);
+                _edges.push_back(get(edge_index_t(), g)[e]);
+                _pred_edge.erase(iter);
+            }
+        }
+
+        if (_stop_targets)
+        {
+            _targets.erase(v);
+            if (_targets.empty())
+                throw stop_search();
+        }
+    }
+
+private:
+    DistMap _dist;
+    TimeMap _time;
+    long double _max_dist;
+    gt_hash_set<size_t>& _targets;
+    bool _stop_targets;
+    bool _collect_edges;
+    vector<int64_t>& _edges;
+    gt_hash_map<size_t, edge_t> _pred_edge;
+    int64_t _t;
+};
+
+python::object dijkstra_search_native(GraphInterface& gi, size_t source,
+                                      boost::any dist_map, boost::any pred_map,
+                                      boost::any weight, boost::any time_map,
+                                      long double max_dist,
+                                      python::object otargets,
+                                      bool collect_edges)
+{
+    typedef vprop_map_t<int64_t>::type pred_t;
+    size_t N = gi.get_num_vertices(false);
+    auto pred = any_cast<pred_t>(pred_map).get_unchecked(N);
+    auto time = any_cast<pred_t>(time_map).get_unchecked(N);
+
+    auto targets = get_array<int64_t, 1>(otargets);
+    gt_hash_set<size_t> tgts(targets.begin(), targets.end());
+    vector<int64_t> edges;
+
+    run_action<all_graph_views_with_frozen>()
+        (gi,
+         [&](auto& g, auto dist, auto w)
+         {
+             typedef typename std::remove_reference<decltype(g)>::type g_t;
+             typedef typename property_traits<decltype(dist)>::value_type
+                 dtype_t;
+             dtype_t inf = std::is_floating_point<dtype_t>::value ?
+                 numeric_limits<dtype_t>::infinity() :
+                 numeric_limits<dtype_t>::max();
+
+             for (auto v : vertices_range(g))
+                 time[v] = -1;
+
+             DJKNativeVisitor<g_t, decltype(dist), decltype(time)>
+                 vis(dist, time, max_dist, tgts, collect_edges, edges);
+             try
+             {
+                 dijkstra_shortest_paths_no_color_map
+                     (g, vertex(source, g), visitor(vis).weight_map(w).
+                      predecessor_map(pred).distance_map(dist).
+                      distance_inf(inf).distance_zero(dtype_t(0)));
+             }
+             catch (stop_search&) {}
+         },
+         writable_vertex_scalar_properties(),
+         edge_scalar_properties())(dist_map, weight);
+
+    python::object oedges = wrap_vector_owned(edges);
+    return oedges.attr("reshape")(-1, 3);
+}
+
 #ifdef HAVE_BOOST_COROUTINE
 
 class DJKGeneratorVisitor : public dijkstra_visitor<>
@@ -217,7 +334,7 @@ boost::python::object dijkstra_search_generator(GraphInterface& g,
     auto dispatch = [&](auto& yield)
         {
             DJKGeneratorVisitor vis(g, yield);
-            run_action<graph_tool::all_graph_views, mpl::true_>()
+            run_action<graph_tool::all_graph_views_with_frozen, mpl::true_>()
             (g, std::bind(do_djk_search(), std::placeholders::_1, source,
                           std::placeholders::_2, dummy_property_map(), weight,
                           vis, DJKCmp(cmp), DJKCmb(cmb),
@@ -240,7 +357,7 @@ boost::python::object dijkstra_search_generator_fast(GraphInterface& g,
     auto dispatch = [&](auto& yield)
         {
             DJKGeneratorVisitor vis(g, yield);
-            run_action<graph_tool::all_graph_views, mpl::true_>()
+            run_action<graph_tool::all_graph_views_with_frozen, mpl::true_>()
             (g, std::bind(do_djk_search_fast(), std::placeholders::_1, source,
                           std::placeholders::_2, std::placeholders::_3,
                           vis, make_pair(zero, inf)),
@@ -257,6 +374,7 @@ void export_dijkstra()
 {
     using namespace boost::python;
     def("dijkstra_search", &dijkstra_search);
+    def("dijkstra_search_native", &dijkstra_search_native);
     def("dijkstra_generator", &dijkstra_search_generator);
     def("dijkstra_generator_fast", &dijkstra_search_generator_fast);
 }
@@ -84,6 +84,19 @@ struct get_sampled_distance_histogram
             sources.push_back(v);
         n_samples = min(n_samples, sources.size());
 
+        // the sources are sampled beforehand, so that the result does not
+        // depend on the number of threads
+        vector<vertex_t> samples;
+        samples.reserve(n_samples);
+        for (size_t i = 0; i < n_samples; ++i)
+        {
+            uniform_int_distribution<size_t> randint(0, sources.size()-1);
+            size_t j = randint(rng);
+            samples.push_back(sources[j]);
+            swap(sources[j], sources.back());
+            sources.pop_back();
+        }
+
         typename hist_t::point_t point;
         get_vertex_dists_t get_vertex_dists;
 
@@ -92,15 +105,7 @@ struct get_sampled_distance_histogram
             if (num_vertices(g) * n_samples > OPENMP_MIN_THRESH)
         for (size_t i = 0; i < n_samples; ++i)
         {
-            vertex_t v;
-            #pragma omp critical
-            {
-                uniform_int_distribution<size_t> randint(0, sources.size()-1);
-                size_t j = randint(rng);
-                v = sources[j];
-                swap(sources[j], sources.back());
-                sources.pop_back();
-            }
+            vertex_t v = samples[i];
 
             unchecked_vector_property_map<val_type,VertexIndex>
                 dist_map(vertex_index, num_vertices(g));
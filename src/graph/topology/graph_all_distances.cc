@@ -133,7 +133,7 @@ void get_all_dists(GraphInterface& gi, boost::any dist_map, boost::any weight,
 {
     if (weight.empty())
     {
-        run_action<>()
+        run_action<all_graph_views_with_frozen>()
             (gi, std::bind(do_all_pairs_search_unweighted(),
                            std::placeholders::_1, std::placeholders::_2),
              vertex_scalar_vector_properties())
@@ -141,7 +141,7 @@ void get_all_dists(GraphInterface& gi, boost::any dist_map, boost::any weight,
     }
     else
     {
-        run_action<>()
+        run_action<all_graph_views_with_frozen>()
             (gi, std::bind(do_all_pairs_search(), std::placeholders::_1,
                            gi.get_vertex_index(), std::placeholders::_2,
                            std::placeholders::_3, dense),
@@ -33,7 +33,7 @@ using namespace graph_tool;
 python::object do_label_components(GraphInterface& gi, boost::any prop)
 {
     vector<size_t> hist;
-    run_action<graph_tool::all_graph_views,mpl::true_>()
+    run_action<graph_tool::all_graph_views_with_frozen, mpl::true_>()
         (gi, std::bind(label_components(), std::placeholders::_1,
                        std::placeholders::_2, std::ref(hist)),
          writable_vertex_scalar_properties())(prop);
@@ -45,7 +45,7 @@ do_label_biconnected_components(GraphInterface& gi, boost::any comp,
                                 boost::any art)
 {
     vector<size_t> hist;
-    run_action<graph_tool::detail::never_directed>()
+    run_action<graph_tool::never_directed_with_frozen>()
         (gi, std::bind(label_biconnected_components(), std::placeholders::_1,
                        std::placeholders::_2, std::placeholders::_3,
                        std::ref(hist)),
@@ -57,7 +57,7 @@ do_label_biconnected_components(GraphInterface& gi, boost::any comp,
 
 void do_label_out_component(GraphInterface& gi, size_t root, boost::any prop)
 {
-    run_action<graph_tool::all_graph_views,mpl::true_>()
+    run_action<graph_tool::all_graph_views_with_frozen, mpl::true_>()
         (gi, std::bind(label_out_component(), std::placeholders::_1, std::placeholders::_2, root),
          writable_vertex_scalar_properties())(prop);
 }
@@ -67,7 +67,7 @@ void do_label_attractors(GraphInterface& gi, boost::any cprop, python::object oa
 
     multi_array_ref<bool,1> avec = get_array<bool,1>(oavec);
 
-    run_action<>()(gi, std::bind(label_attractors(), std::placeholders::_1,
+    run_action<all_graph_views_with_frozen>()(gi, std::bind(label_attractors(), std::placeholders::_1,
                                  std::placeholders::_2, avec),
                    vertex_scalar_properties())(cprop);
 }
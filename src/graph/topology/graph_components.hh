@@ -22,6 +22,8 @@
 #include <boost/graph/strong_components.hpp>
 #include <boost/graph/biconnected_components.hpp>
 
+#include "graph_parallel_bfs.hh"
+
 namespace graph_tool
 {
 template <class PropertyMap>
@@ -164,27 +166,18 @@ struct label_biconnected_components
 
 struct label_out_component
 {
-    template <class CompMap>
-    class marker_visitor: public bfs_visitor<>
-    {
-    public:
-        marker_visitor() { }
-        marker_visitor(CompMap comp) : _comp(comp) { }
-
-        template <class Vertex, class Graph>
-        void discover_vertex(Vertex u, const Graph&)
-        {
-            _comp[u] = true;
-        }
-    private:
-        CompMap _comp;
-    };
-
     template <class Graph, class CompMap>
     void operator()(Graph& g, CompMap comp_map, size_t root) const
     {
-        marker_visitor<CompMap> marker(comp_map);
-        breadth_first_search(g, vertex(root, g), visitor(marker));
+        vector<int32_t> dist;
+        vector<size_t> pred;
+        parallel_bfs(g, root, dist, pred,
+                     [&](size_t, const vector<size_t>& vs)
+                     {
+                         for (auto v : vs)
+                             comp_map[v] = true;
+                         return true;
+                     });
     }
 };
 
@@ -0,0 +1,139 @@
+// graph-tool -- a general graph modification and manipulation thingy
+//
+// Copyright (C) 2006-2017 Tiago de Paula Peixoto <tiago@skewed.de>
+//
+// This program is free software; you can redistribute it and/or
+// modify it under the terms of the GNU General Public License
+// as published by the Free Software Foundation; either version 3
+// of the License, or (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+#include "graph.hh"
+#include "graph_filtering.hh"
+#include "graph_properties.hh"
+#include "graph_selectors.hh"
+#include "graph_util.hh"
+#include "numpy_bind.hh"
+
+#include "graph_contraction_hierarchy.hh"
+
+#include <boost/python.hpp>
+
+using namespace std;
+using namespace boost;
+using namespace graph_tool;
+
+typedef multi_array_ref<int64_t, 1> iarray_t;
+typedef multi_array_ref<double, 1> darray_t;
+typedef ch_view<iarray_t, darray_t> ch_view_t;
+
+python::object build_contraction_hierarchy(GraphInterface& gi,
+                                           boost::any weight,
+                                           size_t max_settled)
+{
+    ch_arcs arcs;
+    run_action<>()
+        (gi,
+         [&](auto& g, auto w)
+         {
+             build_ch(g, w, arcs, max_settled);
+         },
+         edge_scalar_properties())(weight);
+
+    python::dict state;
+    state["rank"] = wrap_vector_owned(arcs.rank);
+    state["source"] = wrap_vector_owned(arcs.source);
+    state["target"] = wrap_vector_owned(arcs.target);
+    state["weight"] = wrap_vector_owned(arcs.weight);
+    state["child0"] = wrap_vector_owned(arcs.child0);
+    state["child1"] = wrap_vector_owned(arcs.child1);
+    state["eidx"] = wrap_vector_owned(arcs.eidx);
+    state["fptr"] = wrap_vector_owned(arcs.fptr);
+    state["fidx"] = wrap_vector_owned(arcs.fidx);
+    state["bptr"] = wrap_vector_owned(arcs.bptr);
+    state["bidx"] = wrap_vector_owned(arcs.bidx);
+    return state;
+}
+
+ch_view_t get_ch_view(python::dict state)
+{
+    auto get = [&](const char* k)
+        {
+            return get_array<int64_t, 1>(state[k]);
+        };
+    return ch_view_t{get("source"), get("target"), get("child0"),
+                     get("child1"), get("eidx"), get("fptr"), get("fidx"),
+                     get("bptr"), get("bidx"),
+                     get_array<double, 1>(state["weight"])};
+}
+
+double ch_dist(python::dict state, size_t s, size_t t)
+{
+    auto ch = get_ch_view(state);
+    return ch_query(ch, s, t);
+}
+
+python::object ch_path(python::dict state, size_t s, size_t t)
+{
+    auto ch = get_ch_view(state);
+    vector<size_t> vpath, epath;
+    double d = ch_query(ch, s, t, &vpath, &epath);
+    if (std::isinf(d))
+        return python::object();
+    return python::make_tuple(wrap_vector_owned(vpath),
+                              wrap_vector_owned(epath));
+}
+
+void ch_dist_matrix(python::dict state, python::object osources,
+                    python::object otargets, python::object odist)
+{
+    auto ch = get_ch_view(state);
+    auto sources = get_array<int64_t, 1>(osources);
+    auto targets = get_array<int64_t, 1>(otargets);
+    auto dist = get_array<double, 2>(odist);
+
+    // backward searches from each target, which leave their distances in
+    // buckets at each visited vertex
+    vector<vector<pair<size_t, double>>> buckets(ch.num_vertices());
+    auto& search = get_ch_search(0);
+    for (size_t j = 0; j < targets.size(); ++j)
+    {
+        ch_upward_search(ch, targets[j], true, search,
+                         [&](size_t v, double d)
+                         {
+                             buckets[v].emplace_back(j, d);
+                         });
+    }
+
+    // forward searches from each source, which scan the buckets
+    size_t N = sources.size();
+    #pragma omp parallel for default(shared) schedule(runtime) if (N > 1)
+    for (size_t i = 0; i < N; ++i)
+    {
+        auto& search = get_ch_search(0);
+        ch_upward_search(ch, sources[i], false, search,
+                         [&](size_t v, double d)
+                         {
+                             for (auto& jd : buckets[v])
+                             {
+                                 auto& x = dist[i][jd.first];
+                                 x = std::min(x, d + jd.second);
+                             }
+                         });
+    }
+}
+
+void export_contraction_hierarchy()
+{
+    python::def("build_contraction_hierarchy", &build_contraction_hierarchy);
+    python::def("ch_dist", &ch_dist);
+    python::def("ch_path", &ch_path);
+    python::def("ch_dist_matrix", &ch_dist_matrix);
+};
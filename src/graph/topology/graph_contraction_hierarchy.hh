@@ -0,0 +1,531 @@
+// graph-tool -- a general graph modification and manipulation thingy
+//
+// Copyright (C) 2006-2017 Tiago de Paula Peixoto <tiago@skewed.de>
+//
+// This program is free software; you can redistribute it and/or
+// modify it under the terms of the GNU General Public License
+// as published by the Free Software Foundation; either version 3
+// of the License, or (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+#ifndef GRAPH_CONTRACTION_HIERARCHY_HH
+#define GRAPH_CONTRACTION_HIERARCHY_HH
+
+#include <queue>
+#include <limits>
+
+#include "hash_map_wrap.hh"
+
+namespace graph_tool
+{
+using namespace std;
+using namespace boost;
+
+// The hierarchy is stored as a flat list of arcs (original edges and
+// shortcuts), together with two CSR adjacency lists: "forward" contains, for
+// each vertex, the arcs leading to vertices of higher rank, and "backward"
+// contains, for each vertex, the arcs arriving from vertices of higher
+// rank. Shortcuts point to the two arcs they replace, and original arcs point
+// to the edge index they correspond to.
+struct ch_arcs
+{
+    vector<int64_t> rank;
+    vector<int64_t> source, target, child0, child1, eidx;
+    vector<double> weight;
+    vector<int64_t> fptr, fidx, bptr, bidx;
+};
+
+// Dijkstra search in the remaining graph, from u, avoiding vertex v, used to
+// decide if a shortcut is necessary.
+class ch_witness
+{
+public:
+    ch_witness(size_t N)
+        : _dist(N, numeric_limits<double>::infinity()) {}
+
+    template <class Arcs>
+    void search(size_t u, size_t v, double max_d, size_t max_settled,
+                const Arcs& arcs, const vector<vector<size_t>>& out,
+                const vector<bool>& alive, const vector<bool>& contracted)
+    {
+        for (auto w : _touched)
+            _dist[w] = numeric_limits<double>::infinity();
+        _touched.clear();
+
+        typedef pair<double, size_t> item_t;
+        priority_queue<item_t, vector<item_t>, greater<item_t>> queue;
+        _dist[u] = 0;
+        _touched.push_back(u);
+        queue.emplace(0, u);
+        size_t settled = 0;
+        while (!queue.empty())
+        {
+            auto d = queue.top().first;
+            auto w = queue.top().second;
+            queue.pop();
+            if (d > _dist[w])
+                continue;
+            if (d > max_d || settled++ >= max_settled)
+                break;
+            for (auto a : out[w])
+            {
+                size_t x = arcs.target[a];
+                if (!alive[a] || x == v || contracted[x])
+                    continue;
+                double nd = d + arcs.weight[a];
+                if (nd < _dist[x])
+                {
+                    if (std::isinf(_dist[x]))
+                        _touched.push_back(x);
+                    _dist[x] = nd;
+                    queue.emplace(nd, x);
+                }
+            }
+        }
+    }
+
+    double operator[](size_t v) const { return _dist[v]; }
+
+private:
+    vector<double> _dist;
+    vector<size_t> _touched;
+};
+
+// Contracts the vertices of the graph one by one, in the order given by a
+// lazily updated edge-difference heuristic, inserting shortcuts whenever the
+// contracted vertex lies on the only shortest path between two of its
+// neighbours.
+template <class Graph, class Weight>
+void build_ch(const Graph& g, Weight w, ch_arcs& arcs,
+              size_t max_settled = 500)
+{
+    size_t N = num_vertices(g);
+
+    vector<vector<size_t>> out(N), in(N);
+    vector<bool> alive;
+
+    auto add_arc = [&](size_t u, size_t v, double x, int64_t c0, int64_t c1,
+                       int64_t e)
+        {
+            size_t a = arcs.source.size();
+            arcs.source.push_back(u);
+            arcs.target.push_back(v);
+            arcs.weight.push_back(x);
+            arcs.child0.push_back(c0);
+            arcs.child1.push_back(c1);
+            arcs.eidx.push_back(e);
+            alive.push_back(true);
+            out[u].push_back(a);
+            in[v].push_back(a);
+            return a;
+        };
+
+    // keep only the lightest of parallel edges
+    gt_hash_map<pair<size_t, size_t>, size_t> arc_map;
+    auto add_edge_arc = [&](size_t u, size_t v, double x, int64_t e)
+        {
+            auto iter = arc_map.find({u, v});
+            if (iter != arc_map.end())
+            {
+                auto a = iter->second;
+                if (arcs.weight[a] > x)
+                {
+                    arcs.weight[a] = x;
+                    arcs.eidx[a] = e;
+                }
+                return;
+            }
+            arc_map[{u, v}] = add_arc(u, v, x, -1, -1, e);
+        };
+
+    auto eindex = get(edge_index_t(), g);
+    for (auto e : edges_range(g))
+    {
+        size_t u = source(e, g);
+        size_t v = target(e, g);
+        double x = get(w, e);
+        if (x < 0)
+            throw ValueException("Contraction hierarchies require "
+                                 "non-negative edge weights.");
+        if (u == v)
+            continue;
+        int64_t ei = eindex[e];
+        add_edge_arc(u, v, x, ei);
+        if (!is_directed::apply<Graph>::type::value)
+            add_edge_arc(v, u, x, ei);
+    }
+    arc_map.clear();
+
+    vector<bool> contracted(N, false);
+    vector<size_t> deleted(N, 0);
+    ch_witness witness(N);
+
+    auto prune = [&](vector<size_t>& as, vector<int64_t>& end)
+        {
+            auto iter = std::remove_if(as.begin(), as.end(),
+                                       [&](size_t a)
+                                       {
+                                           return (!alive[a] ||
+                                                   contracted[end[a]]);
+                                       });
+            as.erase(iter, as.end());
+        };
+
+    // Returns the number of shortcuts necessary to contract v; if apply is
+    // true, they are also inserted.
+    auto contract = [&](size_t v, bool apply)
+        {
+            prune(in[v], arcs.source);
+            prune(out[v], arcs.target);
+
+            double max_out = 0;
+            for (auto b : out[v])
+                max_out = std::max(max_out, arcs.weight[b]);
+
+            size_t n_shortcuts = 0;
+            for (auto a : in[v])
+            {
+                size_t u = arcs.source[a];
+                witness.search(u, v, arcs.weight[a] + max_out,
+                               apply ? max_settled : max_settled / 10,
+                               arcs, out, alive, contracted);
+                for (auto b : out[v])
+                {
+                    size_t x = arcs.target[b];
+                    if (x == u)
+                        continue;
+                    double d = arcs.weight[a] + arcs.weight[b];
+                    if (witness[x] <= d)
+                        continue;
+                    n_shortcuts++;
+                    if (!apply)
+                        continue;
+                    for (auto c : out[u])
+                    {
+                        if (alive[c] && size_t(arcs.target[c]) == x &&
+                            arcs.weight[c] > d)
+                            alive[c] = false;
+                    }
+                    add_arc(u, x, d, a, b, -1);
+                    prune(out[u], arcs.target);
+                    prune(in[x], arcs.source);
+                }
+            }
+            return n_shortcuts;
+        };
+
+    // edge difference, plus terms that favour a uniform contraction across
+    // the graph, and a shallow hierarchy
+    vector<size_t> level(N, 0);
+    auto priority = [&](size_t v)
+        {
+            int64_t ed = int64_t(contract(v, false)) -
+                int64_t(in[v].size() + out[v].size());
+            return 2 * ed + int64_t(deleted[v]) + int64_t(level[v]);
+        };
+
+    typedef pair<int64_t, size_t> item_t;
+    priority_queue<item_t, vector<item_t>, greater<item_t>> queue;
+    vector<int64_t> prio(N);
+    for (auto v : vertices_range(g))
+    {
+        prio[v] = priority(v);
+        queue.emplace(prio[v], v);
+    }
+
+    arcs.rank.clear();
+    arcs.rank.resize(N, -1);
+    int64_t r = 0;
+    vector<size_t> ns;
+    while (!queue.empty())
+    {
+        auto p = queue.top().first;
+        size_t v = queue.top().second;
+        queue.pop();
+        if (contracted[v] || p != prio[v])
+            continue;
+
+        contract(v, true);
+        contracted[v] = true;
+        arcs.rank[v] = r++;
+
+        ns.clear();
+        for (auto a : in[v])
+            ns.push_back(arcs.source[a]);
+        for (auto a : out[v])
+            ns.push_back(arcs.target[a]);
+        std::sort(ns.begin(), ns.end());
+        ns.erase(std::unique(ns.begin(), ns.end()), ns.end());
+        for (auto u : ns)
+        {
+            prune(in[u], arcs.source);
+            prune(out[u], arcs.target);
+            deleted[u]++;
+            level[u] = std::max(level[u], level[v] + 1);
+        }
+        for (auto u : ns)
+        {
+            auto np = priority(u);
+            if (np != prio[u])
+            {
+                prio[u] = np;
+                queue.emplace(np, u);
+            }
+        }
+    }
+
+    // upward adjacency lists
+    vector<vector<size_t>> fwd(N), bwd(N);
+    for (size_t a = 0; a < arcs.source.size(); ++a)
+    {
+        if (!alive[a])
+            continue;
+        size_t u = arcs.source[a];
+        size_t v = arcs.target[a];
+        if (arcs.rank[u] < arcs.rank[v])
+            fwd[u].push_back(a);
+        else
+            bwd[v].push_back(a);
+    }
+
+    auto to_csr = [&](auto& adj, auto& ptr, auto& idx)
+        {
+            ptr.clear();
+            idx.clear();
+            ptr.push_back(0);
+            for (auto& as : adj)
+            {
+                idx.insert(idx.end(), as.begin(), as.end());
+                ptr.push_back(idx.size());
+            }
+        };
+    to_csr(fwd, arcs.fptr, arcs.fidx);
+    to_csr(bwd, arcs.bptr, arcs.bidx);
+}
+
+// Read-only view of a hierarchy, as stored in numpy arrays.
+template <class IArray, class DArray>
+struct ch_view
+{
+    IArray source, target, child0, child1, eidx, fptr, fidx, bptr, bidx;
+    DArray weight;
+
+    size_t num_vertices() const { return fptr.size() - 1; }
+
+    // Calls f(a, u) for all upward arcs a of v, with u being the other
+    // endpoint.
+    template <class F>
+    void upward(size_t v, bool backward, F&& f) const
+    {
+        if (!backward)
+        {
+            for (int64_t i = fptr[v]; i < fptr[v + 1]; ++i)
+                f(fidx[i], target[fidx[i]]);
+        }
+        else
+        {
+            for (int64_t i = bptr[v]; i < bptr[v + 1]; ++i)
+                f(bidx[i], source[bidx[i]]);
+        }
+    }
+
+    // Appends the original edges and vertices that the arc a replaces.
+    void unpack(size_t a, vector<size_t>& vpath, vector<size_t>& epath) const
+    {
+        vector<size_t> stack = {a};
+        while (!stack.empty())
+        {
+            a = stack.back();
+            stack.pop_back();
+            if (child0[a] < 0)
+            {
+                epath.push_back(eidx[a]);
+                vpath.push_back(target[a]);
+            }
+            else
+            {
+                stack.push_back(child1[a]);
+                stack.push_back(child0[a]);
+            }
+        }
+    }
+};
+
+// Dense per-thread search state, which is reset in time proportional to the
+// number of vertices touched, not the size of the graph.
+struct ch_search
+{
+    vector<double> dist;
+    vector<int64_t> pred;
+    vector<size_t> touched;
+
+    void reset(size_t N)
+    {
+        if (dist.size() != N)
+        {
+            dist.clear();
+            dist.resize(N, numeric_limits<double>::infinity());
+            pred.clear();
+            pred.resize(N, -1);
+            touched.clear();
+        }
+        for (auto v : touched)
+        {
+            dist[v] = numeric_limits<double>::infinity();
+            pred[v] = -1;
+        }
+        touched.clear();
+    }
+
+    void set(size_t v, double d, int64_t a)
+    {
+        if (std::isinf(dist[v]))
+            touched.push_back(v);
+        dist[v] = d;
+        pred[v] = a;
+    }
+};
+
+inline ch_search& get_ch_search(size_t i)
+{
+    thread_local ch_search search[2];
+    return search[i];
+}
+
+// Upward search from s, visiting all reachable vertices, and calling
+// f(v, d) for every settled vertex v.
+template <class View, class F>
+void ch_upward_search(const View& ch, size_t s, bool backward,
+                      ch_search& search, F&& f)
+{
+    search.reset(ch.num_vertices());
+    typedef pair<double, size_t> item_t;
+    priority_queue<item_t, vector<item_t>, greater<item_t>> queue;
+    search.set(s, 0, -1);
+    queue.emplace(0, s);
+    while (!queue.empty())
+    {
+        auto d = queue.top().first;
+        auto v = queue.top().second;
+        queue.pop();
+        if (d > search.dist[v])
+            continue;
+        f(v, d);
+        ch.upward(v, backward,
+                  [&](size_t a, size_t u)
+                  {
+                      double nd = d + ch.weight[a];
+                      if (nd < search.dist[u])
+                      {
+                          search.set(u, nd, a);
+                          queue.emplace(nd, u);
+                      }
+                  });
+    }
+}
+
+// Bidirectional upward search between s and t. Returns the distance, and
+// optionally the path.
+template <class View>
+double ch_query(const View& ch, size_t s, size_t t,
+                vector<size_t>* vpath = nullptr,
+                vector<size_t>* epath = nullptr)
+{
+    size_t N = ch.num_vertices();
+    ch_search* search[2] = {&get_ch_search(0), &get_ch_search(1)};
+    search[0]->reset(N);
+    search[1]->reset(N);
+
+    typedef pair<double, size_t> item_t;
+    typedef priority_queue<item_t, vector<item_t>, greater<item_t>> queue_t;
+    queue_t queue[2];
+
+    double mu = numeric_limits<double>::infinity();
+    size_t meet = N;
+
+    search[0]->set(s, 0, -1);
+    search[1]->set(t, 0, -1);
+    queue[0].emplace(0, s);
+    queue[1].emplace(0, t);
+
+    size_t side = 0;
+    while (true)
+    {
+        for (size_t i = 0; i < 2; ++i)
+        {
+            while (!queue[i].empty() && queue[i].top().first >= mu)
+                queue[i].pop();
+        }
+        if (queue[0].empty() && queue[1].empty())
+            break;
+        if (queue[side].empty())
+            side = 1 - side;
+
+        auto& q = queue[side];
+        auto& S = *search[side];
+        auto& O = *search[1 - side];
+        auto d = q.top().first;
+        auto v = q.top().second;
+        q.pop();
+        if (d > S.dist[v])
+            continue;
+
+        if (d + O.dist[v] < mu)
+        {
+            mu = d + O.dist[v];
+            meet = v;
+        }
+
+        // stall-on-demand: v cannot be on a shortest path if it can be
+        // reached more cheaply via a higher-ranked vertex
+        bool stalled = false;
+        ch.upward(v, side == 0,
+                  [&](size_t a, size_t u)
+                  {
+                      if (S.dist[u] + ch.weight[a] < d)
+                          stalled = true;
+                  });
+        if (stalled)
+        {
+            side = 1 - side;
+            continue;
+        }
+
+        ch.upward(v, side == 1,
+                  [&](size_t a, size_t u)
+                  {
+                      double nd = d + ch.weight[a];
+                      if (nd < S.dist[u])
+                      {
+                          S.set(u, nd, a);
+                          q.emplace(nd, u);
+                      }
+                  });
+        side = 1 - side;
+    }
+
+    // as in shortest_path(), the path from a vertex to itself is empty
+    if (vpath == nullptr || meet == N || s == t)
+        return mu;
+
+    vector<size_t> fwd;
+    for (size_t v = meet; v != s; v = ch.source[search[0]->pred[v]])
+        fwd.push_back(search[0]->pred[v]);
+    vpath->push_back(s);
+    for (auto iter = fwd.rbegin(); iter != fwd.rend(); ++iter)
+        ch.unpack(*iter, *vpath, *epath);
+    for (size_t v = meet; v != t; v = ch.target[search[1]->pred[v]])
+        ch.unpack(search[1]->pred[v], *vpath, *epath);
+    return mu;
+}
+
+} // graph_tool namespace
+
+#endif // GRAPH_CONTRACTION_HIERARCHY_HH
@@ -19,8 +19,8 @@
 #include "graph_filtering.hh"
 #include "graph_properties.hh"
 #include "graph_selectors.hh"
+#include "graph_parallel_bfs.hh"
 
-#include <boost/graph/breadth_first_search.hpp>
 #include <boost/graph/dijkstra_shortest_paths.hpp>
 
 #include <boost/python.hpp>
@@ -29,39 +29,6 @@ using namespace std;
 using namespace boost;
 using namespace graph_tool;
 
-template <class DistMap>
-class bfs_diam_visitor:
-    public boost::bfs_visitor<null_visitor>
-{
-public:
-    bfs_diam_visitor(DistMap dist_map, size_t& v)
-        : _dist_map(dist_map), _v(v), _dist(0), _max_dist(0),
-          _min_k(numeric_limits<size_t>::max()) {}
-
-    template <class Graph>
-    void tree_edge(typename graph_traits<Graph>::edge_descriptor e,
-                   Graph& g)
-    {
-        typename graph_traits<Graph>::vertex_descriptor v = target(e,g);
-        size_t dist = _dist_map[source(e,g)] + 1;
-        if ((dist > _max_dist) ||
-            (dist == _max_dist && total_degreeS()(v, g) <= _min_k))
-        {
-            _max_dist = dist;
-            _min_k = total_degreeS()(v, g);
-            _v = v;
-        }
-        _dist_map[v] = dist;
-    }
-
-private:
-    DistMap _dist_map;
-    size_t& _v;
-    size_t _dist;
-    size_t _max_dist;
-    size_t _min_k;
-};
-
 template <class DistMap>
 class djk_diam_visitor:
     public boost::dijkstra_visitor<null_visitor>
@@ -97,28 +64,31 @@ private:
 struct do_bfs_search
 {
     template <class Graph, class VertexIndexMap>
-    void operator()(const Graph& g, size_t source, VertexIndexMap vertex_index,
+    void operator()(const Graph& g, size_t source, VertexIndexMap,
                     size_t& target, long double& max_dist) const
     {
-        typedef unchecked_vector_property_map<size_t, VertexIndexMap> dist_map_t;
-        dist_map_t dist_map(vertex_index, num_vertices(g));
-        parallel_vertex_loop
-                (g,
-                 [&](auto v)
-                 {
-                     dist_map[v] = numeric_limits<size_t>::max();
-                 });
-        dist_map[vertex(source,g)] = 0;
-
-        unchecked_vector_property_map<boost::default_color_type, VertexIndexMap>
-            color_map(vertex_index, num_vertices(g));
+        // the farthest vertex with the smallest degree is chosen, with ties
+        // broken by the one discovered last in a FIFO search
+        vector<int32_t> dist;
+        vector<size_t> pred;
         target = source;
-        breadth_first_search(g, vertex(source, g),
-                             visitor(bfs_diam_visitor<dist_map_t>
-                                      (dist_map, std::ref(target))).
-                             vertex_index_map(vertex_index).
-                             color_map(color_map));
-        max_dist = dist_map[vertex(target, g)];
+        max_dist = 0;
+        parallel_bfs(g, source, dist, pred,
+                     [&](size_t d, const vector<size_t>& vs)
+                     {
+                         size_t min_k = numeric_limits<size_t>::max();
+                         for (auto v : vs)
+                         {
+                             size_t k = total_degreeS()(vertex(v, g), g);
+                             if (k <= min_k)
+                             {
+                                 min_k = k;
+                                 target = v;
+                             }
+                         }
+                         max_dist = d;
+                         return true;
+                     }, true);
     }
 };
 
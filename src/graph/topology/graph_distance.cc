@@ -24,11 +24,12 @@
 #include "hash_map_wrap.hh"
 #include "coroutine.hh"
 #include "graph_python_interface.hh"
+#include "graph_parallel_bfs.hh"
 
-#include <boost/graph/breadth_first_search.hpp>
 #include <boost/graph/dijkstra_shortest_paths_no_color_map.hpp>
 #include <boost/graph/bellman_ford_shortest_paths.hpp>
 #include <boost/python/stl_iterator.hpp>
+#include <queue>
 #include <boost/python.hpp>
 
 using namespace std;
@@ -37,130 +38,6 @@ using namespace graph_tool;
 
 struct stop_search {};
 
-template <class DistMap, class PredMap>
-class bfs_max_visitor:
-    public boost::bfs_visitor<null_visitor>
-{
-public:
-    bfs_max_visitor(DistMap dist_map, PredMap pred, size_t max_dist,
-                    size_t source, size_t target)
-        : _dist_map(dist_map), _pred(pred), _max_dist(max_dist),
-          _source(source), _target(target), _dist(0) {}
-
-    template <class Graph>
-    void initialize_vertex(typename graph_traits<Graph>::vertex_descriptor v,
-                           Graph&)
-    {
-        typedef typename property_traits<DistMap>::value_type dist_t;
-        dist_t inf = std::is_floating_point<dist_t>::value ?
-            numeric_limits<dist_t>::infinity() :
-            numeric_limits<dist_t>::max();
-        _dist_map[v] = (v == _source) ? 0 : inf;
-        _pred[v] = v;
-    }
-
-    template <class Graph>
-    void tree_edge(typename graph_traits<Graph>::edge_descriptor e,
-                   Graph& g)
-    {
-        _pred[target(e,g)] = source(e,g);
-    }
-
-    template <class Graph>
-    void examine_vertex(typename graph_traits<Graph>::vertex_descriptor v,
-                        Graph&)
-    {
-        typedef typename property_traits<DistMap>::value_type val_t;
-        if ( _dist_map[v] > val_t(_max_dist))
-            throw stop_search();
-    }
-
-    template <class Graph>
-    void discover_vertex(typename graph_traits<Graph>::vertex_descriptor v,
-                         Graph&)
-    {
-        if (size_t(_pred[v]) == v)
-            return;
-        _dist_map[v] = _dist_map[_pred[v]] + 1;
-        if (v == _target)
-            throw stop_search();
-    }
-
-private:
-    DistMap _dist_map;
-    PredMap _pred;
-    size_t _max_dist;
-    size_t _source;
-    size_t _target;
-    size_t _dist;
-};
-
-template <class DistMap, class PredMap>
-class bfs_max_multiple_targets_visitor:
-    public boost::bfs_visitor<null_visitor>
-{
-public:
-    bfs_max_multiple_targets_visitor(DistMap dist_map, PredMap pred,
-                                     size_t max_dist, size_t source,
-                                     gt_hash_set<std::size_t> target)
-        : _dist_map(dist_map), _pred(pred), _max_dist(max_dist),
-          _source(source), _target(target), _dist(0) {}
-
-    template <class Graph>
-    void initialize_vertex(typename graph_traits<Graph>::vertex_descriptor v,
-                           Graph&)
-    {
-        typedef typename property_traits<DistMap>::value_type dist_t;
-        dist_t inf = std::is_floating_point<dist_t>::value ?
-            numeric_limits<dist_t>::infinity() :
-            numeric_limits<dist_t>::max();
-        _dist_map[v] = (v == _source) ? 0 : inf;
-        _pred[v] = v;
-    }
-
-    template <class Graph>
-    void tree_edge(typename graph_traits<Graph>::edge_descriptor e,
-                   Graph& g)
-    {
-        _pred[target(e,g)] = source(e,g);
-    }
-
-    template <class Graph>
-    void examine_vertex(typename graph_traits<Graph>::vertex_descriptor v,
-                        Graph&)
-    {
-        typedef typename property_traits<DistMap>::value_type val_t;
-        if ( _dist_map[v] > val_t(_max_dist))
-            throw stop_search();
-    }
-
-    template <class Graph>
-    void discover_vertex(typename graph_traits<Graph>::vertex_descriptor v,
-                         Graph&)
-    {
-        if (size_t(_pred[v]) == v)
-            return;
-        _dist_map[v] = _dist_map[_pred[v]] + 1;
-
-        auto iter = _target.find(v);
-        if (iter != _target.end())
-        {
-            _target.erase(iter);
-            if (_target.empty())
-                throw stop_search();
-        };
-    }
-
-private:
-    DistMap _dist_map;
-    PredMap _pred;
-    size_t _max_dist;
-    size_t _source;
-    gt_hash_set<std::size_t> _target;
-    size_t _dist;
-};
-
-
 template <class DistMap>
 class djk_max_visitor:
     public boost::dijkstra_visitor<null_visitor>
@@ -230,8 +107,8 @@ struct do_bfs_search
     template <class Graph, class VertexIndexMap, class DistMap, class PredMap>
     void operator()(const Graph& g, size_t source,
                     boost::python::object otarget_list,
-                    VertexIndexMap vertex_index, DistMap dist_map,
-                    PredMap pred_map, long double max_dist) const
+                    VertexIndexMap, DistMap dist_map,
+                    PredMap pred_map, long double max_dist, bool fifo) const
     {
         typedef typename property_traits<DistMap>::value_type dist_t;
 
@@ -243,36 +120,45 @@ struct do_bfs_search
             numeric_limits<dist_t>::infinity() :
             numeric_limits<dist_t>::max();
 
-        dist_t max_d = (max_dist > 0) ? max_dist : inf;
-
-        unchecked_vector_property_map<boost::default_color_type, VertexIndexMap>
-        color_map(vertex_index, num_vertices(g));
-        try
+        // the search stops at the level of max_dist, or the one where the
+        // last target is reached; the predecessors are the ones of a FIFO
+        // search only if fifo is true, since this disables the bottom-up
+        // steps
+        size_t max_d = (max_dist > 0) ?
+            size_t(max_dist) : numeric_limits<size_t>::max();
+        size_t n_tgt = tgt.size();
+
+        vector<int32_t> dist;
+        vector<size_t> pred;
+        parallel_bfs(g, source, dist, pred,
+                     [&](size_t d, const vector<size_t>& vs)
+                     {
+                         if (n_tgt > 0)
+                         {
+                             for (auto v : vs)
+                             {
+                                 if (tgt.find(v) != tgt.end())
+                                     --n_tgt;
+                             }
+                             if (n_tgt == 0)
+                                 return false;
+                         }
+                         return d < max_d;
+                     }, fifo);
+
+        size_t N = num_vertices(g);
+        #pragma omp parallel for default(shared) schedule(runtime) \
+            if (N > OPENMP_MIN_THRESH)
+        for (size_t v = 0; v < N; ++v)
         {
-            if (tgt.size() <= 1)
-            {
-                size_t target = tgt.empty() ?
-                    graph_traits<GraphInterface::multigraph_t>::null_vertex() :
-                    *tgt.begin();
-                breadth_first_search(g, vertex(source, g),
-                                     visitor(bfs_max_visitor<DistMap, PredMap>
-                                             (dist_map, pred_map, max_d,
-                                              source, target)).
-                                     vertex_index_map(vertex_index).
-                                     color_map(color_map));
-            }
+            if (!is_valid_vertex(vertex(v, g), g))
+                continue;
+            if (dist[v] == numeric_limits<int32_t>::max())
+                dist_map[v] = inf;
             else
-            {
-                breadth_first_search(g, vertex(source, g),
-                                     visitor(bfs_max_multiple_targets_visitor<DistMap, PredMap>
-                                             (dist_map, pred_map, max_d,
-                                              source, tgt)).
-                                     vertex_index_map(vertex_index).
-                                     color_map(color_map));
-            }
-
+                dist_map[v] = dist[v];
+            pred_map[v] = pred[v];
         }
-        catch (stop_search&) {}
     }
 };
 
@@ -369,7 +255,7 @@ struct do_bf_search
 
 void get_dists(GraphInterface& gi, size_t source, boost::python::object tgt,
                boost::any dist_map, boost::any weight, boost::any pred_map,
-               long double max_dist, bool bf)
+               long double max_dist, bool bf, bool fifo)
 {
     typedef property_map_type
         ::apply<int64_t, GraphInterface::vertex_index_map_t>::type pred_map_t;
@@ -378,10 +264,10 @@ void get_dists(GraphInterface& gi, size_t source, boost::python::object tgt,
 
     if (weight.empty())
     {
-        run_action<>()
+        run_action<all_graph_views_with_frozen>()
             (gi, std::bind(do_bfs_search(), std::placeholders::_1, source, tgt, gi.get_vertex_index(),
-                           std::placeholders::_2, pmap.get_unchecked(num_vertices(gi.get_graph())),
-                           max_dist),
+                           std::placeholders::_2, pmap.get_unchecked(gi.get_num_vertices(false)),
+                           max_dist, fifo),
              writable_vertex_scalar_properties())
             (dist_map);
     }
@@ -389,9 +275,9 @@ void get_dists(GraphInterface& gi, size_t source, boost::python::object tgt,
     {
         if (bf)
         {
-            run_action<>()
+            run_action<all_graph_views_with_frozen>()
                 (gi, std::bind(do_bf_search(), std::placeholders::_1, source,
-                               std::placeholders::_2, pmap.get_unchecked(num_vertices(gi.get_graph())),
+                               std::placeholders::_2, pmap.get_unchecked(gi.get_num_vertices(false)),
                                std::placeholders::_3),
                  writable_vertex_scalar_properties(),
                  edge_scalar_properties())
@@ -399,9 +285,9 @@ void get_dists(GraphInterface& gi, size_t source, boost::python::object tgt,
         }
         else
         {
-            run_action<>()
+            run_action<all_graph_views_with_frozen>()
                 (gi, std::bind(do_djk_search(), std::placeholders::_1, source, tgt, gi.get_vertex_index(),
-                               std::placeholders::_2, pmap.get_unchecked(num_vertices(gi.get_graph())),
+                               std::placeholders::_2, pmap.get_unchecked(gi.get_num_vertices(false)),
                                std::placeholders::_3, max_dist),
                  writable_vertex_scalar_properties(),
                  edge_scalar_properties())
@@ -410,6 +296,172 @@ void get_dists(GraphInterface& gi, size_t source, boost::python::object tgt,
     }
 }
 
+// Single-source searches used for batches of sources. The function f(v, d) is
+// called for every reached vertex v, in non-decreasing order of distance d,
+// and the search stops if it returns false. The distance array needs to be
+// initialized to infinity, and all vertices reached are appended to touched.
+
+template <class Graph, class Dist, class F>
+void multi_bfs(const Graph& g, size_t s, Dist& dist, int32_t max_d,
+               vector<size_t>& touched, F&& f)
+{
+    size_t begin = touched.size();
+    touched.push_back(s);
+    dist[s] = 0;
+    for (size_t i = begin; i < touched.size(); ++i)
+    {
+        auto v = touched[i];
+        int32_t d = dist[v];
+        if (!f(v, d))
+            break;
+        // the vertices at the maximum distance are still reported, but not
+        // expanded
+        if (d >= max_d)
+            continue;
+        for (auto u : adjacent_vertices_range(v, g))
+        {
+            if (dist[u] != numeric_limits<int32_t>::max())
+                continue;
+            dist[u] = d + 1;
+            touched.push_back(u);
+        }
+    }
+}
+
+template <class Graph, class Weight, class Dist, class F>
+void multi_dijkstra(const Graph& g, size_t s, Weight& weight, Dist& dist,
+                    double max_d, vector<size_t>& touched, F&& f)
+{
+    typedef pair<double, size_t> item_t;
+    priority_queue<item_t, vector<item_t>, greater<item_t>> queue;
+    touched.push_back(s);
+    dist[s] = 0;
+    queue.emplace(0, s);
+    while (!queue.empty())
+    {
+        double d = queue.top().first;
+        size_t v = queue.top().second;
+        queue.pop();
+        if (d > dist[v])
+            continue;
+        if (!f(v, d))
+            break;
+        for (auto e : out_edges_range(v, g))
+        {
+            auto u = target(e, g);
+            double nd = d + get(weight, e);
+            if (nd > max_d || nd >= dist[u])
+                continue;
+            if (std::isinf(dist[u]))
+                touched.push_back(u);
+            dist[u] = nd;
+            queue.emplace(nd, u);
+        }
+    }
+}
+
+// Runs search(s, dist, touched, f) from each source in parallel. If otop is
+// None, the distances to all vertices are written to the rows of the dense
+// matrix odist, otherwise only the closest vertices other than the source
+// are kept, in otop, with their distances in odist.
+template <class DistT, class Search>
+void multi_source_dists(size_t N, Search&& search, python::object osources,
+                        python::object odist, python::object otop)
+{
+    DistT inf = std::is_floating_point<DistT>::value ?
+        numeric_limits<DistT>::infinity() : numeric_limits<DistT>::max();
+
+    auto sources = get_array<int64_t, 1>(osources);
+    auto dist = get_array<DistT, 2>(odist);
+    size_t S = sources.size();
+
+    if (otop == python::object())
+    {
+        #pragma omp parallel for default(shared) schedule(runtime) if (S > 1)
+        for (size_t i = 0; i < S; ++i)
+        {
+            auto row = dist[i];
+            for (size_t v = 0; v < N; ++v)
+                row[v] = inf;
+            vector<size_t> touched;
+            search(size_t(sources[i]), row, touched,
+                   [](size_t, DistT) { return true; });
+        }
+    }
+    else
+    {
+        auto top = get_array<int64_t, 2>(otop);
+        size_t k = top.shape()[1];
+
+        #pragma omp parallel if (S > 1)
+        {
+            vector<DistT> tdist(N, inf);
+            vector<size_t> touched;
+
+            #pragma omp for schedule(runtime)
+            for (size_t i = 0; i < S; ++i)
+            {
+                size_t s = sources[i];
+                size_t pos = 0;
+                touched.clear();
+                search(s, tdist, touched,
+                       [&](size_t v, DistT d)
+                       {
+                           if (v == s)
+                               return true;
+                           top[i][pos] = v;
+                           dist[i][pos] = d;
+                           return ++pos < k;
+                       });
+                for (auto v : touched)
+                    tdist[v] = inf;
+            }
+        }
+    }
+}
+
+void get_multi_dists(GraphInterface& gi, python::object osources,
+                     boost::any weight, python::object odist,
+                     python::object otop, long double max_dist)
+{
+    size_t N = gi.get_num_vertices(false);
+    if (weight.empty())
+    {
+        int32_t max_d = (max_dist > 0) ?
+            int32_t(max_dist) : numeric_limits<int32_t>::max();
+        run_action<all_graph_views_with_frozen>()
+            (gi,
+             [&](auto& g)
+             {
+                 multi_source_dists<int32_t>
+                     (N,
+                      [&](size_t s, auto& dist, auto& touched, auto&& f)
+                      {
+                          multi_bfs(g, s, dist, max_d, touched, f);
+                      },
+                      osources, odist, otop);
+             })();
+    }
+    else
+    {
+        double max_d = (max_dist > 0) ?
+            double(max_dist) : numeric_limits<double>::infinity();
+        run_action<all_graph_views_with_frozen>()
+            (gi,
+             [&](auto& g, auto w)
+             {
+                 multi_source_dists<double>
+                     (N,
+                      [&](size_t s, auto& dist, auto& touched, auto&& f)
+                      {
+                          multi_dijkstra(g, s, w, dist, max_d, touched, f);
+                      },
+                      osources, odist, otop);
+             },
+             edge_scalar_properties())(weight);
+    }
+}
+
 template <class Graph, class Dist, class Pred, class Preds>
 void get_all_preds(Graph g, Dist dist, Pred pred, Preds preds)
 {
@@ -440,7 +492,7 @@ void do_get_all_preds(GraphInterface& gi, boost::any adist,
     pred_map_t pred = any_cast<pred_map_t>(apred);
     preds_map_t preds = any_cast<preds_map_t>(apreds);
 
-    run_action<>()
+    run_action<all_graph_views_with_frozen>()
         (gi, [&](auto& g, auto dist)
              {get_all_preds(g, dist, pred.get_unchecked(num_vertices(g)),
                             preds.get_unchecked(num_vertices(g)));},
@@ -483,7 +535,7 @@ python::object do_get_all_shortest_paths(GraphInterface& gi, size_t s, size_t t,
 #ifdef HAVE_BOOST_COROUTINE
     auto dispatch = [&](auto& yield)
         {
-            run_action<>()
+            run_action<all_graph_views_with_frozen>()
                 (gi, [&](auto&, auto pred)
                      {get_all_shortest_paths(s, t, pred, yield);},
                  vertex_scalar_vector_properties())(apred);
@@ -554,7 +606,7 @@ python::object do_get_all_paths(GraphInterface& gi, size_t s, size_t t,
     vprop_t visited = boost::any_cast<vprop_t>(avisited);
     auto dispatch = [&](auto& yield)
         {
-            run_action<>()
+            run_action<all_graph_views_with_frozen>()
             (gi, [&](auto& g) {get_all_paths(s, t, cutoff,
                                              visited.get_unchecked(), yield,
                                              g);})();
@@ -568,6 +620,7 @@ python::object do_get_all_paths(GraphInterface& gi, size_t s, size_t t,
 void export_dists()
 {
     python::def("get_dists", &get_dists);
+    python::def("get_multi_dists", &get_multi_dists);
     python::def("get_all_preds", &do_get_all_preds);
     python::def("get_all_shortest_paths", &do_get_all_shortest_paths);
     python::def("get_all_paths", &do_get_all_paths);
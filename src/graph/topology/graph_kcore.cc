@@ -36,7 +36,7 @@ void do_kcore_decomposition(GraphInterface& gi, boost::any prop,
          {
              kcore_decomposition(g, core, d);
          },
-         all_graph_views(), writable_vertex_scalar_properties(),
+         all_graph_views_with_frozen(), writable_vertex_scalar_properties(),
          degree_selectors())(gi.get_graph_view(), prop,
                              degree_selector(deg));
 }
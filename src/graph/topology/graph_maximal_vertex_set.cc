@@ -22,6 +22,7 @@
 #include "graph_util.hh"
 
 #include "random.hh"
+#include "../inference/parallel_rng.hh"
 
 #include <boost/python.hpp>
 
@@ -49,6 +50,10 @@ struct do_maximal_vertex_set
             max_deg = max(out_degree(*v, g), max_deg);
         }
 
+        // the random decision of each vertex is drawn from its own generator,
+        // so that it does not depend on the order in which it is processed
+        parallel_rng<RNG> rngs(rng);
+
         vector<vertex_t> selected, tmp;
         tmp.reserve(vlist.size());
         selected.reserve(vlist.size());
@@ -86,11 +91,7 @@ struct do_maximal_vertex_set
 
 
                          uniform_real_distribution<> sample(0, 1);
-                         auto& rng_ = rng; // workaround clang
-                         #pragma omp critical
-                         {
-                             r = sample(rng_);
-                         }
+                         r = sample(rngs.get(v));
                          if (r < p)
                              include = true;
                      }
@@ -161,10 +162,21 @@ struct do_maximal_vertex_set
                              tmp_max_deg_ = max(tmp_max_deg_, out_degree(v, g));
                          }
                      }
+                 });
+
+            // the marks are only cleared after all conflicts were resolved,
+            // otherwise the outcome would depend on the processing order
+            parallel_loop
+                (selected,
+                 [&](size_t, auto v)
+                 {
                      marked[v] = false;
                  });
 
+            // the order of the remaining vertices depends on the threads
+            std::sort(tmp.begin(), tmp.end());
             vlist = tmp;
+            rngs.next_round();
             max_deg = tmp_max_deg;
         }
     }
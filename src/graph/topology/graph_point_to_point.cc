@@ -0,0 +1,90 @@
+// graph-tool -- a general graph modification and manipulation thingy
+//
+// Copyright (C) 2006-2017 Tiago de Paula Peixoto <tiago@skewed.de>
+//
+// This program is free software; you can redistribute it and/or
+// modify it under the terms of the GNU General Public License
+// as published by the Free Software Foundation; either version 3
+// of the License, or (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+#include "graph.hh"
+#include "graph_filtering.hh"
+#include "graph_properties.hh"
+#include "graph_selectors.hh"
+#include "graph_util.hh"
+#include "numpy_bind.hh"
+
+#include "graph_point_to_point.hh"
+
+#include <boost/python.hpp>
+
+using namespace std;
+using namespace boost;
+using namespace graph_tool;
+
+python::object get_p2p_path(GraphInterface& gi, size_t s, size_t t,
+                            boost::any weight, boost::any adfrom,
+                            boost::any adto)
+{
+    typedef vprop_map_t<vector<double>>::type dmap_t;
+
+    vector<size_t> vpath, epath;
+    bool found = false;
+
+    if (weight.empty())
+    {
+        run_action<all_graph_views_with_frozen>()
+            (gi,
+             [&](auto& g)
+             {
+                 found = p2p_bfs(g, s, t, vpath, epath);
+             })();
+    }
+    else if (adfrom.empty())
+    {
+        run_action<all_graph_views_with_frozen>()
+            (gi,
+             [&](auto& g, auto w)
+             {
+                 found = p2p_dijkstra(g, s, t, w, no_potential(), vpath,
+                                      epath);
+             },
+             edge_scalar_properties())(weight);
+    }
+    else
+    {
+        // the tables are extended to all vertices; those of missing vertices
+        // are empty, and give no bound
+        size_t N = gi.get_num_vertices(false);
+        auto dfrom = any_cast<dmap_t>(adfrom).get_unchecked(N);
+        auto dto = any_cast<dmap_t>(adto).get_unchecked(N);
+        run_action<all_graph_views_with_frozen>()
+            (gi,
+             [&](auto& g, auto w)
+             {
+                 found = p2p_dijkstra(g, s, t, w,
+                                      landmark_potential<decltype(dfrom)>
+                                          (dfrom, dto, s, t),
+                                      vpath, epath);
+             },
+             edge_scalar_properties())(weight);
+    }
+
+    if (!found)
+        return python::object();
+    return python::make_tuple(wrap_vector_owned(vpath),
+                              wrap_vector_owned(epath));
+}
+
+void export_p2p()
+{
+    python::def("get_p2p_path", &get_p2p_path);
+};
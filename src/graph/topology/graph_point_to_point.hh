@@ -0,0 +1,286 @@
+// graph-tool -- a general graph modification and manipulation thingy
+//
+// Copyright (C) 2006-2017 Tiago de Paula Peixoto <tiago@skewed.de>
+//
+// This program is free software; you can redistribute it and/or
+// modify it under the terms of the GNU General Public License
+// as published by the Free Software Foundation; either version 3
+// of the License, or (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+#ifndef GRAPH_POINT_TO_POINT_HH
+#define GRAPH_POINT_TO_POINT_HH
+
+#include <queue>
+#include <limits>
+
+#include "hash_map_wrap.hh"
+
+namespace graph_tool
+{
+using namespace std;
+using namespace boost;
+
+// Calls f(u, e) for all neighbours u of v, following the edges forward or
+// backward.
+template <class Graph, class F>
+void p2p_adjacent(size_t v, const Graph& g, bool backward, F&& f)
+{
+    if (!backward || !is_directed::apply<Graph>::type::value)
+    {
+        for (const auto& e : out_edges_range(v, g))
+            f(size_t(target(e, g)), e);
+    }
+    else
+    {
+        for (const auto& e : in_or_out_edges_range(v, g))
+            f(size_t(source(e, g)), e);
+    }
+}
+
+// State of one of the two directions of a bidirectional search.
+struct p2p_side
+{
+    gt_hash_map<size_t, double> dist;
+    gt_hash_map<size_t, pair<size_t, size_t>> pred;  // (vertex, edge index)
+};
+
+// Assembles the path from the two search trees, meeting at vertex w.
+inline void p2p_path(size_t w, p2p_side& fwd, p2p_side& bwd,
+                     vector<size_t>& vpath, vector<size_t>& epath)
+{
+    size_t v = w;
+    vpath.push_back(v);
+    auto iter = fwd.pred.find(v);
+    while (iter != fwd.pred.end())
+    {
+        epath.push_back(iter->second.second);
+        v = iter->second.first;
+        vpath.push_back(v);
+        iter = fwd.pred.find(v);
+    }
+    std::reverse(vpath.begin(), vpath.end());
+    std::reverse(epath.begin(), epath.end());
+
+    v = w;
+    iter = bwd.pred.find(v);
+    while (iter != bwd.pred.end())
+    {
+        epath.push_back(iter->second.second);
+        v = iter->second.first;
+        vpath.push_back(v);
+        iter = bwd.pred.find(v);
+    }
+}
+
+// Bidirectional breadth-first search. Each step expands an entire level of
+// the smaller frontier.
+template <class Graph>
+bool p2p_bfs(const Graph& g, size_t s, size_t t, vector<size_t>& vpath,
+             vector<size_t>& epath)
+{
+    auto eindex = get(edge_index_t(), g);
+    std::array<p2p_side, 2> side;
+    std::array<vector<size_t>, 2> frontier;
+
+    side[0].dist[s] = 0;
+    side[1].dist[t] = 0;
+    frontier[0].push_back(s);
+    frontier[1].push_back(t);
+
+    if (s == t)
+    {
+        vpath.push_back(s);
+        return true;
+    }
+
+    vector<size_t> next;
+    while (!frontier[0].empty() && !frontier[1].empty())
+    {
+        size_t d = (frontier[0].size() <= frontier[1].size()) ? 0 : 1;
+        auto& self = side[d];
+        auto& other = side[1 - d];
+
+        double mu = numeric_limits<double>::infinity();
+        size_t meet = numeric_limits<size_t>::max();
+        next.clear();
+        for (auto v : frontier[d])
+        {
+            double dv = self.dist[v] + 1;
+            p2p_adjacent(v, g, d == 1,
+                         [&](size_t u, const auto& e)
+                         {
+                             if (self.dist.find(u) != self.dist.end())
+                                 return;
+                             self.dist[u] = dv;
+                             self.pred[u] = make_pair(v, size_t(eindex[e]));
+                             next.push_back(u);
+                             auto iter = other.dist.find(u);
+                             if (iter != other.dist.end() &&
+                                 dv + iter->second < mu)
+                             {
+                                 mu = dv + iter->second;
+                                 meet = u;
+                             }
+                         });
+        }
+
+        if (meet != numeric_limits<size_t>::max())
+        {
+            p2p_path(meet, side[0], side[1], vpath, epath);
+            return true;
+        }
+        frontier[d].swap(next);
+    }
+    return false;
+}
+
+// Bidirectional Dijkstra search. If pot is not null, the search is
+// goal-directed (A*) with the consistent potential p(v) = (pi_t(v) -
+// pi_s(v)) / 2, where pi_t and pi_s are lower bounds on the distances to t
+// and from s, respectively, obtained from the landmark distance tables via
+// the triangle inequality (ALT).
+template <class Graph, class Weight, class Potential>
+bool p2p_dijkstra(const Graph& g, size_t s, size_t t, Weight weight,
+                  Potential&& pot, vector<size_t>& vpath,
+                  vector<size_t>& epath)
+{
+    typedef pair<double, size_t> item_t;
+    typedef priority_queue<item_t, vector<item_t>, std::greater<item_t>>
+        queue_t;
+
+    auto eindex = get(edge_index_t(), g);
+    std::array<p2p_side, 2> side;
+    std::array<queue_t, 2> queue;
+    std::array<gt_hash_set<size_t>, 2> done;
+
+    const double inf = numeric_limits<double>::infinity();
+
+    // potential of vertex v, for direction d (the backward potential is the
+    // negative of the forward one); returns NaN if v cannot lie in a path
+    // between s and t.
+    gt_hash_map<size_t, std::array<double, 2>> pcache;
+    auto get_pot = [&](size_t v, size_t d)
+        {
+            auto iter = pcache.find(v);
+            if (iter == pcache.end())
+                iter = pcache.insert(make_pair(v, pot(v))).first;
+            auto& pi = iter->second;
+            if (std::isinf(pi[0]) || std::isinf(pi[1]))
+                return numeric_limits<double>::quiet_NaN();
+            double p = (pi[0] - pi[1]) / 2;
+            return (d == 0) ? p : -p;
+        };
+
+    side[0].dist[s] = 0;
+    side[1].dist[t] = 0;
+    queue[0].emplace(get_pot(s, 0), s);
+    queue[1].emplace(get_pot(t, 1), t);
+
+    double mu = (s == t) ? 0 : inf;
+    size_t meet = s;
+
+    while (!queue[0].empty() && !queue[1].empty())
+    {
+        if (queue[0].top().first + queue[1].top().first >= mu)
+            break;
+
+        size_t d = (queue[0].size() <= queue[1].size()) ? 0 : 1;
+        auto& self = side[d];
+        auto& other = side[1 - d];
+
+        size_t v = queue[d].top().second;
+        queue[d].pop();
+        if (!done[d].insert(v).second)
+            continue;
+
+        double dv = self.dist[v];
+        p2p_adjacent(v, g, d == 1,
+                     [&](size_t u, const auto& e)
+                     {
+                         double du = dv + get(weight, e);
+                         auto iter = self.dist.find(u);
+                         if (iter != self.dist.end() && iter->second <= du)
+                             return;
+                         double p = get_pot(u, d);
+                         if (std::isnan(p))
+                             return;
+                         self.dist[u] = du;
+                         self.pred[u] = make_pair(v, size_t(eindex[e]));
+                         queue[d].emplace(du + p, u);
+                         auto oiter = other.dist.find(u);
+                         if (oiter != other.dist.end() &&
+                             du + oiter->second < mu)
+                         {
+                             mu = du + oiter->second;
+                             meet = u;
+                         }
+                     });
+    }
+
+    if (std::isinf(mu))
+        return false;
+    p2p_path(meet, side[0], side[1], vpath, epath);
+    return true;
+}
+
+// Landmark lower bounds (pi_t(v), pi_s(v)) on the distances from v to t and
+// from s to v, where dfrom[v][l] is the distance from landmark l to v, and
+// dto[v][l] is the distance from v to l.
+template <class DistMap>
+class landmark_potential
+{
+public:
+    landmark_potential(DistMap dfrom, DistMap dto, size_t s, size_t t)
+        : _dfrom(dfrom), _dto(dto), _s(s), _t(t) {}
+
+    std::array<double, 2> operator()(size_t v)
+    {
+        std::array<double, 2> pi = {{0, 0}};
+        auto& fv = _dfrom[v];
+        auto& tv = _dto[v];
+        auto& ft = _dfrom[_t];
+        auto& tt = _dto[_t];
+        auto& fs = _dfrom[_s];
+        auto& ts = _dto[_s];
+        size_t L = std::min({fv.size(), tv.size(), ft.size(), tt.size(),
+                             fs.size(), ts.size()});
+        for (size_t l = 0; l < L; ++l)
+        {
+            bound(pi[0], ft[l], fv[l]);  // d(l,t) - d(l,v)
+            bound(pi[0], tv[l], tt[l]);  // d(v,l) - d(t,l)
+            bound(pi[1], fv[l], fs[l]);  // d(l,v) - d(l,s)
+            bound(pi[1], ts[l], tv[l]);  // d(s,l) - d(v,l)
+        }
+        return pi;
+    }
+
+private:
+    void bound(double& pi, double a, double b)
+    {
+        // if b is infinite the bound is uninformative; if only a is, the
+        // distance itself is infinite
+        if (std::isinf(b))
+            return;
+        pi = std::max(pi, a - b);
+    }
+
+    DistMap _dfrom, _dto;
+    size_t _s, _t;
+};
+
+struct no_potential
+{
+    std::array<double, 2> operator()(size_t) { return {{0, 0}}; }
+};
+
+} // graph_tool namespace
+
+#endif // GRAPH_POINT_TO_POINT_HH
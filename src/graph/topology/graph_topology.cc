@@ -58,6 +58,8 @@ void export_kcore();
 void export_percolation();
 void export_similarity();
 void export_dists();
+void export_p2p();
+void export_contraction_hierarchy();
 void export_all_dists();
 void export_all_circuits();
 void export_diam();
@@ -87,6 +89,8 @@ BOOST_PYTHON_MODULE(libgraph_tool_topology)
     export_percolation();
     export_similarity();
     export_dists();
+    export_p2p();
+    export_contraction_hierarchy();
     export_all_dists();
     export_all_circuits();
     export_diam();
@@ -124,6 +124,13 @@ import io
 import collections
 import itertools
 import csv
+import json
+import pickle
+import contextlib
+try:
+    import copyreg
+except ImportError:
+    import copy_reg as copyreg
 
 if sys.version_info < (3,):
     import StringIO
@@ -138,14 +145,17 @@ else:
 from .decorators import _wraps, _require, _attrs, _limit_args, _copy_func
 from inspect import ismethod
 
-__all__ = ["Graph", "GraphView", "Vertex", "Edge", "VertexBase", "EdgeBase",
-           "Vector_bool", "Vector_int16_t", "Vector_int32_t", "Vector_int64_t",
+__all__ = ["Graph", "GraphView", "FrozenGraph", "GraphBuilder", "Vertex",
+           "Edge", "VertexBase", "EdgeBase", "Vector_bool", "Vector_int16_t", "Vector_int32_t", "Vector_int64_t",
            "Vector_double", "Vector_long_double", "Vector_string",
            "Vector_size_t", "value_types", "load_graph", "load_graph_from_csv",
-           "PropertyMap", "PropertyArray", "group_vector_property",
+           "load_graph_from_parquet",
+           "PropertyMap", "CategoricalPropertyMap", "PropertyArray",
+           "group_vector_property",
            "ungroup_vector_property", "map_property_values",
            "infect_vertex_property", "edge_endpoint_property",
-           "incident_edges_op", "perfect_prop_hash", "seed_rng", "show_config",
+           "incident_edges_op", "perfect_prop_hash", "seed_rng", "rng_context",
+           "show_config",
            "openmp_enabled", "openmp_get_num_threads", "openmp_set_num_threads",
            "openmp_get_schedule", "openmp_set_schedule", "__author__",
            "__copyright__", "__URL__", "__version__"]
@@ -158,9 +168,9 @@ graph_tool = sys.modules[__name__]
 ################################################################################
 
 
-def _prop(t, g, prop):
+def _prop(t, g, prop, write=True):
     """Return either a property map, or an internal property map with a given
-    name."""
+    name. If ``write == False``, the values are only read."""
     if isinstance(prop, (str, unicode)):
         try:
             pmap = g.properties[(t, prop)]
@@ -176,7 +186,13 @@ def _prop(t, g, prop):
         names = {'e': 'edge', 'v': 'vertex', 'g': 'graph'}
         raise ValueError("Expected '%s' property map, got '%s'" %
                          (names[t], names[prop.key_type()]))
-    return pmap._get_any()
+    return pmap._get_any(write)
+
+
+def _prop_storage(pmap):
+    """Return the internal storage of a property map, without conversion. For
+    categorical maps, this is the map of codes."""
+    return PropertyMap._get_any(pmap)
 
 
 def _degree(g, name):
@@ -218,6 +234,8 @@ def _type_alias(type_name):
 
 
 def _python_type(type_name):
+    if type_name == "categorical":
+        return str
     type_name = _type_alias(type_name)
     if "vector" in type_name:
         ma = re.compile(r"vector<(.*)>").match(type_name)
@@ -256,6 +274,11 @@ def _gt_type(obj):
         return "vector<%s>" % _gt_type(obj[0])
     return "object"
 
+# dtypes of the property map values which can be accessed in bulk via arrays
+_bulk_dtypes = {"bool": "uint8", "int16_t": "int16", "int32_t": "int32",
+                "int64_t": "int64", "double": "float64",
+                "long double": "longdouble"}
+
 def _converter(val_type):
     # attempt to convert to a compatible python type. This is useful,
     # for instance, when dealing with numpy types.
@@ -334,6 +357,49 @@ def conv_pickle_state(state):
             state[k.decode("utf-8")] = state[k]
             del state[k]
 
+# out-of-band pickle buffers, available with pickle protocol 5
+_PickleBuffer = getattr(pickle, "PickleBuffer", None)
+
+def _pickle_buffer(a):
+    a = numpy.ascontiguousarray(a)
+    return (a.dtype.str, a.shape, _PickleBuffer(a))
+
+def _unpickle_buffer(state):
+    dtype, shape, buf = state
+    return numpy.frombuffer(buf, dtype=dtype).reshape(shape)
+
+def _pickle_values(pmap, N):
+    """Return the values of ``pmap`` for the indexes in ``range(N)``, where the
+    scalar and vector arrays are wrapped in :class:`pickle.PickleBuffer`
+    objects."""
+    if isinstance(pmap, CategoricalPropertyMap):
+        return ("categorical", _pickle_buffer(pmap.get_array()[:N]),
+                pmap.categories[1:])
+    vtype = pmap.value_type()
+    if vtype in _bulk_dtypes:
+        return ("scalar", _pickle_buffer(pmap.get_array()[:N]))
+    vals = pmap.take(numpy.arange(N))
+    if isinstance(vals, tuple):
+        return ("vector",) + tuple(_pickle_buffer(x) for x in vals)
+    return ("list", vals)
+
+def _unpickle_values(pmap, N, vals):
+    """Set the values of ``pmap`` from the output of :func:`_pickle_values`."""
+    if vals[0] == "categorical":
+        # the categories are added in their stored order, so that the codes
+        # remain valid
+        categories = pmap._shared_categories()
+        for x in vals[2]:
+            categories.code(x)
+        pmap.get_array()[:N] = _unpickle_buffer(vals[1])
+    elif vals[0] == "scalar":
+        pmap.get_array()[:N] = _unpickle_buffer(vals[1])
+    elif vals[0] == "vector":
+        pmap.put(numpy.arange(N), (_unpickle_buffer(vals[1]),
+                                   _unpickle_buffer(vals[2])))
+    else:
+        pmap.put(numpy.arange(N), vals[1])
+
 
 ################################################################################
 # Property Maps
@@ -384,7 +450,9 @@ class PropertyMap(object):
         self.__convert = _converter(self.value_type())
         self.__register_map()
 
-    def _get_any(self):
+    def _get_any(self, write=True):
+        if write:
+            self._unshare()
         t = self.key_type()
         g = self.get_graph()
         if t == "v":
@@ -432,6 +500,57 @@ class PropertyMap(object):
     def __del__(self):
         self.__unregister_map()
 
+    # Filters inherited by graph views share the storage of the parent's
+    # filter, which is only copied when it is about to be modified. The maps
+    # of the views which borrow the storage are kept in a set of weak
+    # references attached to the storage itself, so that writes via any other
+    # map of the same storage can detach them.
+
+    def _borrow(self):
+        """Mark this filter map as borrowing the storage of the filter it was
+        inherited from, which is then copied before either is modified."""
+        borrowers = getattr(self.__map, "_borrowers", None)
+        if borrowers is None:
+            borrowers = self.__map._borrowers = weakref.WeakSet()
+        borrowers.add(self)
+
+    def _is_borrowed(self):
+        return self in getattr(self.__map, "_borrowers", ())
+
+    def _unshare(self):
+        """Copy the storage of the borrowed filters, before it is modified via
+        this map. If this map is itself a borrowed filter, only its own storage
+        is copied."""
+        borrowers = getattr(self.__map, "_borrowers", None)
+        if not borrowers:
+            return
+        if self in borrowers:
+            borrowers.discard(self)
+            self.__copy_storage()
+            return
+        for m in list(borrowers):
+            m.__copy_storage()
+        borrowers.clear()
+
+    def __copy_storage(self):
+        g = self.get_graph()
+        if g is None:
+            return
+        pmap = g.new_property(self.key_type(), self.value_type())
+        a = pmap._get_data()
+        a[:] = self._get_data()[:len(a)]
+        self.__map = pmap.__map
+        if self.key_type() == "v":
+            filt, inverted = g.get_vertex_filter()
+            if filt is self:
+                g._Graph__graph.set_vertex_filter_property(self._get_any(),
+                                                           inverted)
+        else:
+            filt, inverted = g.get_edge_filter()
+            if filt is self:
+                g._Graph__graph.set_edge_filter_property(self._get_any(),
+                                                         inverted)
+
     def __getitem__(self, k):
         k = self.__key_trans(k)
         try:
@@ -451,6 +570,7 @@ class PropertyMap(object):
                                  % (str(k), str(type(k)), kt) )
 
     def __setitem__(self, k, v):
+        self._unshare()
         key = self.__key_trans(k)
         try:
             try:
@@ -571,6 +691,7 @@ class PropertyMap(object):
            store a **copy** instead.
 
         """
+        self._unshare()
         return self._get_data()
 
     def _get_data(self):
@@ -621,20 +742,20 @@ class PropertyMap(object):
                 filt = (g.new_edge_property("bool"), filt[1])
                 libcore.mark_edges(g._Graph__graph, _prop("e", g, filt[0]))
                 if filt[1]:
-                    filt[0].a = numpy.logical_not(filt[0].a)
+                    filt[0].a = numpy.logical_not(filt[0]._get_data())
             elif g.edge_index_range != g.num_edges():
                 filt = (g.new_edge_property("bool"), False)
                 libcore.mark_edges(g._Graph__graph, _prop("e", g, filt[0]))
             if filt[0] is None:
                 N = g.edge_index_range
             else:
-                N = (filt[0].a == (not filt[1])).sum()
+                N = (filt[0]._get_data() == (not filt[1])).sum()
         if get:
             if a is None:
                 return a
             if filt[0] is None:
                 return a
-            return a[filt[0].a == (not filt[1])][:N]
+            return a[filt[0]._get_data() == (not filt[1])][:N]
         else:
             if a is None:
                 raise TypeError("cannot set property map values from array for" +
@@ -645,7 +766,7 @@ class PropertyMap(object):
                 except ValueError:
                     a[:] = v[:len(a)]
             else:
-                m = filt[0].a == (not filt[1])
+                m = filt[0]._get_data() == (not filt[1])
                 m *= m.cumsum() <= N
                 try:
                     a[m] = v
@@ -679,13 +800,14 @@ class PropertyMap(object):
                 filt = (g.new_edge_property("bool"), filt[1])
                 libcore.mark_edges(g._Graph__graph, _prop("e", g, filt[0]))
                 if filt[1]:
-                    filt[0].a = 1 - filt[0].a
+                    filt[0].a = 1 - filt[0]._get_data()
         if filt[0] is None or a is None:
             if get:
                 return a
             else:
                 return
-        ma = numpy.ma.array(a, mask=(filt[0].a == False) if not filt[1] else (filt[0].a == True))
+        fa = filt[0]._get_data()
+        ma = numpy.ma.array(a, mask=(fa == False) if not filt[1] else (fa == True))
         if get:
             return ma
         else:
@@ -711,7 +833,8 @@ class PropertyMap(object):
         if "vector" not in self.value_type() and (len(pos) > 1 or pos[0] != 0):
             raise ValueError("Cannot create array of dimension %d (indexes %s) from non-vector property map of type '%s'." \
                              % (len(pos), str(pos), self.value_type()))
-        if "string" in self.value_type():
+        if ("string" in self.value_type() or
+            self.value_type() == "categorical"):
             if "vector" in self.value_type():
                 p = ungroup_vector_property(self, pos)
             else:
@@ -741,7 +864,7 @@ class PropertyMap(object):
                 a = a[0]
             a = numpy.array(a)
             if vfilt[0] is not None:
-                a = a[filt[0].a[:a.shape[0]] == (not filt[1])]
+                a = a[filt[0]._get_data()[:a.shape[0]] == (not filt[1])]
             return a
 
         a = self.fa
@@ -762,7 +885,7 @@ class PropertyMap(object):
             if len(a.shape) != 1:
                 raise ValueError("Cannot set array of shape %s to non-vector property map of type %s" % \
                                  (str(a.shape), self.value_type()))
-            if self.value_type() != "string":
+            if self.value_type() not in ["string", "categorical"]:
                 self.fa = a
             else:
                 g = self.get_graph()
@@ -790,6 +913,87 @@ class PropertyMap(object):
                     ps[-1][v] = a[i, j]
         group_vector_property(ps, val, self, pos)
 
+    def __check_indices(self, indices):
+        if self.key_type() == "g":
+            raise ValueError("Cannot access graph property maps by index.")
+        g = self.get_graph()
+        if g is None:
+            raise ValueError("Cannot access orphaned property map by index.")
+        idx = numpy.asarray(indices, dtype="int64").ravel()
+        if self.key_type() == "v":
+            N = g._Graph__graph.get_num_vertices(False)
+        else:
+            N = g.edge_index_range
+        if len(idx) > 0 and (idx.min() < 0 or idx.max() >= N):
+            raise ValueError("Invalid %s index: %d" %
+                             ("vertex" if self.key_type() == "v" else "edge",
+                              idx.min() if idx.min() < 0 else idx.max()))
+        return idx
+
+    def take(self, indices):
+        r"""Return the values of the property map for the vertices or edges with
+        indexes given by ``indices``, which should be a sequence of integers
+        (e.g. a :class:`~numpy.ndarray`), in a single call.
+
+        If the value type is scalar, a :class:`~numpy.ndarray` is returned. If
+        the value type is a vector of scalars, a pair ``(values, offsets)`` of
+        :class:`~numpy.ndarray` is returned, where the values for ``indices[i]``
+        are given by ``values[offsets[i]:offsets[i+1]]``. For any other value
+        type (e.g. ``string``), a list is returned.
+
+        Examples
+        --------
+        >>> g = gt.Graph()
+        >>> g.add_vertex(4)
+        <...>
+        >>> p = g.new_vertex_property("vector<int>")
+        >>> p[1] = [1, 2]
+        >>> p[3] = [3]
+        >>> vals, offsets = p.take([1, 2, 3])
+        >>> print(vals, offsets)
+        [1 2 3] [0 2 2 3]
+        """
+        idx = self.__check_indices(indices)
+        return self.__map.take(idx)
+
+    def put(self, indices, values):
+        r"""Set the values of the property map for the vertices or edges with
+        indexes given by ``indices``, which should be a sequence of integers
+        (e.g. a :class:`~numpy.ndarray`), in a single call.
+
+        If the value type is scalar, ``values`` should be a sequence with the
+        same length as ``indices``. If the value type is a vector of scalars,
+        ``values`` should either be a pair ``(values, offsets)`` of sequences,
+        as returned by :meth:`~PropertyMap.take`, or a sequence of sequences.
+        For any other value type, ``values`` should be a sequence of values.
+
+        If an index appears more than once, the last value is kept.
+        """
+        idx = self.__check_indices(indices)
+        vtype = self.value_type()
+        offsets = None
+        if vtype in _bulk_dtypes:
+            values = numpy.asarray(values, dtype=_bulk_dtypes[vtype])
+        elif vtype.startswith("vector") and vtype[7:-1] in _bulk_dtypes:
+            dtype = _bulk_dtypes[vtype[7:-1]]
+            if (isinstance(values, tuple) and len(values) == 2 and
+                len(values[1]) == len(idx) + 1):
+                values, offsets = values
+                values = numpy.asarray(values, dtype=dtype)
+                offsets = numpy.asarray(offsets, dtype="int64")
+            else:
+                values = [numpy.asarray(x, dtype=dtype).ravel() for x in values]
+                offsets = numpy.zeros(len(values) + 1, dtype="int64")
+                offsets[1:] = numpy.cumsum([len(x) for x in values])
+                if len(values) > 0:
+                    values = numpy.concatenate(values)
+                else:
+                    values = numpy.array([], dtype=dtype)
+        else:
+            values = [self.__convert(x) for x in values]
+        self._unshare()
+        self.__map.put(idx, values, offsets)
+
     def is_writable(self):
         """Return True if the property is writable."""
         return self.__map.is_writable()
@@ -813,11 +1017,13 @@ class PropertyMap(object):
 
     def resize(self, size):
         """Resize the underlying container to contain exactly ``size`` elements."""
+        self._unshare()
         self.__map.resize(size)
 
     def shrink_to_fit(self):
         """Shrink size of underlying container to accommodate only the necessary amount,
         and thus potentially freeing memory."""
+        self._unshare()
         g = self.get_graph()
         if self.key_type() == "v":
             size = g.num_vertices(True)
@@ -832,7 +1038,16 @@ class PropertyMap(object):
         """Return the pointer to memory where the data resides."""
         return self.__map.data_ptr()
 
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5 and _PickleBuffer is not None:
+            return (copyreg.__newobj__, (type(self),),
+                    self.__get_state(buffers=True))
+        return object.__reduce_ex__(self, protocol)
+
     def __getstate__(self):
+        return self.__get_state()
+
+    def __get_state(self, buffers=False):
         g = self.get_graph()
         if g is None:
             raise ValueError("cannot pickle orphaned property map")
@@ -840,6 +1055,9 @@ class PropertyMap(object):
         key_type = self.key_type()
         if not self.is_writable():
             vals = None
+        elif buffers and key_type != "g":
+            vals = _pickle_values(self, g._Graph__pickle_range(key_type))
+            value_type = self.value_type()
         else:
             u = GraphView(g, skip_vfilt=True, skip_efilt=True)
             if key_type == "v":
@@ -852,7 +1070,8 @@ class PropertyMap(object):
         state = dict(g=g, value_type=value_type,
                      key_type=key_type, vals=vals,
                      is_vindex=self is g.vertex_index,
-                     is_eindex=self is g.edge_index)
+                     is_eindex=self is g.edge_index,
+                     buffers=buffers)
 
         return state
 
@@ -867,6 +1086,9 @@ class PropertyMap(object):
             pmap = g.vertex_index
         elif state["is_eindex"]:
             pmap = g.edge_index
+        elif state.get("buffers", False) and key_type != "g":
+            pmap = g.new_property(key_type, value_type)
+            _unpickle_values(pmap, g._Graph__pickle_range(key_type), vals)
         else:
             u = GraphView(g, skip_vfilt=True, skip_efilt=True)
             if key_type == "v":
@@ -878,6 +1100,8 @@ class PropertyMap(object):
                 pmap[u] = vals
             pmap = g.own_property(pmap)
 
+        if isinstance(pmap, CategoricalPropertyMap):
+            self._CategoricalPropertyMap__dict = pmap._shared_categories()
         self.__map = pmap.__map
         self.__g = pmap.__g
         self.__base_g = pmap.__base_g
@@ -885,6 +1109,154 @@ class PropertyMap(object):
         self.__convert = _converter(self.value_type())
         self.__register_map()
 
+class _CategoryDict(object):
+    # list of categories, shared between the views of the same categorical
+    # property map
+    def __init__(self, categories=None):
+        self.values = [""]
+        self.index = {"": 0}
+        for x in (categories if categories is not None else []):
+            self.code(x)
+
+    def code(self, x, add=True):
+        x = _c_str(_str_decode(x))
+        c = self.index.get(x)
+        if c is None:
+            if not add:
+                return -1
+            c = self.index[x] = len(self.values)
+            self.values.append(x)
+        return c
+
+
+class CategoricalPropertyMap(PropertyMap):
+    """A string-valued :class:`~graph_tool.PropertyMap` which is stored compactly
+    as an array of integer codes, together with a dictionary of categories,
+    shared by all values. It is created by passing the value type
+    ``"categorical"`` to :meth:`~graph_tool.Graph.new_vertex_property` or
+    :meth:`~graph_tool.Graph.new_edge_property`.
+
+    Values are read and written as strings, and new categories are added to
+    the dictionary as they are encountered. The code ``0`` always
+    corresponds to the empty string, which is the default value. The
+    :attr:`~PropertyMap.a` and :attr:`~PropertyMap.fa` attributes give
+    direct access to the codes, which index the list
+    :attr:`~CategoricalPropertyMap.categories`.
+
+    The value type is reported as ``"categorical"``, but the map can be used
+    wherever a string property map is expected. When it is passed to
+    functions implemented in C++, a temporary string property map is built
+    for the duration of the call, and released afterwards. For this reason
+    it cannot be used to store the output of such functions, and a
+    :class:`ValueError` is raised if this is attempted.
+
+    Examples
+    --------
+    >>> g = gt.Graph()
+    >>> g.add_vertex(4)
+    <...>
+    >>> country = g.new_vertex_property("categorical",
+    ...                                 vals=["br", "de", "br", "fr"])
+    >>> print(country[2], country.a, country.categories)
+    br [1 2 1 3] ['', 'br', 'de', 'fr']
+    """
+
+    def __init__(self, pmap, g, key_type, categories=None):
+        if isinstance(categories, _CategoryDict):
+            self.__dict = categories
+        else:
+            self.__dict = _CategoryDict(categories)
+        PropertyMap.__init__(self, pmap, g, key_type)
+
+    def __get_categories(self):
+        return list(self.__dict.values)
+    categories = property(__get_categories,
+                          doc="List of categories, indexed by their codes.")
+
+    def __get_codes(self):
+        return PropertyMap(self._PropertyMap__map, self.get_graph(),
+                           self.key_type())
+    codes = property(__get_codes,
+                     doc=r"""Plain ``int32_t`` :class:`~graph_tool.PropertyMap`
+                     with the codes, sharing the same storage.""")
+
+    def _shared_categories(self):
+        return self.__dict
+
+    def value_type(self):
+        """Return the value type of the map, which is always
+        ``"categorical"``."""
+        return "categorical"
+
+    def python_value_type(self):
+        """Return the python-compatible value type of the map."""
+        return _python_type("categorical")
+
+    def encode(self, values):
+        """Return a :class:`~numpy.ndarray` with the codes of ``values``, adding
+        new categories to the dictionary if necessary."""
+        values = numpy.asarray([] if values is None else values)
+        if len(values) == 0:
+            return numpy.array([], dtype="int32")
+        uniq, inv = numpy.unique(values.astype("str"), return_inverse=True)
+        codes = numpy.array([self.__dict.code(x) for x in uniq], dtype="int32")
+        return codes[inv.ravel()]
+
+    def decode(self, codes):
+        """Return a :class:`~numpy.ndarray` of objects with the categories
+        corresponding to ``codes``."""
+        return numpy.asarray(self.__dict.values, dtype="object")[codes]
+
+    def code(self, value):
+        """Return the code of ``value``, or ``-1`` if it is not a known
+        category."""
+        return self.__dict.code(value, add=False)
+
+    def __getitem__(self, k):
+        return self.__dict.values[PropertyMap.__getitem__(self, k)]
+
+    def __setitem__(self, k, v):
+        PropertyMap.__setitem__(self, k, self.__dict.code(v))
+
+    def _get_any(self, write=True):
+        g = self.get_graph()
+        if self.key_type() == "v":
+            N = g.num_vertices(True)
+        else:
+            N = g.edge_index_range
+        # the temporary map is owned only by the returned object, so that it
+        # is released as soon as the C++ call returns
+        tmp = g.new_property(self.key_type(), "string")
+        codes = self.codes._get_data()[:N]
+        tmp.put(numpy.arange(N), self.decode(codes).tolist())
+        return tmp._get_any()
+
+    def take(self, indices):
+        """Return a list with the values for the vertices or edges with
+        indexes given by ``indices``. See :meth:`~graph_tool.PropertyMap.take`."""
+        return self.decode(self.codes.take(indices)).tolist()
+
+    def put(self, indices, values):
+        """Set the values for the vertices or edges with indexes given by
+        ``indices``. See :meth:`~graph_tool.PropertyMap.put`."""
+        self.codes.put(indices, self.encode(values))
+
+    def set_value(self, val):
+        """Sets all values in the property map to ``val``."""
+        self.codes.set_value(self.__dict.code(val))
+
+    def __repr__(self):
+        g = self.get_graph()
+        if g is None:
+            g = "a non-existent graph"
+        else:
+            g = "Graph 0x%x" % id(g)
+        return ("<CategoricalPropertyMap object with key type '%s' and %d "
+                "categories, for %s, at 0x%x>") % \
+                ("Vertex" if self.key_type() == "v" else "Edge",
+                 len(self.__dict.values), g, id(self))
+
+
 class PropertyArray(numpy.ndarray):
     """This is a :class:`~numpy.ndarray` subclass which keeps a reference of its
     :class:`~graph_tool.PropertyMap` owner.
@@ -910,6 +1282,10 @@ def _check_prop_writable(prop, name=None):
     if not prop.is_writable():
         raise ValueError("property map%s is not writable." %\
                          ((" '%s'" % name) if name is not None else ""))
+    if isinstance(prop, CategoricalPropertyMap):
+        raise ValueError("categorical property map%s cannot be used to store "
+                         "the output of functions implemented in C++." %\
+                         ((" '%s'" % name) if name is not None else ""))
 
 
 def _check_prop_scalar(prop, name=None, floating=False):
@@ -982,7 +1358,9 @@ def group_vector_property(props, value_type=None, vprop=None, pos=None):
         if "vector" in p.value_type():
             raise ValueError("property map 'props[%d]' is a vector property." %
                              i)
-        vtypes.add(p.value_type())
+        # categorical maps are grouped by their values
+        vtypes.add(p.value_type() if p.value_type() != "categorical"
+                   else "string")
         keys.add(p.key_type())
     if len(keys) > 1:
         raise ValueError("'props' must be of the same key type.")
@@ -1071,6 +1449,7 @@ def ungroup_vector_property(vprop, pos, props=None):
             raise ValueError("'props' must be of the same key type as 'vprop'.")
 
         if k != 'g':
+            _check_prop_writable(props[i], name="props[%d]" % i)
             u = GraphView(g, directed=True, reversed=g.is_reversed(),
                           skip_properties=True)
             libcore.ungroup_vector_property(u._Graph__graph,
@@ -1120,6 +1499,7 @@ def map_property_values(src_prop, tgt_prop, map_func):
     if k == "g":
         tgt_prop[g] = map_func(src_prop[g])
         return
+    _check_prop_writable(tgt_prop, name="tgt_prop")
     u = GraphView(g, directed=True, reversed=g.is_reversed(),
                   skip_properties=True)
     libcore.property_map_values(u._Graph__graph,
@@ -1154,6 +1534,7 @@ def infect_vertex_property(g, prop, vals=None):
     >>> print(sum(prop.a == 10))
     4
     """
+    _check_prop_writable(prop, name="prop")
     libcore.infect_vertex_property(g._Graph__graph, _prop("v", g, prop),
                                    vals)
 
@@ -1201,6 +1582,8 @@ def edge_endpoint_property(g, prop, endpoint, eprop=None):
     val_t = prop.value_type()
     if val_t == "unsigned long" or val_t == "unsigned int":
         val_t = "int64_t"
+    elif val_t == "categorical":
+        val_t = "string"
     if eprop is None:
         eprop = g.new_edge_property(val_t)
     if eprop.value_type() != val_t:
@@ -1552,8 +1935,9 @@ class Graph(object):
             vfilt = g.get_vertex_filter()[0]
             efilt = g.get_edge_filter()[0]
 
-            if (vorder is None and ((vfilt is None and efilt is None) or
-                                    (not vprune and not eprune))):
+            if (vorder is None and not g.__graph.is_frozen() and
+                ((vfilt is None and efilt is None) or
+                 (not vprune and not eprune))):
                 # Do a simpler, faster copy.
                 self.__graph = libcore.GraphInterface(gv.__graph, False,
                                                       [], [], None)
@@ -1590,12 +1974,16 @@ class Graph(object):
                 for k, m in gv.vertex_properties.items():
                     if not m.is_writable():
                         m = m.copy("int32_t")
+                    if isinstance(m, CategoricalPropertyMap):
+                        m = m.codes
                     if not vprune and m is vfilt:
                         vf_pos = len(vprops)
                     vprops.append([_prop("v", gv, m), libcore.any()])
                 for k, m in gv.edge_properties.items():
                     if not m.is_writable():
                         m = m.copy("int32_t")
+                    if isinstance(m, CategoricalPropertyMap):
+                        m = m.codes
                     if not eprune and m is efilt:
                         ef_pos = len(eprops)
                     eprops.append([_prop("e", gv, m), libcore.any()])
@@ -1624,16 +2012,28 @@ class Graph(object):
 
                 # Put the copied properties in the internal dictionary
                 for i, (k, m) in enumerate(gv.vertex_properties.items()):
-                    pmap = new_vertex_property(m.value_type() if m.is_writable() else "int32_t",
+                    cat = isinstance(m, CategoricalPropertyMap)
+                    pmap = new_vertex_property(m.value_type() if m.is_writable() and not cat else "int32_t",
                                                self.__graph.get_vertex_index(),
                                                vprops[i][1])
-                    self.vertex_properties[k] = PropertyMap(pmap, self, "v")
+                    if cat:
+                        self.vertex_properties[k] = \
+                            CategoricalPropertyMap(pmap, self, "v",
+                                                   m.categories[1:])
+                    else:
+                        self.vertex_properties[k] = PropertyMap(pmap, self, "v")
 
                 for i, (k, m) in enumerate(gv.edge_properties.items()):
-                    pmap = new_edge_property(m.value_type() if m.is_writable() else "int32_t",
+                    cat = isinstance(m, CategoricalPropertyMap)
+                    pmap = new_edge_property(m.value_type() if m.is_writable() and not cat else "int32_t",
                                              self.__graph.get_edge_index(),
                                              eprops[i][1])
-                    self.edge_properties[k] = PropertyMap(pmap, self, "e")
+                    if cat:
+                        self.edge_properties[k] = \
+                            CategoricalPropertyMap(pmap, self, "e",
+                                                   m.categories[1:])
+                    else:
+                        self.edge_properties[k] = PropertyMap(pmap, self, "e")
 
                 for k, v in gv.graph_properties.items():
                     new_p = self.new_graph_property(v.value_type())
@@ -1746,7 +2146,9 @@ class Graph(object):
 
         This operation will take :math:`O(min(k(s), k(t)))` time, where
         :math:`k(s)` and :math:`k(t)` are the out-degree and in-degree (or
-        out-degree if undirected) of vertices :math:`s` and :math:`t`.
+        out-degree if undirected) of vertices :math:`s` and :math:`t`, or
+        :math:`O(1)` if ``all_edges == False`` and the edge lookup cache is
+        enabled with :meth:`~graph_tool.Graph.set_edge_index_cache`.
 
         """
         s = self.vertex(int(s))
@@ -1782,6 +2184,7 @@ class Graph(object):
         vertices are inserted and an iterator over the new vertices is returned.
         This operation is :math:`O(n)`.
         """
+        self.__unshare_filters()
         v = libcore.add_vertex(self.__graph, n)
 
         if n == 1:
@@ -1832,6 +2235,7 @@ class Graph(object):
            the graph will no longer be the same.
 
         """
+        self.__unshare_filters()
         back = self.__graph.get_num_vertices(False) - 1
         is_iter = isinstance(vertex, collections.Iterable)
         if is_iter:
@@ -1857,24 +2261,126 @@ class Graph(object):
                 vfiltptr = vfilt.data_ptr()
             else:
                 vfiltptr = None
-            for pmap_ in self.__known_properties.values():
+            for pmap_ in list(self.__known_properties.values()):
                 pmap = pmap_()
                 if (pmap is not None and
                     pmap.key_type() == "v" and
                     pmap.is_writable() and
                     pmap.data_ptr() != vfiltptr):
                     if fast:
-                        self.__graph.move_vertex_property(_prop("v", self, pmap), vs)
+                        self.__graph.move_vertex_property(_prop_storage(pmap), vs)
                     else:
-                        self.__graph.shift_vertex_property(_prop("v", self, pmap), vs)
+                        self.__graph.shift_vertex_property(_prop_storage(pmap), vs)
 
         if is_iter:
             libcore.remove_vertex_array(self.__graph, vs, fast)
         else:
             libcore.remove_vertex(self.__graph, vertex, fast)
 
+    def remove_vertices(self, vertices, return_map=False):
+        r"""Remove several vertices from the graph at once. The parameter
+        ``vertices`` can be either a boolean array of length
+        ``g.num_vertices(ignore_filter=True)``, marking the vertices to be removed, or an
+        array (or iterable) of vertex indexes.
+
+        If ``return_map == True``, an array ``vmap`` of length equal to the
+        original number of vertices is returned, where ``vmap[v]`` is the new
+        index of vertex ``v``, or ``-1`` if it was removed.
+
+        .. note::
+
+           This operation is :math:`O(V + E)`, independently of the number of
+           vertices being removed, and the edge lists are updated in
+           parallel. Afterwards, every vertex property map associated with the
+           graph is reindexed to the new vertex positions, one map at a time.
+
+        .. warning::
+
+           Like :meth:`~Graph.remove_vertex` with ``fast == False``, the
+           remaining vertices are renumbered contiguously while keeping their
+           relative order, hence vertex descriptors pointing to vertices with
+           an index higher than the smallest removed one will be
+           invalidated. Edge descriptors and edge indexes of the remaining
+           edges are not affected.
+
+        """
+        self.__unshare_filters()
+        N = self.__graph.get_num_vertices(False)
+        mask = self.__index_mask(vertices, N, "vertex")
+        if not mask.any():
+            vmap = numpy.arange(N, dtype="int64")
+            return vmap if return_map else None
+
+        vmap = libcore.remove_vertex_mask(self.__graph, mask)
+        kept = numpy.flatnonzero(~mask)
+
+        # move all known property maps to the new positions
+        if len(kept) > 0 and kept[-1] != len(kept) - 1:
+            old_index = self.new_vertex_property("int64_t")
+            old_index.a = kept
+            vfilt = self.get_vertex_filter()[0]
+            if vfilt is not None:
+                vfiltptr = vfilt.data_ptr()
+            else:
+                vfiltptr = None
+            for pmap_ in list(self.__known_properties.values()):
+                pmap = pmap_()
+                if (pmap is not None and
+                    pmap.key_type() == "v" and
+                    pmap.is_writable() and
+                    pmap.data_ptr() not in (vfiltptr, old_index.data_ptr())):
+                    self.__graph.re_index_vertex_property(_prop_storage(pmap),
+                                                          _prop("v", self, old_index))
+        if return_map:
+            return vmap
+
+    def remove_edges(self, edges):
+        r"""Remove several edges from the graph at once. The parameter ``edges``
+        can be either a boolean array of length ``g.edge_index_range``, marking
+        the edges to be removed according to their index, or an array (or
+        iterable) of edge indexes.
+
+        .. note::
+
+           This operation is :math:`O(V + E)`, independently of the number of
+           edges being removed, and is performed in parallel.
+
+        .. note::
+
+           The indexes of the remaining edges are not modified, hence edge
+           property maps need not be updated, and remain valid. The relative
+           ordering of the remaining edges is also kept unchanged.
+
+        """
+        self.__unshare_filters()
+        mask = self.__index_mask(edges, self.edge_index_range, "edge")
+        if mask.any():
+            libcore.remove_edge_mask(self.__graph, mask)
+
+    def __index_mask(self, idx, N, kind):
+        if not isinstance(idx, numpy.ndarray):
+            try:
+                idx = numpy.asarray(idx)
+            except TypeError:
+                idx = numpy.asarray([int(i) for i in idx])
+            if idx.dtype == object:
+                idx = numpy.asarray([int(i) for i in idx], dtype="int64")
+        if idx.dtype == bool:
+            if len(idx) != N:
+                raise ValueError("%s mask has length %d, expected %d" %
+                                 (kind.capitalize(), len(idx), N))
+            return numpy.ascontiguousarray(idx)
+        idx = numpy.asarray(idx, dtype="int64").ravel()
+        if len(idx) > 0 and (idx.min() < 0 or idx.max() >= N):
+            bad = idx[(idx < 0) | (idx >= N)][0]
+            raise ValueError("%s index %d is invalid" % (kind.capitalize(), bad))
+        mask = numpy.zeros(N, dtype="bool")
+        mask[idx] = True
+        return mask
+
     def clear_vertex(self, vertex):
         """Remove all in and out-edges from the given vertex."""
+        self.__unshare_filters()
         libcore.clear_vertex(self.__graph, int(vertex))
 
     def add_edge(self, source, target, add_missing=True):
@@ -1884,6 +2390,7 @@ class Graph(object):
         If ``add_missing == True``, the source and target vertices are included
         in the graph if they don't yet exist.
         """
+        self.__unshare_filters()
         e = libcore.add_edge(self.__graph,
                              self.vertex(int(source), add_missing=add_missing),
                              self.vertex(int(target), add_missing=add_missing))
@@ -1905,6 +2412,7 @@ class Graph(object):
            unchanged, unless :meth:`~Graph.set_fast_edge_removal` is set to
            `True`, in which case it can change.
         """
+        self.__unshare_filters()
         return libcore.remove_edge(self.__graph, edge)
 
     def add_edge_list(self, edge_list, hashed=False, string_vals=False,
@@ -1928,10 +2436,34 @@ class Graph(object):
         If given, ``eprops`` specifies edge property maps that will be filled
         with the remaining values at each row, if there are more than two.
 
+        If ``hashed == True`` and ``edge_list`` is a :class:`~numpy.ndarray` of
+        strings (or of objects, if ``string_vals == True``), the vertex values
+        are hashed natively and in parallel, and the vertices and edges are
+        inserted with a single call to the native routines. The returned
+        property map is an ordinary ``"string"`` map, holding one string per
+        vertex.
+
+        The ``edge_list`` can also be a :class:`pyarrow.Table`, whose first two
+        columns contain the endpoints, which is inserted in the same manner.
+        If these columns are of string or dictionary type (or if
+        ``string_vals == True``), the vertex values are always hashed as
+        strings. Otherwise they are used as vertex indexes, unless
+        ``hashed == True``, in which case the property map with the vertex
+        values has the numeric type of the columns.
+
         """
+        self.__unshare_filters()
+        if _is_arrow_table(edge_list):
+            return self.__add_edge_list_arrow(edge_list, hashed, string_vals,
+                                              eprops)
+        if hashed and self.__is_string_list(edge_list, string_vals):
+            return self.__add_edge_list_str(edge_list, eprops)
         if eprops is None:
             eprops = ()
         else:
+            eprops = list(eprops)
+            for i, x in enumerate(eprops):
+                _check_prop_writable(x, name="eprops[%d]" % i)
             convert = [_converter(x.value_type()) for x in eprops]
             eprops = [_prop("e", self, x) for x in eprops]
             if not isinstance(edge_list, numpy.ndarray):
@@ -1957,6 +2489,173 @@ class Graph(object):
                                          string_vals, eprops)
             return vprop
 
+    @staticmethod
+    def __is_string_list(edge_list, string_vals):
+        if not isinstance(edge_list, numpy.ndarray):
+            return False
+        return (edge_list.dtype.kind in "US" or
+                (edge_list.dtype.kind == "O" and string_vals))
+
+    def __add_edge_list_arrow(self, edge_list, hashed, string_vals, eprops):
+        pa = _get_pyarrow()
+        if edge_list.num_columns < 2:
+            raise ValueError("edge list must have at least two columns")
+        cols = [_arrow_to_numpy(c) for c in edge_list.columns]
+        is_str = string_vals or any(pa.types.is_string(c.type) or
+                                    pa.types.is_large_string(c.type) or
+                                    pa.types.is_dictionary(c.type)
+                                    for c in edge_list.columns[:2])
+        if is_str:
+            ends = numpy.array([cols[0], cols[1]], dtype="str").T
+        else:
+            ends = numpy.array([cols[0], cols[1]]).T
+        if not hashed and not is_str:
+            eidx = libcore.add_edge_list(self.__graph,
+                                         ends.astype("int64"), [])
+            for p, x in zip(eprops if eprops is not None else [], cols[2:]):
+                p.put(eidx, x)
+            return None
+        return self.__add_edge_list_hashed(ends, cols[2:], eprops)
+
+    def __add_edge_list_str(self, edge_list, eprops):
+        if edge_list.ndim != 2 or edge_list.shape[1] < 2:
+            raise ValueError("edge list must be of shape (E, k), with k >= 2")
+        ends = edge_list[:, :2]
+        if ends.dtype.kind == "O":
+            ends = ends.astype("str")
+        vals = [edge_list[:, i] for i in range(2, edge_list.shape[1])]
+        return self.__add_edge_list_hashed(ends, vals, eprops)
+
+    def __add_edge_list_hashed(self, ends, vals, eprops):
+        # vertices are numbered in the order in which they are first
+        # encountered, reading the edge list row by row
+        ends = numpy.ascontiguousarray(ends).ravel()
+        if ends.dtype.kind in "US":
+            # the strings are hashed natively, and in parallel, as raw bytes
+            raw = ends.view("uint8").reshape((len(ends),
+                                              ends.dtype.itemsize))
+            ids, first = libcore.hash_strings(raw)
+            uniq = ends[first]
+        else:
+            uniq, first, inv = numpy.unique(ends, return_index=True,
+                                            return_inverse=True)
+            order = numpy.argsort(first)
+            rank = numpy.empty(len(order), dtype="int64")
+            rank[order] = numpy.arange(len(order))
+            ids = rank[inv.ravel()]
+            uniq = uniq[order]
+
+        N = self.__graph.get_num_vertices(False)
+        vs = N + numpy.arange(len(uniq))
+        if len(uniq) > 0:
+            libcore.add_vertex(self.__graph, len(uniq))
+        eidx = libcore.add_edge_list(self.__graph, (N + ids).reshape((-1, 2)),
+                                     [])
+        for p, x in zip(eprops if eprops is not None else [], vals):
+            p.put(eidx, x)
+
+        if ends.dtype.kind in "US":
+            vprop = self.new_vertex_property("string")
+            vprop.put(vs, uniq.tolist())
+        else:
+            vprop = self.new_vertex_property(_gt_type(ends.dtype))
+            vprop.put(vs, uniq)
+        return vprop
+
+    def builder(self, eprops=None, batch_size=1 << 16):
+        """Return a :class:`~graph_tool.GraphBuilder` which buffers edges (and
+        the values of the edge property maps in ``eprops``), and adds them to
+        the graph in batches of size ``batch_size``. See
+        :class:`~graph_tool.GraphBuilder` for details."""
+        return GraphBuilder(self, eprops=eprops, batch_size=batch_size)
+
+    def get_edges(self):
+        """Return a :class:`~numpy.ndarray` of shape ``(E, 3)``, where ``E`` is
+        the number of edges, and each line contains the source, target and
+        index of an edge. The lines are ordered by edge index.
+
+        Examples
+        --------
+        >>> g = gt.Graph()
+        >>> g.add_edge_list([(0, 1), (1, 2), (2, 0)])
+        >>> print(g.get_edges())
+        [[0 1 0]
+         [1 2 1]
+         [2 0 2]]
+        """
+        edges = libcore.get_edge_list(self.__graph)
+        return edges.reshape((-1, 3))
+
+    def freeze(self):
+        """Return a read-only and compressed :class:`~graph_tool.FrozenGraph`
+        copy of the graph, together with its internal property maps. It
+        requires several times less memory, and can be used directly with
+        the topology, centrality and search algorithms. If the graph is
+        filtered, only the filtered vertices and edges are kept, and the
+        vertices are renumbered contiguously."""
+        return FrozenGraph(self)
+
+    def find_edges(self, pairs, all_edges=False):
+        """Return the indexes of the edges between the vertex pairs given by
+        ``pairs``, which should be a :class:`~numpy.ndarray` of shape
+        ``(M, 2)`` (or an equivalent sequence) of ``(source, target)`` vertex
+        indexes.
+
+        If ``all_edges == False``, a :class:`~numpy.ndarray` of length ``M`` is
+        returned, with the index of one edge for each pair, or ``-1`` if the
+        vertices are not connected. If ``all_edges == True``, the indexes of
+        all parallel edges are returned in compressed sparse row format, as a
+        pair ``(ids, offsets)`` of :class:`~numpy.ndarray`, where the edges of
+        ``pairs[i]`` are given by ``ids[offsets[i]:offsets[i+1]]``.
+
+        The lookups are done in parallel, each taking :math:`O(min(k(s),
+        k(t)))` time, as in :meth:`~graph_tool.Graph.edge` (or :math:`O(1)`
+        with ``all_edges == False``, if the edge lookup cache is enabled with
+        :meth:`~graph_tool.Graph.set_edge_index_cache`), but no
+        :class:`~graph_tool.Edge` descriptors are created. The indexes can be
+        used with :meth:`~graph_tool.PropertyMap.take` to obtain the edge
+        property values.
+
+        Examples
+        --------
+        >>> g = gt.Graph()
+        >>> g.add_edge_list([(0, 1), (1, 2), (2, 0), (0, 1)])
+        >>> print(g.find_edges([(0, 1), (0, 2)]))
+        [ 0 -1]
+        >>> ids, offsets = g.find_edges([(0, 1), (0, 2)], all_edges=True)
+        >>> print(ids, offsets)
+        [0 3] [0 2 2]
+        """
+        pairs = numpy.asarray(pairs, dtype="int64")
+        if pairs.ndim != 2 or pairs.shape[1] != 2:
+            pairs = pairs.reshape((-1, 2))
+        return libcore.find_edges(self.__graph,
+                                  numpy.ascontiguousarray(pairs[:, 0]),
+                                  numpy.ascontiguousarray(pairs[:, 1]),
+                                  all_edges)
+
+    def edge_ids(self, sources, targets):
+        """Return a :class:`~numpy.ndarray` with the indexes of the edges
+        ``(sources[i], targets[i])``, where ``sources`` and ``targets`` are
+        sequences of vertex indexes (e.g. :class:`~numpy.ndarray`) of the
+        same length. For pairs which are not connected, the value ``-1`` is
+        returned. If there are parallel edges, the index of one of them is
+        returned.
+
+        This is equivalent to :meth:`~graph_tool.Graph.find_edges`, with the
+        sources and targets given separately.
+
+        Examples
+        --------
+        >>> g = gt.Graph()
+        >>> g.add_edge_list([(0, 1), (1, 2), (2, 0)])
+        >>> print(g.edge_ids([0, 1, 0], [1, 2, 2]))
+        [ 0  1 -1]
+        """
+        sources = numpy.asarray(sources, dtype="int64").ravel()
+        targets = numpy.asarray(targets, dtype="int64").ravel()
+        return libcore.find_edges(self.__graph, sources, targets, False)
+
     def set_fast_edge_removal(self, fast=True):
         r"""If ``fast == True`` the fast :math:`O(1)` removal of edges will be
         enabled. This requires an additional data structure of size :math:`O(E)`
@@ -1969,12 +2668,36 @@ class Graph(object):
         enabled."""
         return self.__graph.get_keep_epos()
 
+    def set_edge_index_cache(self, cache=True):
+        r"""If ``cache == True`` a hash table of the ``(source, target)`` pairs of
+        all edges is kept, so that edge lookups via
+        :meth:`~graph_tool.Graph.edge` and :meth:`~graph_tool.Graph.find_edges`
+        (and by the C++ algorithms) take :math:`O(1)` time, instead of
+        :math:`O(min(k(s), k(t)))`. This requires an additional data structure
+        of size :math:`O(E)` to be kept at all times, and updated whenever
+        edges are added or removed. If ``cache == False``, this data structure
+        is destroyed.
+
+        .. note::
+
+           The lookup of all parallel edges (i.e. with ``all_edges == True``)
+           still requires the adjacency lists to be scanned.
+        """
+        self.__graph.set_keep_ecache(cache)
+
+    def get_edge_index_cache(self):
+        r"""Return whether the edge lookup cache is currently enabled (see
+        :meth:`~graph_tool.Graph.set_edge_index_cache`)."""
+        return self.__graph.get_keep_ecache()
+
     def clear(self):
         """Remove all vertices and edges from the graph."""
+        self.__unshare_filters()
         self.__graph.clear()
 
     def clear_edges(self):
         """Remove all edges from the graph."""
+        self.__unshare_filters()
         self.__graph.clear_edges()
 
     # Internal property maps
@@ -2015,6 +2738,10 @@ class Graph(object):
     def own_property(self, prop):
         """Return a version of the property map 'prop' (possibly belonging to
         another graph) which is owned by the current graph."""
+        if isinstance(prop, CategoricalPropertyMap):
+            return CategoricalPropertyMap(prop._PropertyMap__map, self,
+                                          prop.key_type(),
+                                          prop._shared_categories())
         return PropertyMap(prop._PropertyMap__map, self, prop.key_type())
 
     def list_properties(self):
@@ -2109,12 +2836,14 @@ class Graph(object):
            be usable, but their contents will still be tied to the old indexes,
            and thus may become scrambled.
         """
+        self.__unshare_filters()
         self.__graph.re_index_edges()
 
 
     def shrink_to_fit(self):
         """Force the physical capacity of the underlying containers to match the graph's
         actual size, potentially freeing memory back to the system."""
+        self.__unshare_filters()
         self.__graph.shrink_to_fit()
 
     # Property map creation
@@ -2138,7 +2867,20 @@ class Graph(object):
         """Create a new vertex property map of type ``value_type``, and return it. If
         provided, the values will be initialized by ``vals``, which should be
         sequence or by ``val`` which should be  a single value.
+
+        If ``value_type == "categorical"``, a
+        :class:`~graph_tool.CategoricalPropertyMap` is returned.
         """
+        if value_type == "categorical":
+            prop = CategoricalPropertyMap(new_vertex_property("int32_t",
+                                                              self.__graph.get_vertex_index(),
+                                                              libcore.any()),
+                                          self, "v")
+            if vals is not None:
+                prop.fa = prop.encode(vals)
+            elif val is not None:
+                prop.set_value(val)
+            return prop
         prop = PropertyMap(new_vertex_property(_type_alias(value_type),
                                                self.__graph.get_vertex_index(),
                                                libcore.any()),
@@ -2160,7 +2902,20 @@ class Graph(object):
         """Create a new edge property map of type ``value_type``, and return it. If
         provided, the values will be initialized by ``vals``, which should be
         sequence or by ``val`` which should be a single value.
+
+        If ``value_type == "categorical"``, a
+        :class:`~graph_tool.CategoricalPropertyMap` is returned.
         """
+        if value_type == "categorical":
+            prop = CategoricalPropertyMap(new_edge_property("int32_t",
+                                                            self.__graph.get_edge_index(),
+                                                            libcore.any()),
+                                          self, "e")
+            if vals is not None:
+                prop.fa = prop.encode(vals)
+            elif val is not None:
+                prop.set_value(val)
+            return prop
         prop = PropertyMap(new_edge_property(_c_str(_type_alias(value_type)),
                                              self.__graph.get_edge_index(),
                                              libcore.any()),
@@ -2181,6 +2936,8 @@ class Graph(object):
     def new_graph_property(self, value_type, val=None):
         """Create a new graph property map of type ``value_type``, and return
         it. If ``val`` is not None, the property is initialized to its value."""
+        if value_type == "categorical":
+            raise ValueError("categorical property maps are only supported for vertices and edges")
         prop = PropertyMap(new_graph_property(_c_str(_type_alias(value_type)),
                                               self.__graph.get_graph_index(),
                                               libcore.any()),
@@ -2204,6 +2961,12 @@ class Graph(object):
         graphs only the unmasked values are copied (with the remaining ones
         taking the type-dependent default value).
         """
+        if (isinstance(tgt, CategoricalPropertyMap) or
+            (tgt is None and
+             (value_type == "categorical" or
+              (value_type is None and
+               isinstance(src, CategoricalPropertyMap))))):
+            return self.__copy_categorical(src, tgt, g, full)
         if tgt is None:
             tgt = self.new_property(src.key_type(),
                                     (src.value_type()
@@ -2230,7 +2993,7 @@ class Graph(object):
                                  (g.num_vertices(), sf.num_vertices()))
             try:
                 sf.__graph.copy_vertex_property(g.__graph,
-                                                _prop("v", g, src),
+                                                _prop("v", g, src, write=False),
                                                 _prop("v", sf, tgt))
             except ValueError:
                 raise ValueError("property maps with the following types are"
@@ -2242,7 +3005,7 @@ class Graph(object):
                                  (g.num_edges(), sf.num_edges()))
             try:
                 sf.__graph.copy_edge_property(g.__graph,
-                                              _prop("e", g, src),
+                                              _prop("e", g, src, write=False),
                                               _prop("e", sf, tgt))
             except ValueError:
                 raise ValueError("property maps with the following types are"
@@ -2252,6 +3015,21 @@ class Graph(object):
             tgt[sf] = src[g]
         return ret
 
+    def __copy_categorical(self, src, tgt, g, full):
+        # copy the codes, and translate them to the categories of the target
+        ret = None
+        if tgt is None:
+            tgt = ret = self.new_property(src.key_type(), "categorical")
+        if isinstance(src, CategoricalPropertyMap):
+            codes = self.copy_property(src.codes, g=g, full=full)
+            cmap = tgt.encode(src.categories)
+            tgt.codes.a = cmap[codes.a]
+        else:
+            vals = self.copy_property(src, value_type="string", g=g, full=full)
+            N = len(tgt.codes.a)
+            tgt.codes.a = tgt.encode(vals.take(numpy.arange(N)))
+        return ret
+
     # degree property map
     @_limit_args({"deg": ["in", "out", "total"]})
     def degree_property_map(self, deg, weight=None):
@@ -2266,8 +3044,8 @@ class Graph(object):
     # ==============
     def __get_file_format(self, file_name):
         fmt = None
-        for f in ["gt", "graphml", "xml", "dot", "gml"]:
-            names = ["." + f, ".%s.gz" % f, ".%s.bz2" % f, ".%s.xz" % f]
+        for f in ["gt", "graphml", "xml", "dot", "gml", "frozen"]:
+            names = ["." + f] + [".%s%s" % (f, ext) for ext in _compression_ext]
             for name in names:
                 if file_name.endswith(name):
                     fmt = f
@@ -2277,11 +3055,21 @@ class Graph(object):
         return fmt
 
     def load(self, file_name, fmt="auto", ignore_vp=None, ignore_ep=None,
-             ignore_gp=None):
+             ignore_gp=None, compression="auto"):
         """Load graph from ``file_name`` (which can be either a string or a file-like
         object). The format is guessed from ``file_name``, or can be specified
         by ``fmt``, which can be either "gt", "graphml", "xml", "dot" or "gml".
-        (Note that "graphml" and "xml" are synonyms).
+        (Note that "graphml" and "xml" are synonyms). Files in the "frozen"
+        format need to be loaded with :func:`~graph_tool.load_graph`.
+
+        The compression of the file is guessed from its extension (``.gz``,
+        ``.bz2``, ``.xz`` or ``.zst``), or can be specified by
+        ``compression``, which can be either "gzip", "bzip2", "xz", "zstd" or
+        ``None``. If ``compression == None``, the file is read uncompressed,
+        regardless of its extension. The file is always decompressed
+        incrementally, in fixed-size chunks, so that memory usage does not
+        depend on the size of the file. The "zstd" compression requires the
+        `zstandard <https://pypi.org/project/zstandard/>`_ module.
 
         If provided, the parameters ``ignore_vp``, ``ignore_ep`` and
         ``ignore_gp``, should contain a list of property names (vertex, edge or
@@ -2295,18 +3083,32 @@ class Graph(object):
 
         """
 
+        f_orig = file_name
         if isinstance(file_name, (str, unicode)):
             file_name = os.path.expanduser(file_name)
             f = open(file_name) # throw the appropriate exception, if not found
+            f.close()
+            f_orig = file_name
         if fmt == 'auto' and isinstance(file_name, (str, unicode)):
             fmt = self.__get_file_format(file_name)
         elif fmt == "auto":
             fmt = "gt"
-        if isinstance(file_name, (str, unicode)) and file_name.endswith(".xz"):
-            try:
-                file_name = lzma.open(file_name, mode="rb")
-            except NameError:
-                raise NotImplementedError("lzma compression is only available in Python >= 3.3")
+        if fmt == "frozen":
+            raise ValueError("graphs in the 'frozen' format can only be loaded with load_graph()")
+        if isinstance(file_name, (str, unicode)):
+            if compression == "auto":
+                compression = _get_compression(file_name)
+            # gzip and bzip2 are decompressed natively by the C++ stream
+            # filters, but only if the extension matches, since the filters
+            # are chosen from it
+            if (compression is not None and
+                (_get_compression(file_name) != compression or
+                 compression not in ["gzip", "bzip2"])):
+                file_name = _open_compressed(file_name, "rb", compression)
+            elif compression is None and _get_compression(file_name) is not None:
+                # the stream is passed directly, so that the extension is
+                # not used to select a decompression filter
+                file_name = open(file_name, "rb")
         if fmt == "graphml":
             fmt = "xml"
         if ignore_vp is None:
@@ -2320,8 +3122,13 @@ class Graph(object):
                                                 _c_str(fmt), ignore_vp,
                                                 ignore_ep, ignore_gp)
         else:
-            props = self.__graph.read_from_file("", file_name, _c_str(fmt),
-                                                ignore_vp, ignore_ep, ignore_gp)
+            try:
+                props = self.__graph.read_from_file("", file_name,
+                                                    _c_str(fmt), ignore_vp,
+                                                    ignore_ep, ignore_gp)
+            finally:
+                if file_name is not f_orig:
+                    file_name.close()
         for name, prop in props[0].items():
             self.vertex_properties[name] = PropertyMap(prop, self, "v")
         for name, prop in props[1].items():
@@ -2341,13 +3148,41 @@ class Graph(object):
         if "_Graph__reversed" in self.graph_properties:
             self.set_reversed(True)
             del self.graph_properties["_Graph__reversed"]
+        for cname in list(self.graph_properties.keys()):
+            if not cname.startswith("_Graph__save__categories_"):
+                continue
+            k, name = cname[len("_Graph__save__categories_"):].split("_", 1)
+            if (k, name) in self.properties:
+                p = self.properties[(k, name)]
+                self.properties[(k, name)] = \
+                    CategoricalPropertyMap(p._PropertyMap__map, self, k,
+                                           list(self.graph_properties[cname])[1:])
+            del self.graph_properties[cname]
         self.shrink_to_fit()
 
-    def save(self, file_name, fmt="auto"):
+    def save(self, file_name, fmt="auto", compression="auto", level=None):
         """Save graph to ``file_name`` (which can be either a string or a file-like
         object). The format is guessed from the ``file_name``, or can be
-        specified by ``fmt``, which can be either "gt", "graphml", "xml", "dot"
-        or "gml".  (Note that "graphml" and "xml" are synonyms).
+        specified by ``fmt``, which can be either "gt", "graphml", "xml", "dot",
+        "gml" or "frozen".  (Note that "graphml" and "xml" are synonyms).
+
+        The compression is guessed from the extension of ``file_name``
+        (``.gz``, ``.bz2``, ``.xz`` or ``.zst``), or can be specified by
+        ``compression``, which can be either "gzip", "bzip2", "xz", "zstd" or
+        ``None``. If ``compression == None``, the file is written
+        uncompressed, regardless of its extension. The compression level can be
+        given by ``level``; otherwise the default of each compressor is
+        used. The "zstd" compressor runs with as many threads as given by
+        :func:`~graph_tool.openmp_get_num_threads`, and requires the
+        `zstandard <https://pypi.org/project/zstandard/>`_ module.
+
+        The "frozen" format stores the compressed adjacency of a
+        :class:`~graph_tool.FrozenGraph` (the graph is frozen first with
+        :meth:`~graph_tool.Graph.freeze`, if it is not), together with its
+        internal property maps, which need to be of the types supported by
+        :meth:`~graph_tool.Graph.to_shared_memory`. Files in this format are
+        never compressed, so that they can be memory-mapped by
+        :func:`~graph_tool.load_graph`.
 
         .. warning::
 
@@ -2357,6 +3192,28 @@ class Graph(object):
 
         """
 
+        if isinstance(file_name, (str, unicode)):
+            file_name = os.path.expanduser(file_name)
+        if fmt == 'auto' and isinstance(file_name, (str, unicode)):
+            fmt = self.__get_file_format(file_name)
+        elif fmt == "auto":
+            fmt = "gt"
+        if fmt == "graphml":
+            fmt = "xml"
+
+        if fmt == "frozen":
+            if compression == "auto" and isinstance(file_name, (str, unicode)):
+                compression = _get_compression(file_name)
+            if compression not in [None, "auto"]:
+                raise ValueError("files in the 'frozen' format cannot be compressed")
+            g = self if isinstance(self, FrozenGraph) else FrozenGraph(self)
+            if isinstance(file_name, (str, unicode)):
+                with open(file_name, "wb") as f:
+                    g._save_frozen(f)
+            else:
+                g._save_frozen(file_name)
+            return
+
         u = GraphView(self, reversed=self.is_reversed(), skip_vfilt=True,
                       skip_efilt=True)
 
@@ -2373,20 +3230,31 @@ class Graph(object):
             u.graph_properties["_Graph__reversed"] = self.new_graph_property("bool")
             u.graph_properties["_Graph__reversed"] = True
 
-        if isinstance(file_name, (str, unicode)):
-            file_name = os.path.expanduser(file_name)
-        if fmt == 'auto' and isinstance(file_name, (str, unicode)):
-            fmt = self.__get_file_format(file_name)
-        elif fmt == "auto":
-            fmt = "gt"
-        if fmt == "graphml":
-            fmt = "xml"
+        # categorical property maps are stored as integer codes, together
+        # with their categories
+        for (k, name), p in list(u.properties.items()):
+            if isinstance(p, CategoricalPropertyMap):
+                cname = "_Graph__save__categories_%s_%s" % (k, name)
+                u.graph_properties[cname] = \
+                    u.new_graph_property("vector<string>", p.categories)
 
-        if isinstance(file_name, (str, unicode)) and file_name.endswith(".xz"):
-            try:
-                file_name = lzma.open(file_name, mode="wb")
-            except NameError:
-                raise NotImplementedError("lzma compression is only available in Python >= 3.3")
+        f_orig = file_name
+        if isinstance(file_name, (str, unicode)):
+            if compression == "auto":
+                compression = _get_compression(file_name)
+            # gzip and bzip2 with default levels are compressed natively by
+            # the C++ stream filters, but only if the extension matches,
+            # since the filters are chosen from it
+            if (compression is not None and
+                (level is not None or
+                 _get_compression(file_name) != compression or
+                 compression not in ["gzip", "bzip2"])):
+                file_name = _open_compressed(file_name, "wb", compression,
+                                             level)
+            elif compression is None and _get_compression(file_name) is not None:
+                # the stream is passed directly, so that the extension is
+                # not used to select a compression filter
+                file_name = open(file_name, "wb")
 
         props = [(_c_str(name[1]), prop._PropertyMap__map) for name, prop in \
                  u.__properties.items()]
@@ -2397,7 +3265,293 @@ class Graph(object):
             f.close()
             u.__graph.write_to_file(_c_str(file_name), None, _c_str(fmt), props)
         else:
-            u.__graph.write_to_file("", file_name, _c_str(fmt), props)
+            try:
+                u.__graph.write_to_file("", file_name, _c_str(fmt), props)
+            finally:
+                if file_name is not f_orig:
+                    file_name.close()
+
+    def to_arrow(self):
+        """Return a pair ``(vertices, edges)`` of :class:`pyarrow.Table` objects
+        with the contents of the graph.
+
+        The ``edges`` table contains the columns ``"source"`` and ``"target"``,
+        followed by one column for each internal edge property map, in the
+        order of the edge indexes. The ``vertices`` table contains one column
+        for each internal vertex property map, in the order of the vertex
+        indexes. If the graph is filtered, only the unfiltered vertices and
+        edges are included, and the vertices are re-indexed contiguously.
+
+        The value type of each property map is stored in the metadata of its
+        field, and the directedness and internal graph properties in the
+        metadata of the ``edges`` table, so that the graph can be restored
+        with :meth:`~graph_tool.Graph.from_arrow`.
+
+        .. note::
+
+           Columns of scalar property maps share the memory of the property
+           maps whenever possible, i.e. for vertex properties if the vertices
+           are not filtered, and for edge properties if the edges are not
+           filtered and the edge indexes are contiguous. As with
+           :meth:`~graph_tool.PropertyMap.get_array`, such tables become
+           *invalid* if the graph is modified. Property maps with value type
+           ``object`` are not exported.
+
+        Categorical property maps (see
+        :class:`~graph_tool.CategoricalPropertyMap`) are exported as
+        dictionary-encoded columns, with their codes as indices into the
+        categories.
+
+        This requires the `pyarrow <https://arrow.apache.org/>`_ module.
+
+        """
+        pa = _get_pyarrow()
+
+        edges = self.get_edges()
+        vfilt, inverted = self.get_vertex_filter()
+        if vfilt is not None:
+            vmask = numpy.asarray(vfilt.a, dtype="bool")
+            if inverted:
+                vmask = numpy.logical_not(vmask)
+            vmap = numpy.cumsum(vmask) - 1
+            s = vmap[edges[:, 0]]
+            t = vmap[edges[:, 1]]
+        else:
+            s = edges[:, 0]
+            t = edges[:, 1]
+        eidx = edges[:, 2]
+        if len(eidx) == self.edge_index_range:
+            eidx = None        # all edges are present, in index order
+
+        efields = [pa.field("source", pa.int64()),
+                   pa.field("target", pa.int64())]
+        ecols = [pa.array(s), pa.array(t)]
+        vfields = []
+        vcols = []
+        gprops = {}
+        for (k, name), prop in self.properties.items():
+            if prop.value_type() == "python::object":
+                continue
+            if k == "g":
+                val = prop[self]
+                if prop.value_type().startswith("vector"):
+                    val = list(val)
+                gprops[name] = {"type": prop.value_type(), "value": val}
+                continue
+            col = _arrow_column(pa, self, prop, eidx)
+            field = pa.field(name, col.type,
+                             metadata={b"graph_tool.value_type":
+                                       prop.value_type().encode("utf-8")})
+            if k == "v":
+                vfields.append(field)
+                vcols.append(col)
+            else:
+                efields.append(field)
+                ecols.append(col)
+
+        emeta = {b"graph_tool.directed": json.dumps(self.is_directed()).encode("utf-8"),
+                 b"graph_tool.num_vertices": str(self.num_vertices()).encode("utf-8"),
+                 b"graph_tool.graph_properties": json.dumps(gprops).encode("utf-8")}
+        etable = pa.Table.from_arrays(ecols,
+                                      schema=pa.schema(efields,
+                                                       metadata=emeta))
+        vtable = pa.Table.from_arrays(vcols, schema=pa.schema(vfields))
+        return vtable, etable
+
+    @staticmethod
+    def from_arrow(edges, vertices=None, directed=None, source="source",
+                   target="target"):
+        """Create a new graph from the :class:`pyarrow.Table` objects
+        ``edges`` and (optionally) ``vertices``, as returned by
+        :meth:`~graph_tool.Graph.to_arrow`.
+
+        The columns ``source`` and ``target`` of the ``edges`` table must
+        contain vertex indexes, and every other column is stored as an internal
+        edge property map. Likewise, every column of ``vertices`` is stored as
+        an internal vertex property map, where the row number corresponds to
+        the vertex index. The number of vertices is the number of rows in
+        ``vertices``, or is otherwise determined from ``edges``.
+
+        The value types of the property maps are read from the field metadata
+        written by :meth:`~graph_tool.Graph.to_arrow`, or otherwise inferred
+        from the Arrow types, where dictionary-encoded string columns give
+        categorical property maps (see
+        :class:`~graph_tool.CategoricalPropertyMap`). If ``directed`` is
+        ``None``, the directedness is also read from the table metadata, and
+        the graph is directed if it is absent.
+
+        The columns of scalar types are copied directly into the property maps,
+        with a single copy for each column.
+
+        This requires the `pyarrow <https://arrow.apache.org/>`_ module.
+
+        """
+        pa = _get_pyarrow()
+
+        meta = edges.schema.metadata or {}
+        if directed is None:
+            directed = json.loads(meta.get(b"graph_tool.directed", b"true").decode("utf-8"))
+        g = Graph(directed=directed)
+
+        N = int(meta.get(b"graph_tool.num_vertices", b"0"))
+        if vertices is not None:
+            N = max(N, vertices.num_rows)
+        g.add_vertex(N)
+
+        s = edges.column(source)
+        t = edges.column(target)
+        elist = numpy.empty((edges.num_rows, 2), dtype="int64")
+        elist[:, 0] = _arrow_to_numpy(s)
+        elist[:, 1] = _arrow_to_numpy(t)
+
+        # scalar columns are copied directly into the property maps, and the
+        # remaining ones are passed to add_edge_list()
+        scalar_props = []
+        eprops = []
+        cols = []
+        for i, field in enumerate(edges.schema):
+            if field.name in [source, target]:
+                continue
+            eprop = g.new_edge_property(_arrow_value_type(pa, field))
+            g.ep[field.name] = eprop
+            if eprop.get_array() is not None:
+                scalar_props.append((i, eprop))
+            else:
+                eprops.append(eprop)
+                cols.append(edges.column(i).to_pylist())
+
+        if len(eprops) == 0:
+            g.add_edge_list(elist)
+        else:
+            g.add_edge_list(zip(elist[:, 0].tolist(), elist[:, 1].tolist(),
+                                *cols),
+                            eprops=eprops)
+        for i, eprop in scalar_props:
+            if isinstance(eprop, CategoricalPropertyMap):
+                eprop.a = _arrow_codes(pa, eprop, edges.column(i))
+            else:
+                eprop.a = _arrow_to_numpy(edges.column(i))
+
+        if vertices is not None:
+            for i, field in enumerate(vertices.schema):
+                vtype = _arrow_value_type(pa, field)
+                vprop = g.new_vertex_property(vtype)
+                if isinstance(vprop, CategoricalPropertyMap):
+                    vprop.a = _arrow_codes(pa, vprop, vertices.column(i))
+                elif vprop.get_array() is not None:
+                    vprop.a = _arrow_to_numpy(vertices.column(i))
+                else:
+                    convert = _converter(vtype)
+                    for v, x in zip(g.vertices(), vertices.column(i).to_pylist()):
+                        vprop[v] = convert(x)
+                g.vp[field.name] = vprop
+
+        gprops = json.loads(meta.get(b"graph_tool.graph_properties", b"{}").decode("utf-8"))
+        for name, val in gprops.items():
+            gprop = g.new_graph_property(val["type"])
+            gprop[g] = val["value"]
+            g.gp[name] = gprop
+        return g
+
+    def to_parquet(self, edge_file, vertex_file=None, **kwargs):
+        """Save the graph in the `Parquet <https://parquet.apache.org/>`_
+        format. The edges and their properties are written to ``edge_file``,
+        and the vertex properties to ``vertex_file``, if given. The tables are
+        the ones obtained from :meth:`~graph_tool.Graph.to_arrow`, and the
+        remaining keyword arguments are passed to
+        :func:`pyarrow.parquet.write_table`.
+
+        The graph can be loaded back with
+        :func:`~graph_tool.load_graph_from_parquet`.
+
+        """
+        pq = _get_pyarrow("parquet")
+        vtable, etable = self.to_arrow()
+        pq.write_table(etable, edge_file, **kwargs)
+        if vertex_file is not None:
+            pq.write_table(vtable, vertex_file, **kwargs)
+
+    def to_shared_memory(self, name=None, vprops=None, eprops=None,
+                         gprops=None):
+        r"""Place a compressed snapshot of the graph (see
+        :meth:`~graph_tool.Graph.freeze`) in a named shared memory segment,
+        which can be attached by other processes with
+        :meth:`~graph_tool.Graph.attach_shared_memory`. The
+        :class:`multiprocessing.shared_memory.SharedMemory` object is
+        returned, and its name can be obtained via its ``name`` attribute.
+
+        The parameters ``vprops``, ``eprops`` and ``gprops`` are lists with
+        the names of the internal property maps to be included. If they are
+        ``None``, all internal property maps of scalar, vector or categorical
+        type are included (``string`` property maps are also included for
+        graph properties). Other value types are not supported.
+
+        .. note::
+
+           The segment persists until ``unlink()`` is called on the returned
+           object, which should be done by the process that created it, once
+           all workers are done.
+
+        Examples
+        --------
+        >>> g = gt.Graph()
+        >>> g.add_edge_list([(0, 1), (1, 2), (2, 0)])
+        >>> shm = g.to_shared_memory()
+        >>> fg = gt.Graph.attach_shared_memory(shm.name)
+        >>> print(fg.get_out_neighbours(0))
+        [1]
+        >>> print(gt.shortest_distance(fg, 0).a)
+        [0 1 2]
+        >>> del fg
+        >>> shm.close()
+        >>> shm.unlink()
+        """
+        names = []
+        for props, sel, k in [(self.vp, vprops, "v"), (self.ep, eprops, "e"),
+                              (self.gp, gprops, "g")]:
+            if sel is None:
+                sel = [name for name, p in props.items()
+                       if _shared_memory_type(p.value_type(), k)]
+            for name in sel:
+                vt = props[name].value_type()
+                if not _shared_memory_type(vt, k):
+                    raise ValueError("property map '%s' of type '%s' cannot be placed in shared memory" %
+                                     (name, vt))
+            names.append(sel)
+        return FrozenGraph(self, *names).to_shared_memory(name)
+
+    @staticmethod
+    def attach_shared_memory(name, frozen=True, vprops=None, eprops=None,
+                             gprops=None):
+        r"""Attach the graph stored in the shared memory segment ``name``, as
+        created by :meth:`~graph_tool.Graph.to_shared_memory`.
+
+        If ``frozen == True``, a :class:`~graph_tool.FrozenGraph` is returned,
+        whose adjacency is a read-only view of the shared segment, which is
+        not copied. It can be passed directly (or via a
+        :class:`~graph_tool.GraphView`) to the algorithms that accept frozen
+        graphs, hence all processes share the same copy of the topology.
+        Otherwise, a new :class:`~graph_tool.Graph` is returned, which is
+        built from the shared data in :math:`O(V + E)` time, as with
+        :meth:`~graph_tool.FrozenGraph.thaw`.
+
+        The parameters ``vprops``, ``eprops`` and ``gprops`` are lists with
+        the names of the internal property maps to be attached. If they are
+        ``None``, all the property maps in the segment are attached.
+
+        .. note::
+
+           The values of the attached property maps are always copied into
+           the private memory of each process, since property maps cannot
+           be backed by the shared segment. The memory used by each process
+           is therefore proportional to the size of the selected property
+           maps, although not to the size of the topology, if ``frozen ==
+           True``.
+        """
+        fg = FrozenGraph.attach_shared_memory(name, vprops, eprops, gprops)
+        if frozen:
+            return fg
+        return fg.thaw()
 
 
     # Directedness
@@ -2445,22 +3599,40 @@ class Graph(object):
             eprop = self.new_edge_property("bool")
             eprop.a = not inverted_edges
         else:
-            eprop = self.own_property(eprop)
+            eprop = self.__own_filter(eprop)
 
         if vprop is None:
             vprop = self.new_vertex_property("bool")
             vprop.a = not inverted_vertices
         else:
-            vprop = self.own_property(vprop)
+            vprop = self.__own_filter(vprop)
 
-        self.__graph.set_vertex_filter_property(_prop("v", self, vprop),
+        self.__graph.set_vertex_filter_property(_prop("v", self, vprop,
+                                                      write=False),
                                                 inverted_vertices)
         self.__filter_state["vertex_filter"] = (vprop, inverted_vertices)
 
-        self.__graph.set_edge_filter_property(_prop("e", self, eprop),
+        self.__graph.set_edge_filter_property(_prop("e", self, eprop,
+                                                    write=False),
                                               inverted_edges)
         self.__filter_state["edge_filter"] = (eprop, inverted_edges)
 
+    def __own_filter(self, prop):
+        # a filter borrowed from another graph remains borrowed
+        filt = self.own_property(prop)
+        if prop._is_borrowed():
+            filt._borrow()
+        return filt
+
+    def __unshare_filters(self):
+        # the filters are modified directly by the structural changes of the
+        # graph (e.g. new vertices and edges are marked as visible), which
+        # must not affect the graphs that share them
+        for filt, inverted in [self.get_vertex_filter(),
+                               self.get_edge_filter()]:
+            if filt is not None:
+                filt._unshare()
+
     def set_vertex_filter(self, prop, inverted=False):
         """Set the vertex boolean filter property. Only the vertices with value
         different than ``False`` are kept in the filtered graph. If the ``inverted``
@@ -2471,7 +3643,7 @@ class Graph(object):
         if prop is not None and prop.value_type() != "bool":
             raise ValueError("filter property map must have 'bool' type")
 
-        vfilt = self.own_property(prop) if prop is not None else prop
+        vfilt = self.__own_filter(prop) if prop is not None else prop
         efilt = None
 
         eprop = self.get_edge_filter()
@@ -2482,7 +3654,8 @@ class Graph(object):
             vfilt = self.new_vertex_property("bool")
             vfilt.a = not inverted
 
-        self.__graph.set_vertex_filter_property(_prop("v", self, vfilt),
+        self.__graph.set_vertex_filter_property(_prop("v", self, vfilt,
+                                                      write=False),
                                                 inverted)
         self.__filter_state["vertex_filter"] = (vfilt, inverted)
 
@@ -2504,7 +3677,7 @@ class Graph(object):
         if prop is not None and prop.value_type() != "bool":
             raise ValueError("filter property map must have 'bool' type")
 
-        efilt = self.own_property(prop) if prop is not None else prop
+        efilt = self.__own_filter(prop) if prop is not None else prop
         vfilt = None
 
         vprop = self.get_vertex_filter()
@@ -2514,7 +3687,9 @@ class Graph(object):
         if vprop[0] is not None and efilt is None:
             efilt = self.new_edge_property("bool")
             efilt.a = not inverted
-        self.__graph.set_edge_filter_property(_prop("e", self, efilt), inverted)
+        self.__graph.set_edge_filter_property(_prop("e", self, efilt,
+                                                    write=False),
+                                              inverted)
         self.__filter_state["edge_filter"] = (efilt, inverted)
 
         if vfilt is not None:
@@ -2555,15 +3730,16 @@ class Graph(object):
            unfiltered state, use :meth:`~graph_tool.Graph.clear_filters`.
 
         """
+        self.__unshare_filters()
         if in_place:
             old_indexes = self.vertex_index.copy("int64_t")
             self.__graph.purge_vertices(_prop("v", self, old_indexes))
             self.set_vertex_filter(None)
-            for pmap in self.__known_properties.values():
+            for pmap in list(self.__known_properties.values()):
                 if (pmap() is not None and pmap().key_type() == "v" and
                     pmap().is_writable() and
                     pmap() not in [self.vertex_index, self.edge_index]):
-                    self.__graph.re_index_vertex_property(_prop("v", self, pmap()),
+                    self.__graph.re_index_vertex_property(_prop_storage(pmap()),
                                                           _prop("v", self, old_indexes))
         else:
             stamp = id(self)
@@ -2603,6 +3779,7 @@ class Graph(object):
            unfiltered state, use :meth:`~graph_tool.Graph.clear_filters`.
 
         """
+        self.__unshare_filters()
         self.__graph.purge_edges()
         self.set_edge_filter(None)
 
@@ -2654,6 +3831,14 @@ class Graph(object):
     # Pickling support
     # ================
 
+    def __reduce_ex__(self, protocol):
+        # With protocol 5, the topology and the property maps are pickled
+        # directly from their arrays, which can be transferred out-of-band.
+        if protocol >= 5 and _PickleBuffer is not None:
+            return (copyreg.__newobj__, (type(self),),
+                    self.__get_buffer_state())
+        return object.__reduce_ex__(self, protocol)
+
     def __getstate__(self):
         state = dict()
         sio = get_bytes_io()
@@ -2661,8 +3846,78 @@ class Graph(object):
         state["blob"] = sio.getvalue()
         return state
 
+    def __pickle_range(self, key_type):
+        # range of vertex or edge indexes stored in pickled property maps;
+        # it must be the same before and after unpickling
+        if key_type == "v":
+            return self.__graph.get_num_vertices(False)
+        if self.__graph.get_num_edges(False) == 0:
+            return 0
+        return self.edge_index_range
+
+    def __get_buffer_state(self):
+        u = GraphView(self, skip_properties=True, skip_vfilt=True,
+                      skip_efilt=True, reversed=self.is_reversed())
+        N = self.__pickle_range("v")
+        R = self.__pickle_range("e")
+        props = []
+        for (k, name), p in self.properties.items():
+            if k == "g":
+                vals = _converter(p.value_type())(p[self])
+            else:
+                vals = _pickle_values(p, N if k == "v" else R)
+            props.append((k, name, p.value_type(), vals))
+        state = dict(buffers=True, directed=self.is_directed(),
+                     reversed=self.is_reversed(), N=N, R=R,
+                     edges=_pickle_buffer(u.get_edges()), properties=props)
+        for k, (filt, inv) in [("v", self.get_vertex_filter()),
+                               ("e", self.get_edge_filter())]:
+            if filt is not None:
+                state[k + "filt"] = (_pickle_values(filt, N if k == "v" else R),
+                                     inv)
+        return state
+
+    def __set_buffer_state(self, state):
+        self.__init__(directed=state["directed"])
+        N, R = state["N"], state["R"]
+        if N > 0:
+            self.add_vertex(N)
+        if R > 0:
+            # the edges are inserted in index order, with placeholders for
+            # the unused indexes, so that all edge indexes are preserved
+            edges = _unpickle_buffer(state["edges"])
+            elist = numpy.zeros((R, 2), dtype="int64")
+            elist[edges[:, 2]] = edges[:, :2]
+            self.add_edge_list(elist)
+            unused = numpy.ones(R, dtype="bool")
+            unused[edges[:, 2]] = False
+            if unused.any():
+                self.remove_edges(unused)
+        for k, name, value_type, vals in state["properties"]:
+            p = self.new_property(k, value_type)
+            if k == "g":
+                p[self] = vals
+            else:
+                _unpickle_values(p, N if k == "v" else R, vals)
+            self.properties[(k, name)] = p
+        if state.get("vfilt") is not None:
+            vals, inv = state["vfilt"]
+            vfilt = self.new_vertex_property("bool")
+            _unpickle_values(vfilt, N, vals)
+            self.set_vertex_filter(vfilt, inv)
+        if state.get("efilt") is not None:
+            vals, inv = state["efilt"]
+            efilt = self.new_edge_property("bool")
+            _unpickle_values(efilt, R, vals)
+            self.set_edge_filter(efilt, inv)
+        if state["reversed"]:
+            self.set_reversed(True)
+
     def __setstate__(self, state):
         conv_pickle_state(state)
+        if state.get("buffers", False):
+            self.__set_buffer_state(state)
+            return
         self.__init__()
         blob = state["blob"]
         if blob != "":
@@ -2680,18 +3935,77 @@ class Graph(object):
                 self.load(stream, "xml")
 
 
+_compression_ext = collections.OrderedDict([(".gz", "gzip"),
+                                            (".bz2", "bzip2"),
+                                            (".xz", "xz"),
+                                            (".zst", "zstd")])
+
+def _get_compression(file_name):
+    """Guess the compression of ``file_name`` from its extension."""
+    for ext, compression in _compression_ext.items():
+        if file_name.endswith(ext):
+            return compression
+    return None
+
+def _open_compressed(file_name, mode, compression, level=None):
+    """Return a file object that (de)compresses ``file_name`` incrementally,
+    using the given ``compression``."""
+    if compression == "gzip":
+        return gzip.open(file_name, mode,
+                         compresslevel=level if level is not None else 9)
+    elif compression == "bzip2":
+        return bz2.open(file_name, mode,
+                        compresslevel=level if level is not None else 9)
+    elif compression == "xz":
+        try:
+            return lzma.open(file_name, mode, preset=level)
+        except NameError:
+            raise NotImplementedError("lzma compression is only available in Python >= 3.3")
+    elif compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise NotImplementedError("zstd compression requires the 'zstandard' module")
+        if "r" in mode:
+            dctx = zstandard.ZstdDecompressor()
+            f = dctx.stream_reader(open(file_name, "rb"), closefd=True)
+        else:
+            threads = openmp_get_num_threads() if openmp_enabled() else 0
+            cctx = zstandard.ZstdCompressor(level=level if level is not None else 3,
+                                            threads=threads if threads > 1 else 0)
+            f = cctx.stream_writer(open(file_name, "wb"), closefd=True)
+        if "t" in mode:
+            f = io.TextIOWrapper(f)
+        return f
+    else:
+        raise ValueError("invalid compression: " + str(compression))
+
 def load_graph(file_name, fmt="auto", ignore_vp=None, ignore_ep=None,
-               ignore_gp=None):
+               ignore_gp=None, mmap=False, compression="auto"):
     """Load a graph from ``file_name`` (which can be either a string or a file-like object).
 
     The format is guessed from ``file_name``, or can be specified by ``fmt``,
-    which can be either "gt", "graphml", "xml", "dot" or "gml".  (Note that
-    "graphml" and "xml" are synonyms).
+    which can be either "gt", "graphml", "xml", "dot", "gml" or "frozen".
+    (Note that "graphml" and "xml" are synonyms).
 
     If provided, the parameters ``ignore_vp``, ``ignore_ep`` and
     ``ignore_gp``, should contain a list of property names (vertex, edge or
     graph, respectively) which should be ignored when reading the file.
 
+    Files in the "frozen" format (see :meth:`~graph_tool.Graph.save`) are
+    returned as a :class:`~graph_tool.FrozenGraph`. If ``mmap == True``, and
+    ``file_name`` is a string, the file is mapped into memory, and the
+    adjacency of the graph is a read-only view of the mapping, which is not
+    copied. Its pages are only read from disk as they are accessed, and are
+    shared via the page cache between all processes that map the same file.
+    The internal property maps are copied into private memory, as with
+    :meth:`~graph_tool.Graph.attach_shared_memory`. This option is only
+    supported with the "frozen" format.
+
+    The compression is guessed from the file extension, or can be specified
+    by ``compression``, which can be either "gzip", "bzip2", "xz", "zstd" or
+    ``None``. Compressed files are decompressed incrementally.
+
     .. warning::
 
        The only file formats which are capable of perfectly preserving the
@@ -2699,8 +4013,21 @@ def load_graph(file_name, fmt="auto", ignore_vp=None, ignore_ep=None,
        they should be preferred over the other formats whenever possible.
 
     """
+    if isinstance(file_name, (str, unicode)):
+        file_name = os.path.expanduser(file_name)
+        if fmt == "auto" and file_name.endswith(".frozen"):
+            fmt = "frozen"
+    if fmt == "frozen":
+        if mmap and not isinstance(file_name, (str, unicode)):
+            raise ValueError("mmap=True requires a file name")
+        ignore = {"v": ignore_vp or [], "e": ignore_ep or [],
+                  "g": ignore_gp or []}
+        return FrozenGraph._load_frozen(file_name, mmap, ignore)
+    if mmap:
+        raise ValueError("mmap=True is only supported with the 'frozen' format")
     g = Graph()
-    g.load(file_name, fmt, ignore_vp, ignore_ep, ignore_gp)
+    g.load(file_name, fmt, ignore_vp, ignore_ep, ignore_gp,
+           compression=compression)
     return g
 
 def load_graph_from_csv(file_name, directed=True, eprop_types=None,
@@ -2746,21 +4073,38 @@ def load_graph_from_csv(file_name, directed=True, eprop_types=None,
         internal edge property maps. If ``hashed == True``, it will also contain
         an internal vertex property map with the vertex names.
 
+    Notes
+    -----
+    If ``file_name`` is the path of an uncompressed file, ``csv_options``
+    contains only the ``delimiter`` and ``quotechar`` options, and all edge
+    properties have scalar or string types, the file is read by a native
+    parser, which splits it into byte ranges and parses them in parallel,
+    using all OpenMP threads (see :func:`~graph_tool.openmp_set_num_threads`).
+    In this case, quoted values must not contain line breaks. Otherwise the
+    file is read row by row with :func:`csv.reader`. In both cases, if
+    ``string_vals == False`` and ``hashed == True`` the vertex names are
+    stored in a property map of type ``int64_t``.
+
     """
+    _csv_options = {"delimiter": ",", "quotechar": '"'}
+    _csv_options.update(csv_options)
+
+    if (isinstance(file_name, (str, unicode)) and
+        _get_compression(file_name) is None and
+        set(_csv_options.keys()) <= set(["delimiter", "quotechar"]) and
+        all(len(x) == 1 for x in _csv_options.values()) and
+        (eprop_types is None or
+         all(_type_alias(t) in _csv_native_types for t in eprop_types))):
+        return _load_graph_from_csv_native(file_name, directed, eprop_types,
+                                           eprop_names, string_vals, hashed,
+                                           skip_first, ecols, _csv_options)
+
     if isinstance(file_name, (str, unicode)):
-        if file_name.endswith(".xz"):
-            try:
-                file_name = lzma.open(file_name, mode="r")
-            except ImportError:
-                raise NotImplementedError("lzma compression is only available in Python >= 3.3")
-        elif file_name.endswith(".gz"):
-            file_name = gzip.open(file_name, mode="r")
-        elif file_name.endswith(".bz2"):
-            file_name = bz2.open(file_name, mode="r")
+        compression = _get_compression(file_name)
+        if compression is not None:
+            file_name = _open_compressed(file_name, "rt", compression)
         else:
             file_name = open(file_name, "r")
-    _csv_options = {"delimiter": ",", "quotechar": '"'}
-    _csv_options.update(csv_options)
     r = csv.reader(file_name, **_csv_options)
     if skip_first:
         next(r)
@@ -2785,15 +4129,80 @@ def load_graph_from_csv(file_name, directed=True, eprop_types=None,
     line = next(r)
     g = Graph(directed=directed)
 
+    if eprop_types is None:
+        eprops = [g.new_ep("string") for x in line[2:]]
+    else:
+        # categorical maps are filled as string maps, and converted afterwards
+        eprops = [g.new_ep(t if t != "categorical" else "string")
+                  for t in eprop_types]
+
+    if hashed and not string_vals:
+        # the vertex values are hashed natively into an "int64_t" map, as
+        # done by the native parser
+        convert = [_converter(p.value_type()) for p in eprops]
+        rows = ([row[0], row[1]] + [c(x) for c, x in zip(convert, row[2:])]
+                for row in itertools.chain([line], r))
+        name = g.new_vp("int64_t")
+        libcore.add_edge_list_hashed(g._Graph__graph, rows,
+                                     _prop("v", g, name), False,
+                                     [_prop("e", g, p) for p in eprops])
+    else:
+        name = g.add_edge_list(itertools.chain([line], r),
+                               string_vals=string_vals,
+                               hashed=string_vals, eprops=eprops)
+
+    for i, p in enumerate(eprops):
+        if eprop_types is not None and eprop_types[i] == "categorical":
+            p = p.copy(value_type="categorical")
+        if eprop_names:
+            ename = eprop_names[i]
+        else:
+            ename = "c%d" % i
+        g.ep[ename] = p
+
+    if name is not None:
+        g.vp.name = name
+    return g
+
+_csv_native_types = ["bool", "int16_t", "int32_t", "int64_t", "double",
+                     "long double", "string"]
+
+def _load_graph_from_csv_native(file_name, directed, eprop_types, eprop_names,
+                                string_vals, hashed, skip_first, ecols,
+                                csv_options):
+    file_name = os.path.expanduser(file_name)
+
+    # the number of columns is obtained from the first row
+    with open(file_name, "r") as f:
+        r = csv.reader(f, **csv_options)
+        if skip_first:
+            next(r)
+        line = []
+        while len(line) == 0:
+            line = next(r)
+
+    g = Graph(directed=directed)
+
     if eprop_types is None:
         eprops = [g.new_ep("string") for x in line[2:]]
     else:
         eprops = [g.new_ep(t) for t in eprop_types]
 
-    name = g.add_edge_list(itertools.chain([line], r),
-                           string_vals=string_vals,
-                           hashed=hashed or string_vals,
-                           eprops=eprops)
+    if string_vals:
+        name = g.new_vp("string")
+        hash_mode = 1
+    elif hashed:
+        name = g.new_vp("int64_t")
+        hash_mode = 2
+    else:
+        name = None
+        hash_mode = 0
+
+    libcore.load_csv_edges(g._Graph__graph, _c_str(file_name),
+                           csv_options["delimiter"], csv_options["quotechar"],
+                           skip_first, int(ecols[0]), int(ecols[1]), hash_mode,
+                           _prop("v", g, name),
+                           [_prop("e", g, p) for p in eprops])
 
     for i, p in enumerate(eprops):
         if eprop_names:
@@ -2806,6 +4215,125 @@ def load_graph_from_csv(file_name, directed=True, eprop_types=None,
         g.vp.name = name
     return g
 
+def load_graph_from_parquet(edge_file, vertex_file=None, directed=None,
+                            source="source", target="target"):
+    """Load a graph from the `Parquet <https://parquet.apache.org/>`_ files
+    ``edge_file`` and (optionally) ``vertex_file``, which can be either
+    strings or file-like objects.
+
+    The files are read as :class:`pyarrow.Table` objects, and the graph is
+    created with :meth:`~graph_tool.Graph.from_arrow`, where the meaning of
+    the remaining parameters is described. Files written by
+    :meth:`~graph_tool.Graph.to_parquet` are restored with all their internal
+    property maps.
+
+    This requires the `pyarrow <https://arrow.apache.org/>`_ module.
+
+    """
+    pq = _get_pyarrow("parquet")
+    edges = pq.read_table(edge_file)
+    vertices = None
+    if vertex_file is not None:
+        vertices = pq.read_table(vertex_file)
+    return Graph.from_arrow(edges, vertices, directed=directed, source=source,
+                            target=target)
+
+def _get_pyarrow(module=None):
+    try:
+        import pyarrow
+        if module == "parquet":
+            import pyarrow.parquet
+            return pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise NotImplementedError("Arrow support requires the 'pyarrow' module")
+
+def _arrow_column(pa, g, prop, eidx):
+    # Return an arrow array with the values of the vertex or edge property
+    # map, sharing its memory if possible.
+    if isinstance(prop, CategoricalPropertyMap):
+        # dictionary-encoded column, with the codes as indices
+        return pa.DictionaryArray.from_arrays(
+            _arrow_column(pa, g, prop.codes, eidx),
+            pa.array(prop.categories, type=pa.string()))
+    if prop.key_type() == "v":
+        a = prop.fa
+    else:
+        a = prop.get_array()
+        if a is not None:
+            a = a if eidx is None else a[eidx]
+    if a is not None:
+        a = numpy.asarray(a)
+        if prop.value_type() == "bool":
+            a = numpy.asarray(a, dtype="bool")
+        elif prop.value_type() == "long double":
+            a = numpy.asarray(a, dtype="float64")
+        return pa.array(a)
+
+    # non-scalar types
+    if prop.value_type().startswith("vector"):
+        convert = list
+    else:
+        convert = lambda x: x
+    if prop.key_type() == "v":
+        vals = [convert(prop[v]) for v in g.vertices()]
+    else:
+        vals = [None] * g.edge_index_range
+        eindex = g.edge_index
+        for e in g.edges():
+            vals[eindex[e]] = convert(prop[e])
+        if eidx is not None:
+            vals = [vals[i] for i in eidx]
+    return pa.array(vals)
+
+def _arrow_value_type(pa, field):
+    # Obtain the value type of the property map corresponding to the arrow
+    # field, either from its metadata, or inferred from its arrow type.
+    meta = field.metadata or {}
+    if b"graph_tool.value_type" in meta:
+        return meta[b"graph_tool.value_type"].decode("utf-8")
+    t = field.type
+    if pa.types.is_dictionary(t):
+        vtype = _arrow_value_type(pa, pa.field(field.name, t.value_type))
+        return "categorical" if vtype == "string" else vtype
+    if pa.types.is_list(t) or pa.types.is_large_list(t):
+        vtype = _arrow_value_type(pa, t.value_field)
+        if vtype in ["object", "string"] or vtype.startswith("vector"):
+            return "object" if vtype != "string" else "vector<string>"
+        return "vector<%s>" % vtype
+    if pa.types.is_boolean(t):
+        return "bool"
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        return "string"
+    if pa.types.is_integer(t) or pa.types.is_floating(t):
+        return _gt_type(numpy.dtype(t.to_pandas_dtype()))
+    return "object"
+
+def _arrow_codes(pa, prop, col):
+    # Return the codes of the categorical property map corresponding to the
+    # values of the arrow column, adding new categories to it as needed.
+    if not pa.types.is_dictionary(col.type):
+        return prop.encode(col.to_pylist())
+    codes = [numpy.array([], dtype="int32")]
+    for chunk in col.chunks:
+        # null values are mapped to the empty string, with code zero
+        cmap = numpy.concatenate(([0], prop.encode(chunk.dictionary.to_pylist())))
+        idx = chunk.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        codes.append(cmap[idx + 1])
+    return numpy.concatenate(codes)
+
+def _is_arrow_table(obj):
+    return (type(obj).__module__.startswith("pyarrow") and
+            hasattr(obj, "columns"))
+
+def _arrow_to_numpy(col):
+    # Convert an arrow column to a numpy array, without copying if possible.
+    if _get_pyarrow().types.is_dictionary(col.type):
+        col = col.cast(col.type.value_type)
+    if col.num_chunks == 1:
+        return col.chunk(0).to_numpy(zero_copy_only=False)
+    return col.to_numpy()
+
 
 class GraphView(Graph):
     """A view of selected vertices or edges of another graph.
@@ -2836,11 +4364,26 @@ class GraphView(Graph):
 
     If ``reversed == True``, the direction of the edges is reversed.
 
+    If ``vectorized == True``, the functions given as ``vfilt`` and ``efilt``
+    are called only once, with a :class:`~numpy.ndarray` containing the
+    indexes of all (unfiltered) vertices, or with an array of shape ``(E,
+    3)`` containing the source, target and index of all (unfiltered) edges,
+    as returned by :meth:`~graph_tool.Graph.get_edges`, respectively. They
+    should return a boolean array of the same length, which avoids calling
+    them for every vertex or edge.
+
     If ``vfilt`` or ``efilt`` is anything other than a
     :class:`~graph_tool.PropertyMap` instance, the instantiation running time is
     :math:`O(V)` and :math:`O(E)`, respectively. Otherwise, the running time is
     :math:`O(1)`.
 
+    The filters already present in ``g`` are shared with the view, and are
+    copied only when either graph modifies them, i.e. when their values are
+    set, when their arrays are accessed via :meth:`~PropertyMap.get_array`,
+    or when vertices or edges are added to or removed from a filtered graph.
+    Hence, creating nested views does not copy the filters, unless ``vfilt``
+    or ``efilt`` are given.
+
     If either ``skip_properties``, ``skip_vfilt`` or ``skip_efilt`` is ``True``,
     then the internal properties, vertex filter or edge filter of the original
     graph are ignored, respectively.
@@ -2849,7 +4392,7 @@ class GraphView(Graph):
 
     def __init__(self, g, vfilt=None, efilt=None, directed=None,
                  reversed=False, skip_properties=False, skip_vfilt=False,
-                 skip_efilt=False):
+                 skip_efilt=False, vectorized=False):
         self.__base = g if not isinstance(g, GraphView) else g.base
         Graph.__init__(self)
         # copy graph reference
@@ -2861,27 +4404,31 @@ class GraphView(Graph):
             for k, v in g.properties.items():
                 self.properties[k] = self.own_property(v)
 
-        # set already existing filters
+        # set already existing filters, which are shared with g until either
+        # of them is modified
         if not skip_efilt:
             ef = list(g.get_edge_filter())
-            if ef[0] is not None:
-                ef[0] = self.own_property(ef[0].copy())
         else:
             ef = [None, False]
         if not skip_vfilt:
             vf = list(g.get_vertex_filter())
-            if vf[0] is not None:
-                vf[0] = self.own_property(vf[0].copy())
         else:
             vf = [None, False]
 
         self.set_filters(ef[0], vf[0], ef[1], vf[1])
+        for filt, inherited in [(self.get_edge_filter()[0], ef[0]),
+                                (self.get_vertex_filter()[0], vf[0])]:
+            if inherited is not None and not filt._is_borrowed():
+                filt._borrow()
 
         if efilt is not None:
             if type(efilt) is not PropertyMap:
                 emap = self.new_edge_property("bool")
                 if isinstance(efilt, collections.Iterable):
                     emap.fa = efilt
+                elif vectorized:
+                    es = self.get_edges()
+                    emap.a[es[:, 2]] = numpy.asarray(efilt(es), dtype="bool")
                 else:
                     for e in g.edges():
                         emap[e] = efilt(e)
@@ -2902,6 +4449,12 @@ class GraphView(Graph):
                 vmap = self.new_vertex_property("bool")
                 if isinstance(vfilt, collections.Iterable):
                     vmap.fa = vfilt
+                elif vectorized:
+                    if vf[0] is None:
+                        vs = numpy.arange(self.num_vertices(True))
+                    else:
+                        vs = numpy.flatnonzero(vf[0]._get_data().astype("bool") != vf[1])
+                    vmap.a[vs] = numpy.asarray(vfilt(vs), dtype="bool")
                 else:
                     for v in g.vertices():
                         vmap[v] = vfilt(v)
@@ -2937,6 +4490,669 @@ class GraphView(Graph):
         self.__init__(g)
 
 
+class GraphBuilder(object):
+    """Buffer for the incremental construction of a :class:`~graph_tool.Graph`
+    ``g`` from a stream of edges.
+
+    The edges, together with the values of the edge property maps given by
+    the list ``eprops``, are accumulated in :class:`~numpy.ndarray` buffers,
+    and are added to the graph in a single call to the native edge list
+    insertion routine whenever ``batch_size`` edges are pending, when
+    :meth:`~graph_tool.GraphBuilder.flush` is called, or when the builder is
+    used as a context manager and the ``with`` block is left. The storage of
+    the property maps is grown geometrically, via
+    :meth:`~graph_tool.PropertyMap.reserve`. As in
+    :meth:`~graph_tool.Graph.add_edge_list`, vertices that do not yet exist
+    are created.
+
+    Instances of this class are normally obtained via
+    :meth:`~graph_tool.Graph.builder`.
+
+    .. note::
+
+       If the ``with`` block is left due to an exception, the pending edges
+       are discarded.
+
+    Examples
+    --------
+    >>> g = gt.Graph()
+    >>> w = g.new_edge_property("double")
+    >>> with g.builder(eprops=[w]) as b:
+    ...     b.add_edge(0, 1, 0.5)
+    ...     b.add_edges([(1, 2), (2, 0)], [1.5, 2.5])
+    >>> print(g.get_edges(), w.a)
+    [[0 1 0]
+     [1 2 1]
+     [2 0 2]] [ 0.5  1.5  2.5]
+    """
+
+    def __init__(self, g, eprops=None, batch_size=1 << 16):
+        self.__g = g
+        self.__eprops = list(eprops) if eprops is not None else []
+        for p in self.__eprops:
+            if p.key_type() != "e":
+                raise ValueError("only edge property maps can be used")
+        self.__batch_size = max(int(batch_size), 1)
+        self.__edges = numpy.empty((self.__batch_size, 2), dtype="int64")
+        self.__vals = [self.__new_buffer(p, self.__batch_size)
+                       for p in self.__eprops]
+        self.__n = 0
+        self.__capacity = g.edge_index_range
+
+    @staticmethod
+    def __new_buffer(p, n):
+        if p.value_type() in _bulk_dtypes:
+            return numpy.empty(n, dtype=_bulk_dtypes[p.value_type()])
+        return [None] * n
+
+    def __grow(self, n):
+        # grow the buffers geometrically, for insertions larger than a batch
+        cap = len(self.__edges)
+        if n <= cap:
+            return
+        cap = max(2 * cap, n)
+        edges = numpy.empty((cap, 2), dtype="int64")
+        edges[:self.__n] = self.__edges[:self.__n]
+        self.__edges = edges
+        for i, p in enumerate(self.__eprops):
+            vals = self.__new_buffer(p, cap)
+            vals[:self.__n] = self.__vals[i][:self.__n]
+            self.__vals[i] = vals
+
+    def add_edge(self, source, target, *vals):
+        """Append the edge ``(source, target)``, with values ``vals`` for the
+        edge property maps, to the buffer."""
+        if len(vals) != len(self.__eprops):
+            raise ValueError("expected %d property values, got %d" %
+                             (len(self.__eprops), len(vals)))
+        n = self.__n
+        self.__edges[n, 0] = int(source)
+        self.__edges[n, 1] = int(target)
+        for buf, x in zip(self.__vals, vals):
+            buf[n] = x
+        self.__n += 1
+        if self.__n >= self.__batch_size:
+            self.flush()
+
+    def add_edges(self, edges, *vals):
+        """Append the edges in ``edges``, which should be an array of shape
+        ``(E, 2)``, with values given by the sequences ``vals`` for the edge
+        property maps, to the buffer."""
+        edges = numpy.asarray(edges, dtype="int64").reshape((-1, 2))
+        if len(vals) != len(self.__eprops):
+            raise ValueError("expected %d property values, got %d" %
+                             (len(self.__eprops), len(vals)))
+        m = len(edges)
+        n = self.__n
+        self.__grow(n + m)
+        self.__edges[n:n + m] = edges
+        for i, x in enumerate(vals):
+            if len(x) != m:
+                raise ValueError("expected %d property values, got %d" %
+                                 (m, len(x)))
+            if isinstance(self.__vals[i], numpy.ndarray):
+                self.__vals[i][n:n + m] = x
+            else:
+                self.__vals[i][n:n + m] = list(x)
+        self.__n += m
+        if self.__n >= self.__batch_size:
+            self.flush()
+
+    def flush(self):
+        """Add all pending edges to the graph."""
+        n = self.__n
+        if n == 0:
+            return
+        g = self.__g
+        needed = g.edge_index_range + n
+        if needed > self.__capacity:
+            self.__capacity = max(2 * self.__capacity, needed)
+            for p in self.__eprops:
+                p.reserve(self.__capacity)
+        g._Graph__unshare_filters()
+        eidx = libcore.add_edge_list(g._Graph__graph, self.__edges[:n], [])
+        for p, buf in zip(self.__eprops, self.__vals):
+            p.put(eidx, buf[:n])
+        self.__n = 0
+        if len(self.__edges) > self.__batch_size:
+            self.__edges = numpy.empty((self.__batch_size, 2), dtype="int64")
+            self.__vals = [self.__new_buffer(p, self.__batch_size)
+                           for p in self.__eprops]
+
+    def __len__(self):
+        return self.__n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.__n = 0
+        return False
+
+
+def _varint_encode(x):
+    """Encode the non-negative integers in ``x`` as a byte array, using a
+    variable-length (LEB128) encoding of 7 bits per byte."""
+    x = numpy.asarray(x, dtype="uint64")
+    nb = _varint_len(x)
+    buf = numpy.empty(int(nb.sum()), dtype="uint8")
+    pos = numpy.cumsum(nb) - nb
+    for k in range(int(nb.max()) if len(nb) > 0 else 0):
+        m = nb > k
+        byte = (x[m] >> numpy.uint64(7 * k)) & numpy.uint64(0x7f)
+        byte[nb[m] - 1 > k] |= numpy.uint64(0x80)
+        buf[pos[m] + k] = byte
+    return buf
+
+def _varint_len(x):
+    """Return the number of bytes required to encode each value in ``x``
+    with :func:`_varint_encode`."""
+    x = numpy.asarray(x, dtype="uint64")
+    nb = numpy.ones(len(x), dtype="int64")
+    for k in range(1, 10):
+        nb += x >= numpy.uint64(1 << (7 * k))
+    return nb
+
+def _varint_decode(buf):
+    """Decode a byte array produced by :func:`_varint_encode`."""
+    buf = numpy.asarray(buf, dtype="uint8")
+    if len(buf) == 0:
+        return numpy.array([], dtype="uint64")
+    term = buf < 0x80
+    starts = numpy.flatnonzero(numpy.concatenate(([True], term[:-1])))
+    gid = numpy.cumsum(numpy.concatenate(([0], term[:-1])))
+    shift = (numpy.arange(len(buf)) - starts[gid]) * 7
+    vals = ((buf & 0x7f).astype("uint64") << shift.astype("uint64"))
+    return numpy.bitwise_or.reduceat(vals, starts)
+
+def _min_uint(n):
+    return "uint32" if n < 2 ** 32 else "uint64"
+
+def _get_shared_memory():
+    try:
+        from multiprocessing import shared_memory
+        return shared_memory
+    except ImportError:
+        raise NotImplementedError("Shared memory support requires Python 3.8 or above")
+
+def _shared_memory_type(value_type, key_type):
+    if value_type in _bulk_dtypes or value_type == "categorical":
+        return True
+    if value_type.startswith("vector") and value_type[7:-1] in _bulk_dtypes:
+        return True
+    return key_type == "g" and value_type != "python::object"
+
+def _align(n, size=64):
+    return (n + size - 1) // size * size
+
+# start of the shared memory segments and files with frozen graphs
+_frozen_magic = b"\xe2\x9b\xbe gt-f"
+
+
+class FrozenGraph(Graph):
+    """A read-only :class:`~graph_tool.Graph`, with a compressed adjacency, as
+    returned by :meth:`~graph_tool.Graph.freeze`.
+
+    The adjacency is stored in compressed sparse row (CSR) format, both for
+    the out- and in-edges. The neighbours of each vertex are sorted, and
+    stored as variable-length encoded differences between consecutive
+    indexes, which typically require only one or two bytes each. The edge
+    indexes and row offsets are stored as 32-bit integers, whenever they
+    fit. This requires several times less memory than a
+    :class:`~graph_tool.Graph`, which stores two pairs of 64-bit integers
+    per edge.
+
+    A frozen graph can be iterated over, and used with graph views and
+    property maps, like any other graph. Only the following algorithms
+    accept it:
+
+    - :mod:`~graph_tool.topology`:
+      :func:`~graph_tool.topology.shortest_distance`,
+      :func:`~graph_tool.topology.shortest_path`,
+      :func:`~graph_tool.topology.all_predecessors`,
+      :func:`~graph_tool.topology.all_shortest_paths`,
+      :func:`~graph_tool.topology.all_paths`,
+      :func:`~graph_tool.topology.label_components` (including the
+      attractors), :func:`~graph_tool.topology.label_biconnected_components`,
+      :func:`~graph_tool.topology.label_out_component` and
+      :func:`~graph_tool.topology.kcore_decomposition`.
+    - :mod:`~graph_tool.centrality`:
+      :func:`~graph_tool.centrality.pagerank`,
+      :func:`~graph_tool.centrality.betweenness`,
+      :func:`~graph_tool.centrality.closeness`,
+      :func:`~graph_tool.centrality.eigenvector` and
+      :func:`~graph_tool.centrality.katz`.
+    - :mod:`~graph_tool.search`:
+      :func:`~graph_tool.search.bfs_search`,
+      :func:`~graph_tool.search.bfs_iterator`,
+      :func:`~graph_tool.search.dfs_search`,
+      :func:`~graph_tool.search.dfs_iterator`,
+      :func:`~graph_tool.search.dijkstra_search` and
+      :func:`~graph_tool.search.dijkstra_iterator`.
+
+    All other functions raise a :exc:`RuntimeError`. This includes, in
+    particular, :func:`~graph_tool.topology.pseudo_diameter`,
+    :func:`~graph_tool.topology.similarity`,
+    :func:`~graph_tool.topology.vertex_similarity`,
+    :func:`~graph_tool.topology.isomorphism`,
+    :func:`~graph_tool.topology.subgraph_isomorphism`,
+    :func:`~graph_tool.topology.min_spanning_tree`,
+    :func:`~graph_tool.topology.random_spanning_tree`,
+    :func:`~graph_tool.topology.dominator_tree`,
+    :func:`~graph_tool.topology.topological_sort`,
+    :func:`~graph_tool.topology.transitive_closure`,
+    :func:`~graph_tool.topology.tsp_tour`,
+    :func:`~graph_tool.topology.sequential_vertex_coloring`,
+    :func:`~graph_tool.topology.is_bipartite`,
+    :func:`~graph_tool.topology.is_planar`,
+    :func:`~graph_tool.topology.make_maximal_planar`,
+    :func:`~graph_tool.topology.is_DAG`,
+    :func:`~graph_tool.topology.max_cardinality_matching`,
+    :func:`~graph_tool.topology.max_independent_vertex_set`,
+    :func:`~graph_tool.topology.edge_reciprocity`,
+    :func:`~graph_tool.centrality.hits`,
+    :func:`~graph_tool.centrality.eigentrust`,
+    :func:`~graph_tool.centrality.trust_transitivity`,
+    :func:`~graph_tool.search.astar_search`,
+    :func:`~graph_tool.search.bellman_ford_search`, and every function in
+    :mod:`~graph_tool.stats`, :mod:`~graph_tool.clustering`,
+    :mod:`~graph_tool.correlations`, :mod:`~graph_tool.flow`,
+    :mod:`~graph_tool.spectral`, :mod:`~graph_tool.dynamics`,
+    :mod:`~graph_tool.generation`, :mod:`~graph_tool.inference`,
+    :mod:`~graph_tool.draw` and :mod:`~graph_tool.util`. Any operation that
+    adds or removes vertices or edges also raises a :exc:`RuntimeError`. A
+    mutable copy, which can be used with all functions, is obtained with
+    :meth:`~graph_tool.FrozenGraph.thaw`. The internal property maps are
+    ordinary property maps, which can be modified.
+
+    Frozen graphs cannot be filtered or reversed themselves, but a
+    :class:`~graph_tool.GraphView` of a frozen graph can. Property maps
+    cannot be copied between frozen and mutable graphs with
+    :meth:`~graph_tool.Graph.copy_property`.
+
+    The compressed arrays can be saved to a file in the "frozen" format (see
+    :meth:`~graph_tool.Graph.save`), which :func:`~graph_tool.load_graph`
+    can map into memory instead of reading it, or placed in shared memory
+    (see :meth:`~graph_tool.Graph.to_shared_memory`). In both cases the
+    adjacency is used in place, without being copied.
+
+    Examples
+    --------
+    >>> g = gt.Graph()
+    >>> g.add_edge_list([(0, 1), (0, 2), (2, 1)])
+    >>> fg = g.freeze()
+    >>> print(fg.get_out_neighbours(0), fg.get_in_neighbours(1))
+    [1 2] [0 2]
+    >>> print(gt.shortest_distance(fg, 0).a)
+    [0 1 1]
+    >>> print(fg.thaw().get_edges())
+    [[0 1 0]
+     [0 2 1]
+     [2 1 2]]
+    """
+
+    def __init__(self, g, vprops=None, eprops=None, gprops=None):
+        if (isinstance(g, GraphView) or g.get_vertex_filter()[0] is not None or
+            g.get_edge_filter()[0] is not None or g.is_reversed()):
+            g = Graph(g, prune=True)
+
+        # the edges are renumbered contiguously, in the order of their indexes
+        edges = g.get_edges()
+        N, E = g.num_vertices(), len(edges)
+        s, t, idx = edges[:, 0], edges[:, 1], edges[:, 2]
+        eidx = numpy.arange(E)
+        self.__freeze(g.is_directed(), N, E,
+                      self.__compress(N, s, t, eidx),
+                      self.__compress(N, t, s, eidx))
+
+        sel = {"v": vprops, "e": eprops, "g": gprops}
+        for (k, name), p in g.properties.items():
+            if sel[k] is not None and name not in sel[k]:
+                continue
+            vals = FrozenGraph.__take(g, p, numpy.arange(N) if k == "v" else idx)
+            FrozenGraph.__put(self, k, name, p.value_type(), vals)
+
+    def __freeze(self, directed, N, E, out, in_):
+        Graph.__init__(self, directed=directed)
+        for a in out + in_:
+            a.flags.writeable = False
+        self.__N = N
+        self.__E = E
+        self.__out = out
+        self.__in = in_
+        self._Graph__graph.freeze(N, E, out, in_)
+
+    @staticmethod
+    def __compress(N, s, t, idx):
+        order = numpy.lexsort((t, s))
+        deg = numpy.bincount(s, minlength=N)
+        ptr = numpy.zeros(N + 1, dtype="int64")
+        ptr[1:] = numpy.cumsum(deg)
+        t = t[order]
+        delta = numpy.empty(len(t), dtype="int64")
+        if len(t) > 0:
+            delta[0] = t[0]
+            delta[1:] = t[1:] - t[:-1]
+            starts = ptr[:-1][deg > 0]
+            delta[starts] = t[starts]
+        bptr = numpy.zeros(len(t) + 1, dtype="int64")
+        bptr[1:] = numpy.cumsum(_varint_len(delta))
+        bptr = bptr[ptr]
+        data = _varint_encode(delta)
+        return (ptr.astype(_min_uint(len(t))),
+                bptr.astype(_min_uint(len(data))),
+                data,
+                idx[order].astype(_min_uint(len(idx))))
+
+    @staticmethod
+    def __take(g, p, idx):
+        # property values, in a form that can be placed in shared memory
+        if p.key_type() == "g":
+            return _converter(p.value_type())(p[g])
+        if isinstance(p, CategoricalPropertyMap):
+            return (p.codes.take(idx), p.categories[1:])
+        return p.take(idx)
+
+    @staticmethod
+    def __put(g, k, name, value_type, vals):
+        p = g.new_property(k, value_type)
+        if k == "g":
+            p[g] = vals
+        elif value_type == "categorical":
+            # the categories are added in their stored order, so that the
+            # codes remain valid
+            codes, categories = vals
+            for x in categories:
+                p._shared_categories().code(x)
+            p.codes.put(numpy.arange(len(codes)), codes)
+        else:
+            N = g.num_vertices() if k == "v" else g.num_edges()
+            p.put(numpy.arange(N), vals)
+        g.properties[(k, name)] = p
+
+    def __row(self, csr, v):
+        v = int(v)
+        if v < 0 or v >= self.__N:
+            raise ValueError("Vertex index %d is invalid" % v)
+        ptr, bptr, data, eidx = csr
+        t = numpy.cumsum(_varint_decode(data[bptr[v]:bptr[v + 1]]),
+                         dtype="int64")
+        return t, eidx[ptr[v]:ptr[v + 1]].astype("int64")
+
+    def __edges(self, v, out):
+        directed = self.is_directed()
+        rows = []
+        if out or not directed:
+            rows.append(self.__row(self.__out, v) + (True,))
+        if not out or not directed:
+            rows.append(self.__row(self.__in, v) + (False,))
+        es = []
+        for u, idx, is_out in rows:
+            vs = numpy.full(len(u), int(v), dtype="int64")
+            es.append(numpy.array([vs, u, idx] if is_out else [u, vs, idx]).T)
+        return numpy.concatenate(es).reshape((-1, 3))
+
+    def set_vertex_filter(self, prop, inverted=False):
+        """Frozen graphs cannot be filtered; a :class:`~graph_tool.GraphView`
+        should be used instead."""
+        if prop is not None:
+            raise ValueError("Frozen graphs cannot be filtered, use a GraphView instead")
+
+    def set_edge_filter(self, prop, inverted=False):
+        """Frozen graphs cannot be filtered; a :class:`~graph_tool.GraphView`
+        should be used instead."""
+        if prop is not None:
+            raise ValueError("Frozen graphs cannot be filtered, use a GraphView instead")
+
+    def set_reversed(self, is_reversed):
+        """Frozen graphs cannot be reversed; a :class:`~graph_tool.GraphView`
+        should be used instead."""
+        if is_reversed:
+            raise ValueError("Frozen graphs cannot be reversed, use a GraphView instead")
+
+    def get_out_neighbours(self, v):
+        """Return a :class:`~numpy.ndarray` with the sorted out-neighbours of
+        vertex ``v``. For undirected graphs, all neighbours are returned."""
+        if self.is_directed():
+            return self.__row(self.__out, v)[0]
+        return numpy.sort(numpy.concatenate((self.__row(self.__out, v)[0],
+                                             self.__row(self.__in, v)[0])))
+
+    def get_in_neighbours(self, v):
+        """Return a :class:`~numpy.ndarray` with the sorted in-neighbours of
+        vertex ``v``. For undirected graphs, all neighbours are returned."""
+        if self.is_directed():
+            return self.__row(self.__in, v)[0]
+        return self.get_out_neighbours(v)
+
+    def get_out_edges(self, v):
+        """Return a :class:`~numpy.ndarray` of shape ``(k, 3)`` with the source,
+        target and index of the out-edges of vertex ``v``. For undirected
+        graphs, all incident edges are returned."""
+        return self.__edges(v, True)
+
+    def get_in_edges(self, v):
+        """Return a :class:`~numpy.ndarray` of shape ``(k, 3)`` with the source,
+        target and index of the in-edges of vertex ``v``. For undirected
+        graphs, all incident edges are returned."""
+        return self.__edges(v, False)
+
+    def get_out_degrees(self):
+        """Return a :class:`~numpy.ndarray` with the out-degrees of all
+        vertices (or the total degrees, for undirected graphs)."""
+        k = numpy.diff(self.__out[0].astype("int64"))
+        if not self.is_directed():
+            k += numpy.diff(self.__in[0].astype("int64"))
+        return k
+
+    def get_in_degrees(self):
+        """Return a :class:`~numpy.ndarray` with the in-degrees of all
+        vertices (or the total degrees, for undirected graphs)."""
+        if not self.is_directed():
+            return self.get_out_degrees()
+        return numpy.diff(self.__in[0].astype("int64"))
+
+    def nbytes(self):
+        """Return the number of bytes used to store the graph topology."""
+        return sum(a.nbytes for a in self.__out + self.__in)
+
+    def thaw(self):
+        """Return a new (mutable) :class:`~graph_tool.Graph` with the same
+        topology and internal property maps. The vertex and edge indexes are
+        preserved.
+
+        .. note::
+
+           If the original graph had unused edge indexes (e.g. due to edge
+           removal), they were renumbered contiguously when it was frozen.
+        """
+        g = Graph(directed=self.is_directed())
+        if self.__N > 0:
+            g.add_vertex(self.__N)
+        g.add_edge_list(self.get_edges()[:, :2])
+        for (k, name), p in self.properties.items():
+            vals = FrozenGraph.__take(self, p, numpy.arange(self.__N if k == "v"
+                                                            else self.__E))
+            FrozenGraph.__put(g, k, name, p.value_type(), vals)
+        return g
+
+    def __layout(self):
+        # The arrays are laid out after a header with a magic number and the
+        # metadata, at aligned offsets, so that they can be used in place
+        # from a shared memory segment or a mapped file. The header, the
+        # offset of each array and the total size are returned.
+        arrays = []
+        for d, csr in [("out", self.__out), ("in", self.__in)]:
+            for key, a in zip(["ptr", "bptr", "data", "eidx"], csr):
+                arrays.append(("%s_%s" % (d, key), a))
+        props = []
+        for (k, pname), p in sorted(self.properties.items()):
+            vt = p.value_type()
+            if not _shared_memory_type(vt, k):
+                raise ValueError("property map '%s' of type '%s' cannot be placed in shared memory or saved in the 'frozen' format" %
+                                 (pname, vt))
+            val = FrozenGraph.__take(self, p, numpy.arange(self.__N if k == "v"
+                                                           else self.__E))
+            if k == "g":
+                props.append((k, pname, vt, val, None))
+                continue
+            categories = None
+            if vt == "categorical":
+                val, categories = val
+            keys = []
+            for j, a in enumerate(val if isinstance(val, tuple) else (val,)):
+                keys.append("prop_%d_%d" % (len(props), j))
+                arrays.append((keys[-1], a))
+            props.append((k, pname, vt, keys, categories))
+
+        offset = 0
+        layout = []
+        for i, (key, a) in enumerate(arrays):
+            a = arrays[i] = numpy.ascontiguousarray(a)
+            offset = _align(offset)
+            layout.append((key, a.dtype.str, a.shape, offset))
+            offset += a.nbytes
+        meta = json.dumps(dict(directed=self.is_directed(), N=self.__N,
+                               E=self.__E, arrays=layout,
+                               properties=props)).encode("utf-8")
+        header = _frozen_magic + len(meta).to_bytes(8, "little") + meta
+        hsize = _align(len(header))
+        return (header, [(hsize + pos, a) for (key, dtype, shape, pos), a
+                         in zip(layout, arrays)], hsize + offset)
+
+    @staticmethod
+    def __from_buffer(buf, keep):
+        # the inverse of __layout(); the adjacency arrays are read-only views
+        # of the buffer, and only the property maps for which keep(k, name)
+        # is true are copied
+        m = len(_frozen_magic)
+        if bytes(buf[:m]) != _frozen_magic:
+            raise ValueError("invalid frozen graph data: wrong magic number")
+        n = int.from_bytes(bytes(buf[m:m + 8]), "little")
+        meta = json.loads(bytes(buf[m + 8:m + 8 + n]).decode("utf-8"))
+        hsize = _align(m + 8 + n)
+        arrays = {}
+        for key, dtype, shape, pos in meta["arrays"]:
+            a = numpy.ndarray(tuple(shape), dtype=dtype, buffer=buf,
+                              offset=hsize + pos)
+            a.flags.writeable = False
+            arrays[key] = a
+
+        fg = FrozenGraph.__new__(FrozenGraph)
+        fg.__freeze(meta["directed"], meta["N"], meta["E"],
+                    *[tuple(arrays["%s_%s" % (d, key)]
+                            for key in ["ptr", "bptr", "data", "eidx"])
+                      for d in ["out", "in"]])
+        for k, pname, vt, val, categories in meta["properties"]:
+            if not keep(k, pname):
+                continue
+            if k != "g":
+                val = tuple(arrays[key] for key in val)
+                if categories is not None:
+                    val = (val[0], categories)
+                elif len(val) == 1:
+                    val = val[0]
+            FrozenGraph.__put(fg, k, pname, vt, val)
+        # the buffer is kept open for as long as the arrays are in use
+        fg.__buffer = buf
+        return fg
+
+    def to_shared_memory(self, name=None):
+        """Copy the frozen graph into a new shared memory segment, and return
+        the :class:`multiprocessing.shared_memory.SharedMemory` object. See
+        :meth:`~graph_tool.Graph.to_shared_memory`."""
+        shared_memory = _get_shared_memory()
+        header, arrays, size = self.__layout()
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:len(header)] = header
+        for pos, a in arrays:
+            dst = numpy.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf,
+                                offset=pos)
+            dst[...] = a
+            del dst
+        return shm
+
+    @staticmethod
+    def attach_shared_memory(name, vprops=None, eprops=None, gprops=None):
+        """Return a :class:`~graph_tool.FrozenGraph` whose adjacency is backed
+        by the shared memory segment ``name``, without copying it. The
+        selected property maps are copied. See
+        :meth:`~graph_tool.Graph.attach_shared_memory`."""
+        shared_memory = _get_shared_memory()
+        try:
+            # attached segments must not be unlinked when the process exits
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # before Python 3.13, attaching registers the segment with the
+            # resource tracker of this process, which would unlink it at exit
+            shm = shared_memory.SharedMemory(name=name)
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        sel = {"v": vprops, "e": eprops, "g": gprops}
+        fg = FrozenGraph.__from_buffer(shm.buf,
+                                       lambda k, name: (sel[k] is None or
+                                                        name in sel[k]))
+        fg.__shm = shm
+        return fg
+
+    def _save_frozen(self, f):
+        # writes the layout of __layout() to the file object f
+        header, arrays, size = self.__layout()
+        f.write(header)
+        pos = len(header)
+        for offset, a in arrays:
+            f.write(b"\0" * (offset - pos))
+            f.write(memoryview(a).cast("B"))
+            pos = offset + a.nbytes
+
+    @staticmethod
+    def _load_frozen(file_name, mmap, ignore):
+        # file_name is either a path, which is mapped into memory if mmap is
+        # true, or a file object, which is read
+        keep = lambda k, name: name not in ignore[k]
+        if isinstance(file_name, (str, unicode)):
+            if mmap:
+                buf = numpy.memmap(file_name, dtype="uint8", mode="r")
+            else:
+                buf = numpy.fromfile(file_name, dtype="uint8")
+        else:
+            buf = numpy.frombuffer(file_name.read(), dtype="uint8")
+        return FrozenGraph.__from_buffer(buf, keep)
+
+    # Pickling support
+    # ================
+
+    def __reduce_ex__(self, protocol):
+        # the compressed arrays are pickled directly, and can be transferred
+        # out-of-band with protocol 5
+        return object.__reduce_ex__(self, protocol)
+
+    def __getstate__(self):
+        props = []
+        for (k, name), p in self.properties.items():
+            vals = FrozenGraph.__take(self, p, numpy.arange(self.__N if k == "v"
+                                                            else self.__E))
+            props.append((k, name, p.value_type(), vals))
+        return dict(directed=self.is_directed(), N=self.__N, E=self.__E,
+                    out=self.__out, in_=self.__in, properties=props)
+
+    def __setstate__(self, state):
+        self.__freeze(state["directed"], state["N"], state["E"],
+                      tuple(numpy.ascontiguousarray(a) for a in state["out"]),
+                      tuple(numpy.ascontiguousarray(a) for a in state["in_"]))
+        for k, name, value_type, vals in state["properties"]:
+            FrozenGraph.__put(self, k, name, value_type, vals)
+
+    def __repr__(self):
+        return ("<FrozenGraph object, %s with %d vertices and %d edges, "
+                "%d bytes, at 0x%x>") % ("directed" if self.is_directed() else
+                                         "undirected", self.__N, self.__E,
+                                         self.nbytes(), id(self))
+
+
 def value_types():
     """Return a list of possible properties value types."""
     return libcore.get_property_types()
@@ -3152,6 +5368,39 @@ def _get_rng():
     global _rng
     return _rng
 
+@contextlib.contextmanager
+def rng_context(seed, deterministic=True):
+    """Context manager that temporarily replaces the random number generator
+    used by graph-tool's algorithms with one seeded by ``seed``.
+
+    If ``deterministic == True``, parallel algorithms will draw random numbers
+    from independent counter-based (Philox) streams associated with each unit
+    of work (e.g. a vertex in a given sweep), instead of each thread. Each
+    stream is identified by the seed, the sweep and the unit of work, and
+    requires no state other than a counter, so that it is created at
+    negligible cost. The results will then be reproducible regardless of the
+    number of threads set with :func:`~graph_tool.openmp_set_num_threads`.
+
+    The previous generator and mode are restored when the context is exited.
+
+    Examples
+    --------
+
+    >>> g = gt.collection.data["polbooks"]
+    >>> with gt.rng_context(42):
+    ...     state = gt.minimize_blockmodel_dl(g)
+    """
+    import graph_tool
+    rng = graph_tool._rng
+    det = libcore.get_rng_deterministic()
+    graph_tool._rng = libcore.get_rng(seed)
+    libcore.set_rng_deterministic(deterministic)
+    try:
+        yield
+    finally:
+        graph_tool._rng = rng
+        libcore.set_rng_deterministic(det)
+
 # OpenMP Setup
 
 def openmp_enabled():
@@ -0,0 +1,277 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# graph_tool -- a general graph manipulation python module
+#
+# Copyright (C) 2006-2017 Tiago de Paula Peixoto <tiago@skewed.de>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+``graph_tool.cache`` - Persistent result cache
+----------------------------------------------
+
+Opt-in memoization of expensive algorithms, such as
+:func:`~graph_tool.centrality.betweenness`,
+:func:`~graph_tool.centrality.pagerank`,
+:func:`~graph_tool.topology.label_components` and
+:func:`~graph_tool.topology.kcore_decomposition`.
+
+When enabled, results are stored on disk under a key computed from the
+content of the graph (its structure, filters and directedness), the contents
+of the property maps passed as arguments, and the remaining argument
+values. Modifying the graph or any of these property maps therefore results in
+a different key, so that stale results are never returned. Entries which are
+no longer used are eventually discarded in least-recently-used order, once the
+total size of the cache exceeds the given limit.
+
+Summary
++++++++
+
+.. autosummary::
+   :nosignatures:
+
+   enable
+   disable
+   is_enabled
+   clear
+
+Contents
+++++++++
+
+"""
+
+from __future__ import division, absolute_import, print_function
+
+import os
+import json
+import shutil
+import hashlib
+import inspect
+import tempfile
+import numpy
+
+from .decorators import _wraps
+
+__all__ = ["enable", "disable", "is_enabled", "clear"]
+
+_version = 3
+_chunk_edges = 1 << 16
+_path = None
+_max_bytes = None
+
+def enable(path, max_bytes=1 << 30):
+    """Enable the persistent result cache, stored in the directory ``path``
+    (which is created if it does not exist). If the total size of the stored
+    results exceeds ``max_bytes``, the least recently used entries are
+    removed."""
+    global _path, _max_bytes
+    if not os.path.exists(path):
+        os.makedirs(path)
+    _path = os.path.abspath(path)
+    _max_bytes = max_bytes
+    _evict()
+
+def disable():
+    """Disable the persistent result cache. The stored results are kept on
+    disk."""
+    global _path
+    _path = None
+
+def is_enabled():
+    """Return ``True`` if the persistent result cache is enabled."""
+    return _path is not None
+
+def clear():
+    """Remove all entries from the persistent result cache."""
+    if _path is None:
+        return
+    for key in _entries():
+        shutil.rmtree(os.path.join(_path, key), ignore_errors=True)
+
+def _entries():
+    return [k for k in os.listdir(_path) if not k.startswith(".")]
+
+def _evict():
+    entries = []
+    for key in _entries():
+        d = os.path.join(_path, key)
+        try:
+            mtime = os.path.getmtime(os.path.join(d, "meta.json"))
+            size = sum(os.path.getsize(os.path.join(d, f))
+                       for f in os.listdir(d))
+        except OSError:
+            continue
+        entries.append((mtime, size, key))
+    total = sum(e[1] for e in entries)
+    for mtime, size, key in sorted(entries):
+        if total <= _max_bytes:
+            break
+        shutil.rmtree(os.path.join(_path, key), ignore_errors=True)
+        total -= size
+
+class _Uncacheable(Exception):
+    pass
+
+# returned by _load() when there is no entry, since None is a valid result
+_miss = object()
+
+def _hash_value(h, x):
+    from . import PropertyMap, CategoricalPropertyMap
+    if isinstance(x, PropertyMap):
+        if x.key_type() == "g" or x.fa is None:
+            raise _Uncacheable()
+        h.update(("pmap:%s:%s:" % (x.key_type(), x.value_type())).encode())
+        h.update(numpy.ascontiguousarray(x.fa).tobytes())
+        if isinstance(x, CategoricalPropertyMap):
+            # the codes are only meaningful together with the categories
+            h.update(json.dumps(x.categories).encode())
+    elif isinstance(x, numpy.ndarray):
+        if x.dtype == object:
+            raise _Uncacheable()
+        h.update(("array:%s:%s:" % (x.dtype.str, x.shape)).encode())
+        h.update(numpy.ascontiguousarray(x).tobytes())
+    elif isinstance(x, (list, tuple)):
+        h.update(("seq:%d:" % len(x)).encode())
+        for y in x:
+            _hash_value(h, y)
+    elif x is None or isinstance(x, (bool, int, float, str, numpy.generic)):
+        h.update(("%s:%r:" % (type(x).__name__, x)).encode())
+    else:
+        raise _Uncacheable()
+
+def _hash_graph(h, g):
+    from . import libcore
+    h.update(json.dumps([g.num_vertices(True), g.is_directed(),
+                         g.is_reversed()]).encode())
+    vfilt, inv = g.get_vertex_filter()
+    if vfilt is not None:
+        h.update(("vfilt:%s:" % inv).encode())
+        # the raw values are read, so that filters shared with other views
+        # are not copied
+        h.update(numpy.ascontiguousarray(vfilt._get_data()).tobytes())
+    # the edges are hashed in chunks as they are traversed, so that the whole
+    # edge list is never built
+    libcore.get_edge_list_chunked(g._Graph__graph, h.update, _chunk_edges)
+
+def _key(func, args, outputs=()):
+    # the output parameters are only filled in by the function, hence their
+    # contents must not affect the key
+    h = hashlib.sha1()
+    h.update(("%d:%s.%s:" % (_version, func.__module__,
+                             func.__name__)).encode())
+    _hash_graph(h, args["g"])
+    for k in sorted(args.keys()):
+        if k == "g" or k in outputs:
+            continue
+        h.update(("%s=" % k).encode())
+        _hash_value(h, args[k])
+    return h.hexdigest()
+
+def _load(key, g, outputs):
+    d = os.path.join(_path, key)
+    meta_path = os.path.join(d, "meta.json")
+    if not os.path.exists(meta_path):
+        return _miss
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        items = []
+        for i, m in enumerate(meta["items"]):
+            fname = os.path.join(d, "%d.npy" % i)
+            if m["kind"] == "pmap":
+                p = outputs.get(i)
+                if p is None:
+                    p = g.new_property(m["key_type"], m["value_type"])
+                if m["value_type"] == "categorical":
+                    codes = numpy.load(fname)
+                    p.fa = p.encode(numpy.asarray(m["categories"])[codes])
+                else:
+                    p.fa = numpy.load(fname, mmap_mode="r")
+                items.append(p)
+            elif m["kind"] == "array":
+                items.append(numpy.load(fname, mmap_mode="c"))
+            else:
+                items.append(m["value"])
+        os.utime(meta_path, None)
+    except (OSError, IOError, ValueError, KeyError):
+        shutil.rmtree(d, ignore_errors=True)
+        return _miss
+    if meta["single"]:
+        return items[0]
+    return tuple(items)
+
+def _store(key, ret):
+    from . import PropertyMap, CategoricalPropertyMap
+    single = not isinstance(ret, tuple)
+    items = [ret] if single else list(ret)
+    meta = {"single": single, "items": []}
+    tmp = tempfile.mkdtemp(prefix=".tmp", dir=_path)
+    try:
+        for i, x in enumerate(items):
+            fname = os.path.join(tmp, "%d.npy" % i)
+            if (isinstance(x, PropertyMap) and x.key_type() != "g" and
+                x.fa is not None):
+                numpy.save(fname, x.fa)
+                meta["items"].append({"kind": "pmap",
+                                      "key_type": x.key_type(),
+                                      "value_type": x.value_type()})
+                if isinstance(x, CategoricalPropertyMap):
+                    meta["items"][-1]["categories"] = x.categories
+            elif isinstance(x, numpy.ndarray) and x.dtype != object:
+                numpy.save(fname, x)
+                meta["items"].append({"kind": "array"})
+            elif x is None or isinstance(x, (bool, int, float, numpy.generic)):
+                if isinstance(x, numpy.generic):
+                    x = x.item()
+                meta["items"].append({"kind": "value", "value": x})
+            else:
+                return
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        os.rename(tmp, os.path.join(_path, key))
+        tmp = None
+    except OSError:
+        # another process may have stored the same entry concurrently
+        pass
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+    _evict()
+
+def _cached(outputs=()):
+    """Decorator which memoizes the function in the persistent cache, if it is
+    enabled. The values in ``outputs`` are the names of the optional output
+    property map parameters, in the order they appear in the returned
+    value. The first parameter of the function must be the graph."""
+    def decorate(func):
+        @_wraps(func)
+        def wrap(*args, **kwargs):
+            if _path is None:
+                return func(*args, **kwargs)
+            cargs = inspect.getcallargs(func, *args, **kwargs)
+            try:
+                key = _key(func, cargs, outputs)
+            except _Uncacheable:
+                return func(*args, **kwargs)
+            given = dict((i, cargs[name]) for i, name in enumerate(outputs)
+                         if cargs.get(name) is not None)
+            ret = _load(key, cargs["g"], given)
+            if ret is not _miss:
+                return ret
+            ret = func(*args, **kwargs)
+            _store(key, ret)
+            return ret
+        return wrap
+    return decorate
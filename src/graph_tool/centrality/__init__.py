@@ -50,6 +50,7 @@ from .. dl_import import dl_import
 dl_import("from . import libgraph_tool_centrality")
 
 from .. import _prop, ungroup_vector_property
+from .. cache import _cached
 from .. topology import shortest_distance
 import sys
 import numpy
@@ -59,6 +60,7 @@ __all__ = ["pagerank", "betweenness", "central_point_dominance", "closeness",
            "eigentrust", "eigenvector", "katz", "hits", "trust_transitivity"]
 
 
+@_cached(outputs=("prop",))
 def pagerank(g, damping=0.85, pers=None, weight=None, prop=None, epsilon=1e-6,
              max_iter=None, ret_iter=False):
     r"""
@@ -228,6 +230,7 @@ def pagerank(g, damping=0.85, pers=None, weight=None, prop=None, epsilon=1e-6,
         return prop
 
 
+@_cached(outputs=("vprop", "eprop"))
 def betweenness(g, vprop=None, eprop=None, weight=None, norm=True):
     r"""
     Calculate the betweenness centrality for each vertex and edge.
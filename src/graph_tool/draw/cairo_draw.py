@@ -215,7 +215,7 @@ def shape_from_prop(shape, enum):
         else:
             descs = g.edges()
             prop = g.new_edge_property("int")
-        if shape.value_type() == "string":
+        if shape.value_type() in ["string", "categorical"]:
             def conv(x):
                 return int(getattr(enum, x))
             map_property_values(shape, prop, conv)
@@ -277,7 +277,7 @@ def surface_from_prop(surface):
             prop = surface.get_graph().new_edge_property("object")
         surface_map = {}
         for v in descs:
-            if surface.value_type() == "string":
+            if surface.value_type() in ["string", "categorical"]:
                 if surface[v] not in surface_map:
                     sfc = gen_surface(surface[v])
                     surface_map[surface[v]] = sfc
@@ -424,7 +424,7 @@ def _convert(attr, val, cmap, pmap_default=False, g=None, k=None):
                     prop = g.new_edge_property("vector<double>")
                 map_property_values(nval, prop, lambda x: cmap(cnorm(x)))
                 new_val = prop
-            elif val.value_type() == "string":
+            elif val.value_type() in ["string", "categorical"]:
                 g = val.get_graph()
                 if val.key_type() == "v":
                     prop = g.new_vertex_property("vector<double>")
@@ -385,7 +385,7 @@ def graphviz_draw(g, pos=None, size=(15, 15), pin=False, layout=None,
 
         # normalize color properties
         if (isinstance(vcolor, PropertyMap) and
-            vcolor.value_type() != "string"):
+            vcolor.value_type() not in ["string", "categorical"]):
             minmax = [numpy.inf, -numpy.inf]
             for v in g.vertices():
                 c = vcolor[v]
@@ -399,7 +399,7 @@ def graphviz_draw(g, pos=None, size=(15, 15), pin=False, layout=None,
                 vnorm = lambda x: x
 
         if (isinstance(ecolor, PropertyMap) and
-            ecolor.value_type() != "string"):
+            ecolor.value_type() not in ["string", "categorical"]):
             minmax = [numpy.inf, -numpy.inf]
             for e in g.edges():
                 c = ecolor[e]
@@ -30,6 +30,7 @@ Summary
 
    random_graph
    random_rewire
+   sample_ensemble
    generate_sbm
    predecessor_tree
    line_graph
@@ -54,24 +55,115 @@ if sys.version_info < (3,):
 from .. dl_import import dl_import
 dl_import("from . import libgraph_tool_generation")
 
-from .. import Graph, GraphView, _check_prop_scalar, _prop, _limit_args, \
-    _gt_type, _get_rng, _c_str, libcore
+from .. import Graph, GraphView, PropertyMap, _check_prop_scalar, _prop, \
+    _limit_args, _gt_type, _get_rng, _c_str, libcore, openmp_enabled, \
+    openmp_set_num_threads
 from .. stats import label_parallel_edges, label_self_loops
 import inspect
 import types
+import multiprocessing
 import numpy
 import numpy.random
 
-__all__ = ["random_graph", "random_rewire", "generate_sbm", "predecessor_tree",
+__all__ = ["random_graph", "random_rewire", "sample_ensemble", "generate_sbm",
+           "predecessor_tree",
            "line_graph", "graph_union", "triangulation", "lattice",
            "geometric_graph", "price_network", "complete_graph",
            "circular_graph", "condensation_graph"]
 
 
+def _deg_array(k, N, directed):
+    """Normalize a sampled degree array into a contiguous ``(N, 2)`` array of
+    (in, out)-degree pairs."""
+    k = numpy.asarray(k, dtype="int64")
+    if directed:
+        if k.shape != (N, 2):
+            raise ValueError("expected an array of (in,out)-degree pairs " +
+                             "with shape (%d, 2), got: %s" % (N, str(k.shape)))
+    else:
+        if k.shape != (N,):
+            raise ValueError("expected an array of degrees with shape " +
+                             "(%d,), got: %s" % (N, str(k.shape)))
+        k = numpy.column_stack((numpy.zeros(N, dtype="int64"), k))
+    if (k < 0).any():
+        raise ValueError("degree values must be non-negative")
+    return numpy.ascontiguousarray(k)
+
+def _edge_prob_table(g, model, edge_probs, block_membership):
+    """Evaluate a vectorized ``edge_probs`` function once over all pairs of
+    vertex classes, and return the corresponding list of ``(r, s, p)``
+    triples."""
+    if model == "probabilistic-configuration":
+        k_out = g.degree_property_map("out").fa
+        if g.is_directed():
+            k_in = g.degree_property_map("in").fa
+        else:
+            k_in = numpy.zeros(len(k_out), dtype=k_out.dtype)
+        d = numpy.column_stack((k_in, k_out)).astype("int64")
+        d = d[d.sum(axis=1) > 0]
+        if len(d) == 0:
+            return []
+        key = d[:, 0] * (d[:, 1].max() + 1) + d[:, 1]
+        rs = d[numpy.unique(key, return_index=True)[1]]
+    else:
+        if block_membership is None:
+            raise ValueError("a vectorized edge_probs function requires " +
+                             "block labels")
+        b = block_membership.fa
+        if b is not None:
+            rs = numpy.unique(b)
+        else:
+            # vector or object labels (e.g. with degree_block=True in
+            # random_graph()), kept in the order they are first encountered
+            rs = []
+            for v in g.vertices():
+                x = block_membership[v]
+                if not isinstance(x, (str, bytes)) and hasattr(x, "__len__"):
+                    x = tuple(x)
+                rs.append(x)
+            rs = list(dict.fromkeys(rs))
+    K = len(rs)
+    R, S = numpy.meshgrid(numpy.arange(K), numpy.arange(K), indexing="ij")
+    if isinstance(rs, list):
+        if (K > 0 and all(isinstance(x, tuple) for x in rs) and
+            len(set(len(x) for x in rs)) == 1):
+            comps = [numpy.asarray(c) for c in zip(*rs)]
+            r = tuple(c[R] for c in comps)
+            s = tuple(c[S] for c in comps)
+        else:
+            labels = numpy.empty(K, dtype="object")
+            for i, x in enumerate(rs):
+                labels[i] = x
+            r = labels[R]
+            s = labels[S]
+    elif rs.ndim == 2:
+        if g.is_directed():
+            r = numpy.rollaxis(rs[R], 2)
+            s = numpy.rollaxis(rs[S], 2)
+        else:
+            r = rs[R, 1]
+            s = rs[S, 1]
+    else:
+        r = rs[R]
+        s = rs[S]
+    p = numpy.asarray(edge_probs(r, s), dtype="float")
+    p = numpy.broadcast_to(p, (K, K))
+    idx = numpy.nonzero(numpy.isfinite(p) & (p > 0))
+    if len(idx[0]) == 0:
+        raise ValueError("edge_probs returned no positive probabilities")
+    if isinstance(rs, list):
+        labels = rs
+    else:
+        labels = rs.tolist()
+        if rs.ndim == 2:
+            labels = [tuple(x) for x in labels]
+    return [(labels[i], labels[j], pij) for i, j, pij in
+            zip(idx[0].tolist(), idx[1].tolist(), p[idx].tolist())]
+
 def random_graph(N, deg_sampler, directed=True,
                  parallel_edges=False, self_loops=False, block_membership=None,
                  block_type="int", degree_block=False,
-                 random=True, verbose=False, **kwargs):
+                 random=True, verbose=False, vectorized=False, **kwargs):
     r"""
     Generate a random graph, with a given degree distribution and (optionally)
     vertex-vertex correlation.
@@ -85,7 +177,7 @@ def random_graph(N, deg_sampler, directed=True,
     ----------
     N : int
         Number of vertices in the graph.
-    deg_sampler : function
+    deg_sampler : function or list or :class:`~numpy.ndarray`
         A degree sampler function which is called without arguments, and returns
         a tuple of ints representing the in and out-degree of a given vertex (or
         a single int for undirected graphs, representing the out-degree). This
@@ -97,6 +189,19 @@ def random_graph(N, deg_sampler, directed=True,
         will be the index of the vertex which will receive the degree.  If
         ``block_membership is not None``, the first value passed will be the vertex
         index, and the second will be the block value of the vertex.
+
+        If the value is a list or a :class:`~numpy.ndarray`, it will be used as
+        a fixed degree sequence, which must have shape ``(N, 2)`` containing
+        (in, out)-degree pairs for directed graphs, or shape ``(N,)`` for
+        undirected graphs. A :class:`ValueError` is raised if the sequence
+        cannot be used to build the graph.
+
+        If ``vectorized == True``, the function will be called with an array of
+        vertex indexes (and an array with their block values, if
+        ``block_membership is not None``), and must return an array of degrees
+        with the shape described above, with ``N`` replaced by the number of
+        indexes passed. Whenever degrees need to be re-sampled, this is done
+        with a single call for all the affected vertices.
     directed : bool (optional, default: ``True``)
         Whether the generated graph should be directed.
     parallel_edges : bool (optional, default: ``False``)
@@ -116,7 +221,10 @@ def random_graph(N, deg_sampler, directed=True,
         If this value is a function, it will be used to sample the block
         types. It must be callable either with no arguments or with a single
         argument which will be the vertex index. In either case it must return
-        a type compatible with the ``block_type`` parameter.
+        a type compatible with the ``block_type`` parameter. If ``vectorized ==
+        True``, the function will instead be called only once, with an array
+        containing all vertex indexes, and must return an array of labels of
+        length ``N``.
 
         See the documentation for the ``vertex_corr`` parameter of the
         :func:`~graph_tool.generation.random_rewire` function which specifies
@@ -133,6 +241,11 @@ def random_graph(N, deg_sampler, directed=True,
         placement of the edges will be used.
     verbose : bool (optional, default: ``False``)
         If ``True``, verbose information is displayed.
+    vectorized : bool (optional, default: ``False``)
+        If ``True``, the functions passed as ``deg_sampler``,
+        ``block_membership`` and ``edge_probs`` operate on arrays, as described
+        above and in :func:`~graph_tool.generation.random_rewire`, instead of
+        being called once per vertex or pair of values.
 
     Returns
     -------
@@ -359,8 +472,14 @@ def random_graph(N, deg_sampler, directed=True,
 
     g = Graph()
 
-    if (type(block_membership) is types.FunctionType or
-        type(block_membership) is types.LambdaType):
+    if vectorized and callable(block_membership):
+        btype = block_type
+        block_membership = numpy.asarray(block_membership(numpy.arange(N)))
+        if len(block_membership) != N:
+            raise ValueError("block_membership returned %d labels, expected %d"
+                             % (len(block_membership), N))
+    elif (type(block_membership) is types.FunctionType or
+          type(block_membership) is types.LambdaType):
         btype = block_type
         bm = []
         if len(inspect.getargspec(block_membership)[0]) == 0:
@@ -373,34 +492,55 @@ def random_graph(N, deg_sampler, directed=True,
     elif block_membership is not None:
         btype = _gt_type(block_membership[0])
 
-    if len(inspect.getargspec(deg_sampler)[0]) > 0:
+    if not callable(deg_sampler):
+        degs = _deg_array(deg_sampler, N, directed)
+        libgraph_tool_generation.gen_graph_array(g._Graph__graph, N, degs, None,
+                                                 not parallel_edges,
+                                                 not self_loops, not directed,
+                                                 _get_rng(), verbose, True)
+    elif vectorized:
         if block_membership is not None:
-            sampler = lambda i: deg_sampler(i, block_membership[i])
+            b = numpy.asarray(block_membership)
+            sampler = lambda idx: deg_sampler(idx, b[idx])
         else:
             sampler = deg_sampler
+        def sampler_wrap(idx):
+            return _deg_array(sampler(idx), len(idx), directed)
+        degs = sampler_wrap(numpy.arange(N))
+        libgraph_tool_generation.gen_graph_array(g._Graph__graph, N, degs,
+                                                 sampler_wrap,
+                                                 not parallel_edges,
+                                                 not self_loops, not directed,
+                                                 _get_rng(), verbose, True)
     else:
-        sampler = lambda i: deg_sampler()
-
-    if not directed:
-        def sampler_wrap(*args):
-            k = sampler(*args)
-            try:
-                return int(k)
-            except:
-                raise ValueError("degree value not understood: " + str(k))
-    else:
-        def sampler_wrap(*args):
-            k = sampler(*args)
-            try:
-                return int(k[0]), int(k[1])
-            except:
-                raise ValueError("(in,out)-degree value pair not understood: " +
-                                 str(k))
-
-    libgraph_tool_generation.gen_graph(g._Graph__graph, N, sampler_wrap,
-                                       not parallel_edges,
-                                       not self_loops, not directed,
-                                       _get_rng(), verbose, True)
+        if len(inspect.getargspec(deg_sampler)[0]) > 0:
+            if block_membership is not None:
+                sampler = lambda i: deg_sampler(i, block_membership[i])
+            else:
+                sampler = deg_sampler
+        else:
+            sampler = lambda i: deg_sampler()
+
+        if not directed:
+            def sampler_wrap(*args):
+                k = sampler(*args)
+                try:
+                    return int(k)
+                except:
+                    raise ValueError("degree value not understood: " + str(k))
+        else:
+            def sampler_wrap(*args):
+                k = sampler(*args)
+                try:
+                    return int(k[0]), int(k[1])
+                except:
+                    raise ValueError("(in,out)-degree value pair not understood: " +
+                                     str(k))
+
+        libgraph_tool_generation.gen_graph(g._Graph__graph, N, sampler_wrap,
+                                           not parallel_edges,
+                                           not self_loops, not directed,
+                                           _get_rng(), verbose, True)
     g.set_directed(directed)
 
     if degree_block:
@@ -441,7 +581,7 @@ def random_graph(N, deg_sampler, directed=True,
         g.set_fast_edge_removal(True)
         random_rewire(g, parallel_edges=parallel_edges,
                       self_loops=self_loops, verbose=verbose,
-                      block_membership=bm, **kwargs)
+                      block_membership=bm, vectorized=vectorized, **kwargs)
         g.set_fast_edge_removal(False)
 
     if bm is None:
@@ -456,7 +596,8 @@ def random_graph(N, deg_sampler, directed=True,
 def random_rewire(g, model="configuration", n_iter=1, edge_sweep=True,
                   parallel_edges=False, self_loops=False, edge_probs=None,
                   block_membership=None, alias=True, cache_probs=True,
-                  persist=False, pin=None, ret_fail=False, verbose=False):
+                  persist=False, pin=None, ret_fail=False, verbose=False,
+                  vectorized=False):
     r"""Shuffle the graph in-place, following a variety of possible statistical
     models, chosen via the parameter ``model``.
 
@@ -538,6 +679,19 @@ def random_rewire(g, model="configuration", n_iter=1, edge_sweep=True,
         respective vertices, as specified via the ``block_membership``
         parameter. The value of ``p`` should be a number proportional to the
         probability of such an edge existing in the generated graph.
+
+        If ``vectorized == True``, the function is called only once, with
+        arrays ``r`` and ``s`` containing all combinations of the distinct
+        values present in the graph, laid out as square matrices, and must
+        return a matrix of probabilities of the same shape. For directed graphs
+        with ``model == probabilistic-configuration``, ``r[0]`` and ``r[1]``
+        (and likewise for ``s``) are the matrices of in- and out-degrees,
+        respectively. If the block labels are tuples (or vectors) of the same
+        length, such as the ``(r, k)`` labels produced by
+        :func:`~graph_tool.generation.random_graph` with
+        ``degree_block=True``, ``r[i]`` (and likewise for ``s``) is the matrix
+        of the ``i``-th components. Other non-scalar labels are passed as
+        matrices of objects.
     block_membership : :class:`~graph_tool.PropertyMap` (optional, default: ``None``)
         If supplied, the graph will be rewired to conform to a blockmodel
         ensemble. The value must be a vertex property map which defines the
@@ -569,6 +723,10 @@ def random_rewire(g, model="configuration", n_iter=1, edge_sweep=True,
         will be left unmodified in the graph.
     verbose : bool (optional, default: ``False``)
         If ``True``, verbose information is displayed.
+    vectorized : bool (optional, default: ``False``)
+        If ``True``, the ``edge_probs`` function is evaluated on entire arrays
+        of values at once, as described above. In this case the probabilities
+        are always cached, regardless of the value of ``cache_probs``.
 
 
     Returns
@@ -805,7 +963,10 @@ def random_rewire(g, model="configuration", n_iter=1, edge_sweep=True,
     #                          "without self-loops if it already contains" +
     #                          " self-loops!")
 
-    if (edge_probs is not None and not g.is_directed()) and "blockmodel" not in model:
+    if vectorized and callable(edge_probs):
+        corr = _edge_prob_table(g, model, edge_probs, block_membership)
+        cache_probs = True
+    elif (edge_probs is not None and not g.is_directed()) and "blockmodel" not in model:
         corr = lambda i, j: edge_probs(i[1], j[1])
     else:
         corr = edge_probs
@@ -829,6 +990,7 @@ def random_rewire(g, model="configuration", n_iter=1, edge_sweep=True,
     if pin.value_type() != "bool":
         pin = pin.copy(value_type="bool")
 
+    g._Graph__unshare_filters()
     pcount = libgraph_tool_generation.random_rewire(g._Graph__graph,
                                                     _c_str(model),
                                                     n_iter, not edge_sweep,
@@ -841,6 +1003,125 @@ def random_rewire(g, model="configuration", n_iter=1, edge_sweep=True,
                                                     _get_rng(), verbose)
     return pcount
 
+_ensemble_state = None
+
+def _ensemble_init(state, worker=False):
+    global _ensemble_state
+    _ensemble_state = state
+    if worker and openmp_enabled():
+        # The OpenMP thread pool of the parent does not survive the fork, and
+        # starting a parallel region in the child may deadlock. The samples
+        # are already run in parallel by the worker processes.
+        openmp_set_num_threads(1)
+
+def _ensemble_sample(seed):
+    import graph_tool
+    g, model, reducer, kwargs = _ensemble_state
+    u = Graph(g)
+    args = {}
+    for k, v in kwargs.items():
+        if isinstance(v, PropertyMap) and v.key_type() != "g":
+            v = u.copy_property(v, g=g)
+        args[k] = v
+    rng = graph_tool._rng
+    graph_tool._rng = libcore.get_rng(seed)
+    try:
+        random_rewire(u, model=model, **args)
+    finally:
+        graph_tool._rng = rng
+    if reducer is not None:
+        return reducer(u)
+    return u
+
+def sample_ensemble(g, n, model="configuration", reducer=None, processes=None,
+                    **kwargs):
+    r"""Generate ``n`` independent samples from a random graph ensemble, by
+    rewiring copies of a given graph.
+
+    Parameters
+    ----------
+    g : :class:`~graph_tool.Graph`
+        Graph to be rewired. The graph itself is not modified.
+    n : int
+        Number of samples.
+    model : string (optional, default: ``"configuration"``)
+        Statistical model used for the rewiring. See
+        :func:`~graph_tool.generation.random_rewire` for the available options.
+    reducer : function (optional, default: ``None``)
+        If supplied, this function is called with each rewired graph as its
+        only argument, and only its return value is kept, instead of the graph
+        itself. This avoids transferring entire graphs between processes when
+        only some statistic of the ensemble is needed.
+    processes : int (optional, default: ``None``)
+        Number of worker processes used. If ``None``, the number of available
+        CPUs is used. If ``processes == 1`` the samples are generated serially
+        in the current process.
+    **kwargs : dict
+        Any remaining parameters are passed to
+        :func:`~graph_tool.generation.random_rewire`. Property maps of ``g``
+        passed in this way are copied to each rewired graph.
+
+    Returns
+    -------
+    samples : list
+        List of ``n`` rewired graphs, or the corresponding values returned by
+        ``reducer``, if it is given.
+
+    See Also
+    --------
+    random_rewire: in-place graph shuffling
+
+    Notes
+    -----
+    Each sample starts from an independent copy of ``g``, and is rewired with
+    its own random number generator, seeded from the global one (see
+    :func:`~graph_tool.seed_rng`). Therefore the results are reproducible, and
+    do not depend on the number of processes used.
+
+    Where available, the worker processes are started with ``fork``, so that
+    neither the graph nor ``reducer`` need to be picklable. The returned values
+    must always be picklable if ``processes != 1``. Each worker process uses a
+    single OpenMP thread (see :func:`~graph_tool.openmp_set_num_threads`),
+    since the OpenMP threads of the parent are not available after the fork.
+
+    Examples
+    --------
+
+    .. testcode::
+       :hide:
+
+       np.random.seed(43)
+       gt.seed_rng(42)
+
+    >>> g = gt.collection.data["football"]
+    >>> c = gt.sample_ensemble(g, 100, n_iter=10,
+    ...                        reducer=lambda u: gt.global_clustering(u)[0])
+    >>> print(len(c))
+    100
+    """
+
+    seeds = libcore.get_rng_seeds(_get_rng(), n).tolist()
+    state = (g, model, reducer, kwargs)
+    if processes == 1 or n <= 1:
+        _ensemble_init(state)
+        try:
+            return [_ensemble_sample(seed) for seed in seeds]
+        finally:
+            _ensemble_init(None)
+    ctx = multiprocessing
+    if hasattr(multiprocessing, "get_context"):
+        try:
+            ctx = multiprocessing.get_context("fork")
+        except ValueError:
+            pass
+    pool = ctx.Pool(processes, initializer=_ensemble_init,
+                    initargs=(state, True))
+    try:
+        return pool.map(_ensemble_sample, seeds, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
 def generate_sbm(b, probs, out_degs=None, in_degs=None, directed=False):
     r"""Generate a random graph by sampling from the Poisson stochastic block model.
 
@@ -1201,6 +1482,10 @@ def graph_union(g1, g2, intersection=None, props=None, include=False,
     u1 = GraphView(g1, directed=True, skip_properties=True)
     u2 = GraphView(g2, directed=True, skip_properties=True)
 
+    # the new vertices and edges are marked as visible only in the filters
+    # of u1, so that they are kept by the inverted filters of g1
+    u1._Graph__unshare_filters()
+
     vmap, emap = libgraph_tool_generation.graph_union(u1._Graph__graph,
                                                       u2._Graph__graph,
                                                       _prop("v", g1,
@@ -1219,6 +1504,11 @@ def graph_union(g1, g2, intersection=None, props=None, include=False,
 
     n_props = []
     for p1, p2 in props:
+        # categorical maps are merged as string maps
+        if p1 is not None and p1.value_type() == "categorical":
+            p1 = p1.copy(value_type="string")
+        if p2 is not None and p2.value_type() == "categorical":
+            p2 = p2.copy(value_type="string")
         if p1 is None:
             p1 = g1.new_property(p2.key_type(), p2.value_type())
         if p2 is None:
@@ -1910,6 +2200,8 @@ def condensation_graph(g, prop, vweight=None, eweight=None, avprops=None,
 
     if prop is g.vertex_index:
         prop = prop.copy(value_type="int32_t")
+    elif prop.value_type() == "categorical":
+        prop = prop.copy(value_type="string")
     cprop = gp.new_vertex_property(prop.value_type())
 
     if avprops is None:
@@ -1919,7 +2211,7 @@ def condensation_graph(g, prop, vweight=None, eweight=None, avprops=None,
     for p in avprops:
         if p is g.vertex_index:
             p = p.copy(value_type="int")
-        if "string" in p.value_type():
+        if "string" in p.value_type() or p.value_type() == "categorical":
             raise ValueError("Cannot compute sum of string properties!")
         temp = g.new_vertex_property(p.value_type())
         cp = gp.new_vertex_property(p.value_type())
@@ -1933,7 +2225,7 @@ def condensation_graph(g, prop, vweight=None, eweight=None, avprops=None,
     for p in aeprops:
         if p is g.edge_index:
             p = p.copy(value_type="int")
-        if "string" in p.value_type():
+        if "string" in p.value_type() or p.value_type() == "categorical":
             raise ValueError("Cannot compute sum of string properties!")
         temp = g.new_edge_property(p.value_type())
         cp = gp.new_edge_property(p.value_type())
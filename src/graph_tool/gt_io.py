@@ -24,6 +24,7 @@ import pickle
 import base64
 import atexit
 import sys
+import io
 from io import BytesIO
 from . import libgraph_tool_core
 
@@ -31,33 +32,57 @@ from . import libgraph_tool_core
 # object...
 
 def IStream_read(self, n=None, buflen=1048576):
-    if n is None:
-        data = b""
+    if n is None or n < 0:
+        data = []
         while True:
             buf = self.read_buf(buflen)
-            data += buf
+            data.append(buf)
             if len(buf) < buflen:
                 break
-        return data
+        return b"".join(data)
     else:
         return self.read_buf(n)
 
-def IStream_readline(self, n=None):
-    c = None
-    line = b""
-    while c != "" and c != "\n" and len(line) < n:
-        c = self.read_buf(1)
-        line += c
-    return line
+def IStream_readline(self, n=-1):
+    if n is None:
+        n = -1
+    return self.readline_buf(n)
+
+class IStreamRaw(io.RawIOBase):
+    """Unbuffered :class:`io.RawIOBase` interface to a
+    :class:`~libgraph_tool_core.IStream`, which reads directly into the
+    buffers provided by the caller."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self.stream.readinto_buf(b)
+
+def IStream_readinto(self, b):
+    return self.readinto_buf(b)
+
+def IStream_buffered(self, buffer_size=io.DEFAULT_BUFFER_SIZE):
+    """Return a :class:`io.BufferedReader` (which implements the
+    :class:`io.BufferedIOBase` interface, including ``peek()``) reading from
+    this stream, in chunks of size ``buffer_size``."""
+    return io.BufferedReader(IStreamRaw(self), buffer_size)
 
 def OStream_write(self, s):
     data = s
     self.write_buf(data, len(s))
 
 libgraph_tool_core.IStream.read_buf = libgraph_tool_core.IStream.read
+libgraph_tool_core.IStream.readline_buf = libgraph_tool_core.IStream.readline
+libgraph_tool_core.IStream.readinto_buf = libgraph_tool_core.IStream.readinto
 libgraph_tool_core.OStream.write_buf = libgraph_tool_core.OStream.write
 libgraph_tool_core.IStream.read = IStream_read
 libgraph_tool_core.IStream.readline = IStream_readline
+libgraph_tool_core.IStream.readinto = IStream_readinto
+libgraph_tool_core.IStream.buffered = IStream_buffered
 libgraph_tool_core.OStream.write = OStream_write
 
 # define and set the pickler/unpickler functions
@@ -70,8 +95,7 @@ def pickler(stream, obj):
     stream.write(sstream.getvalue())
 
 def unpickler(stream):
-    data = stream.read()
-    sstream = BytesIO(data)
+    sstream = stream.buffered()
     if sys.version_info < (3,):
         return pickle.load(sstream)
     return pickle.load(sstream, encoding="bytes")
@@ -44,10 +44,12 @@ Summary
    astar_iterator
    bellman_ford_search
    BFSVisitor
+   BFSBatchVisitor
    DFSVisitor
    DijkstraVisitor
    BellmanFordVisitor
    AStarVisitor
+   NativeVisitor
    StopSearch
 
 Examples
@@ -96,10 +98,11 @@ from .. import _prop, _python_type
 import weakref
 import numpy
 
-__all__ = ["bfs_search", "bfs_iterator", "BFSVisitor", "dfs_search",
-           "dfs_iterator", "DFSVisitor", "dijkstra_search", "dijkstra_iterator",
-           "DijkstraVisitor", "bellman_ford_search", "BellmanFordVisitor",
-           "astar_search", "astar_iterator", "AStarVisitor", "StopSearch"]
+__all__ = ["bfs_search", "bfs_iterator", "BFSVisitor", "BFSBatchVisitor",
+           "dfs_search", "dfs_iterator", "DFSVisitor", "dijkstra_search",
+           "dijkstra_iterator", "DijkstraVisitor", "bellman_ford_search",
+           "BellmanFordVisitor", "astar_search", "astar_iterator",
+           "AStarVisitor", "NativeVisitor", "StopSearch"]
 
 
 class BFSVisitor(object):
@@ -157,6 +160,98 @@ class BFSVisitor(object):
         return
 
 
+class NativeVisitor(object):
+    r"""A visitor implemented in C++, which performs common tasks without
+    invoking any Python code during the search.
+
+    It can be passed instead of a :class:`~graph_tool.search.BFSVisitor` to
+    :func:`~graph_tool.search.bfs_search`, or instead of a
+    :class:`~graph_tool.search.DijkstraVisitor` to
+    :func:`~graph_tool.search.dijkstra_search`.
+
+    Parameters
+    ----------
+    max_dist : scalar value (optional, default: ``None``)
+        If given, the search is stopped once all vertices at a distance (or
+        depth, for BFS) not larger than this value have been visited.
+    targets : iterable of :class:`~graph_tool.Vertex` (optional, default: ``None``)
+        If given, the search is stopped as soon as all these vertices have been
+        reached.
+    collect_edges : ``bool`` (optional, default: ``False``)
+        If ``True``, the edges of the search tree are collected.
+
+    Attributes
+    ----------
+    dist_map : :class:`~graph_tool.PropertyMap`
+        Distances from the source (number of edges, for BFS).
+    pred_map : :class:`~graph_tool.PropertyMap`
+        Predecessor tree.
+    time_map : :class:`~graph_tool.PropertyMap`
+        Order in which the vertices were discovered (``-1`` if they were not).
+    level_counts : :class:`~numpy.ndarray`
+        Number of vertices found at each depth (BFS only).
+    edges : :class:`~numpy.ndarray`
+        Array of shape ``(E, 3)`` with the source, target and index of the edges
+        of the search tree, in the order they were found (empty if
+        ``collect_edges == False``).
+
+    Notes
+    -----
+    The attributes above are set after the search is finished. For vertices
+    which were not reached, the distances correspond to infinity (or the
+    largest representable value for integer types), and the predecessor is
+    the vertex itself. If the search is stopped early with Dijkstra's
+    algorithm, the distances of discovered vertices that were not yet examined
+    are not final.
+
+    With BFS, each level of the search is expanded in parallel, as with
+    :func:`~graph_tool.search.bfs_iterator` when ``parallel == True``, but
+    always by scanning the edges leaving the frontier. The results do not
+    depend on ``collect_edges``, and are the same as those of a sequential
+    search with a FIFO queue.
+
+    Examples
+    --------
+    >>> vis = gt.NativeVisitor(max_dist=2)
+    >>> gt.bfs_search(g, g.vertex(0), vis)
+    >>> print(vis.level_counts)
+    [1 4 3]
+    >>> print(vis.pred_map.a)
+    [0 3 6 0 0 5 0 0 8 6]
+    """
+
+    def __init__(self, max_dist=None, targets=None, collect_edges=False):
+        self.max_dist = max_dist
+        if targets is None:
+            targets = []
+        self.targets = numpy.asarray([int(v) for v in targets], dtype="int64")
+        self.collect_edges = collect_edges
+        self.dist_map = None
+        self.pred_map = None
+        self.time_map = None
+        self.level_counts = numpy.array([], dtype="uint64")
+        self.edges = numpy.zeros((0, 3), dtype="int64")
+
+class BFSBatchVisitor(object):
+    r"""A visitor object that is invoked once per depth level of a
+    breadth-first search, with arrays containing all the vertices and edges
+    found at that level.
+
+    This should be subclassed, and can be passed instead of a
+    :class:`~graph_tool.search.BFSVisitor` to
+    :func:`~graph_tool.search.bfs_search`. Since Python is invoked only once
+    per level, instead of once per vertex and edge, this is much faster.
+    """
+
+    def frontier(self, depth, vertices, edges):
+        """Invoked for every level of the search, in increasing order of
+        ``depth``. The array ``vertices`` contains the vertices at the given
+        depth from the source, and ``edges`` is an array of shape ``(len(vertices),
+        3)`` with the source, target and index of the tree edges that reached
+        them (in the same order). If this returns ``False``, the search is
+        stopped."""
+        return
+
 def bfs_search(g, source, visitor=BFSVisitor()):
     r"""Breadth-first traversal of a directed or undirected graph.
 
@@ -169,7 +264,9 @@ def bfs_search(g, source, visitor=BFSVisitor()):
     visitor : :class:`~graph_tool.search.BFSVisitor` (optional, default: ``BFSVisitor()``)
         A visitor object that is invoked at the event points inside the
         algorithm. This should be a subclass of
-        :class:`~graph_tool.search.BFSVisitor`.
+        :class:`~graph_tool.search.BFSVisitor`, or alternatively an instance
+        of :class:`~graph_tool.search.NativeVisitor` or a subclass of
+        :class:`~graph_tool.search.BFSBatchVisitor` (see below).
 
     See Also
     --------
@@ -187,6 +284,13 @@ def bfs_search(g, source, visitor=BFSVisitor()):
 
     The time complexity is :math:`O(V + E)`.
 
+    Since the visitor methods are invoked for every vertex and edge, the
+    search is dominated by the overhead of calling Python code. If the
+    visitor is a :class:`~graph_tool.search.NativeVisitor`, the search runs
+    entirely in C++. If it is a :class:`~graph_tool.search.BFSBatchVisitor`,
+    Python is invoked only once per depth level, with arrays containing all
+    vertices and edges of that level.
+
     The pseudo-code for the BFS algorithm is listed below, with the annotated
     event points, for which the given visitor object will be called with the
     appropriate method.
@@ -283,13 +387,37 @@ def bfs_search(g, source, visitor=BFSVisitor()):
     .. [bfs-wikipedia] http://en.wikipedia.org/wiki/Breadth-first_search
     """
 
+    if isinstance(visitor, NativeVisitor):
+        visitor.dist_map = g.new_vertex_property("int32_t")
+        visitor.pred_map = g.new_vertex_property("int64_t")
+        visitor.time_map = g.new_vertex_property("int64_t")
+        max_dist = visitor.max_dist
+        if max_dist is None:
+            max_dist = g.num_vertices()
+        counts, edges = \
+            libgraph_tool_search.bfs_search_native(g._Graph__graph,
+                                                   int(source),
+                                                   _prop("v", g, visitor.dist_map),
+                                                   _prop("v", g, visitor.pred_map),
+                                                   _prop("v", g, visitor.time_map),
+                                                   int(max_dist),
+                                                   visitor.targets,
+                                                   visitor.collect_edges)
+        visitor.level_counts = counts
+        visitor.edges = edges
+        return
+
     try:
-        libgraph_tool_search.bfs_search(g._Graph__graph,
-                                        int(source), visitor)
+        if isinstance(visitor, BFSBatchVisitor):
+            libgraph_tool_search.bfs_search_batch(g._Graph__graph,
+                                                  int(source), visitor)
+        else:
+            libgraph_tool_search.bfs_search(g._Graph__graph,
+                                            int(source), visitor)
     except StopSearch:
         pass
 
-def bfs_iterator(g, source):
+def bfs_iterator(g, source, parallel=False):
     r"""Return an iterator of the edges corresponding to a breath-first traversal of
     the graph.
 
@@ -299,10 +427,14 @@ def bfs_iterator(g, source):
         Graph to be used.
     source : :class:`~graph_tool.Vertex`
         Source vertex.
+    parallel : ``bool`` (optional, default: ``False``)
+        If ``True``, the iterator yields one array of vertex indices per level
+        of the search, instead of the individual edges.
 
     Returns
     -------
-    bfs_iterator : An iterator over the edges in breath-first order.
+    bfs_iterator : An iterator over the edges in breath-first order, or over
+        the levels of the search if ``parallel == True``.
 
     See Also
     --------
@@ -319,6 +451,17 @@ def bfs_iterator(g, source):
     The time complexity is :math:`O(1)` to create the generator and
     :math:`O(V + E)` to traverse it completely.
 
+    If ``parallel == True``, the whole search is done when the iterator is
+    created, using a level-synchronous algorithm that expands each level in
+    parallel, and switches between scanning the edges leaving the frontier and
+    scanning the unvisited vertices for neighbours in the frontier, whichever
+    is cheaper [beamer-direction-2012]_. The vertices of each level are given
+    in the order they are discovered by the sequential search if the level is
+    found by scanning the edges leaving the frontier, or ordered by their
+    index otherwise. This choice depends only on the graph, so that the result
+    does not depend on the number of threads, but it is in general not the
+    same as that of the sequential search.
+
     Examples
     --------
 
@@ -334,14 +477,28 @@ def bfs_iterator(g, source):
     Alice -> Oscar
     Alice -> Dave
 
+    >>> for vs in gt.bfs_iterator(g, g.vertex(0), parallel=True):
+    ...    print(sorted(name[v] for v in vs))
+    ['Bob']
+    ['Carlos', 'Chuck', 'Eve', 'Isaac']
+    ['Alice', 'Carol', 'Imothep']
+    ['Dave', 'Oscar']
+
     References
     ----------
     .. [bfs] Edward Moore, "The shortest path through a maze", International
              Symposium on the Theory of Switching, 1959
     .. [bfs-bgl] http://www.boost.org/doc/libs/release/libs/graph/doc/breadth_first_search.html
     .. [bfs-wikipedia] http://en.wikipedia.org/wiki/Breadth-first_search
+    .. [beamer-direction-2012] Scott Beamer, Krste Asanović, David Patterson,
+       "Direction-optimizing breadth-first search", Proceedings of the
+       International Conference on High Performance Computing, Networking,
+       Storage and Analysis, 2012, :doi:`10.1109/SC.2012.50`
     """
 
+    if parallel:
+        return iter(libgraph_tool_search.bfs_search_levels(g._Graph__graph,
+                                                           int(source)))
     return libgraph_tool_search.bfs_search_generator(g._Graph__graph, int(source))
 
 
@@ -702,7 +859,10 @@ def dijkstra_search(g, source, weight, visitor=DijkstraVisitor(), dist_map=None,
     visitor : :class:`~graph_tool.search.DijkstraVisitor` (optional, default: ``DijkstraVisitor()``)
         A visitor object that is invoked at the event points inside the
         algorithm. This should be a subclass of
-        :class:`~graph_tool.search.DijkstraVisitor`.
+        :class:`~graph_tool.search.DijkstraVisitor`, or an instance of
+        :class:`~graph_tool.search.NativeVisitor`, in which case the search
+        runs entirely in C++, and the parameters ``combine``, ``compare``,
+        ``zero`` and ``infinity`` are ignored.
     dist_map : :class:`~graph_tool.PropertyMap` (optional, default: ``None``)
         A vertex property map where the distances from the source will be
         stored.
@@ -909,6 +1069,25 @@ def dijkstra_search(g, source, weight, visitor=DijkstraVisitor(), dist_map=None,
         infinity = (weight.a.max() + 1) * g.num_vertices()
         infinity = _python_type(dist_map.value_type())(infinity)
 
+    if isinstance(visitor, NativeVisitor):
+        visitor.dist_map = dist_map
+        visitor.pred_map = pred_map
+        visitor.time_map = g.new_vertex_property("int64_t")
+        max_dist = visitor.max_dist
+        if max_dist is None:
+            max_dist = numpy.inf
+        visitor.edges = \
+            libgraph_tool_search.dijkstra_search_native(g._Graph__graph,
+                                                        int(source),
+                                                        _prop("v", g, dist_map),
+                                                        _prop("v", g, pred_map),
+                                                        _prop("e", g, weight),
+                                                        _prop("v", g, visitor.time_map),
+                                                        float(max_dist),
+                                                        visitor.targets,
+                                                        visitor.collect_edges)
+        return dist_map, pred_map
+
     try:
         libgraph_tool_search.dijkstra_search(g._Graph__graph,
                                              int(source),
@@ -234,7 +234,8 @@ def vertex_average(g, deg):
     (4.975, 0.068675869124460318)
     """
 
-    if isinstance(deg, PropertyMap) and "string" in deg.value_type():
+    if isinstance(deg, PropertyMap) and ("string" in deg.value_type() or
+                                         deg.value_type() == "categorical"):
         raise ValueError("Cannot calculate average of property type: " + deg.value_type())
     a, aa, count  = libgraph_tool_stats.\
           get_vertex_average(g._Graph__graph, _degree(g, deg))
@@ -296,7 +297,8 @@ def edge_average(g, eprop):
     (0.4989741369720412, 0.004101065927783254)
     """
 
-    if "string" in eprop.value_type():
+    if ("string" in eprop.value_type() or
+        eprop.value_type() == "categorical"):
         raise ValueError("Cannot calculate average of property type: " + eprop.value_type())
     g = GraphView(g, directed=True)
     a, aa, count = libgraph_tool_stats.\
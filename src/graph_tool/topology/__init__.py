@@ -30,6 +30,8 @@ Summary
 
    shortest_distance
    shortest_path
+   landmark_distances
+   ContractionHierarchy
    all_shortest_paths
    all_predecessors
    all_paths
@@ -76,6 +78,7 @@ from .. import _prop, Vector_int32_t, _check_prop_writable, \
      _check_prop_scalar, _check_prop_vector, Graph, PropertyMap, GraphView,\
      libcore, _get_rng, _degree, perfect_prop_hash, _limit_args
 from .. stats import label_self_loops
+from .. cache import _cached
 import random, sys, numpy, collections
 
 __all__ = ["isomorphism", "subgraph_isomorphism", "mark_subgraph",
@@ -86,10 +89,10 @@ __all__ = ["isomorphism", "subgraph_isomorphism", "mark_subgraph",
            "label_largest_component", "label_biconnected_components",
            "label_out_component", "vertex_percolation", "edge_percolation",
            "kcore_decomposition", "shortest_distance", "shortest_path",
-           "all_shortest_paths", "all_predecessors", "all_paths",
-           "all_circuits", "pseudo_diameter", "is_bipartite", "is_DAG",
-           "is_planar", "make_maximal_planar", "similarity", "vertex_similarity",
-           "edge_reciprocity"]
+           "landmark_distances", "ContractionHierarchy", "all_shortest_paths",
+           "all_predecessors", "all_paths", "all_circuits", "pseudo_diameter",
+           "is_bipartite", "is_DAG", "is_planar", "make_maximal_planar",
+           "similarity", "vertex_similarity", "edge_reciprocity"]
 
 def similarity(g1, g2, eweight1=None, eweight2=None, label1=None, label2=None,
                norm=True, distance=False):
@@ -966,6 +969,7 @@ def transitive_closure(g):
     return tg
 
 
+@_cached(outputs=("vprop",))
 def label_components(g, vprop=None, directed=None, attractors=False):
     """
     Label the components to which each vertex in the graph belongs. If the
@@ -1127,7 +1131,9 @@ def label_out_component(g, root, label=None):
 
     Notes
     -----
-    The algorithm runs in :math:`O(V + E)` time.
+    The component is found with a parallel breadth-first search (see
+    :func:`~graph_tool.search.bfs_iterator`), and the algorithm runs in
+    :math:`O(V + E)` time.
 
     Examples
     --------
@@ -1421,6 +1427,7 @@ def edge_percolation(g, edges):
                        edges, max_size)
     return max_size, tree
 
+@_cached(outputs=("vprop",))
 def kcore_decomposition(g, deg="out", vprop=None):
     """
     Perform a k-core decomposition of the given graph.
@@ -1497,10 +1504,11 @@ def kcore_decomposition(g, deg="out", vprop=None):
 
 def shortest_distance(g, source=None, target=None, weights=None,
                       negative_weights=False, max_dist=None, directed=None,
-                      dense=False, dist_map=None, pred_map=False):
+                      dense=False, dist_map=None, pred_map=False, sources=None,
+                      top_k=None, out=None):
     """Calculate the distance from a source to a target vertex, or to of all
-    vertices from a given source, or the all pairs shortest paths, if the source
-    is not specified.
+    vertices from a given source, or from a given set of sources, or the all
+    pairs shortest paths, if the source is not specified.
 
     Parameters
     ----------
@@ -1535,6 +1543,20 @@ def shortest_distance(g, source=None, target=None, weights=None,
     pred_map : ``bool`` (optional, default: ``False``)
         If ``True``, a vertex property map with the predecessors is returned.
         Ignored if ``source`` is ``None``.
+    sources : iterable of :class:`~graph_tool.Vertex` or :class:`~numpy.ndarray` (optional, default: ``None``)
+        If given, the distances from all these vertices are computed, and
+        returned as a two-dimensional array, with one row per source. In this
+        case, ``source``, ``dense``, ``dist_map`` and ``pred_map`` are ignored,
+        and ``negative_weights`` must be ``False``.
+    top_k : ``int`` (optional, default: ``None``)
+        If given together with ``sources``, only the ``top_k`` closest
+        vertices to each source (excluding itself) are returned, instead of
+        the distances to all vertices.
+    out : :class:`~numpy.ndarray` (optional, default: ``None``)
+        If given together with ``sources``, the distances will be written in
+        this array, which must have the correct shape and value type. This can
+        be, for instance, a :class:`~numpy.memmap`, if the distance matrix does
+        not fit in memory. It cannot be combined with ``target``.
 
     Returns
     -------
@@ -1543,6 +1565,15 @@ def shortest_distance(g, source=None, target=None, weights=None,
         it will have a vector value type, with the distances to every vertex.
     pred_map : :class:`~graph_tool.PropertyMap` (optional, if ``pred_map == True``)
         Vertex property map with the predecessors in the search tree.
+    dist : :class:`~numpy.ndarray` (if ``sources`` is given)
+        Array of shape ``(len(sources), g.num_vertices(True))``, where
+        ``dist[i, v]`` is the distance from ``sources[i]`` to vertex ``v``, or
+        shape ``(len(sources), len(target))`` if ``target`` is also given. The
+        value type is ``int32`` if ``weights`` is ``None``, or ``double``
+        otherwise. If ``top_k`` is given, this will have shape
+        ``(len(sources), top_k)``, and will be preceded in the return value by
+        an array of the same shape with the indexes of the corresponding
+        vertices, padded with ``-1`` if fewer vertices are reachable.
 
     Notes
     -----
@@ -1559,11 +1590,24 @@ def shortest_distance(g, source=None, target=None, weights=None,
     correspond to the maximum value allowed by the value type of ``dist_map``,
     or ``inf`` in case of floating point types.
 
+    If ``sources`` is given, one independent search is done per source, and
+    these are run in parallel. The output is written directly to a dense
+    array, without intermediary property maps. If ``max_dist`` or ``top_k``
+    are given, each search stops as soon as the respective limit is reached.
+
+    Without weights, the single-source search expands each level of the BFS in
+    parallel (see :func:`~graph_tool.search.bfs_iterator`). If ``pred_map ==
+    True``, only the edges leaving each level are scanned, so that the
+    predecessors are the same as those of a sequential search.
+
     If source is specified, the algorithm runs in :math:`O(V + E)` time, or
     :math:`O(V \log V)` if weights are given. If ``negative_weights == True``,
     the complexity is :math:`O(VE)`. If source is not specified, it runs in
     :math:`O(VE\log V)` time, or :math:`O(V^3)` if dense == True.
 
+    If enabled during compilation, the searches from multiple ``sources`` run
+    in parallel.
+
     Examples
     --------
     .. testcode::
@@ -1620,6 +1664,9 @@ def shortest_distance(g, source=None, target=None, weights=None,
     >>> dist = gt.shortest_distance(g, source=g.vertex(0), target=[g.vertex(2), g.vertex(6)])
     >>> print(dist)
     [5 9]
+    >>> dist = gt.shortest_distance(g, sources=[0, 1, 2])
+    >>> print(dist.shape, dist[0, 2], dist[0, 6])
+    (3, 100) 5 9
 
     References
     ----------
@@ -1642,6 +1689,18 @@ def shortest_distance(g, source=None, target=None, weights=None,
     else:
         target = numpy.asarray([int(target)], dtype="int64")
 
+    if sources is not None:
+        if negative_weights:
+            raise ValueError("negative weights are not supported for multiple sources")
+        if out is not None and len(target) > 0:
+            raise ValueError("'out' cannot be used together with 'target'")
+        if directed is not None:
+            g = GraphView(g, directed=directed)
+        ret = _multi_source_distance(g, sources, weights, max_dist, top_k, out)
+        if top_k is None and len(target) > 0:
+            ret = ret[:, target]
+        return ret
+
     if weights is None:
         dist_type = 'int32_t'
     else:
@@ -1676,7 +1735,7 @@ def shortest_distance(g, source=None, target=None, weights=None,
                                          _prop("e", u, weights),
                                          _prop("v", u, pmap),
                                          float(max_dist),
-                                         negative_weights)
+                                         negative_weights, bool(pred_map))
     else:
         libgraph_tool_topology.get_all_dists(u._Graph__graph,
                                              _prop("v", u, dist_map),
@@ -1693,8 +1752,45 @@ def shortest_distance(g, source=None, target=None, weights=None,
     else:
         return dist_map
 
+def _multi_source_distance(g, sources, weights, max_dist, top_k, out):
+    if not isinstance(sources, numpy.ndarray):
+        sources = [int(v) for v in sources]
+    sources = numpy.array(sources, dtype="int64")
+    N = g.num_vertices(ignore_filter=True)
+    if len(sources) > 0 and (sources.min() < 0 or sources.max() >= N):
+        raise ValueError("invalid source vertex")
+
+    dtype = numpy.dtype("int32" if weights is None else "double")
+    if top_k is None:
+        shape = (len(sources), N)
+    else:
+        if top_k < 1:
+            raise ValueError("top_k must be positive")
+        shape = (len(sources), int(top_k))
+
+    if out is None:
+        dist = numpy.empty(shape, dtype=dtype)
+    else:
+        if out.shape != shape or out.dtype != dtype:
+            raise ValueError("'out' must have shape %s and type '%s'" %
+                             (str(shape), dtype.name))
+        dist = out
+
+    top = None
+    if top_k is not None:
+        top = numpy.empty(shape, dtype="int64")
+        top.fill(-1)
+        dist.fill(numpy.iinfo(dtype).max if weights is None else numpy.inf)
+
+    libgraph_tool_topology.get_multi_dists(g._Graph__graph, sources,
+                                           _prop("e", g, weights), dist, top,
+                                           float(max_dist or 0))
+    if top is not None:
+        return top, dist
+    return dist
+
 def shortest_path(g, source, target, weights=None, negative_weights=False,
-                  pred_map=None):
+                  pred_map=None, landmarks=None, array=False):
     """Return the shortest path from ``source`` to ``target``.
 
     Parameters
@@ -1713,24 +1809,45 @@ def shortest_path(g, source, target, weights=None, negative_weights=False,
         Vertex property map with the predecessors in the search tree. If this is
         provided, the shortest paths are not computed, and are obtained directly
         from this map.
+    landmarks : tuple of :class:`~graph_tool.PropertyMap` (optional, default: None)
+        Landmark distance tables, as returned by
+        :func:`~graph_tool.topology.landmark_distances`, computed with the same
+        ``weights``. If provided, the search is goal-directed (see below). This
+        is ignored if ``weights`` is ``None``. Vertices which are not covered by
+        the tables, e.g. if they were added after the tables were computed,
+        are given no distance bounds.
+    array : ``bool`` (optional, default: ``False``)
+        If ``True``, the vertex and edge indexes of the path are returned as
+        :class:`~numpy.ndarray` objects, instead of lists of vertex and edge
+        descriptors.
 
     Returns
     -------
-    vertex_list : list of :class:`~graph_tool.Vertex`
+    vertex_list : list of :class:`~graph_tool.Vertex` or :class:`~numpy.ndarray`
         List of vertices from `source` to `target` in the shortest path.
-    edge_list : list of :class:`~graph_tool.Edge`
+    edge_list : list of :class:`~graph_tool.Edge` or :class:`~numpy.ndarray`
         List of edges from `source` to `target` in the shortest path.
 
     Notes
     -----
 
-    The paths are computed with a breadth-first search (BFS) or Dijkstra's
-    algorithm [dijkstra]_, if weights are given. If ``negative_weights ==
-    True``, the Bellman-Ford algorithm is used [bellman-ford]_, which accepts
-    negative weights, as long as there are no negative loops.
+    The paths are computed with a bidirectional breadth-first search (BFS), or
+    a bidirectional version of Dijkstra's algorithm [dijkstra]_, if weights are
+    given. Both searches start simultaneously from the source and the target,
+    and stop as soon as they meet, so that typically only a small part of the
+    graph is visited. If ``landmarks`` are given, the bidirectional search is
+    further directed towards the goal via the A* algorithm with lower bounds
+    derived from the landmark distances via the triangle inequality (ALT)
+    [goldberg-alt-2005]_. If ``negative_weights == True``, the Bellman-Ford
+    algorithm is used [bellman-ford]_, which accepts negative weights, as long
+    as there are no negative loops. If ``pred_map`` is given, no search is
+    done, and the path is read directly from the predecessor tree.
+
+    If ``source`` and ``target`` are the same vertex, or if there is no path
+    between them, both returned lists are empty.
 
     The algorithm runs in :math:`O(V + E)` time, or :math:`O(V \log V)` if
-    weights are given.
+    weights are given, in the worst case.
 
     Examples
     --------
@@ -1759,14 +1876,50 @@ def shortest_path(g, source, target, weights=None, negative_weights=False,
        graphs." Numerische Mathematik, 1:269-271, 1959.
     .. [dijkstra-boost] http://www.boost.org/libs/graph/doc/dijkstra_shortest_paths.html
     .. [bellman-ford] http://www.boost.org/libs/graph/doc/bellman_ford_shortest.html
+    .. [goldberg-alt-2005] Andrew V. Goldberg, Chris Harrelson, "Computing the
+       shortest path: A* search meets graph theory", Proceedings of the
+       sixteenth annual ACM-SIAM symposium on Discrete algorithms, 156-165
+       (2005).
     """
 
+    if pred_map is None and not negative_weights:
+        if int(source) == int(target):
+            if array:
+                return (numpy.array([], dtype="uint64"),
+                        numpy.array([], dtype="uint64"))
+            return [], []
+        if weights is None or landmarks is None:
+            landmarks = (None, None)
+        ret = libgraph_tool_topology.get_p2p_path(g._Graph__graph,
+                                                  int(source), int(target),
+                                                  _prop("e", g, weights),
+                                                  _prop("v", g, landmarks[0]),
+                                                  _prop("v", g, landmarks[1]))
+        if ret is None:
+            vs = numpy.array([], dtype="uint64")
+            es = numpy.array([], dtype="uint64")
+        else:
+            vs, es = ret
+        if array:
+            return vs, es
+        vlist = [g.vertex(v) for v in vs]
+        elist = []
+        for i, ei in enumerate(es):
+            for e in g.edge(vs[i], vs[i + 1], all_edges=True):
+                if g.edge_index[e] == ei:
+                    elist.append(e)
+                    break
+        return vlist, elist
+
     if pred_map is None:
         pred_map = shortest_distance(g, source, target, weights=weights,
                                      negative_weights=negative_weights,
                                      pred_map=True)[1]
 
     if pred_map[target] == int(target):  # no path to target
+        if array:
+            return (numpy.array([], dtype="uint64"),
+                    numpy.array([], dtype="uint64"))
         return [], []
 
     vlist = [target]
@@ -1793,11 +1946,111 @@ def shortest_path(g, source, target, weights=None, negative_weights=False,
                 else:
                     pe = e
                     break
-        elist.insert(0, pe)
-        vlist.insert(0, p)
+        elist.append(pe)
+        vlist.append(p)
         v = p
+    vlist.reverse()
+    elist.reverse()
+    if array:
+        return (numpy.array([int(v) for v in vlist], dtype="uint64"),
+                numpy.array([g.edge_index[e] for e in elist], dtype="uint64"))
     return vlist, elist
 
+def landmark_distances(g, n_landmarks=16, weights=None, landmarks=None):
+    r"""Compute the distances between a set of landmark vertices and all other
+    vertices, to be used in goal-directed shortest path searches.
+
+    Parameters
+    ----------
+    g : :class:`~graph_tool.Graph`
+        Graph to be used.
+    n_landmarks : ``int`` (optional, default: ``16``)
+        Number of landmarks.
+    weights : :class:`~graph_tool.PropertyMap` (optional, default: None)
+        The edge weights.
+    landmarks : list of :class:`~graph_tool.Vertex` (optional, default: None)
+        If given, these vertices will be used as landmarks, and
+        ``n_landmarks`` is ignored.
+
+    Returns
+    -------
+    dist_from : :class:`~graph_tool.PropertyMap`
+        Vector-valued vertex property map where ``dist_from[v][i]`` is the
+        distance from landmark ``i`` to ``v``.
+    dist_to : :class:`~graph_tool.PropertyMap`
+        Vector-valued vertex property map where ``dist_to[v][i]`` is the
+        distance from ``v`` to landmark ``i``. For undirected graphs, this is
+        the same map as ``dist_from``.
+
+    Notes
+    -----
+    If not given, the landmarks are chosen iteratively, starting from a random
+    vertex, such that each new landmark is the vertex farthest away from the
+    ones already chosen. This tends to place the landmarks in the periphery of
+    the graph, where they give the tightest bounds [goldberg-alt-2005]_.
+
+    The returned pair should be passed as the ``landmarks`` parameter of
+    :func:`~graph_tool.topology.shortest_path`. It needs to be recomputed if
+    the graph or the weights are modified.
+
+    The algorithm runs in :math:`O(L(V + E))` time, or :math:`O(L V \log V)`
+    if weights are given, where :math:`L` is the number of landmarks.
+
+    Examples
+    --------
+    >>> g = gt.lattice([100, 100])
+    >>> w = g.new_edge_property("double", vals=numpy.random.random(g.num_edges()))
+    >>> lm = gt.landmark_distances(g, 8, weights=w)
+    >>> vs, es = gt.shortest_path(g, 0, 9999, weights=w, landmarks=lm,
+    ...                           array=True)
+    >>> print(vs[0], vs[-1])
+    0 9999
+
+    References
+    ----------
+    .. [goldberg-alt-2005] Andrew V. Goldberg, Chris Harrelson, "Computing the
+       shortest path: A* search meets graph theory", Proceedings of the
+       sixteenth annual ACM-SIAM symposium on Discrete algorithms, 156-165
+       (2005).
+    """
+
+    vidx = g.vertex_index.copy("int64_t").fa
+
+    def get_dists(u, gv):
+        d = shortest_distance(gv, gv.vertex(u), weights=weights).fa
+        if d.dtype.kind in "iu":
+            inf = d == numpy.iinfo(d.dtype).max
+            d = numpy.array(d, dtype="float")
+            d[inf] = numpy.inf
+        return numpy.array(d, dtype="float")
+
+    dfrom = []
+    if landmarks is None:
+        landmarks = []
+        min_d = numpy.empty(len(vidx))
+        min_d.fill(numpy.inf)
+        u = vidx[numpy.random.randint(len(vidx))]
+        for i in range(min(n_landmarks, len(vidx))):
+            landmarks.append(u)
+            dfrom.append(get_dists(u, g))
+            min_d = numpy.minimum(min_d, dfrom[-1])
+            if min_d.max() == 0:
+                break
+            u = vidx[min_d.argmax()]
+    else:
+        landmarks = [int(u) for u in landmarks]
+        dfrom = [get_dists(u, g) for u in landmarks]
+
+    dist_from = g.new_vertex_property("vector<double>")
+    dist_from.set_2d_array(numpy.array(dfrom))
+    if not g.is_directed():
+        return dist_from, dist_from
+
+    rg = GraphView(g, reversed=True)
+    dist_to = g.new_vertex_property("vector<double>")
+    dist_to.set_2d_array(numpy.array([get_dists(u, rg) for u in landmarks]))
+    return dist_from, dist_to
+
 def all_predecessors(g, dist_map, pred_map):
     """Return a property map with all possible predecessors in the search tree
         determined by ``dist_map`` and ``pred_map``.
@@ -1827,6 +2080,141 @@ def all_predecessors(g, dist_map, pred_map):
                                          _prop("v", g, preds))
     return preds
 
+class ContractionHierarchy(object):
+    r"""Preprocessed graph for fast repeated shortest-distance queries, using
+    contraction hierarchies [geisberger-contraction-2008]_.
+
+    Parameters
+    ----------
+    g : :class:`~graph_tool.Graph`
+        Graph to be used.
+    weights : :class:`~graph_tool.PropertyMap` (optional, default: None)
+        The edge weights, which must be non-negative. If not provided, all
+        edges are assumed to have unit weight.
+    max_settled : ``int`` (optional, default: ``500``)
+        Maximum number of vertices settled in each local search done during
+        preprocessing to decide if a shortcut is necessary. Larger values
+        result in fewer shortcuts (and hence faster queries), at the expense
+        of a slower preprocessing.
+
+    Notes
+    -----
+    During preprocessing, the vertices are ordered by "importance", and
+    removed ("contracted") one by one, in this order. Whenever a vertex lies on
+    the only shortest path between two of its remaining neighbours, a
+    "shortcut" edge is inserted between them, with the weight of the
+    path. Queries are then answered by a bidirectional Dijkstra search that
+    only follows edges towards more important vertices, which visits only a
+    very small fraction of the graph, at least for networks with a pronounced
+    hierarchical structure, such as road networks.
+
+    The hierarchy is a snapshot of the graph and the weights at the time of
+    construction, and is not updated if they are modified. It does not keep a
+    reference to the graph, and can be pickled. In particular, it can be
+    saved together with the graph as an internal graph property map of type
+    ``object``:
+
+    >>> g.gp["ch"] = g.new_gp("object", ch)   # doctest: +SKIP
+    >>> g.save("graph.gt.gz")                  # doctest: +SKIP
+
+    The preprocessing runs typically in :math:`O(V\log V)` time for sparse
+    graphs with a hierarchical structure, but is considerably slower for
+    graphs without it, e.g. random graphs or regular lattices.
+
+    If enabled during compilation, :meth:`dist_matrix` runs in parallel.
+
+    Examples
+    --------
+    >>> g = gt.lattice([50, 50])
+    >>> w = g.new_edge_property("double", vals=numpy.random.random(g.num_edges()))
+    >>> ch = gt.ContractionHierarchy(g, w)
+    >>> d = ch.dist(0, 2499)
+    >>> abs(d - gt.shortest_distance(g, 0, 2499, weights=w)) < 1e-8
+    True
+
+    References
+    ----------
+    .. [geisberger-contraction-2008] Robert Geisberger, Peter Sanders,
+       Dominik Schultes, Daniel Delling, "Contraction Hierarchies: Faster and
+       Simpler Hierarchical Routing in Road Networks", Experimental Algorithms,
+       319-333 (2008), :doi:`10.1007/978-3-540-68552-4_24`
+    .. [knopp-many-to-many-2007] Sebastian Knopp, Peter Sanders, Dominik
+       Schultes, Frank Schulz, Dorothea Wagner, "Computing Many-to-Many
+       Shortest Paths Using Highway Hierarchies", Proceedings of the Ninth
+       Workshop on Algorithm Engineering and Experiments (2007),
+       :doi:`10.1137/1.9781611972870.4`
+    """
+
+    def __init__(self, g, weights=None, max_settled=500):
+        if weights is None:
+            weights = g.new_edge_property("double", val=1)
+        self._N = g.num_vertices(ignore_filter=True)
+        self._state = \
+            libgraph_tool_topology.build_contraction_hierarchy(g._Graph__graph,
+                                                               _prop("e", g, weights),
+                                                               max_settled)
+
+    def __repr__(self):
+        return ("<ContractionHierarchy object with %d vertices and %d arcs, at 0x%x>" %
+                (self._N, len(self._state["fidx"]) + len(self._state["bidx"]),
+                 id(self)))
+
+    def _check_vertex(self, v):
+        v = int(v)
+        if v < 0 or v >= self._N:
+            raise ValueError("Invalid vertex index: %d" % v)
+        return v
+
+    def _vertex_array(self, vs):
+        if not isinstance(vs, numpy.ndarray):
+            vs = [int(v) for v in vs]
+        vs = numpy.array(vs, dtype="int64")
+        if len(vs) > 0 and (vs.min() < 0 or vs.max() >= self._N):
+            raise ValueError("Invalid vertex index in list")
+        return vs
+
+    def get_rank(self):
+        """Return an array with the position of each vertex in the contraction
+        order."""
+        return self._state["rank"]
+
+    def dist(self, source, target):
+        """Return the shortest distance from ``source`` to ``target``, or
+        ``inf`` if ``target`` cannot be reached."""
+        return libgraph_tool_topology.ch_dist(self._state,
+                                              self._check_vertex(source),
+                                              self._check_vertex(target))
+
+    def path(self, source, target):
+        """Return the shortest path from ``source`` to ``target``, as a pair of
+        arrays containing the vertex and edge indexes along the path,
+        respectively. If ``source`` and ``target`` are the same vertex, or if
+        ``target`` cannot be reached, both arrays are empty, as with
+        :func:`~graph_tool.topology.shortest_path`.
+        """
+        ret = libgraph_tool_topology.ch_path(self._state,
+                                             self._check_vertex(source),
+                                             self._check_vertex(target))
+        if ret is None:
+            return (numpy.array([], dtype="uint64"),
+                    numpy.array([], dtype="uint64"))
+        return ret
+
+    def dist_matrix(self, sources, targets):
+        """Return a two-dimensional array ``d``, where ``d[i, j]`` is the
+        shortest distance from ``sources[i]`` to ``targets[j]``.
+
+        This is considerably faster than performing the queries individually,
+        since only one upward search is done per source and per target
+        [knopp-many-to-many-2007]_.
+        """
+        sources = self._vertex_array(sources)
+        targets = self._vertex_array(targets)
+        d = numpy.empty((len(sources), len(targets)), dtype="double")
+        d.fill(numpy.inf)
+        libgraph_tool_topology.ch_dist_matrix(self._state, sources, targets, d)
+        return d
+
 def all_shortest_paths(g, source, target, weights=None, negative_weights=False,
                        dist_map=None, pred_map=None, all_preds_map=None):
     """Return an iterator over all shortest paths from `source` to `target`.
@@ -42,7 +42,7 @@ from __future__ import division, absolute_import, print_function
 from .. dl_import import dl_import
 dl_import("from . import libgraph_tool_util")
 
-from .. import _degree, _prop, _converter
+from .. import _degree, _prop, _converter, CategoricalPropertyMap
 
 __all__ = ["find_vertex", "find_vertex_range", "find_edge", "find_edge_range"]
 
@@ -51,6 +51,12 @@ def find_vertex(g, prop, match):
     """Find all vertices `v` for which `prop[v] = match`. The parameter prop
     can be either a :class:`~graph_tool.PropertyMap` or string with value "in",
     "out" or "total", representing a degree type."""
+    if isinstance(prop, CategoricalPropertyMap):
+        # compare the integer codes directly
+        code = prop.code(match)
+        if code < 0:
+            return []
+        return find_vertex(g, prop.codes, code)
     if prop in ["in", "out", "total"]:
         val = int(match)
     else:
@@ -78,6 +84,11 @@ def find_vertex_range(g, prop, range):
 def find_edge(g, prop, match):
     """Find all edges `e` for which `prop[e] = match`. The parameter prop
     must be a :class:`~graph_tool.PropertyMap`."""
+    if isinstance(prop, CategoricalPropertyMap):
+        code = prop.code(match)
+        if code < 0:
+            return []
+        return find_edge(g, prop.codes, code)
     val = _converter(prop.value_type())(match)
     ret = libgraph_tool_util.\
           find_edge_range(g._Graph__graph, _prop("e", g, prop),